@@ -0,0 +1,340 @@
+"""Scalable download archive.
+
+Replaces yt-dlp's ``--download-archive`` text file, which is re-read in full
+on every run. Lookups go through an in-memory Bloom filter first, so most
+negatives cost a few hash probes. Possible hits are confirmed by binary
+search over a sorted, memory-mapped ID file. New IDs are appended to a small
+journal and merged into the sorted file by periodic compaction.
+
+Entries use yt-dlp's archive format ("<extractor> <id>"), so an existing
+yt-dlp archive can be imported as-is.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+from typing import Iterable, Iterator, Optional, Set
+
+DEFAULT_COMPACT_THRESHOLD = 10000
+DEFAULT_ERROR_RATE = 0.001
+MIN_BLOOM_CAPACITY = 100000
+
+BLOOM_MAGIC = b"YTDLBLM1"
+BLOOM_HEADER = struct.Struct(">8sQQQQQ")
+
+
+def archive_key(extractor: str, video_id: str) -> str:
+    """Build an archive key in yt-dlp's "<extractor> <id>" format."""
+    return f"{extractor.lower()} {video_id}"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one blake2b digest."""
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_ERROR_RATE):
+        self.capacity = max(capacity, 1)
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def is_saturated(self) -> bool:
+        """True once more keys were added than the filter was sized for."""
+        return self.count > self.capacity
+
+
+class DownloadArchive:
+    """Archive of downloaded video keys.
+
+    Files:
+        <path>          sorted, deduplicated keys, one per line
+        <path>.journal  append-only keys added since the last compaction
+        <path>.bloom    cached Bloom filter for the sorted file
+
+    Thread-safe.
+    """
+
+    def __init__(self, path: str, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+                 error_rate: float = DEFAULT_ERROR_RATE):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.bloom_path = path + ".bloom"
+        self.compact_threshold = compact_threshold
+        self.error_rate = error_rate
+        self._lock = threading.RLock()
+        self._journal: Set[str] = set()
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self.bloom: Optional[BloomFilter] = None
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    @classmethod
+    def from_config(cls, config) -> Optional['DownloadArchive']:
+        """Create the archive if ``download_archive`` is configured."""
+        path = config.get("download_archive")
+        if not path:
+            return None
+        return cls(path, int(config.get("archive_compact_threshold", DEFAULT_COMPACT_THRESHOLD)))
+
+    # -- loading -------------------------------------------------------
+
+    def _open(self):
+        if not os.path.exists(self.path):
+            open(self.path, 'wb').close()
+        self._map_sorted_file()
+        self.bloom = self._load_bloom() or self._build_bloom()
+        self._load_journal()
+
+    def _map_sorted_file(self):
+        self._unmap()
+        if os.path.getsize(self.path) == 0:
+            return
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _unmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _signature(self) -> int:
+        stat = os.stat(self.path)
+        return (stat.st_size << 20) ^ stat.st_mtime_ns
+
+    def _load_bloom(self) -> Optional[BloomFilter]:
+        """Load the cached Bloom filter if it matches the sorted file."""
+        try:
+            with open(self.bloom_path, 'rb') as f:
+                magic, signature, capacity, num_bits, num_hashes, count = BLOOM_HEADER.unpack(
+                    f.read(BLOOM_HEADER.size))
+                if magic != BLOOM_MAGIC or signature != self._signature():
+                    return None
+                bloom = BloomFilter.__new__(BloomFilter)
+                bloom.capacity, bloom.num_bits, bloom.num_hashes, bloom.count = capacity, num_bits, num_hashes, count
+                bloom.bits = bytearray(f.read())
+                if len(bloom.bits) != (num_bits + 7) // 8:
+                    return None
+                return bloom
+        except (OSError, struct.error):
+            return None
+
+    def _save_bloom(self, bloom: BloomFilter):
+        tmp_path = self.bloom_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(BLOOM_HEADER.pack(BLOOM_MAGIC, self._signature(), bloom.capacity,
+                                      bloom.num_bits, bloom.num_hashes, bloom.count))
+            f.write(bloom.bits)
+        os.replace(tmp_path, self.bloom_path)
+
+    def _build_bloom(self) -> BloomFilter:
+        # Size for the current archive plus room to grow until the next compaction
+        estimated = os.path.getsize(self.path) // 16
+        bloom = BloomFilter(max(MIN_BLOOM_CAPACITY, 2 * estimated), self.error_rate)
+        previous = None
+        in_order = True
+        for key in self._iter_sorted():
+            bloom.add(key)
+            if previous is not None and key <= previous:
+                in_order = False
+            previous = key
+        if not in_order:
+            # A plain yt-dlp archive used in place: sort it once
+            self._rewrite_sorted()
+        self._save_bloom(bloom)
+        return bloom
+
+    def _rewrite_sorted(self):
+        keys = sorted(set(self._iter_sorted()))
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as out:
+            out.writelines(key + "\n" for key in keys)
+        self._unmap()
+        os.replace(tmp_path, self.path)
+        self._map_sorted_file()
+
+    def _load_journal(self):
+        self._journal = set()
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                key = line.strip()
+                if key:
+                    self._journal.add(key)
+                    self.bloom.add(key)
+
+    def _iter_sorted(self) -> Iterator[str]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                key = line.strip()
+                if key:
+                    yield key
+
+    # -- lookups -------------------------------------------------------
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key not in self.bloom:
+                return False
+            if key in self._journal:
+                return True
+            return self._search_sorted(key.encode('utf-8'))
+
+    def _search_sorted(self, key: bytes) -> bool:
+        """Binary search over newline-separated sorted keys in the mmap."""
+        mm = self._mmap
+        if mm is None:
+            return False
+        lo, hi = 0, len(mm)
+        # Invariant: lo and hi are always at line starts
+        while lo < hi:
+            mid = (lo + hi) // 2
+            newline = mm.rfind(b"\n", lo, mid)
+            start = lo if newline == -1 else newline + 1
+            end = mm.find(b"\n", start, hi)
+            if end == -1:
+                end = hi
+            line = mm[start:end].rstrip(b"\r")
+            if line == key:
+                return True
+            if line < key:
+                lo = end + 1
+            else:
+                hi = start
+        return False
+
+    # -- ingestion -----------------------------------------------------
+
+    def add(self, key: str):
+        """Append a key to the archive."""
+        key = key.strip()
+        if not key:
+            return
+        with self._lock:
+            if key in self:
+                return
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(key + "\n")
+            self._journal.add(key)
+            self.bloom.add(key)
+            if len(self._journal) >= self.compact_threshold:
+                self.compact()
+
+    def add_many(self, keys: Iterable[str]):
+        """Append many keys with a single journal write."""
+        with self._lock:
+            new_keys = {}
+            for key in keys:
+                key = key.strip()
+                if key and key not in new_keys and key not in self:
+                    new_keys[key] = None
+            if not new_keys:
+                return
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.writelines(key + "\n" for key in new_keys)
+            for key in new_keys:
+                self._journal.add(key)
+                self.bloom.add(key)
+            if len(self._journal) >= self.compact_threshold:
+                self.compact()
+
+    def import_ytdlp_archive(self, path: str, batch_size: int = 10000) -> int:
+        """Import keys from a yt-dlp ``--download-archive`` text file.
+
+        Returns:
+            Number of lines read
+        """
+        count = 0
+        batch = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                batch.append(line)
+                count += 1
+                if len(batch) >= batch_size:
+                    self.add_many(batch)
+                    batch = []
+        self.add_many(batch)
+        return count
+
+    def record_completed(self, completed):
+        """Completion hook: archive a finished download."""
+        if completed.extractor and completed.video_id:
+            self.add(archive_key(completed.extractor, completed.video_id))
+
+    # -- compaction ----------------------------------------------------
+
+    def compact(self):
+        """Merge the journal into the sorted file.
+
+        Streams a merge of the sorted file with the sorted journal into a
+        temporary file and atomically replaces the archive.
+        """
+        with self._lock:
+            if not self._journal:
+                return
+            tmp_path = self.path + ".tmp"
+            journal = iter(sorted(self._journal))
+            pending = next(journal, None)
+            with open(tmp_path, 'w', encoding='utf-8') as out:
+                for key in self._iter_sorted():
+                    while pending is not None and pending < key:
+                        out.write(pending + "\n")
+                        pending = next(journal, None)
+                    if pending == key:
+                        pending = next(journal, None)
+                    out.write(key + "\n")
+                while pending is not None:
+                    out.write(pending + "\n")
+                    pending = next(journal, None)
+
+            self._unmap()
+            os.replace(tmp_path, self.path)
+            open(self.journal_path, 'w').close()
+            self._journal = set()
+            self._map_sorted_file()
+
+            if self.bloom.is_saturated():
+                self.bloom = self._build_bloom()
+            else:
+                self._save_bloom(self.bloom)
+
+    def __len__(self):
+        with self._lock:
+            sorted_count = 0
+            with open(self.path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sorted_count += chunk.count(b"\n")
+            return sorted_count + len(self._journal)
+
+    def close(self):
+        """Compact pending entries and release the memory map."""
+        with self._lock:
+            self.compact()
+            self._unmap()
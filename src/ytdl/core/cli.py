@@ -1,7 +1,16 @@
 import argparse
-from typing import List, Optional
+import sys
+import threading
+from typing import Iterator, List, Optional, TextIO
 from .config import ConfigService
 from .downloader import DownloaderService, OutputHandler
+from .dedup import FileDeduplicator
+from .sync import ChannelSync
+from .jobs import DownloadEngine, Job, JobStatus
+from .watch import FolderWatcher, iter_urls
+from .progress import ProgressRenderer
+from .events import JsonEventWriter
+from .eventbus import EventBus, MetricEvent, MetricsSink
 
 
 class CLIService:
@@ -22,6 +31,8 @@ class CLIService:
         self.downloader = downloader
         self.output_handler = output_handler
         self.parser = self._create_parser()
+        self.sync_parser = self._create_sync_parser()
+        self.watch_parser = self._create_watch_parser()
     
     def _create_parser(self) -> argparse.ArgumentParser:
         parser = argparse.ArgumentParser(
@@ -32,7 +43,23 @@ class CLIService:
         parser.add_argument(
             "url",
             nargs="?",
-            help="URL to download (optional in interactive mode)"
+            help="URL to download, or - to read URLs from stdin (optional in interactive mode)"
+        )
+        
+        parser.add_argument(
+            "-a", "--batch-file",
+            help="File with one URL per line to download (- for stdin)"
+        )
+        
+        parser.add_argument(
+            "-j", "--jobs",
+            type=int,
+            help=f"Concurrent downloads for batch input (default: {self.config.get('concurrent_downloads', 2)})"
+        )
+        
+        parser.add_argument(
+            "--status-file",
+            help="Write the final status of every batch URL to this file"
         )
         
         parser.add_argument(
@@ -58,12 +85,103 @@ class CLIService:
             help="Show video information without downloading"
         )
         
+        parser.add_argument(
+            "--dedup",
+            action="store_true",
+            help="Hardlink duplicate files in the output directory and exit"
+        )
+        
         parser.add_argument(
             "-i", "--interactive",
             action="store_true",
             help="Interactive mode for downloading multiple URLs"
         )
         
+        parser.add_argument(
+            "--json-events",
+            action="store_true",
+            help="Write job events to stdout as JSON lines (log messages go to stderr)"
+        )
+        
+        return parser
+    
+    def _create_sync_parser(self) -> argparse.ArgumentParser:
+        parser = argparse.ArgumentParser(
+            prog="ytdl sync",
+            description="Download only the new uploads of channels or playlists"
+        )
+        
+        parser.add_argument(
+            "sources",
+            nargs="+",
+            help="Channel or playlist URLs to sync"
+        )
+        
+        parser.add_argument(
+            "-o", "--output",
+            help=f"Output directory (default: {self.config.download_dir})"
+        )
+        
+        parser.add_argument(
+            "-q", "--quality",
+            help=f"Video quality (default: {self.config.quality})",
+            choices=["best", "worst", "720p", "1080p", "480p"]
+        )
+        
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Ignore sync state and enumerate each source completely"
+        )
+        
+        parser.add_argument(
+            "--json-events",
+            action="store_true",
+            help="Write job events to stdout as JSON lines (log messages go to stderr)"
+        )
+        
+        return parser
+    
+    def _create_watch_parser(self) -> argparse.ArgumentParser:
+        parser = argparse.ArgumentParser(
+            prog="ytdl watch",
+            description="Download URLs from text files dropped into a folder"
+        )
+        
+        parser.add_argument(
+            "directory",
+            help="Folder to watch for .txt/.urls/.list files"
+        )
+        
+        parser.add_argument(
+            "-o", "--output",
+            help=f"Output directory (default: {self.config.download_dir})"
+        )
+        
+        parser.add_argument(
+            "-q", "--quality",
+            help=f"Video quality (default: {self.config.quality})",
+            choices=["best", "worst", "720p", "1080p", "480p"]
+        )
+        
+        parser.add_argument(
+            "-j", "--jobs",
+            type=int,
+            help="Number of concurrent downloads"
+        )
+        
+        parser.add_argument(
+            "--poll",
+            action="store_true",
+            help="Poll the folder instead of using inotify"
+        )
+        
+        parser.add_argument(
+            "--json-events",
+            action="store_true",
+            help="Write job events to stdout as JSON lines (log messages go to stderr)"
+        )
+        
         return parser
     
     def parse_args(self, args: Optional[List[str]] = None) -> argparse.Namespace:
@@ -71,10 +189,31 @@ class CLIService:
     
     def run(self, args: Optional[List[str]] = None) -> int:
         try:
+            if args is None:
+                args = sys.argv[1:]
+            if args and args[0] == "sync":
+                sync_args = self.sync_parser.parse_args(args[1:])
+                self._configure_events(sync_args)
+                return self._sync(sync_args)
+            if args and args[0] == "watch":
+                watch_args = self.watch_parser.parse_args(args[1:])
+                self._configure_events(watch_args)
+                return self._watch(watch_args)
+            
             parsed_args = self.parse_args(args)
             
             if parsed_args.interactive:
+                if parsed_args.json_events:
+                    self.output_handler.error("--json-events can't be used in interactive mode")
+                    return 1
                 return self._interactive_mode(parsed_args)
+            self._configure_events(parsed_args)
+            
+            if parsed_args.dedup:
+                return self._deduplicate(parsed_args)
+            
+            if parsed_args.batch_file or parsed_args.url == "-":
+                return self._batch(parsed_args)
             
             if not parsed_args.url:
                 self.output_handler.error("URL required when not in interactive mode")
@@ -99,6 +238,13 @@ class CLIService:
             self.output_handler.error(f"Unexpected error: {str(e)}")
             return 1
     
+    def _configure_events(self, args: argparse.Namespace):
+        """Switch to JSON event output if requested (main() normally sets this up)."""
+        if not args.json_events:
+            return
+        if getattr(self.downloader, "events", None) is None:
+            self.downloader.enable_json_events(JsonEventWriter.from_config(self.config))
+    
     def _determine_quality(self, args: argparse.Namespace) -> str:
         if args.audio_only:
             return "bestaudio/best"
@@ -115,36 +261,229 @@ class CLIService:
             self.output_handler.error("Could not fetch video information")
             return 1
     
+    def _open_batch_input(self, args: argparse.Namespace) -> TextIO:
+        source = args.batch_file or "-"
+        if source == "-":
+            return sys.stdin
+        return open(source, 'r', encoding='utf-8', errors='replace')
+    
+    def _batch(self, args: argparse.Namespace) -> int:
+        """Download URLs streamed from a batch file or stdin.
+        
+        Input is read lazily, one line at a time, while up to ``--jobs``
+        downloads run; reading pauses while the engine's queue is full.
+        """
+        engine = DownloadEngine.from_config(self.config, self.downloader, self.output_handler, workers=args.jobs)
+        quality = self._determine_quality(args)
+        status_file = open(args.status_file, 'w', encoding='utf-8') if args.status_file else None
+        status_lock = threading.Lock()
+        skipped = 0
+        
+        def write_status(status: str, url: str):
+            if status_file:
+                with status_lock:
+                    status_file.write(f"{status}\t{url}\n")
+                    status_file.flush()
+        
+        def job_finished(job: Job):
+            write_status(job.status, job.url)
+        
+        engine.on_job_finished.append(job_finished)
+        metrics = MetricsSink()
+        bus = getattr(self.downloader, "bus", None)
+        subscription = bus.subscribe(metrics, (MetricEvent,)) if isinstance(bus, EventBus) else None
+        engine.start()
+        batch_input = self._open_batch_input(args)
+        try:
+            for url in iter_urls(batch_input):
+                job = engine.submit(url, output_dir=args.output, quality=quality)
+                if job is None:
+                    skipped += 1
+                    write_status(JobStatus.SKIPPED, url)
+            engine.shutdown()
+        except KeyboardInterrupt:
+            engine.shutdown(wait=False)
+            raise
+        finally:
+            if batch_input is not sys.stdin:
+                batch_input.close()
+            if status_file:
+                status_file.close()
+            if subscription is not None:
+                bus.unsubscribe(subscription)
+        
+        counts = engine.counts()
+        failed = counts[JobStatus.FAILED]
+        self.output_handler.info(
+            f"Summary: {counts[JobStatus.DONE]} downloaded, {failed} failed, "
+            f"{skipped} skipped (duplicate or already downloaded)")
+        if metrics.total("download.bytes"):
+            self.output_handler.info(
+                f"Transferred {metrics.total('download.bytes') / (1024 * 1024):.1f} MB "
+                f"in {metrics.total('download.seconds'):.0f}s of download time")
+        return 0 if failed == 0 else 1
+    
+    def _sync(self, args: argparse.Namespace) -> int:
+        channel_sync = ChannelSync.from_config(self.config, self.downloader, self.output_handler)
+        failed = 0
+        for source in args.sources:
+            result = channel_sync.sync(source, output_dir=args.output,
+                                       quality=args.quality or self.config.quality, full=args.full)
+            if not result.success:
+                failed += 1
+        return 0 if failed == 0 else 1
+    
+    def _watch(self, args: argparse.Namespace) -> int:
+        engine = DownloadEngine.from_config(self.config, self.downloader, self.output_handler, workers=args.jobs)
+        quality = args.quality or self.config.quality
+        
+        def enqueue(url: str):
+            # Blocks while the queue is full, which pauses reading
+            job = engine.submit(url, output_dir=args.output, quality=quality)
+            if job:
+                self.output_handler.info(f"Queued job {job.id}: {url}")
+        
+        watcher = FolderWatcher(args.directory, enqueue, use_inotify=not args.poll)
+        self.output_handler.info(f"Watching {watcher.directory} for URL files (Ctrl+C to stop)")
+        engine.start()
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            watcher.stop()
+            self.output_handler.info("Stopped watching; cancelling queued downloads")
+            engine.shutdown(wait=False)
+            return 0
+        engine.shutdown()
+        return 0
+    
+    def _deduplicate(self, args: argparse.Namespace) -> int:
+        deduplicator = self.downloader.deduplicator
+        if deduplicator is None or args.output:
+            deduplicator = FileDeduplicator([args.output or self.config.download_dir], self.output_handler)
+        deduplicator.deduplicate_tree()
+        return 0
+    
     def _interactive_mode(self, args: argparse.Namespace) -> int:
+        """Read URLs and commands at a prompt while downloads run in the background."""
         self.output_handler.info("Interactive mode - Enter URLs to download (type 'quit' to exit)")
         self.output_handler.info(f"Current settings - Quality: {args.quality or self.config.quality}, Output: {args.output or self.config.download_dir}")
+        self.output_handler.info("Commands: status, jobs, pause <n>, resume <n>, cancel <n>, quit")
+        
+        engine = DownloadEngine.from_config(self.config, self.downloader, self.output_handler, workers=args.jobs)
+        engine.on_job_finished.append(self._report_job)
+        engine.start()
+        progress = getattr(self.downloader, "progress", None)
+        if isinstance(progress, ProgressRenderer) and progress.mode == "bars":
+            # Redrawing bars would fight with the prompt; print periodic lines instead
+            progress.mode = "plain"
+        prefetch = self.config.get("prefetch_metadata", False)
+        quality = self._determine_quality(args)
         
         while True:
             try:
-                url = input("ytdl> ").strip()
+                line = input(self._prompt(engine)).strip()
+                command = line.lower()
                 
-                if url.lower() in ['quit', 'exit', 'q']:
+                if command in ['quit', 'exit', 'q']:
+                    self._finish_interactive(engine)
                     self.output_handler.info("Goodbye!")
                     return 0
                 
-                if not url:
+                if not line:
                     continue
                 
-                if url.startswith('http'):
-                    quality = self._determine_quality(args)
-                    success = self.downloader.download(
-                        url=url,
-                        output_dir=args.output,
-                        quality=quality
-                    )
-                    if not success:
-                        self.output_handler.error("Download failed, continuing...")
+                if command == 'status':
+                    self.output_handler.info(self._status_line(engine) or "No jobs")
+                elif command == 'jobs':
+                    self._list_jobs(engine)
+                elif command.startswith('cancel'):
+                    self._cancel_job(engine, line[len('cancel'):].strip())
+                elif command.startswith('pause'):
+                    self._pause_job(engine, line[len('pause'):].strip())
+                elif command.startswith('resume'):
+                    self._resume_job(engine, line[len('resume'):].strip())
+                elif line.startswith('http'):
+                    job = engine.submit(line, output_dir=args.output, quality=quality, block=False)
+                    if job is None:
+                        self.output_handler.info(self.downloader.find_existing(line) or "Already queued or queue full")
+                        continue
+                    self.output_handler.info(f"Queued job {job.id}: {line}")
+                    if prefetch:
+                        engine.prefetch(job).add_done_callback(
+                            lambda future, job=job: self._report_prefetch(job, future))
                 else:
                     self.output_handler.error("Please enter a valid URL starting with http")
                     
             except KeyboardInterrupt:
                 self.output_handler.info("\nExiting interactive mode")
+                engine.shutdown(wait=False)
                 return 0
             except EOFError:
                 self.output_handler.info("\nExiting interactive mode")
-                return 0
\ No newline at end of file
+                self._finish_interactive(engine)
+                return 0
+    
+    def _finish_interactive(self, engine: DownloadEngine):
+        counts = engine.counts()
+        pending = counts[JobStatus.QUEUED] + counts[JobStatus.RUNNING]
+        if pending:
+            self.output_handler.info(f"Waiting for {pending} download(s) to finish (Ctrl+C to cancel)")
+        try:
+            engine.shutdown()
+        except KeyboardInterrupt:
+            engine.shutdown(wait=False)
+    
+    def _report_job(self, job: Job):
+        if job.status == JobStatus.FAILED:
+            self.output_handler.error(f"Job {job.id} failed: {job.title or job.url}")
+        elif job.status == JobStatus.DONE:
+            self.output_handler.info(f"Job {job.id} done: {job.title or job.url}")
+    
+    def _report_prefetch(self, job: Job, future):
+        if not future.cancelled() and future.exception() is None and future.result():
+            self.output_handler.info(f"Job {job.id}: {job.title}")
+    
+    def _status_line(self, engine: DownloadEngine) -> str:
+        """Compact multi-job summary, e.g. "2 running, 3 queued, 1 failed"."""
+        counts = engine.counts()
+        parts = [f"{counts[status]} {status}" for status in
+                 (JobStatus.RUNNING, JobStatus.QUEUED, JobStatus.DONE, JobStatus.FAILED)
+                 if counts[status]]
+        return ", ".join(parts)
+    
+    def _prompt(self, engine: DownloadEngine) -> str:
+        status = self._status_line(engine)
+        return f"ytdl [{status}]> " if status else "ytdl> "
+    
+    def _list_jobs(self, engine: DownloadEngine):
+        jobs = engine.jobs()
+        if not jobs:
+            self.output_handler.info("No jobs")
+        for job in jobs:
+            percent = f" {job.percent:.0f}%" if job.status == JobStatus.RUNNING and job.percent is not None else ""
+            status = "paused" if job.paused else job.status
+            self.output_handler.info(f"[{job.id}] {status:<9} {job.title or job.url}{percent}")
+    
+    def _cancel_job(self, engine: DownloadEngine, job_id: str):
+        if not job_id.isdigit():
+            self.output_handler.error("Usage: cancel <job number>")
+        elif engine.cancel(int(job_id)):
+            self.output_handler.info(f"Cancelled job {job_id}")
+        else:
+            self.output_handler.error(f"Job {job_id} is not queued or running")
+    
+    def _pause_job(self, engine: DownloadEngine, job_id: str):
+        if not job_id.isdigit():
+            self.output_handler.error("Usage: pause <job number>")
+        elif engine.pause(int(job_id)):
+            self.output_handler.info(f"Paused job {job_id}")
+        else:
+            self.output_handler.error(f"Job {job_id} is not running")
+    
+    def _resume_job(self, engine: DownloadEngine, job_id: str):
+        if not job_id.isdigit():
+            self.output_handler.error("Usage: resume <job number>")
+        elif engine.resume(int(job_id)):
+            self.output_handler.info(f"Resumed job {job_id}")
+        else:
+            self.output_handler.error(f"Job {job_id} is not paused")
@@ -82,7 +82,32 @@ class ConfigService:
             "audio_format": "mp3",
             "ytdlp_binary": "yt-dlp_linux",
             "log_level": "INFO",
-            "log_file": None
+            "log_file": None,
+            "format_planner": True,
+            "disk_full_policy": "wait",
+            "disk_wait_timeout": 600,
+            "disk_safety_margin_mb": 256,
+            "output_roots": [],
+            "placement_policy": "most_free",
+            "library_index": True,
+            "download_archive": None,
+            "dedup": False,
+            "sync_state_file": None,
+            "concurrent_downloads": 2,
+            "queue_size": 1000,
+            "prefetch_metadata": True,
+            "lookahead_jobs": 2,
+            "lookahead_rate": 30,
+            "progress_mode": "auto",
+            "progress_max_fps": 10,
+            "event_progress_interval": 1.0,
+            "metadata_workers": 4,
+            "metadata_timeout": 30,
+            "metadata_batch_size": 20,
+            "metadata_cache_size": 100,
+            "metadata_cache_ttl": 300,
+            "thumbnail_cache_dir": None,
+            "thumbnail_cache_mb": 50
         }
     
     def save_config(self):
@@ -0,0 +1,311 @@
+"""Content-hash deduplication of finished downloads.
+
+The same video often arrives through different URLs (mirrors, re-uploads,
+shared playlists). Candidates are narrowed in three stages so most files
+are never read in full:
+
+    1. size (from the directory scan, no reads)
+    2. partial hash of the first and last block
+    3. full streaming hash
+
+Exact duplicates are replaced with a hardlink to the existing file.
+"""
+
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+PARTIAL_BLOCK_SIZE = 64 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_MIN_SIZE = 1024 * 1024
+# Cached hashes kept (least recently used dropped first); about 200 bytes each
+HASH_CACHE_SIZE = 50000
+SKIPPED_SUFFIXES = ('.part', '.ytdl', '.temp', '.tmp', '.sqlite', '.sqlite-wal', '.sqlite-shm', '.jsonl')
+
+
+class DedupResult:
+    """Outcome of a deduplication pass."""
+
+    def __init__(self):
+        self.files_linked = 0
+        self.bytes_saved = 0
+
+    def add(self, saved: int):
+        self.files_linked += 1
+        self.bytes_saved += saved
+
+    def __repr__(self):
+        return f"DedupResult(files_linked={self.files_linked}, bytes_saved={self.bytes_saved})"
+
+
+def partial_hash(path: str, size: int) -> bytes:
+    """Hash the first and last block of a file together with its size."""
+    digest = hashlib.blake2b(size.to_bytes(8, 'little'), digest_size=16)
+    with open(path, 'rb') as f:
+        digest.update(f.read(PARTIAL_BLOCK_SIZE))
+        if size > PARTIAL_BLOCK_SIZE:
+            f.seek(max(PARTIAL_BLOCK_SIZE, size - PARTIAL_BLOCK_SIZE))
+            digest.update(f.read(PARTIAL_BLOCK_SIZE))
+    return digest.digest()
+
+
+def full_hash(path: str) -> bytes:
+    """Hash a whole file through a read-only memory map."""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return digest.digest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for offset in range(0, len(mm), HASH_CHUNK_SIZE):
+                    digest.update(view[offset:offset + HASH_CHUNK_SIZE])
+            finally:
+                view.release()
+    return digest.digest()
+
+
+class FileDeduplicator:
+    """Replaces duplicate files under a set of roots with hardlinks.
+
+    Files are grouped by (device, size), since hardlinks can't cross
+    volumes. Hashes are cached per (device, inode, size, mtime) so a file
+    is read at most once per stage while it is unchanged, up to
+    ``HASH_CACHE_SIZE`` recently used hashes.
+
+    Thread-safe. Files are hashed without holding the lock, so a large
+    file doesn't hold up other jobs' completion hooks; the lock only
+    covers the candidate index and the final link.
+    """
+
+    def __init__(self, roots: List[str], output_handler=None, min_size: int = DEFAULT_MIN_SIZE,
+                 cache_size: int = HASH_CACHE_SIZE):
+        """Initialize the deduplicator.
+
+        Args:
+            roots: Directories whose files are candidates for deduplication
+            output_handler: Output handler for reporting saved space
+            min_size: Files smaller than this are ignored
+            cache_size: Hashes kept in memory
+        """
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.output_handler = output_handler
+        self.min_size = min_size
+        self.cache_size = max(1, cache_size)
+        self._lock = threading.Lock()
+        self._by_size: Optional[Dict[Tuple[int, int], List[str]]] = None
+        self._hashes: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._hashes_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, output_handler=None) -> Optional['FileDeduplicator']:
+        """Create the deduplicator if ``dedup`` is enabled in configuration."""
+        if not config.get("dedup", False):
+            return None
+        roots = [entry if isinstance(entry, str) else entry["path"]
+                 for entry in (config.get("output_roots") or [])]
+        return cls(roots or [config.download_dir], output_handler,
+                   int(config.get("dedup_min_size_mb", DEFAULT_MIN_SIZE // (1024 * 1024))) * 1024 * 1024)
+
+    # -- candidate index -----------------------------------------------
+
+    def _ensure_index(self) -> Dict[Tuple[int, int], List[str]]:
+        if self._by_size is None:
+            self._by_size = {}
+            for root in self.roots:
+                self._index_tree(root)
+        return self._by_size
+
+    def _candidates(self, key: Tuple[int, int]) -> List[str]:
+        return self._ensure_index().get(key, [])
+
+    def _index_tree(self, root: str):
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                if name.endswith(SKIPPED_SUFFIXES):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.lstat(path)
+                except OSError:
+                    continue
+                if stat.st_size >= self.min_size and os.path.isfile(path) and not os.path.islink(path):
+                    self._by_size.setdefault((stat.st_dev, stat.st_size), []).append(path)
+
+    def _hash(self, path: str, stat: os.stat_result, kind: str) -> bytes:
+        """Hash a file, reading it only if no hash is cached. Call without ``_lock``."""
+        key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, kind)
+        with self._hashes_lock:
+            cached = self._hashes.get(key)
+            if cached is not None:
+                self._hashes.move_to_end(key)
+                return cached
+        digest = partial_hash(path, stat.st_size) if kind == "partial" else full_hash(path)
+        with self._hashes_lock:
+            self._hashes[key] = digest
+            while len(self._hashes) > self.cache_size:
+                self._hashes.popitem(last=False)
+        return digest
+
+    @staticmethod
+    def _unchanged(path: str, stat: os.stat_result) -> bool:
+        """Check that a file is still the one that was hashed."""
+        try:
+            now = os.stat(path)
+        except OSError:
+            return False
+        return (now.st_ino, now.st_size, now.st_mtime_ns) == (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    # -- deduplication -------------------------------------------------
+
+    def find_duplicate(self, path: str) -> Optional[str]:
+        """Return an existing file with identical content, if any."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        if stat.st_size < self.min_size:
+            return None
+        with self._lock:
+            candidates = list(self._candidates((stat.st_dev, stat.st_size)))
+        match = self._find_duplicate(path, stat, candidates)
+        if match is None or match[1].st_ino == stat.st_ino:
+            return None
+        return match[0]
+
+    def _find_duplicate(self, path: str, stat: os.stat_result,
+                        candidates: List[str]) -> Optional[Tuple[str, os.stat_result]]:
+        """Find a candidate with the same content. Call without ``_lock``.
+
+        Returns:
+            The matching file and its stat; a match with the same inode
+            means the file is already linked
+        """
+        partial = None
+        full = None
+        for candidate in candidates:
+            if candidate == path:
+                continue
+            try:
+                other = os.stat(candidate)
+            except OSError:
+                continue
+            if other.st_size != stat.st_size or other.st_dev != stat.st_dev:
+                continue
+            if other.st_ino == stat.st_ino:
+                return candidate, other
+            try:
+                if partial is None:
+                    partial = self._hash(path, stat, "partial")
+                if self._hash(candidate, other, "partial") != partial:
+                    continue
+                if full is None:
+                    full = self._hash(path, stat, "full")
+                if self._hash(candidate, other, "full") == full:
+                    return candidate, other
+            except OSError:
+                continue
+        return None
+
+    def deduplicate_file(self, path: str) -> int:
+        """Hardlink a file to an identical existing file.
+
+        Args:
+            path: File to deduplicate; it is added to the index if unique
+
+        Returns:
+            Bytes saved (0 if no duplicate was found)
+        """
+        path = os.path.abspath(path)
+        checked = set()
+        while True:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return 0
+            if stat.st_size < self.min_size:
+                return 0
+            key = (stat.st_dev, stat.st_size)
+            with self._lock:
+                candidates = [c for c in self._candidates(key) if c != path and c not in checked]
+                if not candidates:
+                    # Unique; later downloads are compared against it
+                    paths = self._ensure_index().setdefault(key, [])
+                    if path not in paths:
+                        paths.append(path)
+                    return 0
+
+            match = self._find_duplicate(path, stat, candidates)
+            # Files indexed while these were hashed are checked on the next pass
+            checked.update(candidates)
+            if match is None:
+                continue
+            original, other = match
+            if other.st_ino == stat.st_ino:
+                return 0
+            with self._lock:
+                if self._unchanged(path, stat) and self._unchanged(original, other):
+                    self._replace_with_link(original, path)
+                    break
+            # Modified while being hashed; compare again
+            checked.clear()
+
+        # Space is only freed if this was the file's last link
+        saved = stat.st_size if stat.st_nlink == 1 else 0
+
+        if self.output_handler is not None:
+            self.output_handler.info(
+                f"Deduplicated {os.path.basename(path)}: linked to {original} "
+                f"({saved / (1024 * 1024):.1f} MB saved)")
+        return saved
+
+    def _replace_with_link(self, original: str, duplicate: str):
+        """Atomically replace ``duplicate`` with a hardlink to ``original``."""
+        tmp_path = f"{duplicate}.dedup-{os.getpid()}.tmp"
+        os.link(original, tmp_path)
+        try:
+            os.replace(tmp_path, duplicate)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+    def deduplicate_tree(self) -> DedupResult:
+        """Deduplicate every file under the configured roots."""
+        result = DedupResult()
+        with self._lock:
+            self._by_size = None
+            groups = [list(paths) for paths in self._ensure_index().values() if len(paths) > 1]
+
+        for paths in groups:
+            for path in paths:
+                saved = self._deduplicate_in_group(path, paths)
+                if saved is not None:
+                    result.add(saved)
+
+        if self.output_handler is not None:
+            self.output_handler.info(
+                f"Deduplication: {result.files_linked} files linked, "
+                f"{result.bytes_saved / (1024 * 1024):.1f} MB saved")
+        return result
+
+    def _deduplicate_in_group(self, path: str, group: List[str]) -> Optional[int]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        # Only compare against files earlier in the group so each pair is seen once
+        match = self._find_duplicate(path, stat, group[:group.index(path)])
+        if match is None or match[1].st_ino == stat.st_ino:
+            return None
+        original, other = match
+        with self._lock:
+            if not (self._unchanged(path, stat) and self._unchanged(original, other)):
+                return None
+            self._replace_with_link(original, path)
+        return stat.st_size if stat.st_nlink == 1 else 0
+
+    def record_completed(self, completed):
+        """Completion hook: deduplicate a finished download."""
+        if completed.filepath and os.path.isfile(completed.filepath):
+            self.deduplicate_file(completed.filepath)
@@ -0,0 +1,228 @@
+"""Disk-space preflight and per-volume reservation accounting.
+
+Each download reserves its estimated size against the free space of the
+volume it writes to before yt-dlp is started. Concurrent jobs therefore see
+each other's pending writes and a batch waits (or fails fast) instead of
+filling the disk halfway through and leaving half-written files behind.
+"""
+
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .formats import FormatPlan
+
+# Merging or remuxing keeps the downloaded parts on disk while ffmpeg writes
+# the output, so the peak usage is roughly twice the download size
+MERGE_HEADROOM = 1.0
+
+DEFAULT_SAFETY_MARGIN = 256 * 1024 * 1024
+DEFAULT_WAIT_TIMEOUT = 600.0
+POLL_INTERVAL = 5.0
+
+
+class InsufficientDiskSpaceError(Exception):
+    """Raised when a reservation cannot be satisfied."""
+
+
+def estimate_required_bytes(info: Optional[Dict[str, Any]],
+                            plan: Optional[FormatPlan] = None) -> Optional[int]:
+    """Estimate peak disk usage for downloading a video.
+
+    Args:
+        info: yt-dlp info JSON
+        plan: Format plan chosen for the download, if any
+
+    Returns:
+        Estimated bytes including merge headroom, or None if unknown
+    """
+    if plan is not None:
+        size = plan.estimated_bytes
+        needs_postprocess = plan.needs_merge or plan.needs_remux
+    elif info:
+        size = info.get('filesize') or info.get('filesize_approx')
+        if not size and info.get('requested_formats'):
+            parts = [f.get('filesize') or f.get('filesize_approx') for f in info['requested_formats']]
+            size = sum(parts) if all(parts) else None
+        needs_postprocess = bool(info.get('requested_formats'))
+    else:
+        return None
+
+    if not size:
+        return None
+    if needs_postprocess:
+        size += size * MERGE_HEADROOM
+    return int(size)
+
+
+def _existing_ancestor(path: str) -> str:
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def volume_id(path: str) -> int:
+    """Return the device ID of the volume holding ``path``.
+
+    Resolves through the nearest existing ancestor so that output directories
+    which have not been created yet still map to their volume.
+    """
+    return os.stat(_existing_ancestor(path)).st_dev
+
+
+def free_bytes(path: str) -> int:
+    """Free bytes on the volume holding ``path``."""
+    return shutil.disk_usage(_existing_ancestor(path)).free
+
+
+class Reservation:
+    """A block of reserved bytes on one volume.
+
+    Use as a context manager, or call release() when the job finishes.
+    """
+
+    def __init__(self, manager: 'DiskReservations', volume: int, path: str, nbytes: int):
+        self.manager = manager
+        self.volume = volume
+        self.path = path
+        self.nbytes = nbytes
+        self.written = 0
+        self.released = False
+
+    def consume(self, written: int):
+        """Record how much of the reservation has already been written.
+
+        Written bytes already show up in the volume's free space, so they
+        are no longer counted as pending.
+        """
+        self.manager._update_written(self, written)
+
+    def release(self):
+        """Return the reserved bytes to the volume."""
+        self.manager.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+class DiskReservations:
+    """Tracks pending writes per volume against real free space.
+
+    Thread-safe; share one instance between all concurrent jobs.
+    """
+
+    def __init__(self, safety_margin: int = DEFAULT_SAFETY_MARGIN,
+                 policy: str = "wait", wait_timeout: float = DEFAULT_WAIT_TIMEOUT):
+        """Initialize reservation accounting.
+
+        Args:
+            safety_margin: Bytes to always keep free on every volume
+            policy: "wait" to block until space frees up, "fail" to fail fast
+            wait_timeout: Maximum seconds to wait under the "wait" policy
+        """
+        self.safety_margin = safety_margin
+        self.policy = policy
+        self.wait_timeout = wait_timeout
+        self._pending: Dict[int, int] = {}
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_config(cls, config) -> 'DiskReservations':
+        """Create reservation accounting from configuration settings."""
+        return cls(
+            safety_margin=int(config.get("disk_safety_margin_mb", DEFAULT_SAFETY_MARGIN // (1024 * 1024))) * 1024 * 1024,
+            policy=config.get("disk_full_policy", "wait"),
+            wait_timeout=float(config.get("disk_wait_timeout", DEFAULT_WAIT_TIMEOUT)),
+        )
+
+    def pending_bytes(self, path: str) -> int:
+        """Bytes reserved but not yet written on the volume holding ``path``."""
+        with self._condition:
+            return self._pending.get(volume_id(path), 0)
+
+    def available_bytes(self, path: str) -> int:
+        """Free bytes on the volume after pending reservations and safety margin."""
+        volume = volume_id(path)
+        with self._condition:
+            return self._available(path, volume)
+
+    def _available(self, path: str, volume: int) -> int:
+        return free_bytes(path) - self._pending.get(volume, 0) - self.safety_margin
+
+    def try_reserve(self, path: str, nbytes: int) -> Optional[Reservation]:
+        """Reserve space without waiting.
+
+        Returns:
+            Reservation, or None if the volume cannot fit ``nbytes`` right now
+        """
+        volume = volume_id(path)
+        with self._condition:
+            if self._available(path, volume) < nbytes:
+                return None
+            return self._add(volume, path, nbytes)
+
+    def reserve(self, path: str, nbytes: int, timeout: Optional[float] = None) -> Reservation:
+        """Reserve space on the volume holding ``path``.
+
+        Under the "wait" policy this blocks until running jobs release enough
+        space. A request that could not fit even with every other reservation
+        released fails immediately.
+
+        Raises:
+            InsufficientDiskSpaceError: If the space cannot be reserved
+        """
+        volume = volume_id(path)
+        timeout = self.wait_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                available = self._available(path, volume)
+                if available >= nbytes:
+                    return self._add(volume, path, nbytes)
+
+                never_fits = available + self._pending.get(volume, 0) < nbytes
+                remaining = deadline - time.monotonic()
+                if self.policy != "wait" or never_fits or remaining <= 0:
+                    raise InsufficientDiskSpaceError(
+                        f"Not enough disk space in {path}: need {nbytes} bytes, "
+                        f"{max(available, 0)} available"
+                    )
+
+                # Released reservations notify us; external writers don't,
+                # so poll free space periodically as well
+                self._condition.wait(min(remaining, POLL_INTERVAL))
+
+    def release(self, reservation: Reservation):
+        """Release a reservation and wake up waiting jobs."""
+        with self._condition:
+            if reservation.released:
+                return
+            reservation.released = True
+            outstanding = reservation.nbytes - reservation.written
+            self._pending[reservation.volume] = max(
+                0, self._pending.get(reservation.volume, 0) - outstanding)
+            self._condition.notify_all()
+
+    def _add(self, volume: int, path: str, nbytes: int) -> Reservation:
+        self._pending[volume] = self._pending.get(volume, 0) + nbytes
+        return Reservation(self, volume, path, nbytes)
+
+    def _update_written(self, reservation: Reservation, written: int):
+        with self._condition:
+            if reservation.released:
+                return
+            written = min(max(written, reservation.written), reservation.nbytes)
+            delta = written - reservation.written
+            reservation.written = written
+            self._pending[reservation.volume] = max(0, self._pending.get(reservation.volume, 0) - delta)
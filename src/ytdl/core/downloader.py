@@ -2,8 +2,39 @@ import subprocess
 import os
 import sys
 import re
-from typing import List, Optional, Protocol
+import json
+import signal
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Protocol, Tuple
 from .config import ConfigService
+from .formats import FormatPlan, is_plannable_quality, plan_formats
+from .diskspace import DiskReservations, Reservation, estimate_required_bytes
+from .placement import OutputPlacement
+from .library import LibraryIndex
+from .archive import DownloadArchive, archive_key
+from .dedup import FileDeduplicator
+from .urls import UrlKind, is_collection_url, parse_url, url_key
+from .metadata import MetadataCache, SingleFlight
+from .processes import ProcessRegistry, process_group_kwargs
+from .progress import ByteCounter, ConsoleSink, ProgressRenderer, parse_progress_line
+from .events import RETRYABLE_REASONS, JsonEventWriter, classify_failure, post_processor_step
+from .eventbus import (DEFAULT_QUEUE_SIZE, EventBus, JobEvent, JobState, LogEvent, MetricEvent,
+                       OutputHandlerSink, ProgressEvent, Stage, StageEvent)
+
+# Written by yt-dlp once per finished file (after it's moved into place)
+COMPLETION_TEMPLATE = "after_move:%(id)s\t%(extractor_key)s\t%(format_id)s\t%(upload_date)s\t%(filepath)s"
+# Printed by a flat listing once per playlist or channel entry
+ENTRY_TEMPLATE = "%(playlist_index)s\t%(ie_key,extractor_key)s\t%(id)s"
+
+# yt-dlp's exit code when anything failed; with --ignore-errors the other entries still ran
+YTDLP_ENTRY_ERRORS = 1
+# yt-dlp's exit code when it stops on purpose (--break-* filters, --max-downloads)
+YTDLP_STOPPED_EARLY = 101
+
+# How often get_info() checks its cancel event while yt-dlp runs
+INFO_POLL_INTERVAL = 0.2
 
 
 class OutputHandler(Protocol):
@@ -25,6 +56,22 @@ class ConsoleOutputHandler:
         print(f"ERROR: {message}")
 
 
+class CompletedDownload:
+    """A file produced by a finished download, passed to completion hooks."""
+    
+    def __init__(self, url: str, video_id: str, extractor: str, format_id: str, filepath: str,
+                 upload_date: Optional[str] = None):
+        self.url = url
+        self.video_id = video_id
+        self.extractor = extractor
+        self.format_id = format_id
+        self.filepath = filepath
+        self.upload_date = upload_date if upload_date and upload_date != "NA" else None
+    
+    def __repr__(self):
+        return f"CompletedDownload({self.video_id!r}, {self.filepath!r})"
+
+
 class DownloaderService:
     """Service for downloading videos using yt-dlp.
     
@@ -32,30 +79,196 @@ class DownloaderService:
     and configurable output directories. Integrates with yt-dlp binary via subprocess.
     """
     
-    def __init__(self, config: ConfigService, output_handler: OutputHandler = None):
+    def __init__(self, config: ConfigService, output_handler: OutputHandler = None,
+                 reservations: Optional[DiskReservations] = None,
+                 placement: Optional[OutputPlacement] = None,
+                 library: Optional[LibraryIndex] = None,
+                 archive: Optional[DownloadArchive] = None,
+                 deduplicator: Optional[FileDeduplicator] = None,
+                 progress: Optional[ProgressRenderer] = None,
+                 events: Optional[JsonEventWriter] = None,
+                 bus: Optional[EventBus] = None,
+                 metadata: Optional[MetadataCache] = None):
         """Initialize downloader service.
         
         Args:
             config: Configuration service instance
             output_handler: Output handler for messages (default: ConsoleOutputHandler)
+            reservations: Shared disk-space reservations (no preflight if None)
+            placement: Multi-root placement used when no output directory is given
+            library: Library index used to skip videos that are already on disk
+            archive: Download archive used to skip videos downloaded before
+            deduplicator: Hardlinks finished files that duplicate existing ones
+            progress: Shared renderer for progress of concurrent downloads
+            events: Writer for machine-readable job events; replaces
+                yt-dlp's console output when set
+            bus: Event bus to publish on (a private one is created if None)
+            metadata: Cache of recently extracted info JSON (no caching if None)
+            
+        Without a renderer or event writer, progress and yt-dlp output are
+        printed directly to the console.
         """
         self.config = config
-        self.output_handler = output_handler or ConsoleOutputHandler()
+        self.reservations = reservations
+        self.placement = placement
+        self.library = library
+        self.archive = archive
+        self.deduplicator = deduplicator
+        self.progress = progress
+        self.events = None
+        self.completion_hooks: List[Callable[[CompletedDownload], None]] = []
+        self.processes = ProcessRegistry()
+        self.metadata = metadata
+        # Concurrent get_info() calls for one video share a single yt-dlp run
+        self._info_flight = SingleFlight()
+        
+        self.bus = bus or EventBus()
+        self._console = None
+        if progress is not None:
+            self.bus.subscribe(progress, (ProgressEvent, JobEvent, LogEvent))
+        elif events is None:
+            self._console = self.bus.subscribe(ConsoleSink(), (ProgressEvent, JobEvent, LogEvent))
+        # Subscribed after the console sinks so a pending progress line is ended first
+        self._output_sink = OutputHandlerSink(output_handler or ConsoleOutputHandler())
+        self.bus.subscribe(self._output_sink, (LogEvent,))
+        if events is not None:
+            self.enable_json_events(events)
+        
+        if deduplicator is not None:
+            self.add_completion_hook(deduplicator.record_completed)
+        if library is not None:
+            self.add_completion_hook(library.record_completed)
+        if placement is not None:
+            self.add_completion_hook(placement.record_completed)
+        if archive is not None:
+            self.add_completion_hook(archive.record_completed)
+    
+    @property
+    def output_handler(self) -> OutputHandler:
+        """Handler receiving info and error messages."""
+        return self._output_sink.output_handler
+    
+    @output_handler.setter
+    def output_handler(self, output_handler: OutputHandler):
+        self._output_sink.output_handler = output_handler
+    
+    @classmethod
+    def from_config(cls, config: ConfigService, output_handler: OutputHandler = None,
+                    progress: Optional[ProgressRenderer] = None,
+                    events: Optional[JsonEventWriter] = None) -> 'DownloaderService':
+        """Create a downloader with the optional subsystems enabled in config."""
+        reservations = DiskReservations.from_config(config)
+        return cls(
+            config, output_handler,
+            progress=progress,
+            events=events,
+            reservations=reservations,
+            placement=OutputPlacement.from_config(config, reservations),
+            library=LibraryIndex.from_config(config),
+            archive=DownloadArchive.from_config(config),
+            deduplicator=FileDeduplicator.from_config(config, output_handler),
+            metadata=MetadataCache.from_config(config)
+        )
+    
+    def enable_json_events(self, events: JsonEventWriter):
+        """Publish job events as JSON lines instead of console progress and output."""
+        self.events = events
+        # Async: a slow reader of the event stream must not stall yt-dlp's output
+        self.bus.subscribe(events, (JobEvent, StageEvent, ProgressEvent), queue_size=DEFAULT_QUEUE_SIZE)
+        if self._console is not None:
+            self.bus.unsubscribe(self._console)
+            self._console = None
+        if self.progress is not None:
+            self.progress.mode = "off"
+    
+    def add_completion_hook(self, hook: Callable[[CompletedDownload], None]):
+        """Register a callback run for every file a download produces."""
+        self.completion_hooks.append(hook)
     
-    def download(self, url: str, output_dir: Optional[str] = None, quality: Optional[str] = None) -> bool:
+    def _info(self, message: str, job: Optional[int] = None):
+        self.bus.publish(LogEvent(LogEvent.INFO, message, job))
+    
+    def _error(self, message: str, job: Optional[int] = None):
+        self.bus.publish(LogEvent(LogEvent.ERROR, message, job))
+    
+    def download(self, url: str, output_dir: Optional[str] = None, quality: Optional[str] = None,
+                 info: Optional[dict] = None, extra_args: Optional[List[str]] = None,
+                 job_id: Optional[int] = None) -> bool:
         """Download video from URL.
         
+        Progress, stages, log lines and the final job state are published
+        on the event bus.
+        
         Args:
             url: Video URL to download
             output_dir: Output directory (uses config default if None)
             quality: Video quality (uses config default if None)
+            info: Pre-fetched info JSON; fetched here when the format planner needs it
+            extra_args: Additional yt-dlp arguments for this download
+            job_id: Job ID used in events (allocated and announced here if None)
             
         Returns:
             True if download succeeded, False otherwise
         """
+        info_file = None
+        record_file = None
+        reservation = None
+        entry = None
+        bus = self.bus
+        started = time.monotonic()
+        last_error = None
+        finished = False
+        if job_id is None:
+            job_id = bus.new_job_id()
+            bus.publish(JobEvent(job_id, JobState.QUEUED, url))
         try:
-            cmd = self._build_command(url, output_dir, quality)
-            self.output_handler.info(f"Downloading: {url}")
+            existing = self.find_existing(url, info)
+            if existing:
+                self._info(existing, job_id)
+                finished = True
+                bus.publish(JobEvent(job_id, JobState.SKIPPED, url, reason=existing))
+                return True
+            
+            bus.publish(StageEvent(job_id, Stage.EXTRACTING, url=url))
+            extra_args = list(extra_args or [])
+            if self.archive is not None and is_collection_url(url):
+                # find_existing only sees the collection URL; check each entry
+                entries = self._list_entries(url, extra_args)
+                missing = [index for index, key in entries if key not in self.archive]
+                if entries and not missing:
+                    reason = f"All {len(entries)} entries are in the archive"
+                    self._info(reason, job_id)
+                    finished = True
+                    bus.publish(JobEvent(job_id, JobState.SKIPPED, url, reason=reason))
+                    return True
+                if len(missing) < len(entries):
+                    self._info(f"Skipping {len(entries) - len(missing)} archived entries", job_id)
+                    extra_args.extend(["--playlist-items", self._playlist_items(missing)])
+            if info is None and self.metadata is not None:
+                # Extracted recently (e.g. by the GUI or a prefetch); yt-dlp can skip extraction
+                info = self.metadata.get(url_key(url))
+            needs_info = self._wants_format_plan(quality) or self.reservations is not None
+            if info is None and needs_info and not is_collection_url(url):
+                # The format plan and the disk space check both work from the info
+                info = self.get_info(url)
+            if info and info.get('formats'):
+                # Hand the already extracted info to yt-dlp so it doesn't extract again
+                info_file = self._write_info_file(info)
+            
+            download_dir = output_dir
+            if output_dir is None and self.placement is not None:
+                download_dir, reservation = self.placement.place(info, self._estimate_bytes(info, quality), url)
+            elif self.reservations is not None and info:
+                reservation = self._reserve_space(output_dir, quality, info)
+            if self.reservations is not None and reservation is None:
+                self._info(f"Skipping disk space check: {self._unknown_size_reason(url, info)}", job_id)
+            
+            if self.completion_hooks or self.events is not None:
+                record_file = self._create_record_file()
+                extra_args.extend(["--print-to-file", COMPLETION_TEMPLATE, record_file])
+            
+            cmd = self._build_command(url, download_dir, quality, info, info_file, extra_args)
+            self._info(f"Downloading: {url}", job_id)
             
             process = subprocess.Popen(
                 cmd,
@@ -64,55 +277,303 @@ class DownloaderService:
                 text=True,
                 bufsize=1,
                 universal_newlines=True,
-                cwd=os.getcwd()
+                cwd=os.getcwd(),
+                **process_group_kwargs()
             )
+            entry = self.processes.register(job_id, url, process)
             
-            # Stream output in real-time with smart progress handling
-            last_progress_line = None
+            # Only parse here; sinks decide how progress and output are shown
+            label = (info or {}).get('title') or url
+            written = ByteCounter()
+            post_step = None
             for line in process.stdout:
                 line = line.rstrip()
                 if self._is_progress_line(line):
-                    # Store progress line, only show the latest one
-                    last_progress_line = line
-                    print(f"\r{line}", end="", flush=True)
-                else:
-                    # Non-progress lines: print normally
-                    # If we had a progress line, add newline first
-                    if last_progress_line:
-                        print()  # Add newline after the last progress line
-                        last_progress_line = None
-                    print(line)
-            
-            # Ensure we end with a newline after the final progress line
-            if last_progress_line:
-                print()  # Final newline after progress
+                    progress = parse_progress_line(line)
+                    if progress:
+                        total_written = written.update(progress)
+                        if reservation:
+                            # Bytes on disk now show up in free space; stop counting them as pending
+                            reservation.consume(total_written)
+                        bus.publish(ProgressEvent(job_id, url, label, written=total_written, **progress))
+                    continue
+                
+                entry.note_output(line)
+                if line.startswith("ERROR:"):
+                    last_error = line[len("ERROR:"):].strip()
+                step = post_processor_step(line)
+                if step and step != post_step:
+                    post_step = step
+                    bus.publish(StageEvent(job_id, Stage.POST_PROCESSING, step=step))
+                bus.publish(LogEvent(LogEvent.OUTPUT, line, job_id))
             
             # Wait for process to complete and get return code
             return_code = process.wait()
             
-            if return_code == 0:
-                self.output_handler.info("Download completed successfully")
+            if entry.cancelled:
+                self.processes.finish_cancelled(entry)
+                finished = True
+                self._info("Download cancelled", job_id)
+                bus.publish(JobEvent(job_id, JobState.CANCELLED, url,
+                                     elapsed=round(time.monotonic() - started, 3)))
+                return False
+            
+            # Playlists can partially succeed, so hooks run for whatever finished
+            completed = self._run_completion_hooks(url, record_file) if record_file else []
+            elapsed = round(time.monotonic() - started, 3)
+            
+            finished = True
+            if return_code in (0, YTDLP_STOPPED_EARLY):
+                if return_code == 0:
+                    self._info("Download completed successfully", job_id)
+                else:
+                    self._info("Download stopped early: reached already downloaded items", job_id)
+                bus.publish(MetricEvent("download.bytes", written.written, job_id))
+                bus.publish(MetricEvent("download.seconds", elapsed, job_id))
+                bus.publish(JobEvent(job_id, JobState.COMPLETED, url,
+                                     files=[c.filepath for c in completed], elapsed=elapsed))
                 return True
             else:
-                self.output_handler.error("Download failed")
+                self._error("Download failed", job_id)
+                self._publish_failure(job_id, url, last_error or f"yt-dlp exited with code {return_code}",
+                                      elapsed, return_code)
                 return False
                 
         except Exception as e:
-            self.output_handler.error(f"Error during download: {str(e)}")
+            self._error(f"Error during download: {str(e)}", job_id)
+            finished = True
+            self._publish_failure(job_id, url, str(e), round(time.monotonic() - started, 3))
             return False
+        finally:
+            if entry is not None and entry.process.poll() is None:
+                # Interrupted; yt-dlp runs in its own process group, so the
+                # terminal's Ctrl+C doesn't reach it
+                entry.signal_group(signal.SIGTERM)
+            self.processes.unregister(job_id)
+            if not finished:
+                # Interrupted (e.g. Ctrl+C); make sure sinks see the job end
+                bus.publish(JobEvent(job_id, JobState.CANCELLED, url))
+            if reservation:
+                reservation.release()
+            for path in (info_file, record_file):
+                if path and os.path.exists(path):
+                    os.remove(path)
+    
+    def pause(self, job_id: int) -> bool:
+        """Pause a running download by stopping its processes.
+        
+        Not available on Windows, which has no SIGSTOP.
+        
+        Args:
+            job_id: Job ID the download was started with
+            
+        Returns:
+            True if the download was running and is now paused
+        """
+        entry = self.processes.get(job_id)
+        if not self.processes.pause(job_id):
+            return False
+        self.bus.publish(JobEvent(job_id, JobState.PAUSED, entry.url))
+        return True
+    
+    def resume(self, job_id: int) -> bool:
+        """Resume a paused download.
+        
+        Returns:
+            True if the download was paused
+        """
+        entry = self.processes.get(job_id)
+        if not self.processes.resume(job_id):
+            return False
+        self.bus.publish(JobEvent(job_id, JobState.RESUMED, entry.url))
+        return True
+    
+    def cancel(self, job_id: int, pending: bool = False) -> bool:
+        """Cancel a running download.
+        
+        The whole process group (yt-dlp and its ffmpeg children) is
+        terminated; download() then deletes the partial files and
+        publishes the cancelled event.
+        
+        Args:
+            job_id: Job ID the download was started with
+            pending: Also cancel a download that hasn't started yt-dlp yet
+                (still extracting or waiting for disk space)
+            
+        Returns:
+            True if the download was running (or pending and not yet started)
+        """
+        return self.processes.cancel(job_id, pending)
+    
+    def _publish_failure(self, job_id: int, url: str, error: str, elapsed: float,
+                         exit_code: Optional[int] = None):
+        reason = classify_failure(error)
+        self.bus.publish(MetricEvent("download.failures", 1, job_id, {"reason": reason}))
+        self.bus.publish(JobEvent(job_id, JobState.FAILED, url, error=error, reason=reason,
+                                  retryable=reason in RETRYABLE_REASONS, exit_code=exit_code,
+                                  elapsed=elapsed))
+    
+    def find_existing(self, url: str, info: Optional[dict] = None) -> Optional[str]:
+        """Check the library index and archive without spawning anything.
+        
+        Args:
+            url: Video URL
+            info: Info JSON for the video, if already fetched
+            
+        Returns:
+            A message describing where the video already is, or None
+        """
+        if self.library is None and self.archive is None:
+            return None
+        
+        if info and info.get('id'):
+            video_id, extractor = info['id'], info.get('extractor_key') or info.get('extractor')
+        else:
+            parsed = parse_url(url)
+            if parsed is None or parsed[2] != UrlKind.VIDEO:
+                return None
+            extractor, video_id = parsed[0], parsed[1]
+        
+        if self.library is not None and self.library.contains(video_id, extractor):
+            entry = self.library.lookup(video_id, extractor)
+            return f"Already downloaded: {entry['path']}"
+        if self.archive is not None and extractor and archive_key(extractor, video_id) in self.archive:
+            return f"Already in archive: {video_id}"
+        return None
+    
+    def _create_record_file(self) -> str:
+        fd, path = tempfile.mkstemp(prefix="ytdl-done-", suffix=".tsv")
+        os.close(fd)
+        return path
+    
+    def _list_entries(self, url: str, extra_args: List[str]) -> List[Tuple[int, str]]:
+        """List a playlist or channel without extracting its videos.
+        
+        The download's own options (e.g. break filters) apply, so the
+        listing stops where the download would.
+        
+        Returns:
+            (playlist index, archive key) per entry; empty if the listing failed
+        """
+        stdout, returncode = self._run_ytdlp(
+            ["--flat-playlist", "--print", ENTRY_TEMPLATE] + extra_args + [url], None, None)
+        if returncode not in (0, YTDLP_STOPPED_EARLY):
+            # An incomplete listing would leave entries out of the download
+            return []
+        entries = []
+        for line in stdout.splitlines():
+            parts = line.split("\t")
+            if len(parts) != 3 or not parts[0].isdigit() or "NA" in parts[1:]:
+                continue
+            entries.append((int(parts[0]), archive_key(parts[1], parts[2])))
+        return entries
+    
+    @staticmethod
+    def _playlist_items(indices: List[int]) -> str:
+        """Format playlist indices for --playlist-items, joining runs into ranges."""
+        ranges = []
+        for index in sorted(indices):
+            if ranges and ranges[-1][1] == index - 1:
+                ranges[-1][1] = index
+            else:
+                ranges.append([index, index])
+        return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+    
+    def _run_completion_hooks(self, url: str, record_file: str) -> List[CompletedDownload]:
+        """Parse the completion records written by yt-dlp and run hooks.
+        
+        Returns:
+            The finished files, in the order yt-dlp wrote them
+        """
+        finished = []
+        with open(record_file, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t", 4)
+                if len(parts) != 5:
+                    continue
+                video_id, extractor, format_id, upload_date, filepath = parts
+                completed = CompletedDownload(url, video_id, extractor, format_id, filepath, upload_date)
+                finished.append(completed)
+                for hook in self.completion_hooks:
+                    try:
+                        hook(completed)
+                    except Exception as e:
+                        self._error(f"Completion hook failed for {completed.filepath}: {e}")
+        return finished
+    
+    def _reserve_space(self, output_dir: Optional[str], quality: Optional[str], info: dict) -> Optional[Reservation]:
+        """Reserve the estimated download size on the target volume.
+        
+        Raises:
+            InsufficientDiskSpaceError: If the job does not fit on the volume
+        """
+        download_dir = output_dir or self.config.download_dir
+        nbytes = self._estimate_bytes(info, quality)
+        if not nbytes:
+            return None
+        
+        reservation = self.reservations.try_reserve(download_dir, nbytes)
+        if reservation is None:
+            self._info(f"Waiting for disk space in {download_dir}...")
+            reservation = self.reservations.reserve(download_dir, nbytes)
+        return reservation
     
-    def _build_command(self, url: str, output_dir: Optional[str] = None, quality: Optional[str] = None) -> List[str]:
+    def _unknown_size_reason(self, url: str, info: Optional[dict]) -> str:
+        """Why no size estimate is available for a download."""
+        if is_collection_url(url):
+            return "playlist and channel sizes aren't known in advance"
+        if not info:
+            return "video information is unavailable"
+        return "the video's size is unknown"
+    
+    def _estimate_bytes(self, info: Optional[dict], quality: Optional[str] = None) -> Optional[int]:
+        """Estimate peak disk usage for a download, including merge headroom."""
+        if not info:
+            return None
+        return estimate_required_bytes(info, self._plan(info, quality))
+    
+    def _plan(self, info: Optional[dict], quality: Optional[str] = None) -> Optional[FormatPlan]:
+        """Plan formats from info JSON for MP4 output."""
+        target_format = self.config.format.lower()
+        if not info or target_format != "mp4":
+            return None
+        return plan_formats(info, quality or self.config.quality, target_format)
+    
+    def _wants_format_plan(self, quality: Optional[str] = None) -> bool:
+        """Check whether downloads should be planned from the format list."""
+        format_quality = quality or self.config.quality
+        return (self.config.format.lower() == "mp4"
+                and self.config.get("format_planner", False)
+                and is_plannable_quality(format_quality))
+    
+    def _write_info_file(self, info: dict) -> str:
+        """Write info JSON to a temporary file for --load-info-json."""
+        fd, path = tempfile.mkstemp(prefix="ytdl-info-", suffix=".info.json")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(info, f)
+        return path
+    
+    def _build_command(self, url: str, output_dir: Optional[str] = None, quality: Optional[str] = None,
+                       info: Optional[dict] = None, info_file: Optional[str] = None,
+                       extra_args: Optional[List[str]] = None) -> List[str]:
         cmd = [self.config.ytdlp_binary]
         
         download_dir = output_dir or self.config.download_dir
         os.makedirs(download_dir, exist_ok=True)
-        cmd.extend(["-o", f"{download_dir}/%(title)s.%(ext)s"])
+        # The bracketed ID lets a library scan index the file
+        cmd.extend(["-o", f"{download_dir}/%(title)s [%(id)s].%(ext)s"])
         
         # Build format selector to prefer MP4 but ensure we get the requested quality
         format_quality = quality or self.config.quality
         target_format = self.config.format.lower()
         
-        if target_format == "mp4":
+        # With the format list at hand, pick an explicit format ID and only
+        # pay for merge/remux when the cheapest plan actually needs it
+        plan = self._plan(info, format_quality)
+        
+        if plan:
+            cmd.extend(plan.ytdlp_args(target_format))
+        elif target_format == "mp4":
             if format_quality == "best":
                 # Prefer MP4 containers, but fallback to any format
                 cmd.extend(["-f", "bv[ext=mp4]+ba[ext=m4a]/b[ext=mp4]/bv+ba/b"])
@@ -132,7 +593,13 @@ class DownloaderService:
             if format_quality != "best":
                 cmd.extend(["-f", format_quality])
         
-        cmd.append(url)
+        if extra_args:
+            cmd.extend(extra_args)
+        
+        if info_file:
+            cmd.extend(["--load-info-json", info_file])
+        else:
+            cmd.append(url)
         return cmd
     
     def _is_progress_line(self, line: str) -> bool:
@@ -148,22 +615,153 @@ class DownloaderService:
         percentage_pattern = r'\s*\d+(?:\.\d+)?%'
         return bool(re.search(percentage_pattern, line))
     
-    def get_info(self, url: str) -> Optional[dict]:
+    def get_info(self, url: str, timeout: Optional[float] = None,
+                 cancel: Optional[threading.Event] = None) -> Optional[dict]:
         """Get video information without downloading.
         
         Args:
             url: Video URL to get information for
+            timeout: Seconds to wait for yt-dlp before killing it (no limit if None)
+            cancel: Event that, when set, kills yt-dlp and gives up
             
+        Concurrent calls for the same video share one yt-dlp run, and the
+        result is kept in the metadata cache.
+        
         Returns:
-            Dictionary with video information or None if failed
+            Dictionary with video information or None if failed, timed out or cancelled
         """
+        key = url_key(url)
+        if self.metadata is not None:
+            info = self.metadata.get(key)
+            if info is not None:
+                return info
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        def extract() -> Optional[dict]:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            info = self._extract_info(url, remaining, cancel)
+            if info is not None:
+                self._cache_info(key, info)
+            return info
+        return self._info_flight.run(key, extract, timeout, cancel)
+    
+    def _extract_info(self, url: str, timeout: Optional[float],
+                      cancel: Optional[threading.Event]) -> Optional[dict]:
+        stdout, returncode = self._dump_json([url], timeout, cancel)
+        if returncode != 0:
+            return None
         try:
-            cmd = [self.config.ytdlp_binary, "--dump-json", url]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                import json
-                return json.loads(result.stdout.strip())
+            return json.loads(stdout.strip())
+        except ValueError:
             return None
+    
+    def _cache_info(self, key: str, info: dict):
+        """Store info under the requested URL's key and the video's own key."""
+        if self.metadata is None or not isinstance(info, dict):
+            return
+        self.metadata.put(key, info)
+        extractor = info.get('extractor_key') or info.get('extractor')
+        if extractor and info.get('id'):
+            canonical = archive_key(extractor, str(info['id']))
+            if canonical != key:
+                self.metadata.put(canonical, info)
+    
+    def get_info_many(self, urls: List[str], timeout: Optional[float] = None,
+                      cancel: Optional[threading.Event] = None) -> Dict[str, dict]:
+        """Get information for several videos with one yt-dlp call.
+        
+        One process pays yt-dlp's start-up cost once for the whole list.
+        URLs that fail are left out; if the call times out or is cancelled,
+        the videos extracted up to then are still returned.
+        
+        Args:
+            urls: Video URLs
+            timeout: Seconds to wait for the whole list (no limit if None)
+            cancel: Event that, when set, kills yt-dlp
+            
+        Returns:
+            Info dictionaries keyed by the URL they were requested with
+        """
+        found = {}
+        if self.metadata is not None:
+            for url in urls:
+                info = self.metadata.get(url_key(url))
+                if info is not None:
+                    found[url] = info
+            urls = [url for url in urls if url not in found]
+        if not urls:
+            return found
+        stdout, _ = self._dump_json(urls, timeout, cancel, ["--ignore-errors", "--no-warnings"])
+        by_key = {}
+        for url in urls:
+            by_key.setdefault(url_key(url), url)
+        wanted = set(urls)
+        for line in stdout.splitlines():
+            try:
+                info = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(info, dict):
+                continue
+            # yt-dlp reports the URL it was given as original_url
+            url = info.get('original_url')
+            if url not in wanted:
+                extractor = info.get('extractor_key') or info.get('extractor') or ""
+                url = (by_key.get(archive_key(extractor, str(info.get('id'))))
+                       or by_key.get(url_key(info.get('webpage_url') or "")))
+            if url is not None:
+                found[url] = info
+                self._cache_info(url_key(url), info)
+        return found
+    
+    def _dump_json(self, urls: List[str], timeout: Optional[float], cancel: Optional[threading.Event],
+                   options: Optional[List[str]] = None) -> Tuple[str, Optional[int]]:
+        """Run yt-dlp --dump-json with a timeout and cancel event."""
+        return self._run_ytdlp(["--dump-json"] + list(options or []) + list(urls), timeout, cancel)
+    
+    def _run_ytdlp(self, args: List[str], timeout: Optional[float],
+                   cancel: Optional[threading.Event]) -> Tuple[str, Optional[int]]:
+        """Run yt-dlp to collect its output, with a timeout and cancel event.
+        
+        Returns:
+            The output so far and the exit code (None if yt-dlp couldn't
+            start, timed out or was cancelled)
+        """
+        try:
+            cmd = [self.config.ytdlp_binary] + args
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        except Exception:
+            return "", None
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                wait = INFO_POLL_INTERVAL if cancel is not None else None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return self._kill(process), None
+                    wait = remaining if wait is None else min(wait, remaining)
+                try:
+                    stdout, _ = process.communicate(timeout=wait)
+                    return stdout or "", process.returncode
+                except subprocess.TimeoutExpired:
+                    if cancel is not None and cancel.is_set():
+                        return self._kill(process), None
+        except Exception:
+            return self._kill(process), None
+    
+    @staticmethod
+    def _kill(process: subprocess.Popen) -> str:
+        """Kill a yt-dlp process and reap it.
+        
+        Returns:
+            Whatever it had written to stdout
+        """
+        try:
+            process.kill()
+            stdout, _ = process.communicate()
+            return stdout or ""
         except Exception:
-            return None
\ No newline at end of file
+            return ""
\ No newline at end of file
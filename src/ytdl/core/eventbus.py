@@ -0,0 +1,364 @@
+"""Typed event bus for download activity.
+
+The downloader and the download engine publish events; any number of sinks
+(console, progress bars, JSON events, GUI, metrics, job store) subscribe.
+Publishing is cheap and never blocks: fast sinks are called inline, and
+slow ones sit behind an AsyncSink with a bounded queue, in which progress
+updates for a job are coalesced to the latest one.
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Optional, Tuple, Type
+
+DEFAULT_QUEUE_SIZE = 10000
+
+
+class JobState:
+    """Job lifecycle states carried by JobEvent."""
+    QUEUED = "queued"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+    CANCELLED = "cancelled"
+    PAUSED = "paused"
+    RESUMED = "resumed"
+
+    FINISHED = (COMPLETED, FAILED, SKIPPED, CANCELLED)
+
+
+class Stage:
+    """Work stages carried by StageEvent."""
+    EXTRACTING = "extracting"
+    POST_PROCESSING = "post_processing"
+
+
+class Event:
+    """Base class of all events."""
+
+    def __init__(self, job: Optional[int] = None):
+        self.job = job
+        self.ts = time.time()
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={v!r}" for k, v in vars(self).items() if k != "ts")
+        return f"{type(self).__name__}({fields})"
+
+
+class JobEvent(Event):
+    """A job changed lifecycle state.
+
+    ``details`` holds state-specific data: ``files`` and ``elapsed`` for
+    completed jobs; ``error``, ``reason``, ``retryable`` and ``exit_code``
+    for failed ones; ``reason`` for skipped ones.
+    """
+
+    def __init__(self, job: Optional[int], state: str, url: str, **details):
+        super().__init__(job)
+        self.state = state
+        self.url = url
+        self.details = details
+
+
+class StageEvent(Event):
+    """A job entered a stage of its work."""
+
+    def __init__(self, job: Optional[int], stage: str, url: Optional[str] = None,
+                 step: Optional[str] = None):
+        super().__init__(job)
+        self.stage = stage
+        self.url = url
+        self.step = step
+
+
+class ProgressEvent(Event):
+    """Download progress of a job (one yt-dlp progress line)."""
+
+    def __init__(self, job: Optional[int], url: str, label: str, percent: float,
+                 total_bytes: Optional[int] = None, downloaded_bytes: Optional[int] = None,
+                 speed: Optional[str] = None, eta: Optional[str] = None, written: int = 0):
+        super().__init__(job)
+        self.url = url
+        self.label = label
+        self.percent = percent
+        self.total_bytes = total_bytes
+        self.downloaded_bytes = downloaded_bytes
+        self.speed = speed
+        self.eta = eta
+        # Bytes written by this job so far, across all of its streams
+        self.written = written
+
+    def as_dict(self) -> Dict[str, object]:
+        """Progress fields in the form returned by parse_progress_line."""
+        return {"percent": self.percent, "total_bytes": self.total_bytes,
+                "downloaded_bytes": self.downloaded_bytes, "speed": self.speed, "eta": self.eta}
+
+
+class LogEvent(Event):
+    """A message.
+
+    Levels are "info" and "error" for ytdl's own messages and "output" for
+    raw yt-dlp output lines.
+    """
+
+    INFO = "info"
+    ERROR = "error"
+    OUTPUT = "output"
+
+    def __init__(self, level: str, message: str, job: Optional[int] = None):
+        super().__init__(job)
+        self.level = level
+        self.message = message
+
+
+class MetricEvent(Event):
+    """A measurement, e.g. bytes downloaded or seconds spent by a job."""
+
+    def __init__(self, name: str, value: float, job: Optional[int] = None,
+                 tags: Optional[Dict[str, str]] = None):
+        super().__init__(job)
+        self.name = name
+        self.value = value
+        self.tags = tags or {}
+
+
+Sink = Callable[[Event], None]
+
+
+class _ProgressSlot:
+    """Queue placeholder holding the latest pending progress of one job (None once dropped)."""
+    __slots__ = ("event",)
+
+    def __init__(self, event: ProgressEvent):
+        self.event = event
+
+
+class AsyncSink:
+    """Runs a sink on its own thread behind a bounded queue.
+
+    Progress events for a job that already has one waiting are merged into
+    it, so a slow sink sees fewer, fresher updates. When the queue is full
+    the oldest pending progress update is dropped and counted in
+    ``dropped``. Other events, job lifecycle events above all, are never
+    dropped: with no progress left to drop they are queued past the bound.
+    """
+
+    def __init__(self, sink: Sink, queue_size: int = DEFAULT_QUEUE_SIZE, name: str = "ytdl-sink"):
+        """Initialize the async sink.
+
+        Args:
+            sink: Sink to call on the worker thread
+            queue_size: Maximum pending events
+            name: Worker thread name
+        """
+        self.sink = sink
+        self.dropped = 0
+        self.errors = 0
+        self._queue: Deque[object] = deque()
+        self._queue_size = max(1, queue_size)
+        # Oldest first, since slots are added when queued and removed when delivered or dropped
+        self._pending_progress: Dict[object, _ProgressSlot] = {}
+        # Queued events, not counting dropped progress slots still in the deque
+        self._size = 0
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def __call__(self, event: Event):
+        with self._cond:
+            if self._closed:
+                return
+            if isinstance(event, ProgressEvent):
+                key = (event.job, event.url)
+                slot = self._pending_progress.get(key)
+                if slot is not None:
+                    slot.event = event
+                    return
+            if self._size >= self._queue_size and self._pending_progress:
+                self._drop_oldest_progress()
+            if isinstance(event, ProgressEvent):
+                item = self._pending_progress[key] = _ProgressSlot(event)
+            else:
+                item = event
+            self._queue.append(item)
+            self._size += 1
+            self._cond.notify_all()
+
+    def _drop_oldest_progress(self):
+        """Drop the oldest pending progress update. Caller holds the lock.
+
+        The slot stays in the queue, emptied, and the worker skips it.
+        """
+        key = next(iter(self._pending_progress))
+        self._pending_progress.pop(key).event = None
+        self._size -= 1
+        self.dropped += 1
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                item = self._queue.popleft()
+                if isinstance(item, _ProgressSlot):
+                    if item.event is None:
+                        continue
+                    event = item.event
+                    self._pending_progress.pop((event.job, event.url), None)
+                    item = event
+                self._size -= 1
+                self._busy = True
+            try:
+                self.sink(item)
+            except Exception:
+                self.errors += 1
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued event has been delivered.
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None):
+        """Deliver what is queued, then stop the worker thread."""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+
+class Subscription:
+    """A sink registered on the bus, with the event types it receives."""
+
+    def __init__(self, sink: Sink, event_types: Optional[Tuple[Type[Event], ...]] = None):
+        self.sink = sink
+        self.event_types = event_types
+
+    def accepts(self, event: Event) -> bool:
+        return self.event_types is None or isinstance(event, self.event_types)
+
+
+class EventBus:
+    """Delivers published events to subscribed sinks.
+
+    Thread-safe. Sink errors are counted, never raised into the publisher.
+    """
+
+    def __init__(self):
+        # Replaced, never mutated, so publish() can iterate without locking
+        self._subscriptions: Tuple[Subscription, ...] = ()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.errors = 0
+
+    def new_job_id(self) -> int:
+        """Allocate a job ID, unique among every job published on this bus."""
+        return next(self._ids)
+
+    def subscribe(self, sink: Sink, event_types: Optional[Iterable[Type[Event]]] = None,
+                  queue_size: Optional[int] = None) -> Subscription:
+        """Register a sink.
+
+        Args:
+            sink: Callable receiving events
+            event_types: Event classes to deliver (all events if None)
+            queue_size: Deliver on a separate thread through a queue of this
+                size; use for sinks that may be slow
+
+        Returns:
+            Subscription to pass to unsubscribe()
+        """
+        if queue_size:
+            sink = AsyncSink(sink, queue_size, name=f"ytdl-sink-{getattr(sink, '__name__', type(sink).__name__)}")
+        subscription = Subscription(sink, tuple(event_types) if event_types else None)
+        with self._lock:
+            self._subscriptions = self._subscriptions + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a sink; an async sink delivers what it has queued first."""
+        with self._lock:
+            self._subscriptions = tuple(s for s in self._subscriptions if s is not subscription)
+        if isinstance(subscription.sink, AsyncSink):
+            subscription.sink.close()
+
+    def publish(self, event: Event):
+        """Deliver an event to every interested sink."""
+        for subscription in self._subscriptions:
+            if subscription.accepts(event):
+                try:
+                    subscription.sink(event)
+                except Exception:
+                    self.errors += 1
+
+    def flush(self, timeout: Optional[float] = None):
+        """Wait for async sinks to deliver their queued events."""
+        for subscription in self._subscriptions:
+            if isinstance(subscription.sink, AsyncSink):
+                subscription.sink.flush(timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Flush and stop every async sink."""
+        with self._lock:
+            subscriptions, self._subscriptions = self._subscriptions, ()
+        for subscription in subscriptions:
+            if isinstance(subscription.sink, AsyncSink):
+                subscription.sink.close(timeout)
+
+
+class MetricsSink:
+    """Sums MetricEvent values by name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+
+    def __call__(self, event: Event):
+        if isinstance(event, MetricEvent):
+            with self._lock:
+                self._totals[event.name] = self._totals.get(event.name, 0) + event.value
+                self._counts[event.name] = self._counts.get(event.name, 0) + 1
+
+    def total(self, name: str) -> float:
+        with self._lock:
+            return self._totals.get(name, 0)
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            return self._counts.get(name, 0)
+
+
+class OutputHandlerSink:
+    """Adapts an info/error output handler into a sink for LogEvents."""
+
+    def __init__(self, output_handler):
+        self.output_handler = output_handler
+
+    def __call__(self, event: Event):
+        if not isinstance(event, LogEvent):
+            return
+        if event.level == LogEvent.INFO:
+            self.output_handler.info(event.message)
+        elif event.level == LogEvent.ERROR:
+            self.output_handler.error(event.message)
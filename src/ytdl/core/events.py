@@ -0,0 +1,157 @@
+"""Machine-readable job events.
+
+With ``--json-events`` every job lifecycle change is written to stdout as
+one JSON object per line (NDJSON), so wrappers don't have to parse log
+messages or yt-dlp output. Every event has ``event``, ``job`` and ``ts``
+(Unix time) fields:
+
+    queued, extracting, progress, post_processing, completed, failed,
+    skipped, cancelled, paused, resumed
+
+Progress events are throttled per job; the final 100% update is always
+written.
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+from typing import Dict, Optional, TextIO
+
+from .eventbus import Event, JobEvent, JobState, ProgressEvent, StageEvent
+
+DEFAULT_PROGRESS_INTERVAL = 1.0
+
+
+class EventType:
+    """Event names."""
+    QUEUED = "queued"
+    EXTRACTING = "extracting"
+    PROGRESS = "progress"
+    POST_PROCESSING = "post_processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+    CANCELLED = "cancelled"
+    PAUSED = "paused"
+    RESUMED = "resumed"
+
+
+# Checked in order; the first match wins
+FAILURE_PATTERNS = [
+    ("private", re.compile(r"private video|video is private", re.I)),
+    ("members_only", re.compile(r"members[- ]only|join this channel", re.I)),
+    ("age_restricted", re.compile(r"confirm your age|age[- ]restricted|inappropriate for some users", re.I)),
+    ("geo_restricted", re.compile(r"available in your country|geo[- ]?restrict", re.I)),
+    ("auth_required", re.compile(r"not a bot|login required|sign in|--cookies", re.I)),
+    ("rate_limited", re.compile(r"HTTP Error 429|too many requests", re.I)),
+    ("unsupported_url", re.compile(r"unsupported url", re.I)),
+    ("unavailable", re.compile(r"unavailable|has been removed|does not exist|no longer available|not available", re.I)),
+    ("disk_full", re.compile(r"no space left|disk quota|not enough disk space", re.I)),
+    ("post_processing", re.compile(r"ffmpeg|ffprobe|postprocessing|conversion failed", re.I)),
+    ("network", re.compile(r"timed out|connection|network|name resolution|unable to download|"
+                           r"HTTP Error 5\d\d|incomplete read", re.I)),
+]
+# Failures worth retrying later without changes
+RETRYABLE_REASONS = {"rate_limited", "network"}
+
+# yt-dlp post-processor tags, e.g. "[Merger] Merging formats into ..."
+POST_PROCESSOR_RE = re.compile(
+    r'^\[(Merger|ffmpeg|VideoRemuxer|VideoConvertor|ExtractAudio|Fixup\w*|EmbedThumbnail|'
+    r'EmbedSubtitle|Metadata|ModifyChapters|SponsorBlock|SplitChapters|ThumbnailsConvertor|MoveFiles)\]'
+)
+
+
+def classify_failure(message: Optional[str]) -> str:
+    """Classify a failure message into a stable reason code.
+
+    Args:
+        message: yt-dlp ``ERROR:`` line or exception message
+
+    Returns:
+        Reason such as "private", "geo_restricted", "network" or "unknown"
+    """
+    if message:
+        for reason, pattern in FAILURE_PATTERNS:
+            if pattern.search(message):
+                return reason
+    return "unknown"
+
+
+def post_processor_step(line: str) -> Optional[str]:
+    """Return the post-processor name if a yt-dlp line comes from one."""
+    match = POST_PROCESSOR_RE.match(line)
+    return match.group(1) if match else None
+
+
+class JsonEventWriter:
+    """Writes job events as NDJSON; subscribe it to the event bus.
+
+    Thread-safe; each event is written and flushed as a single line. If the
+    reader goes away (broken pipe), further events are dropped so downloads
+    aren't interrupted.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None,
+                 progress_interval: float = DEFAULT_PROGRESS_INTERVAL):
+        """Initialize the event writer.
+
+        Args:
+            stream: Output stream (default: sys.stdout)
+            progress_interval: Minimum seconds between progress events of one job
+        """
+        self.stream = stream or sys.stdout
+        self.progress_interval = progress_interval
+        self._lock = threading.Lock()
+        self._last_progress: Dict[object, float] = {}
+        self._closed = False
+
+    @classmethod
+    def from_config(cls, config, stream: Optional[TextIO] = None) -> 'JsonEventWriter':
+        """Create an event writer throttled by ``event_progress_interval``."""
+        return cls(stream, float(config.get("event_progress_interval", DEFAULT_PROGRESS_INTERVAL)))
+
+    def emit(self, event: str, job, ts: Optional[float] = None, **fields):
+        """Write one event.
+
+        Args:
+            event: Event name (see EventType)
+            job: Job ID, or None for URLs that never became a job
+            ts: When the event happened (default: now)
+            **fields: Event-specific fields; None values are omitted
+        """
+        record = {"event": event, "job": job, "ts": round(ts or time.time(), 3)}
+        record.update((key, value) for key, value in fields.items() if value is not None)
+        line = json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self.stream.write(line)
+                self.stream.flush()
+            except (BrokenPipeError, ValueError):
+                self._closed = True
+
+    def __call__(self, event: Event):
+        """Event bus sink: write job, stage and progress events."""
+        if isinstance(event, ProgressEvent):
+            self.progress(event.job, event.as_dict(), event.ts)
+        elif isinstance(event, StageEvent):
+            self.emit(event.stage, event.job, event.ts, url=event.url, step=event.step)
+        elif isinstance(event, JobEvent):
+            if event.state in JobState.FINISHED:
+                with self._lock:
+                    self._last_progress.pop(event.job, None)
+            self.emit(event.state, event.job, event.ts, url=event.url, **event.details)
+
+    def progress(self, job, progress: Dict[str, object], ts: Optional[float] = None):
+        """Write a progress event unless one was written for the job recently."""
+        now = time.monotonic()
+        percent = progress.get("percent")
+        with self._lock:
+            last = self._last_progress.get(job)
+            if last is not None and now - last < self.progress_interval and percent != 100.0:
+                return
+            self._last_progress[job] = now
+        self.emit(EventType.PROGRESS, job, ts, **progress)
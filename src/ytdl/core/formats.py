@@ -0,0 +1,209 @@
+"""Format planning for yt-dlp downloads.
+
+Chooses an explicit format ID from the ``formats`` list of an info JSON so
+that downloads avoid ffmpeg work (merging and remuxing) whenever a cheaper
+plan delivers the same resolution.
+"""
+
+from typing import Any, Dict, List, Optional
+
+# Relative cost weights per byte. Transfer is the baseline; merging and
+# remuxing are ffmpeg stream copies that read and rewrite the whole file,
+# which is what hurts on CPU-limited workers.
+TRANSFER_COST = 1.0
+MERGE_COST = 0.35
+REMUX_COST = 0.5
+
+# Containers that can hold the merged result without a separate remux pass
+MP4_VIDEO_EXTS = ("mp4",)
+MP4_AUDIO_EXTS = ("m4a", "mp4")
+
+# An MP4-compatible audio stream may be this much lower in bitrate than the
+# best audio and still be considered equivalent
+AUDIO_BITRATE_TOLERANCE = 0.7
+
+
+class FormatPlan:
+    """A concrete download plan for a single video.
+
+    Attributes:
+        format_id: Explicit yt-dlp format selector (e.g. "22" or "137+140")
+        ext: Container extension produced by the download/merge step
+        needs_merge: True if separate video and audio streams must be merged
+        needs_remux: True if the result must be remuxed to the target format
+        estimated_bytes: Estimated download size in bytes
+        cost: Estimated total cost (transfer plus post-processing)
+    """
+
+    def __init__(self, format_id: str, ext: str, needs_merge: bool, needs_remux: bool,
+                 estimated_bytes: int, cost: float, height: Optional[int] = None):
+        self.format_id = format_id
+        self.ext = ext
+        self.needs_merge = needs_merge
+        self.needs_remux = needs_remux
+        self.estimated_bytes = estimated_bytes
+        self.cost = cost
+        self.height = height
+
+    def ytdlp_args(self, target_format: str = "mp4") -> List[str]:
+        """Build yt-dlp arguments for this plan.
+
+        Args:
+            target_format: Desired final container
+
+        Returns:
+            List of command line arguments
+        """
+        args = ["-f", self.format_id]
+        if self.needs_merge and self.ext != target_format:
+            # Merge straight into the target container instead of merging
+            # and then remuxing in a second ffmpeg pass
+            args.extend(["--merge-output-format", target_format])
+        elif self.needs_remux:
+            args.extend(["--remux-video", target_format])
+        return args
+
+    def __repr__(self):
+        return (f"FormatPlan({self.format_id!r}, ext={self.ext!r}, merge={self.needs_merge}, "
+                f"remux={self.needs_remux}, bytes={self.estimated_bytes}, cost={self.cost:.0f})")
+
+
+def parse_height(quality: str) -> Optional[int]:
+    """Parse a height limit from a quality string like "720p".
+
+    Returns:
+        Height in pixels, or None for "best"
+    """
+    if quality.endswith('p') and quality[:-1].isdigit():
+        return int(quality[:-1])
+    return None
+
+
+def is_plannable_quality(quality: str) -> bool:
+    """Check whether the planner understands a quality setting."""
+    return quality == "best" or parse_height(quality) is not None
+
+
+def estimate_format_bytes(fmt: Dict[str, Any], duration: Optional[float] = None) -> Optional[int]:
+    """Estimate the size of a single format in bytes.
+
+    Uses ``filesize``, then ``filesize_approx``, then total bitrate times duration.
+    """
+    size = fmt.get('filesize') or fmt.get('filesize_approx')
+    if size:
+        return int(size)
+    tbr = fmt.get('tbr')
+    if tbr and duration:
+        # tbr is in kbit/s
+        return int(tbr * 1000 / 8 * duration)
+    return None
+
+
+def _has_video(fmt: Dict[str, Any]) -> bool:
+    vcodec = fmt.get('vcodec')
+    return bool(vcodec) and vcodec != 'none' and bool(fmt.get('height'))
+
+
+def _has_audio(fmt: Dict[str, Any]) -> bool:
+    acodec = fmt.get('acodec')
+    return bool(acodec) and acodec != 'none'
+
+
+def _is_direct(fmt: Dict[str, Any]) -> bool:
+    # Storyboards and manifests without a usable protocol are never worth planning
+    return fmt.get('ext') not in (None, 'mhtml') and bool(fmt.get('format_id'))
+
+
+def _audio_candidates(audio_formats: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Limit audio choices to the best stream plus the best MP4-compatible one.
+
+    Without this the cost model would always pick the lowest bitrate audio.
+    The MP4-compatible stream is only kept if it is close in quality.
+    """
+    if not audio_formats:
+        return []
+
+    def bitrate(fmt):
+        return fmt.get('abr') or fmt.get('tbr') or 0
+
+    best = max(audio_formats, key=bitrate)
+    candidates = [best]
+    mp4_audio = [f for f in audio_formats if f.get('ext') in MP4_AUDIO_EXTS]
+    if mp4_audio:
+        best_mp4 = max(mp4_audio, key=bitrate)
+        if best_mp4 is not best and bitrate(best_mp4) >= AUDIO_BITRATE_TOLERANCE * bitrate(best):
+            candidates.append(best_mp4)
+    return candidates
+
+
+def plan_formats(info: Dict[str, Any], quality: str = "best",
+                 target_format: str = "mp4") -> Optional[FormatPlan]:
+    """Pick the cheapest plan that reaches the best height allowed by ``quality``.
+
+    Resolution is never traded for cost: only candidates at the highest
+    available height (within the quality limit) are compared. Among those,
+    progressive formats that already match the target container win unless
+    they are much larger than a split video+audio pair.
+
+    Args:
+        info: yt-dlp info JSON for a single video
+        quality: "best" or a height limit such as "720p"
+        target_format: Desired final container
+
+    Returns:
+        The lowest-cost FormatPlan, or None if the info has no usable formats
+    """
+    formats = [f for f in info.get('formats') or [] if _is_direct(f)]
+    if not formats or not is_plannable_quality(quality):
+        return None
+
+    duration = info.get('duration')
+    max_height = parse_height(quality)
+
+    video_formats = [f for f in formats if _has_video(f)
+                     and (max_height is None or f['height'] <= max_height)]
+    if not video_formats:
+        return None
+    target_height = max(f['height'] for f in video_formats)
+    at_height = [f for f in video_formats if f['height'] == target_height]
+
+    progressive = [f for f in at_height if _has_audio(f)]
+    video_only = [f for f in at_height if not _has_audio(f)]
+    audio_only = _audio_candidates([f for f in formats if _has_audio(f) and not _has_video(f)])
+
+    candidates: List[FormatPlan] = []
+
+    for fmt in progressive:
+        size = estimate_format_bytes(fmt, duration)
+        if size is None:
+            continue
+        ext = fmt['ext']
+        needs_remux = ext != target_format
+        cost = size * TRANSFER_COST + (size * REMUX_COST if needs_remux else 0)
+        candidates.append(FormatPlan(fmt['format_id'], ext, False, needs_remux,
+                                     size, cost, target_height))
+
+    for video in video_only:
+        video_size = estimate_format_bytes(video, duration)
+        if video_size is None:
+            continue
+        for audio in audio_only:
+            audio_size = estimate_format_bytes(audio, duration)
+            if audio_size is None:
+                continue
+            size = video_size + audio_size
+            if video['ext'] in MP4_VIDEO_EXTS and audio['ext'] in MP4_AUDIO_EXTS:
+                ext = "mp4"
+            else:
+                ext = "mkv"
+            # Merging into the target container is a single ffmpeg pass,
+            # so a split plan never needs a separate remux
+            cost = size * TRANSFER_COST + size * MERGE_COST
+            candidates.append(FormatPlan(f"{video['format_id']}+{audio['format_id']}", ext,
+                                         True, False, size, cost, target_height))
+
+    if not candidates:
+        return None
+
+    # Ties go to the larger stream (usually the better encode)
+    return min(candidates, key=lambda plan: (plan.cost, -plan.estimated_bytes))
@@ -2,16 +2,24 @@ import tkinter as tk
 from tkinter import ttk
 from typing import Callable, Optional
 from .downloader import OutputHandler
+from .eventbus import Event, LogEvent, ProgressEvent
 
 
 class GUIOutputHandler(OutputHandler):
+    """Output handler and event bus sink forwarding to GUI callbacks.
+    
+    As a sink it is called on download threads, so the callbacks must hand
+    their work to the Tk main loop.
+    """
     def __init__(self, 
                  info_callback: Optional[Callable[[str], None]] = None,
                  error_callback: Optional[Callable[[str], None]] = None,
-                 progress_callback: Optional[Callable[[str], None]] = None):
+                 progress_callback: Optional[Callable[[ProgressEvent], None]] = None,
+                 output_callback: Optional[Callable[[LogEvent], None]] = None):
         self.info_callback = info_callback
         self.error_callback = error_callback  
         self.progress_callback = progress_callback
+        self.output_callback = output_callback
     
     def info(self, message: str):
         if self.info_callback:
@@ -21,10 +29,17 @@ class GUIOutputHandler(OutputHandler):
         if self.error_callback:
             self.error_callback(message)
     
-    def progress(self, message: str):
+    def progress(self, event: ProgressEvent):
         """Handle progress updates from downloader"""
         if self.progress_callback:
-            self.progress_callback(message)
+            self.progress_callback(event)
+    
+    def __call__(self, event: Event):
+        """Event bus sink for progress and raw yt-dlp output"""
+        if isinstance(event, ProgressEvent):
+            self.progress(event)
+        elif isinstance(event, LogEvent) and event.level == LogEvent.OUTPUT and self.output_callback:
+            self.output_callback(event)
 
 
 class GUILogger:
@@ -0,0 +1,493 @@
+"""Concurrent download engine.
+
+A bounded queue feeds a fixed pool of worker threads that call
+``DownloaderService.download``. Producers block when the queue is full, so
+feeding the engine from a huge input stays constant-memory. URLs already
+queued or running are deduplicated, and so are videos the library index or
+download archive already has.
+
+While downloads run, the next few queued jobs are extracted ahead of
+time (lookahead), so each download starts with its info JSON ready and
+doesn't pay extraction time when its turn comes.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, List, Optional
+
+from .metadata import RateLimiter
+from .urls import is_collection_url, url_key
+from .eventbus import EventBus, JobEvent, JobState, ProgressEvent, StageEvent
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_PREFETCH_WORKERS = 2
+# Queued jobs extracted ahead of their turn
+DEFAULT_LOOKAHEAD = 2
+# Background extractions started per minute
+DEFAULT_LOOKAHEAD_RATE = 30
+# Seconds a background extraction may take before yt-dlp is killed
+DEFAULT_PREFETCH_TIMEOUT = 30.0
+# Finished jobs kept for status display
+FINISHED_JOBS_KEPT = 1000
+
+
+class JobStatus:
+    """Job lifecycle states."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+    CANCELLED = "cancelled"
+
+    FINISHED = (DONE, FAILED, SKIPPED, CANCELLED)
+
+
+def job_key(url: str) -> str:
+    """Deduplication key for a URL: extractor and video ID when known, else the URL."""
+    return url_key(url)
+
+
+class Job:
+    """A single download submitted to the engine."""
+
+    def __init__(self, job_id: int, url: str, output_dir: Optional[str] = None,
+                 quality: Optional[str] = None, info: Optional[dict] = None):
+        self.id = job_id
+        self.url = url
+        self.key = job_key(url)
+        self.output_dir = output_dir
+        self.quality = quality
+        self.info = info
+        self.title: Optional[str] = info.get('title') if info else None
+        self.status = JobStatus.QUEUED
+        # Latest stage and download percentage while running
+        self.stage: Optional[str] = None
+        self.percent: Optional[float] = None
+        self.error: Optional[str] = None
+        # Set while a running job's processes are stopped
+        self.paused = False
+        self.cancel_requested = False
+        # Background metadata fetch, once prefetch or lookahead started one
+        self.lookup: Optional[Future] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in JobStatus.FINISHED
+
+    def __repr__(self):
+        return f"Job({self.id}, {self.url!r}, {self.status})"
+
+
+class DownloadEngine:
+    """Runs downloads on a pool of worker threads.
+
+    Thread-safe: jobs may be submitted from any thread.
+    """
+
+    def __init__(self, downloader, workers: int = DEFAULT_WORKERS,
+                 queue_size: int = DEFAULT_QUEUE_SIZE, output_handler=None,
+                 prefetch_workers: int = DEFAULT_PREFETCH_WORKERS, lookahead: int = 0,
+                 limiter: Optional[RateLimiter] = None,
+                 prefetch_timeout: Optional[float] = DEFAULT_PREFETCH_TIMEOUT):
+        """Initialize the download engine.
+
+        Args:
+            downloader: Downloader service that performs each download
+            workers: Number of concurrent downloads
+            queue_size: Maximum queued jobs before submit() blocks
+            output_handler: Output handler for messages (default: downloader's)
+            prefetch_workers: Threads used to fetch metadata of queued jobs
+            lookahead: Number of upcoming queued jobs to extract while
+                others download (0 to disable)
+            limiter: Rate limit for background extractions (none if None)
+            prefetch_timeout: Seconds a background extraction may take
+                (no limit if None)
+        """
+        self.downloader = downloader
+        self.workers = max(1, workers)
+        self.prefetch_workers = max(1, prefetch_workers)
+        self.lookahead = max(0, lookahead)
+        self.limiter = limiter
+        self.prefetch_timeout = prefetch_timeout
+        self.output_handler = output_handler or downloader.output_handler
+        # The downloader's bus, so engine and downloader events share job IDs
+        self.bus = getattr(downloader, "bus", None)
+        self._subscription = None
+        self.on_job_finished: List[Callable[[Job], None]] = []
+
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue(maxsize=max(1, queue_size))
+        self._lock = threading.Lock()
+        # The bus's counter, so jobs started outside the engine never reuse an ID
+        self._new_job_id = (self.bus.new_job_id if isinstance(self.bus, EventBus)
+                            else itertools.count(1).__next__)
+        self._active: Dict[int, Job] = {}
+        self._active_keys: Dict[str, int] = {}
+        self._running_count = 0
+        self._finished: Deque[Job] = deque(maxlen=FINISHED_JOBS_KEPT)
+        self._counts = {status: 0 for status in JobStatus.FINISHED}
+        self._threads: List[threading.Thread] = []
+        self._idle = threading.Condition(self._lock)
+        self._prefetcher: Optional[ThreadPoolExecutor] = None
+        # Set by shutdown(); no new background fetches start and running ones are cancelled
+        self._stopping = threading.Event()
+
+    @classmethod
+    def from_config(cls, config, downloader, output_handler=None,
+                    workers: Optional[int] = None) -> 'DownloadEngine':
+        """Create an engine sized from the ``concurrent_downloads`` setting."""
+        return cls(
+            downloader,
+            workers or int(config.get("concurrent_downloads", DEFAULT_WORKERS)),
+            int(config.get("queue_size", DEFAULT_QUEUE_SIZE)),
+            output_handler,
+            lookahead=int(config.get("lookahead_jobs", DEFAULT_LOOKAHEAD)),
+            limiter=RateLimiter.per_minute(float(config.get("lookahead_rate", DEFAULT_LOOKAHEAD_RATE))),
+            prefetch_timeout=float(config.get("metadata_timeout", DEFAULT_PREFETCH_TIMEOUT))
+        )
+
+    # -- lifecycle -----------------------------------------------------
+
+    def start(self):
+        """Start the worker threads."""
+        if self._threads:
+            return
+        self._stopping.clear()
+        if isinstance(self.bus, EventBus):
+            self._subscription = self.bus.subscribe(self._record_event, (ProgressEvent, StageEvent, JobEvent))
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"ytdl-worker-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted job has finished.
+
+        Returns:
+            True if the engine is idle, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._active:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers.
+
+        Args:
+            wait: Finish queued jobs first; otherwise queued and running
+                jobs are cancelled
+        """
+        if not wait:
+            self._stop_prefetching()
+            for job in self.jobs():
+                if not job.is_finished:
+                    self.cancel(job.id)
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        # Only now: workers finishing the queue keep looking ahead until then
+        self._stop_prefetching()
+        if self._subscription is not None:
+            self.bus.unsubscribe(self._subscription)
+            self._subscription = None
+
+    def _stop_prefetching(self):
+        """Cancel background fetches and keep new ones from starting."""
+        with self._lock:
+            self._stopping.set()
+            prefetcher, self._prefetcher = self._prefetcher, None
+        if prefetcher is not None:
+            prefetcher.shutdown(wait=False, cancel_futures=True)
+
+    # -- submission ----------------------------------------------------
+
+    def submit(self, url: str, output_dir: Optional[str] = None, quality: Optional[str] = None,
+               info: Optional[dict] = None, block: bool = True) -> Optional[Job]:
+        """Queue a download.
+
+        Args:
+            url: Video URL
+            output_dir: Output directory (uses config default if None)
+            quality: Video quality (uses config default if None)
+            info: Pre-fetched info JSON
+            block: Wait for queue space instead of failing when the queue is full
+
+        Returns:
+            The new Job, or None if the URL was a duplicate, already
+            downloaded, or the queue was full and block is False
+        """
+        url = url.strip()
+        if not url:
+            return None
+        if self.is_queued(url):
+            self._publish(JobEvent(None, JobState.SKIPPED, url, reason="Already queued"))
+            return None
+        existing = self.downloader.find_existing(url, info)
+        if existing:
+            self._publish(JobEvent(None, JobState.SKIPPED, url, reason=existing))
+            return None
+
+        with self._lock:
+            job = Job(self._new_job_id(), url, output_dir, quality, info)
+            if job.key in self._active_keys:
+                return None
+            self._active[job.id] = job
+            self._active_keys[job.key] = job.id
+        try:
+            self._queue.put(job, block=block)
+        except queue.Full:
+            with self._lock:
+                self._forget(job)
+            return None
+        self._publish(JobEvent(job.id, JobState.QUEUED, url))
+        self._lookahead()
+        return job
+
+    def prefetch(self, job: Job) -> Future:
+        """Fetch a queued job's metadata in the background.
+
+        The info is handed to the download when the job starts, so the
+        video isn't extracted twice. At most ``prefetch_workers`` fetches
+        run at once, started no faster than the rate limiter allows.
+
+        Returns:
+            Future resolving to the info JSON, or None (at once if the
+            engine is shutting down)
+        """
+        with self._lock:
+            if job.lookup is not None:
+                return job.lookup
+            if self._stopping.is_set():
+                future: Future = Future()
+                future.set_result(None)
+                return future
+            if self._prefetcher is None:
+                self._prefetcher = ThreadPoolExecutor(max_workers=self.prefetch_workers,
+                                                      thread_name_prefix="ytdl-prefetch")
+            job.lookup = self._prefetcher.submit(self._prefetch, job)
+            return job.lookup
+
+    def _lookahead(self):
+        """Prefetch the ``lookahead`` queued jobs after those about to start.
+
+        Jobs an idle worker will pick up right away are left alone; their
+        download extracts them anyway.
+        """
+        if not self.lookahead or self._stopping.is_set():
+            return
+        upcoming = []
+        with self._lock:
+            idle = max(0, self.workers - self._running_count)
+            # Active jobs are kept in submission order, so the first queued ones are next
+            queued = (job for job in self._active.values() if job.status == JobStatus.QUEUED)
+            for job in itertools.islice(queued, idle, idle + self.lookahead):
+                if job.lookup is None and job.info is None and not is_collection_url(job.url):
+                    upcoming.append(job)
+        for job in upcoming:
+            self.prefetch(job)
+
+    def _prefetch(self, job: Job) -> Optional[dict]:
+        if job.status != JobStatus.QUEUED:
+            return None
+        if self.limiter is not None and not self.limiter.wait(self._stopping):
+            return None
+        if job.status != JobStatus.QUEUED:
+            # Started while waiting for the limiter; the download extracts it
+            return None
+        info = self.downloader.get_info(job.url, timeout=self.prefetch_timeout, cancel=self._stopping)
+        if not info:
+            return None
+        with self._lock:
+            job.title = info.get('title')
+            if job.status == JobStatus.QUEUED and job.info is None:
+                job.info = info
+        return info
+
+    def is_queued(self, url: str) -> bool:
+        """Check whether a URL is already queued or running."""
+        with self._lock:
+            return job_key(url) in self._active_keys
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a queued or running job.
+
+        A running job's processes are terminated and its partial files
+        deleted; it is marked cancelled once its download returns.
+
+        Returns:
+            True if the job was cancelled
+        """
+        with self._lock:
+            job = self._active.get(job_id)
+            if job is None or job.cancel_requested:
+                return False
+            if job.status == JobStatus.RUNNING:
+                job.cancel_requested = True
+            else:
+                self._finish(job, JobStatus.CANCELLED)
+        if job.cancel_requested:
+            if self.downloader.cancel(job.id, pending=True):
+                job.paused = False
+                return True
+            job.cancel_requested = False
+            return False
+        self._publish(JobEvent(job.id, JobState.CANCELLED, job.url))
+        self._notify(job)
+        return True
+
+    def pause(self, job_id: int) -> bool:
+        """Pause a running job; its download keeps its progress.
+
+        Returns:
+            True if the job was running and is now paused
+        """
+        job = self._running(job_id)
+        if job is None or job.paused or not self.downloader.pause(job_id):
+            return False
+        job.paused = True
+        return True
+
+    def resume(self, job_id: int) -> bool:
+        """Resume a paused job.
+
+        Returns:
+            True if the job was paused
+        """
+        job = self._running(job_id)
+        if job is None or not job.paused or not self.downloader.resume(job_id):
+            return False
+        job.paused = False
+        return True
+
+    def _running(self, job_id: int) -> Optional[Job]:
+        with self._lock:
+            job = self._active.get(job_id)
+            if job is None or job.status != JobStatus.RUNNING or job.cancel_requested:
+                return None
+            return job
+
+    # -- inspection ----------------------------------------------------
+
+    def get(self, job_id: int) -> Optional[Job]:
+        """Look up an active or recently finished job."""
+        with self._lock:
+            job = self._active.get(job_id)
+            if job is None:
+                job = next((j for j in self._finished if j.id == job_id), None)
+            return job
+
+    def jobs(self) -> List[Job]:
+        """Active jobs followed by recently finished ones, oldest first."""
+        with self._lock:
+            return sorted(self._active.values(), key=lambda j: j.id) + list(self._finished)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        with self._lock:
+            counts = dict(self._counts)
+            counts[JobStatus.QUEUED] = sum(1 for j in self._active.values() if j.status == JobStatus.QUEUED)
+            counts[JobStatus.RUNNING] = sum(1 for j in self._active.values() if j.status == JobStatus.RUNNING)
+            return counts
+
+    # -- workers -------------------------------------------------------
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: Job):
+        with self._lock:
+            if job.status != JobStatus.QUEUED:
+                return
+            job.status = JobStatus.RUNNING
+            job.started = time.time()
+            self._running_count += 1
+            info = job.info
+            lookup = job.lookup
+        self._lookahead()
+
+        try:
+            if info is None and lookup is not None and lookup.running():
+                # Join the extraction already under way rather than starting another
+                info = self.downloader.get_info(job.url)
+            success = self.downloader.download(job.url, output_dir=job.output_dir,
+                                               quality=job.quality, info=info, job_id=job.id)
+            if success:
+                status = JobStatus.DONE
+            else:
+                status = JobStatus.CANCELLED if job.cancel_requested else JobStatus.FAILED
+        except Exception as e:
+            job.error = str(e)
+            status = JobStatus.FAILED
+            self.output_handler.error(f"Job {job.id} failed: {e}")
+
+        with self._lock:
+            self._finish(job, status)
+        self._notify(job)
+
+    def _finish(self, job: Job, status: str):
+        """Mark a job finished. Caller holds the lock."""
+        if job.status == JobStatus.RUNNING:
+            self._running_count -= 1
+        job.status = status
+        job.paused = False
+        job.finished = time.time()
+        # Drop the info JSON so finished jobs stay small
+        job.info = None
+        job.lookup = None
+        self._counts[status] += 1
+        self._finished.append(job)
+        self._forget(job)
+
+    def _forget(self, job: Job):
+        """Remove a job from the active indexes. Caller holds the lock."""
+        self._active.pop(job.id, None)
+        if self._active_keys.get(job.key) == job.id:
+            del self._active_keys[job.key]
+        if not self._active:
+            self._idle.notify_all()
+
+    def _publish(self, event: JobEvent):
+        if self.bus is not None:
+            self.bus.publish(event)
+
+    def _record_event(self, event):
+        """Bus sink: keep running jobs' stage, progress and failure reason for status display."""
+        with self._lock:
+            job = self._active.get(event.job)
+            if job is None:
+                return
+            if isinstance(event, ProgressEvent):
+                job.percent = event.percent
+            elif isinstance(event, StageEvent):
+                job.stage = event.stage
+            elif event.state == JobState.FAILED and not job.error:
+                job.error = event.details.get("error")
+
+    def _notify(self, job: Job):
+        for callback in self.on_job_finished:
+            try:
+                callback(job)
+            except Exception as e:
+                self.output_handler.error(f"Job callback failed for job {job.id}: {e}")
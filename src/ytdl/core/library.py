@@ -0,0 +1,290 @@
+"""Library index of what is already in the download directory.
+
+A SQLite file in the download directory maps (extractor, video ID) pairs to
+the files on disk. It is built with a parallel directory scan, kept current by
+rescanning only directories whose mtime changed, and updated directly
+from download completion hooks.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+DB_NAME = ".ytdl-library.sqlite"
+DEFAULT_SCAN_WORKERS = 8
+
+# yt-dlp's default naming puts the ID in brackets: "Title [dQw4w9WgXcQ].mp4"
+FILENAME_ID_RE = re.compile(r'\[([A-Za-z0-9_-]{6,})\]\.[A-Za-z0-9]+$')
+PARTIAL_SUFFIXES = ('.part', '.ytdl', '.temp', '.tmp')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT NOT NULL,
+    -- Lowercase extractor name; empty for files found by a scan, whose names only carry the ID
+    extractor TEXT NOT NULL DEFAULT '',
+    path TEXT NOT NULL,
+    dir TEXT NOT NULL,
+    size INTEGER,
+    mtime REAL,
+    format TEXT,
+    PRIMARY KEY (video_id, extractor)
+);
+CREATE INDEX IF NOT EXISTS videos_dir ON videos(dir);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+"""
+
+
+class LibraryIndex:
+    """SQLite-backed index of downloaded videos.
+
+    Thread-safe; a single connection is shared behind a lock. While a
+    background scan runs, lookups and additions wait for it to finish.
+    """
+
+    def __init__(self, root: str, db_path: Optional[str] = None, scan_workers: int = DEFAULT_SCAN_WORKERS):
+        """Initialize the library index.
+
+        Args:
+            root: Directory tree to index
+            db_path: SQLite file (default: ``.ytdl-library.sqlite`` in root)
+            scan_workers: Threads used for directory scans
+        """
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+        self.db_path = db_path or os.path.join(self.root, DB_NAME)
+        self.scan_workers = scan_workers
+        self._lock = threading.Lock()
+        self._scan_done = threading.Event()
+        self._scan_done.set()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._migrate()
+        self._conn.executescript(SCHEMA)
+
+    def _migrate(self):
+        """Upgrade an index keyed by bare video ID; its entries keep an unknown extractor."""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(videos)")]
+        if not columns or "extractor" in columns:
+            return
+        self._conn.execute("ALTER TABLE videos RENAME TO videos_old")
+        self._conn.execute("DROP INDEX IF EXISTS videos_dir")
+        self._conn.executescript(SCHEMA)
+        self._conn.execute(
+            "INSERT INTO videos (video_id, extractor, path, dir, size, mtime, format) "
+            "SELECT video_id, '', path, dir, size, mtime, format FROM videos_old")
+        self._conn.execute("DROP TABLE videos_old")
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config) -> Optional['LibraryIndex']:
+        """Create the library index if enabled in configuration."""
+        if not config.get("library_index", False):
+            return None
+        return cls(config.download_dir)
+
+    def close(self):
+        """Close the database connection, after any background scan."""
+        self._scan_done.wait()
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, video_id: str, extractor: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the indexed entry for a video, if any.
+
+        Args:
+            video_id: Video ID
+            extractor: Extractor name; entries with an unknown extractor
+                match any. None matches every extractor.
+
+        Returns:
+            Entry dict; its ``extractor`` is empty if unknown
+        """
+        self._scan_done.wait()
+        query = "SELECT video_id, extractor, path, size, mtime, format FROM videos WHERE video_id = ?"
+        params = [video_id]
+        if extractor:
+            query += " AND extractor IN (?, '')"
+            params.append(extractor.lower())
+        # Prefer an entry with a known extractor over one found by a scan
+        query += " ORDER BY extractor DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+        if not row:
+            return None
+        return {"id": row[0], "extractor": row[1], "path": row[2], "size": row[3], "mtime": row[4],
+                "format": row[5]}
+
+    def contains(self, video_id: str, extractor: Optional[str] = None) -> bool:
+        """Check whether a video is present on disk.
+
+        Entries whose file has disappeared are dropped.
+        """
+        entry = self.lookup(video_id, extractor)
+        if not entry:
+            return False
+        if not os.path.exists(entry["path"]):
+            self.remove(video_id, entry["extractor"])
+            return False
+        return True
+
+    def add(self, video_id: str, path: str, format_id: Optional[str] = None, extractor: Optional[str] = None):
+        """Add or update a video entry from a file on disk."""
+        path = os.path.abspath(path)
+        extractor = (extractor or "").lower()
+        try:
+            stat = os.stat(path)
+            size, mtime = stat.st_size, stat.st_mtime
+        except OSError:
+            size, mtime = None, None
+        self._scan_done.wait()
+        with self._lock:
+            if extractor:
+                # A scan may have found the file first, without its extractor
+                self._conn.execute("DELETE FROM videos WHERE video_id = ? AND extractor = '' AND path = ?",
+                                   (video_id, path))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO videos (video_id, extractor, path, dir, size, mtime, format) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (video_id, extractor, path, os.path.dirname(path), size, mtime, format_id)
+            )
+            self._conn.commit()
+
+    def remove(self, video_id: str, extractor: Optional[str] = None):
+        """Remove a video entry (every extractor's if extractor is None)."""
+        with self._lock:
+            if extractor is None:
+                self._conn.execute("DELETE FROM videos WHERE video_id = ?", (video_id,))
+            else:
+                self._conn.execute("DELETE FROM videos WHERE video_id = ? AND extractor = ?",
+                                   (video_id, extractor.lower()))
+            self._conn.commit()
+
+    def record_completed(self, completed):
+        """Completion hook: index a finished download."""
+        if completed.video_id and completed.filepath:
+            self.add(completed.video_id, completed.filepath, completed.format_id, completed.extractor)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+
+    def scan(self, full: bool = False) -> int:
+        """Scan the directory tree and update the index.
+
+        Directories are listed in parallel. Only directories whose mtime
+        changed since the last scan have their files re-read; unchanged
+        ones are only walked for subdirectories.
+
+        Args:
+            full: Re-read every directory regardless of mtime
+
+        Returns:
+            Number of directories whose entries were refreshed
+        """
+        with self._lock:
+            known = dict(self._conn.execute("SELECT path, mtime FROM dirs").fetchall())
+
+        refreshed = 0
+        seen_dirs = set()
+        pending = [self.root]
+        with ThreadPoolExecutor(max_workers=self.scan_workers) as executor:
+            while pending:
+                results = list(executor.map(lambda d: self._scan_dir(d, known, full), pending))
+                pending = []
+                for directory, mtime, files, subdirs in results:
+                    if mtime is None:
+                        continue
+                    seen_dirs.add(directory)
+                    pending.extend(subdirs)
+                    if files is not None:
+                        self._replace_dir(directory, mtime, files)
+                        refreshed += 1
+
+        self._forget_missing_dirs(set(known) - seen_dirs)
+        return refreshed
+
+    def scan_in_background(self, full: bool = False) -> threading.Thread:
+        """Run :meth:`scan` on a daemon thread.
+
+        Startup doesn't wait for the scan; the first lookup does.
+
+        Args:
+            full: Re-read every directory regardless of mtime
+
+        Returns:
+            The scan thread
+        """
+        self._scan_done.clear()
+
+        def run():
+            try:
+                self.scan(full)
+            finally:
+                self._scan_done.set()
+
+        thread = threading.Thread(target=run, name="ytdl-library-scan", daemon=True)
+        thread.start()
+        return thread
+
+    def _scan_dir(self, directory: str, known: Dict[str, float],
+                  full: bool) -> Tuple[str, Optional[float], Optional[List[Tuple[str, str, int, float]]], List[str]]:
+        try:
+            mtime = os.stat(directory).st_mtime
+            entries = list(os.scandir(directory))
+        except OSError:
+            return directory, None, None, []
+
+        subdirs = [e.path for e in entries if e.is_dir(follow_symlinks=False)]
+        if not full and known.get(directory) == mtime:
+            return directory, mtime, None, subdirs
+
+        files = []
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False) or entry.name.endswith(PARTIAL_SUFFIXES):
+                continue
+            match = FILENAME_ID_RE.search(entry.name)
+            if not match:
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append((match.group(1), entry.path, stat.st_size, stat.st_mtime))
+        return directory, mtime, files, subdirs
+
+    def _replace_dir(self, directory: str, mtime: float, files: List[Tuple[str, str, int, float]]):
+        found = {video_id for video_id, _, _, _ in files}
+        with self._lock:
+            # Drop entries for files that vanished from this directory
+            existing = self._conn.execute(
+                "SELECT video_id, extractor, path FROM videos WHERE dir = ?", (directory,)).fetchall()
+            gone = [(video_id, extractor) for video_id, extractor, path in existing
+                    if video_id not in found and not os.path.exists(path)]
+            self._conn.executemany("DELETE FROM videos WHERE video_id = ? AND extractor = ?", gone)
+            # Files indexed by a completion hook keep their extractor
+            extractors = {(video_id, path): extractor for video_id, extractor, path in existing}
+            self._conn.executemany(
+                "INSERT INTO videos (video_id, extractor, path, dir, size, mtime, format) "
+                "VALUES (?, ?, ?, ?, ?, ?, NULL) "
+                "ON CONFLICT(video_id, extractor) DO UPDATE SET path=excluded.path, dir=excluded.dir, "
+                "size=excluded.size, mtime=excluded.mtime",
+                [(video_id, extractors.get((video_id, path), ""), path, directory, size, file_mtime)
+                 for video_id, path, size, file_mtime in files]
+            )
+            self._conn.execute("INSERT OR REPLACE INTO dirs (path, mtime) VALUES (?, ?)", (directory, mtime))
+            self._conn.commit()
+
+    def _forget_missing_dirs(self, missing: set):
+        if not missing:
+            return
+        with self._lock:
+            for directory in missing:
+                self._conn.execute("DELETE FROM dirs WHERE path = ?", (directory,))
+                self._conn.execute("DELETE FROM videos WHERE dir = ?", (directory,))
+            self._conn.commit()
@@ -1,11 +1,12 @@
 import logging
 import sys
 import os
-from typing import Optional
+from typing import Optional, TextIO
 
 
 class LoggerService:
-    def __init__(self, name: str = "ytdl", level: str = "INFO", log_file: Optional[str] = None):
+    def __init__(self, name: str = "ytdl", level: str = "INFO", log_file: Optional[str] = None,
+                 console_stream: Optional[TextIO] = None):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(getattr(logging, level.upper()))
         
@@ -14,15 +15,16 @@ class LoggerService:
             log_file = "ytdl_debug.log"
         
         if not self.logger.handlers:
-            self._setup_handlers(log_file)
+            self._setup_handlers(log_file, console_stream or sys.stdout)
     
-    def _setup_handlers(self, log_file: Optional[str] = None):
+    def _setup_handlers(self, log_file: Optional[str] = None, console_stream: Optional[TextIO] = None):
+        console_stream = console_stream or sys.stdout
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         
         # Always add console handler for immediate feedback
-        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler = logging.StreamHandler(console_stream)
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(formatter)
         self.logger.addHandler(console_handler)
@@ -44,10 +46,11 @@ class LoggerService:
                 print(f"Warning: Could not create log file {log_file}: {e}")
                 
         # Also add stderr handler for errors to ensure they're visible
-        error_handler = logging.StreamHandler(sys.stderr)
-        error_handler.setLevel(logging.ERROR)
-        error_handler.setFormatter(formatter)
-        self.logger.addHandler(error_handler)
+        if console_stream is not sys.stderr:
+            error_handler = logging.StreamHandler(sys.stderr)
+            error_handler.setLevel(logging.ERROR)
+            error_handler.setFormatter(formatter)
+            self.logger.addHandler(error_handler)
     
     def info(self, message: str):
         self.logger.info(message)
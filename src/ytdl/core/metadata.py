@@ -0,0 +1,192 @@
+"""Shared video metadata lookups.
+
+The same video is often extracted by several callers at once: the GUI's
+background fetch, the Info button, prefetching and the download itself.
+SingleFlight lets concurrent lookups for one video share a single yt-dlp
+run, and MetadataCache keeps the result for a short while so later
+lookups, including the download's, don't extract again.
+
+Info JSON carries signed format URLs that expire after a few hours, so
+entries are kept only for ``metadata_cache_ttl`` seconds. RateLimiter
+spaces out extractions that run ahead of need, so they don't get the
+client throttled.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+DEFAULT_MAX_ITEMS = 100
+DEFAULT_TTL = 300.0
+# How often a waiting caller checks its own cancel event and timeout
+WAIT_POLL_INTERVAL = 0.2
+
+
+class MetadataCache:
+    """Recently extracted info JSON by URL key, least recently used evicted first.
+
+    Thread-safe. Info JSON for a single video can be hundreds of kilobytes,
+    so the number of entries is capped.
+    """
+
+    def __init__(self, max_items: int = DEFAULT_MAX_ITEMS, ttl: float = DEFAULT_TTL):
+        """Initialize the cache.
+
+        Args:
+            max_items: Maximum number of videos kept
+            ttl: Seconds an entry stays valid
+        """
+        self.max_items = max(1, max_items)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (expiry, info), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, config) -> Optional['MetadataCache']:
+        """Create the cache, or None if ``metadata_cache_size`` is 0."""
+        max_items = int(config.get("metadata_cache_size", DEFAULT_MAX_ITEMS))
+        ttl = float(config.get("metadata_cache_ttl", DEFAULT_TTL))
+        if max_items <= 0 or ttl <= 0:
+            return None
+        return cls(max_items, ttl)
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached info for a key, if present and not expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, info: dict):
+        """Store info for a key, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, info)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _Call:
+    """One in-flight call and its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        # The leader gave up (cancelled), so the result says nothing about the video
+        self.abandoned = False
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time.
+
+    The first caller for a key runs the call; callers arriving while it
+    runs wait for it and get the same result. Each waiter still honours
+    its own timeout and cancel event. If the running call was cancelled
+    by its caller, waiters that still want the result run it again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def run(self, key: str, fn: Callable[[], object], timeout: Optional[float] = None,
+            cancel: Optional[threading.Event] = None):
+        """Run fn for a key, or wait for the call already running for it.
+
+        Args:
+            key: Identifies what is being computed (e.g. a URL key)
+            fn: The call; runs on the calling thread of the first caller
+            timeout: Seconds this caller waits for someone else's call
+            cancel: Event that, when set, makes this caller stop waiting
+
+        Returns:
+            fn's result, or None if this caller timed out or was cancelled
+            while waiting
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+
+            if leader:
+                try:
+                    call.result = fn()
+                finally:
+                    call.abandoned = cancel is not None and cancel.is_set()
+                    with self._lock:
+                        del self._calls[key]
+                    call.done.set()
+                return call.result
+
+            while not call.done.wait(WAIT_POLL_INTERVAL):
+                if cancel is not None and cancel.is_set():
+                    return None
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
+            if not call.abandoned or (cancel is not None and cancel.is_set()):
+                return call.result
+
+    def in_flight(self) -> int:
+        """Number of calls currently running."""
+        with self._lock:
+            return len(self._calls)
+
+
+class RateLimiter:
+    """Spaces calls evenly so at most ``per_minute`` start each minute.
+
+    Thread-safe. Each caller reserves the next free slot, so waiting
+    callers are served in the order they arrived.
+    """
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    @classmethod
+    def per_minute(cls, rate: float) -> Optional['RateLimiter']:
+        """Create a limiter, or None if rate is 0 (no limit)."""
+        return cls(rate) if rate > 0 else None
+
+    def wait(self, cancel: Optional[threading.Event] = None) -> bool:
+        """Block until this caller's slot comes up.
+
+        Args:
+            cancel: Event that, when set, stops the wait
+
+        Returns:
+            True when the caller may proceed, False if cancelled
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        delay = slot - now
+        if delay <= 0:
+            return cancel is None or not cancel.is_set()
+        if cancel is None:
+            time.sleep(delay)
+            return True
+        return not cancel.wait(delay)
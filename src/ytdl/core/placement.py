@@ -0,0 +1,239 @@
+"""Output placement across multiple download roots.
+
+Spreads downloads over several disks using a placement policy, and records
+where each video landed so later lookups don't have to search every root.
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .diskspace import DiskReservations, Reservation, free_bytes
+from .urls import url_key
+
+PLACEMENT_POLICIES = ("most_free", "round_robin", "hash_by_channel")
+DEFAULT_INDEX_NAME = ".ytdl-placement.jsonl"
+# The index file is rewritten once it has this many lines and at least
+# twice as many lines as videos (each video is recorded on placement and
+# again on completion)
+COMPACT_MIN_LINES = 1000
+
+
+class OutputRoot:
+    """A download root with a relative weight."""
+
+    def __init__(self, path: str, weight: float = 1.0):
+        self.path = path
+        self.weight = weight if weight > 0 else 1.0
+        # Smooth weighted round-robin state
+        self.current_weight = 0.0
+
+    def __repr__(self):
+        return f"OutputRoot({self.path!r}, weight={self.weight})"
+
+
+class PlacementIndex:
+    """Append-only record of which root each video was placed on.
+
+    The whole index is held in a dict for O(1) lookups; the file is a JSON
+    lines log so recording a placement is a single append. Superseded lines
+    are dropped by rewriting the file when they pile up.
+    """
+
+    def __init__(self, index_file: Optional[str] = None):
+        self.index_file = index_file
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # Lines in the index file, including superseded ones
+        self._lines = 0
+        if index_file:
+            self._load()
+            if self._needs_compaction():
+                self._compact()
+
+    def _load(self):
+        if not os.path.exists(self.index_file):
+            return
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                self._lines += 1
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Tolerate a torn last line from an interrupted write
+                    continue
+                if entry.get('id'):
+                    self._entries[entry['id']] = entry
+
+    def record(self, video_id: str, root: str, path: Optional[str] = None):
+        """Record where a video was placed."""
+        entry = {"id": video_id, "root": root, "path": path, "time": int(time.time())}
+        with self._lock:
+            self._entries[video_id] = entry
+            if self.index_file:
+                os.makedirs(os.path.dirname(os.path.abspath(self.index_file)), exist_ok=True)
+                with open(self.index_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry) + "\n")
+                self._lines += 1
+                if self._needs_compaction():
+                    self._compact()
+
+    def _needs_compaction(self) -> bool:
+        return self._lines >= max(COMPACT_MIN_LINES, 2 * len(self._entries))
+
+    def _compact(self):
+        """Rewrite the file with one line per video. Caller holds the lock (or is __init__)."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_file)), exist_ok=True)
+        tmp_path = self.index_file + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self._entries.values():
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.index_file)
+        self._lines = len(self._entries)
+
+    def lookup(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Return the placement entry for a video, if any."""
+        return self._entries.get(video_id)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class OutputPlacement:
+    """Chooses an output root per job.
+
+    Policies:
+        most_free: root with the most weighted available space
+        round_robin: smooth weighted round-robin
+        hash_by_channel: weighted rendezvous hash of the channel, so a
+            channel stays on one disk while channels spread across disks
+
+    Roots that cannot fit the job are skipped; if none fits right now the
+    job waits on its preferred root.
+    """
+
+    def __init__(self, roots: List[OutputRoot], policy: str = "most_free",
+                 reservations: Optional[DiskReservations] = None,
+                 index: Optional[PlacementIndex] = None):
+        if not roots:
+            raise ValueError("At least one output root is required")
+        if policy not in PLACEMENT_POLICIES:
+            raise ValueError(f"Unknown placement policy: {policy}")
+        self.roots = roots
+        self.policy = policy
+        self.reservations = reservations
+        self.index = index if index is not None else PlacementIndex()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, reservations: Optional[DiskReservations] = None) -> Optional['OutputPlacement']:
+        """Create placement from the ``output_roots`` setting.
+
+        Returns:
+            OutputPlacement, or None if no output roots are configured
+        """
+        roots_config = config.get("output_roots") or []
+        if not roots_config:
+            return None
+
+        roots = []
+        for entry in roots_config:
+            if isinstance(entry, str):
+                roots.append(OutputRoot(entry))
+            else:
+                roots.append(OutputRoot(entry["path"], float(entry.get("weight", 1.0))))
+
+        index_file = config.get("placement_index") or os.path.join(roots[0].path, DEFAULT_INDEX_NAME)
+        return cls(roots, config.get("placement_policy", "most_free"), reservations, PlacementIndex(index_file))
+
+    def place(self, info: Optional[Dict[str, Any]] = None,
+              nbytes: Optional[int] = None, url: Optional[str] = None) -> Tuple[str, Optional[Reservation]]:
+        """Choose a root for a job and reserve space on it.
+
+        Args:
+            info: yt-dlp info JSON for the job, if known
+            nbytes: Estimated bytes to reserve, if known
+            url: The job's URL, used to place it when there is no info
+
+        Returns:
+            Tuple of (root path, reservation or None)
+        """
+        ranked = self.rank(info, url)
+        root = ranked[0]
+        reservation = None
+
+        if self.reservations is not None and nbytes:
+            for candidate in ranked:
+                reservation = self.reservations.try_reserve(candidate.path, nbytes)
+                if reservation is not None:
+                    root = candidate
+                    break
+            else:
+                # Nothing fits right now: wait on the preferred root
+                reservation = self.reservations.reserve(root.path, nbytes)
+
+        if info and info.get('id'):
+            self.index.record(info['id'], root.path)
+        return root.path, reservation
+
+    def record_completed(self, completed):
+        """Completion hook: record the final path of a placed video."""
+        entry = self.index.lookup(completed.video_id)
+        if entry and completed.filepath:
+            self.index.record(completed.video_id, entry['root'], completed.filepath)
+
+    def rank(self, info: Optional[Dict[str, Any]] = None, url: Optional[str] = None) -> List[OutputRoot]:
+        """Return roots in preference order for a job."""
+        if self.policy == "hash_by_channel":
+            ranked = self._rank_by_channel(info, url)
+        elif self.policy == "round_robin":
+            ranked = self._rank_round_robin()
+        else:
+            ranked = self._rank_most_free()
+
+        # Re-downloads go back to the root that already holds the video
+        if info and info.get('id'):
+            entry = self.index.lookup(info['id'])
+            if entry:
+                previous = [r for r in ranked if r.path == entry['root']]
+                ranked = previous + [r for r in ranked if r.path != entry['root']]
+        return ranked
+
+    def _available(self, root: OutputRoot) -> int:
+        if self.reservations is not None:
+            return self.reservations.available_bytes(root.path)
+        return free_bytes(root.path)
+
+    def _rank_most_free(self) -> List[OutputRoot]:
+        return sorted(self.roots, key=lambda r: self._available(r) * r.weight, reverse=True)
+
+    def _rank_round_robin(self) -> List[OutputRoot]:
+        with self._lock:
+            total = sum(r.weight for r in self.roots)
+            for root in self.roots:
+                root.current_weight += root.weight
+            chosen = max(self.roots, key=lambda r: r.current_weight)
+            chosen.current_weight -= total
+        start = self.roots.index(chosen)
+        return self.roots[start:] + self.roots[:start]
+
+    def _rank_by_channel(self, info: Optional[Dict[str, Any]], url: Optional[str] = None) -> List[OutputRoot]:
+        info = info or {}
+        key = info.get('channel_id') or info.get('uploader_id') or info.get('channel') \
+            or info.get('uploader') or info.get('id')
+        if not key and url:
+            # Collections and sync run without info; their URL identifies the channel or playlist
+            key = url_key(url)
+        key = key or ""
+
+        def score(root: OutputRoot) -> float:
+            digest = hashlib.md5(f"{key}\0{root.path}".encode('utf-8')).digest()
+            # Map to (0, 1] and apply weighted rendezvous hashing
+            unit = (int.from_bytes(digest[:8], 'big') + 1) / (2 ** 64 + 1)
+            return -root.weight / math.log(unit)
+
+        return sorted(self.roots, key=score, reverse=True)
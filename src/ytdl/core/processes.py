@@ -0,0 +1,196 @@
+"""Control of running yt-dlp processes.
+
+Each download's yt-dlp runs in its own process group, together with the
+ffmpeg children it starts. That lets one job be paused (SIGSTOP), resumed
+(SIGCONT) or cancelled as a whole. A paused job keeps its connections and
+partial files, so resuming continues where it stopped. A cancelled job's
+partial files are deleted once the process has exited.
+"""
+
+import glob
+import os
+import re
+import signal
+import subprocess
+import threading
+from typing import Dict, List, Optional, Set
+
+# Seconds a cancelled process gets to exit after SIGTERM before it is killed
+CANCEL_GRACE = 5.0
+
+DESTINATION_RE = re.compile(r'^\[download\] Destination: (?P<path>.+)$')
+MERGER_RE = re.compile(r'^\[Merger\] Merging formats into "(?P<path>.+)"$')
+# Per-format files yt-dlp merges and deletes afterwards, e.g. "Title.f137.mp4"
+FORMAT_FILE_RE = re.compile(r'\.f[\w-]+\.\w+$')
+
+CAN_PAUSE = hasattr(signal, "SIGSTOP")
+
+
+def process_group_kwargs() -> dict:
+    """Popen arguments that start a process in a new process group."""
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def interrupt_on_termination():
+    """Raise KeyboardInterrupt in the main thread on SIGTERM and SIGHUP.
+
+    yt-dlp runs in its own process group, so the signals that end this
+    process don't reach it. Handled like Ctrl+C, they cancel running jobs,
+    which terminates their process groups and removes partial files.
+    """
+    def interrupt(signum, frame):
+        raise KeyboardInterrupt
+
+    for name in ("SIGTERM", "SIGHUP"):
+        sig = getattr(signal, name, None)
+        if sig is not None:
+            signal.signal(sig, interrupt)
+
+
+class JobProcess:
+    """A running yt-dlp process and the files it is writing."""
+
+    def __init__(self, job_id: int, url: str, process: subprocess.Popen):
+        self.job_id = job_id
+        self.url = url
+        self.process = process
+        self.paused = False
+        self.cancelled = False
+        self.destinations: List[str] = []
+
+    def note_output(self, line: str):
+        """Remember the files a yt-dlp output line says are being written."""
+        match = DESTINATION_RE.match(line) or MERGER_RE.match(line)
+        if match:
+            self.destinations.append(match.group('path'))
+
+    def partial_files(self) -> List[str]:
+        """Partial and intermediate files of this job that exist on disk."""
+        paths = []
+        for destination in self.destinations:
+            root, ext = os.path.splitext(destination)
+            candidates = [destination + ".ytdl", root + ".temp" + ext]
+            candidates.extend(glob.glob(glob.escape(destination) + ".part*"))
+            if FORMAT_FILE_RE.search(destination):
+                candidates.append(destination)
+            paths.extend(p for p in candidates if os.path.isfile(p) and p not in paths)
+        return paths
+
+    def signal_group(self, sig: int):
+        """Send a signal to the process and its children."""
+        if os.name == "nt":
+            if sig == signal.SIGTERM:
+                self.process.terminate()
+            return
+        try:
+            os.killpg(os.getpgid(self.process.pid), sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+class ProcessRegistry:
+    """Running yt-dlp processes by job ID.
+
+    Thread-safe: jobs are registered by the download threads and
+    controlled from the CLI prompt or the GUI.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: Dict[int, JobProcess] = {}
+        # Jobs cancelled before their process started
+        self._cancel_pending: Set[int] = set()
+
+    def register(self, job_id: int, url: str, process: subprocess.Popen) -> JobProcess:
+        entry = JobProcess(job_id, url, process)
+        with self._lock:
+            self._jobs[job_id] = entry
+            cancel = job_id in self._cancel_pending
+            self._cancel_pending.discard(job_id)
+        if cancel:
+            entry.cancelled = True
+            entry.signal_group(signal.SIGTERM)
+        return entry
+
+    def unregister(self, job_id: int):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._cancel_pending.discard(job_id)
+
+    def get(self, job_id: int) -> Optional[JobProcess]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def running(self) -> List[int]:
+        """IDs of jobs with a running process."""
+        with self._lock:
+            return sorted(self._jobs)
+
+    def pause(self, job_id: int) -> bool:
+        """Stop a job's processes where they are.
+
+        Returns:
+            True if the job was running and is now paused
+        """
+        entry = self.get(job_id)
+        if entry is None or entry.paused or entry.cancelled or not CAN_PAUSE:
+            return False
+        entry.signal_group(signal.SIGSTOP)
+        entry.paused = True
+        return True
+
+    def resume(self, job_id: int) -> bool:
+        """Continue a paused job.
+
+        Returns:
+            True if the job was paused
+        """
+        entry = self.get(job_id)
+        if entry is None or not entry.paused:
+            return False
+        entry.signal_group(signal.SIGCONT)
+        entry.paused = False
+        return True
+
+    def cancel(self, job_id: int, pending: bool = False) -> bool:
+        """Terminate a job's processes; the download thread cleans up.
+
+        Args:
+            job_id: Job to cancel
+            pending: If the job has no process yet, terminate it as soon as
+                it is registered (for jobs that are still extracting)
+
+        Returns:
+            True if the job was running, or will be cancelled on start
+        """
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None:
+                if pending:
+                    self._cancel_pending.add(job_id)
+                return pending
+            if entry.cancelled:
+                return False
+            entry.cancelled = True
+        entry.signal_group(signal.SIGTERM)
+        if entry.paused:
+            # A stopped process only acts on SIGTERM once it runs again
+            entry.signal_group(signal.SIGCONT)
+            entry.paused = False
+        return True
+
+    def finish_cancelled(self, entry: JobProcess):
+        """Make sure a cancelled job has exited, then delete its partial files."""
+        try:
+            entry.process.wait(timeout=CANCEL_GRACE)
+        except subprocess.TimeoutExpired:
+            entry.signal_group(signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+            entry.process.kill()
+            entry.process.wait()
+        for path in entry.partial_files():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
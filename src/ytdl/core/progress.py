@@ -0,0 +1,358 @@
+"""Console progress rendering for concurrent downloads.
+
+yt-dlp progress lines from every running job are parsed into per-job state.
+A renderer thread redraws a fixed block of bars, one per job, at a capped
+frame rate with a single buffered write per frame. When stdout isn't a
+terminal it prints plain progress lines periodically instead.
+"""
+
+import re
+import shutil
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, TextIO
+
+from .eventbus import Event, JobEvent, JobState, LogEvent, ProgressEvent
+
+DEFAULT_MAX_FPS = 10
+DEFAULT_LOG_INTERVAL = 5.0
+BAR_WIDTH = 24
+LABEL_WIDTH = 32
+
+PROGRESS_RE = re.compile(
+    r'^\[download\]\s*(?P<percent>\d+(?:\.\d+)?)%'
+    r'(?:\s+of\s+~?\s*(?P<total>[\d.]+\s*[KMGT]?i?B))?'
+    r'(?:\s+at\s+(?P<speed>\S+))?'
+    r'(?:\s+ETA\s+(?P<eta>\S+))?'
+)
+SIZE_RE = re.compile(r'^([\d.]+)\s*([KMGT]?)(i?)B$')
+SIZE_EXPONENTS = {"": 0, "K": 1, "M": 2, "G": 3, "T": 4}
+
+# ANSI: cursor to start of line N lines up, and clear to end of screen
+CURSOR_UP = "\x1b[{}F"
+CLEAR_DOWN = "\x1b[J"
+
+MODES = ("bars", "plain", "off")
+
+
+def parse_size(text: str) -> Optional[int]:
+    """Convert a yt-dlp size such as "10.50MiB" to bytes."""
+    match = SIZE_RE.match(text.strip())
+    if not match:
+        return None
+    number, unit, binary = match.groups()
+    base = 1024 if binary or not unit else 1000
+    return int(float(number) * base ** SIZE_EXPONENTS[unit])
+
+
+def parse_progress_line(line: str) -> Optional[Dict[str, object]]:
+    """Parse a yt-dlp ``[download]`` progress line.
+
+    Args:
+        line: One line of yt-dlp output
+
+    Returns:
+        Dict with percent, total_bytes, downloaded_bytes, speed and eta, or
+        None if the line isn't a progress line
+    """
+    match = PROGRESS_RE.match(line.strip())
+    if not match:
+        return None
+    percent = float(match.group('percent'))
+    total = parse_size(match.group('total')) if match.group('total') else None
+    return {
+        "percent": percent,
+        "total_bytes": total,
+        "downloaded_bytes": int(total * percent / 100) if total else None,
+        "speed": match.group('speed') if match.group('speed') not in (None, "Unknown") else None,
+        "eta": match.group('eta') if match.group('eta') not in (None, "Unknown") else None,
+    }
+
+
+class ByteCounter:
+    """Cumulative bytes written by one job.
+
+    yt-dlp reports progress per stream, so the percentage starts over for
+    the audio stream after the video stream; completed streams are summed.
+    """
+
+    def __init__(self):
+        self.completed = 0
+        self._current = 0
+        self._current_total = 0
+
+    def update(self, progress: Dict[str, object]) -> int:
+        downloaded = progress.get("downloaded_bytes")
+        if downloaded is None:
+            return self.written
+        if downloaded < self._current:
+            self.completed += self._current_total or self._current
+        self._current = downloaded
+        self._current_total = progress.get("total_bytes") or 0
+        return self.written
+
+    @property
+    def written(self) -> int:
+        return self.completed + self._current
+
+
+class JobProgress:
+    """Latest progress of one job."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.percent = 0.0
+        self.total_bytes: Optional[int] = None
+        self.speed: Optional[str] = None
+        self.eta: Optional[str] = None
+        self.updated = time.monotonic()
+        self.logged = 0.0
+
+    def describe(self) -> str:
+        parts = [f"{self.percent:5.1f}%"]
+        if self.total_bytes:
+            parts.append(f"of {self.total_bytes / (1024 * 1024):.1f}MiB")
+        if self.speed:
+            parts.append(f"at {self.speed}")
+        if self.eta:
+            parts.append(f"ETA {self.eta}")
+        return " ".join(parts)
+
+
+def _fit(text: str, width: int) -> str:
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+class ProgressRenderer:
+    """Aggregates progress from all jobs and draws it at a capped rate.
+
+    Modes:
+        bars: redraw a block of per-job bars in place (terminals)
+        plain: print one line per changed job every ``log_interval`` seconds
+        off: drop progress; log lines are still printed
+
+    Thread-safe. Other console output should go through log() or a handler
+    from wrap(), so it is printed above the bar block instead of over it.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, mode: Optional[str] = None,
+                 max_fps: float = DEFAULT_MAX_FPS, log_interval: float = DEFAULT_LOG_INTERVAL):
+        """Initialize the renderer.
+
+        Args:
+            stream: Output stream (default: sys.stdout)
+            mode: "bars", "plain" or "off" (default: bars on a TTY, else plain)
+            max_fps: Maximum redraws per second in bars mode
+            log_interval: Seconds between progress lines in plain mode
+        """
+        self.stream = stream or sys.stdout
+        if mode is None:
+            mode = "bars" if getattr(self.stream, "isatty", lambda: False)() else "plain"
+        if mode not in MODES:
+            raise ValueError(f"Unknown progress mode: {mode}")
+        self.mode = mode
+        self.frame_interval = 1.0 / max_fps
+        self.log_interval = log_interval
+        self._jobs: Dict[str, JobProgress] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._dirty = False
+        self._lines_drawn = 0
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    @classmethod
+    def from_config(cls, config, stream: Optional[TextIO] = None) -> Optional['ProgressRenderer']:
+        """Create a renderer from the ``progress_mode`` setting ("auto" picks by TTY)."""
+        mode = config.get("progress_mode", "auto")
+        return cls(stream, None if mode == "auto" else mode,
+                   float(config.get("progress_max_fps", DEFAULT_MAX_FPS)))
+
+    # -- job updates ---------------------------------------------------
+
+    def update(self, key: str, progress: Dict[str, object], label: Optional[str] = None):
+        """Record a progress update for a job."""
+        if self.mode == "off":
+            return
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                job = self._jobs[key] = JobProgress(label or key)
+            elif label:
+                job.label = label
+            job.percent = float(progress.get("percent") or 0.0)
+            job.total_bytes = progress.get("total_bytes") or job.total_bytes
+            job.speed = progress.get("speed")
+            job.eta = progress.get("eta")
+            job.updated = time.monotonic()
+            self._dirty = True
+            self._ensure_thread()
+
+    def finish(self, key: str):
+        """Remove a job's bar."""
+        with self._lock:
+            if self._jobs.pop(key, None) is not None:
+                self._dirty = True
+
+    def __call__(self, event: Event):
+        """Event bus sink: progress, job ends and yt-dlp output lines."""
+        if isinstance(event, ProgressEvent):
+            self.update(event.job if event.job is not None else event.url, event.as_dict(), event.label)
+        elif isinstance(event, JobEvent):
+            if event.state in JobState.FINISHED:
+                self.finish(event.job if event.job is not None else event.url)
+        elif isinstance(event, LogEvent) and event.level == LogEvent.OUTPUT:
+            self.log(event.message)
+
+    def snapshot(self) -> Dict[str, JobProgress]:
+        """Copy of the current per-job progress."""
+        with self._lock:
+            return dict(self._jobs)
+
+    # -- other output --------------------------------------------------
+
+    def log(self, message: str):
+        """Print a line above the progress block."""
+        with self._lock:
+            self._clear_block()
+            self.stream.write(message + "\n")
+            self.stream.flush()
+            self._dirty = bool(self._jobs)
+
+    def wrap(self, output_handler) -> 'RendererOutputHandler':
+        """Wrap an output handler so its messages don't collide with the bars."""
+        return RendererOutputHandler(output_handler, self)
+
+    def external_output(self):
+        """Context manager for writing to the console outside the renderer."""
+        return _ExternalOutput(self)
+
+    def close(self):
+        """Stop the renderer thread and erase the progress block."""
+        with self._lock:
+            self._closed = True
+            self._wake.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            self._clear_block()
+            self.stream.flush()
+
+    # -- rendering -----------------------------------------------------
+
+    def _ensure_thread(self):
+        """Start the renderer thread. Caller holds the lock."""
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._run, name="ytdl-progress", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        with self._lock:
+            while not self._closed:
+                self._wake.wait(self.frame_interval)
+                if self._closed:
+                    break
+                if self.mode == "bars" and self._dirty:
+                    self._draw_bars()
+                elif self.mode == "plain":
+                    self._draw_plain()
+
+    def _clear_block(self):
+        """Erase the bar block. Caller holds the lock."""
+        if self._lines_drawn:
+            self.stream.write(CURSOR_UP.format(self._lines_drawn) + CLEAR_DOWN)
+            self._lines_drawn = 0
+
+    def _draw_bars(self):
+        """Redraw every bar with one write. Caller holds the lock."""
+        frame: List[str] = []
+        if self._lines_drawn:
+            frame.append(CURSOR_UP.format(self._lines_drawn) + CLEAR_DOWN)
+        # A line that wraps would throw off the cursor movement of the next redraw
+        width = max(1, shutil.get_terminal_size().columns - 1)
+        for job in self._jobs.values():
+            filled = int(BAR_WIDTH * min(job.percent, 100.0) / 100)
+            bar = "#" * filled + "-" * (BAR_WIDTH - filled)
+            line = f"{_fit(job.label, LABEL_WIDTH):<{LABEL_WIDTH}} [{bar}] {job.describe()}"
+            frame.append(_fit(line, width) + "\n")
+        self.stream.write("".join(frame))
+        self.stream.flush()
+        self._lines_drawn = len(self._jobs)
+        self._dirty = False
+
+    def _draw_plain(self):
+        """Print a line for each job that changed since it was last logged. Caller holds the lock."""
+        now = time.monotonic()
+        lines = []
+        for job in self._jobs.values():
+            if job.updated > job.logged and now - job.logged >= self.log_interval:
+                lines.append(f"[progress] {job.label}: {job.describe()}\n")
+                job.logged = now
+        if lines:
+            self.stream.write("".join(lines))
+            self.stream.flush()
+
+
+class _ExternalOutput:
+    def __init__(self, renderer: ProgressRenderer):
+        self.renderer = renderer
+
+    def __enter__(self):
+        self.renderer._lock.acquire()
+        self.renderer._clear_block()
+        self.renderer.stream.flush()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.renderer._dirty = bool(self.renderer._jobs)
+        self.renderer._lock.release()
+        return False
+
+
+class RendererOutputHandler:
+    """Output handler that prints above the progress block."""
+
+    def __init__(self, output_handler, renderer: ProgressRenderer):
+        self.output_handler = output_handler
+        self.renderer = renderer
+
+    def info(self, message: str):
+        with self.renderer.external_output():
+            self.output_handler.info(message)
+
+    def error(self, message: str):
+        with self.renderer.external_output():
+            self.output_handler.error(message)
+
+    def __getattr__(self, name):
+        return getattr(self.output_handler, name)
+
+
+class ConsoleSink:
+    """Event bus sink that prints progress and yt-dlp output directly.
+
+    The latest progress line is rewritten in place with a carriage return.
+    Meant for a single download at a time; use ProgressRenderer for more.
+    """
+
+    def __init__(self):
+        self._progress_shown = False
+
+    def __call__(self, event: Event):
+        if isinstance(event, ProgressEvent):
+            progress = JobProgress(event.label)
+            progress.percent = event.percent
+            progress.total_bytes = event.total_bytes
+            progress.speed = event.speed
+            progress.eta = event.eta
+            print(f"\r[download] {progress.describe()}", end="", flush=True)
+            self._progress_shown = True
+            return
+        # Anything else starts on a fresh line
+        if self._progress_shown:
+            print()
+            self._progress_shown = False
+        if isinstance(event, LogEvent) and event.level == LogEvent.OUTPUT:
+            print(event.message)
@@ -0,0 +1,196 @@
+"""Incremental channel and playlist sync.
+
+Each synced source remembers the newest video IDs and upload date it has
+seen. Later syncs enumerate the source lazily, newest first, and tell
+yt-dlp to stop at the first known item, so a sync with nothing new only
+fetches the first page of the channel.
+
+The stored state moves forward after a sync that walked the whole source,
+even if some entries failed (private, members-only or blocked videos).
+Failed entries newer than the newest download are retried by the next sync;
+older ones only by a full sync. If a run is aborted, the state is left as
+it was and the next sync retries what this one missed; entries it did
+download are then skipped because their files already exist (and by the
+download archive, if one is configured).
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .downloader import YTDLP_ENTRY_ERRORS
+from .eventbus import JobEvent, JobState
+
+DEFAULT_STATE_NAME = ".ytdl-sync.json"
+# IDs kept per source, so a deleted or privated newest video doesn't force a full re-scan
+KNOWN_IDS_KEPT = 20
+
+
+class SyncState:
+    """Per-source sync state stored as one JSON file."""
+
+    def __init__(self, state_file: str):
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                self._sources = json.load(f).get("sources", {})
+        except (OSError, ValueError):
+            self._sources = {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_file)), exist_ok=True)
+        tmp_path = self.state_file + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"sources": self._sources}, f, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def get(self, source: str) -> Dict[str, Any]:
+        """Return the stored state for a source (empty if never synced)."""
+        with self._lock:
+            return dict(self._sources.get(source, {}))
+
+    def update(self, source: str, new_ids: List[str], newest_date: Optional[str] = None):
+        """Record the items fetched by a sync.
+
+        Args:
+            source: Channel or playlist URL
+            new_ids: IDs downloaded by this sync, newest first
+            newest_date: Newest upload date (YYYYMMDD) seen by this sync
+        """
+        with self._lock:
+            entry = self._sources.get(source, {})
+            known = list(dict.fromkeys(new_ids + entry.get("known_ids", [])))
+            entry["known_ids"] = known[:KNOWN_IDS_KEPT]
+            dates = [d for d in (newest_date, entry.get("newest_date")) if d]
+            entry["newest_date"] = max(dates) if dates else None
+            entry["last_sync"] = int(time.time())
+            self._sources[source] = entry
+            self._save()
+
+    def forget(self, source: str):
+        """Drop the stored state for a source."""
+        with self._lock:
+            if self._sources.pop(source, None) is not None:
+                self._save()
+
+
+def build_break_filter(known_ids: List[str], newest_date: Optional[str] = None) -> Optional[str]:
+    """Build a yt-dlp match filter that fails on the first already-seen item.
+
+    Args:
+        known_ids: IDs seen by earlier syncs
+        newest_date: Newest upload date seen by earlier syncs
+
+    Returns:
+        Filter string for ``--break-match-filters``, or None for a first sync
+    """
+    clauses = [f"id!='{video_id}'" for video_id in known_ids]
+    if newest_date:
+        # "?" lets flat playlist entries without a date through to the ID checks
+        clauses.append(f"upload_date>=?{newest_date}")
+    return " & ".join(clauses) or None
+
+
+class SyncResult:
+    """Outcome of syncing one source."""
+
+    def __init__(self, source: str, success: bool, new_ids: List[str], partial: bool = False):
+        self.source = source
+        self.success = success
+        self.new_ids = new_ids
+        # Walked the whole source, but some entries failed
+        self.partial = partial
+
+    def __repr__(self):
+        return (f"SyncResult({self.source!r}, success={self.success}, partial={self.partial}, "
+                f"new={len(self.new_ids)})")
+
+
+class ChannelSync:
+    """Downloads only the uploads a source gained since its last sync."""
+
+    def __init__(self, downloader, state: SyncState, output_handler=None):
+        """Initialize channel sync.
+
+        Args:
+            downloader: Downloader service used for the actual downloads
+            state: Sync state store
+            output_handler: Output handler for messages (default: downloader's)
+        """
+        self.downloader = downloader
+        self.state = state
+        self.output_handler = output_handler or downloader.output_handler
+
+    @classmethod
+    def from_config(cls, config, downloader, output_handler=None) -> 'ChannelSync':
+        """Create channel sync with the state file from configuration."""
+        state_file = config.get("sync_state_file") or os.path.join(config.download_dir, DEFAULT_STATE_NAME)
+        return cls(downloader, SyncState(state_file), output_handler)
+
+    def sync(self, source: str, output_dir: Optional[str] = None, quality: Optional[str] = None,
+             full: bool = False) -> SyncResult:
+        """Download new uploads from a channel or playlist.
+
+        Args:
+            source: Channel or playlist URL
+            output_dir: Output directory (uses config default if None)
+            quality: Video quality (uses config default if None)
+            full: Ignore stored state and enumerate the whole source
+
+        Returns:
+            SyncResult with the IDs downloaded by this sync
+        """
+        entry = {} if full else self.state.get(source)
+        # A private or members-only entry shouldn't end the walk through the source
+        extra_args = ["--lazy-playlist", "--ignore-errors"]
+        break_filter = build_break_filter(entry.get("known_ids", []), entry.get("newest_date"))
+        if break_filter:
+            extra_args.extend(["--break-match-filters", break_filter])
+            self.output_handler.info(f"Syncing {source} (new uploads since {entry.get('newest_date') or 'last sync'})")
+        else:
+            self.output_handler.info(f"Syncing {source} (first sync, enumerating everything)")
+
+        bus = self.downloader.bus
+        job_id = bus.new_job_id()
+        failures = []
+
+        def on_job_event(event: JobEvent):
+            if event.job == job_id and event.state == JobState.FAILED:
+                failures.append(event)
+
+        completed = []
+        hook = completed.append
+        self.downloader.add_completion_hook(hook)
+        subscription = bus.subscribe(on_job_event, [JobEvent])
+        bus.publish(JobEvent(job_id, JobState.QUEUED, source))
+        try:
+            success = self.downloader.download(source, output_dir=output_dir, quality=quality,
+                                               extra_args=extra_args, job_id=job_id)
+        finally:
+            bus.unsubscribe(subscription)
+            self.downloader.completion_hooks.remove(hook)
+
+        new_ids = list(dict.fromkeys(c.video_id for c in completed if c.video_id))
+        dates = [c.upload_date for c in completed if c.upload_date]
+        # With --ignore-errors, yt-dlp exits with YTDLP_ENTRY_ERRORS after
+        # finishing the walk when some entries failed; anything else aborted it
+        partial = (not success and bool(new_ids)
+                   and any(f.details.get("exit_code") == YTDLP_ENTRY_ERRORS for f in failures))
+        if success or partial:
+            self.state.update(source, new_ids, max(dates) if dates else None)
+
+        self.output_handler.info(f"Sync of {source}: {len(new_ids)} new video(s)")
+        if partial:
+            self.output_handler.error(
+                f"Sync of {source}: some uploads failed; use --full to retry those older than the newest download")
+        elif not success:
+            self.output_handler.error(
+                f"Sync of {source} had errors; the next sync checks these uploads again")
+        return SyncResult(source, success, new_ids, partial)
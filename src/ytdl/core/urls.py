@@ -0,0 +1,272 @@
+"""Local URL helpers that don't need to spawn yt-dlp.
+
+parse_url() reduces a URL on one of the major sites to the extractor and
+ID yt-dlp would report for it, and says whether it is a single video, a
+playlist or a channel. Host variants (``m.``, ``music.``, ``youtu.be``),
+path forms (``/shorts/``, ``/embed/``) and tracking parameters all map to
+the same key, so deduplication, caches and archive checks can be keyed
+without running yt-dlp.
+"""
+
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Anything from http(s):// up to whitespace, quotes or angle brackets
+URL_RE = re.compile(r'https?://[^\s<>"\'`]+', re.IGNORECASE)
+# Punctuation that ends a sentence or closes brackets around a URL in text
+URL_TRAILING = '.,;:!?)]}'
+
+YOUTUBE_ID_RE = re.compile(r'^[A-Za-z0-9_-]{11}$')
+YOUTUBE_LIST_RE = re.compile(r'^[A-Za-z0-9_-]{2,}$')
+YOUTUBE_VIDEO_PATHS = ("shorts", "embed", "live", "v", "e")
+YOUTUBE_CHANNEL_PATHS = ("channel", "c", "user")
+DIGITS_RE = re.compile(r'^\d+$')
+DAILYMOTION_ID_RE = re.compile(r'^x[0-9a-z]+$', re.IGNORECASE)
+NAME_RE = re.compile(r'^[A-Za-z0-9_.-]+$')
+INSTAGRAM_POST_PATHS = ("p", "reel", "reels", "tv")
+INSTAGRAM_RESERVED = ("explore", "stories", "accounts", "direct", "about", "legal")
+# Host prefixes that don't change what a URL points at
+HOST_PREFIXES = ("www.", "m.", "mobile.")
+
+
+class UrlKind:
+    """What a URL points at."""
+    VIDEO = "video"
+    PLAYLIST = "playlist"
+    CHANNEL = "channel"
+
+    COLLECTIONS = (PLAYLIST, CHANNEL)
+
+
+# (extractor, id, kind); extractor is yt-dlp's extractor key, lowercased
+ParsedUrl = Tuple[str, str, str]
+
+
+def _query_value(query: str, name: str) -> Optional[str]:
+    """First value of a query parameter, without decoding the whole query."""
+    prefix = name + "="
+    for pair in query.split("&"):
+        if pair.startswith(prefix):
+            return pair[len(prefix):]
+    return None
+
+
+def _youtube(parts: List[str], query: str) -> Optional[ParsedUrl]:
+    first = parts[0]
+    if first == "watch":
+        video_id = _query_value(query, "v")
+        if video_id and YOUTUBE_ID_RE.match(video_id):
+            return ("youtube", video_id, UrlKind.VIDEO)
+    if first in ("watch", "playlist"):
+        list_id = _query_value(query, "list")
+        if list_id and YOUTUBE_LIST_RE.match(list_id):
+            return ("youtubetab", list_id, UrlKind.PLAYLIST)
+        return None
+    if first in YOUTUBE_VIDEO_PATHS and len(parts) > 1 and YOUTUBE_ID_RE.match(parts[1]):
+        return ("youtube", parts[1], UrlKind.VIDEO)
+    if first.startswith("@") and len(first) > 1:
+        # Handles are case-insensitive
+        return ("youtubetab", first.lower(), UrlKind.CHANNEL)
+    if first in YOUTUBE_CHANNEL_PATHS and len(parts) > 1 and parts[1]:
+        # Channel IDs are case-sensitive; legacy names aren't
+        name = parts[1] if first == "channel" else parts[1].lower()
+        return ("youtubetab", f"{first}/{name}", UrlKind.CHANNEL)
+    return None
+
+
+def _youtu_be(parts: List[str], query: str) -> Optional[ParsedUrl]:
+    if YOUTUBE_ID_RE.match(parts[0]):
+        return ("youtube", parts[0], UrlKind.VIDEO)
+    return None
+
+
+def _vimeo(parts: List[str], query: str) -> Optional[ParsedUrl]:
+    first = parts[0]
+    if first in ("showcase", "album") and len(parts) > 1 and DIGITS_RE.match(parts[1]):
+        return ("vimeoalbum", parts[1], UrlKind.PLAYLIST)
+    if first == "channels" and len(parts) == 2:
+        return ("vimeochannel", parts[1].lower(), UrlKind.CHANNEL)
+    # vimeo.com/123, /channels/name/123, /groups/name/videos/123, player.vimeo.com/video/123
+    for part in parts:
+        if DIGITS_RE.match(part):
+            return ("vimeo", part, UrlKind.VIDEO)
+    return None
+
+
+def _dailymotion(parts: List[str], query: str) -> Optional[ParsedUrl]:
+    if "video" in parts:
+        index = parts.index("video")
+        if index + 1 < len(parts):
+            # /video/x8abcde_title-slug
+            video_id = parts[index + 1].split("_")[0]
+            if DAILYMOTION_ID_RE.match(video_id):
+                return ("dailymotion", video_id, UrlKind.VIDEO)
+        return None
+    if parts[0] == "playlist" and len(parts) > 1:
+        return ("dailymotionplaylist", parts[1].split("_")[0], UrlKind.PLAYLIST)
+    if len(parts) == 1 and NAME_RE.match(parts[0]):
+        return ("dailymotionuser", parts[0].lower(), UrlKind.CHANNEL)
+    return None
+
+
+def _dai_ly(parts: List[str], query: str) -> Optional[ParsedUrl]:
+    if DAILYMOTION_ID_RE.match(parts[0]):
+        return ("dailymotion", parts[0], UrlKind.VIDEO)
+    return None
+
+
+def _twitch(parts: List[str], query: str) -> Optional[ParsedUrl]:
+    first = parts[0]
+    if first == "videos" and len(parts) > 1 and DIGITS_RE.match(parts[1]):
+        return ("twitchvod", "v" + parts[1], UrlKind.VIDEO)
+    if len(parts) > 2 and parts[1] == "clip":
+        return ("twitchclips", parts[2], UrlKind.VIDEO)
+    if len(parts) > 1 and parts[1] == "videos":
+        return ("twitchvideos", first.lower(), UrlKind.CHANNEL)
+    if len(parts) == 1 and NAME_RE.match(first):
+        # The channel's live stream
+        return ("twitchstream", first.lower(), UrlKind.VIDEO)
+    return None
+
+
+def _twitch_clips(parts: List[str], query: str) -> Optional[ParsedUrl]:
+    return ("twitchclips", parts[0], UrlKind.VIDEO)
+
+
+def _tiktok(parts: List[str], query: str) -> Optional[ParsedUrl]:
+    first = parts[0]
+    if not first.startswith("@") or len(first) < 2:
+        return None
+    if len(parts) > 2 and parts[1] == "video" and DIGITS_RE.match(parts[2]):
+        return ("tiktok", parts[2], UrlKind.VIDEO)
+    if len(parts) == 1:
+        return ("tiktokuser", first[1:].lower(), UrlKind.CHANNEL)
+    return None
+
+
+def _instagram(parts: List[str], query: str) -> Optional[ParsedUrl]:
+    first = parts[0]
+    if first in INSTAGRAM_POST_PATHS and len(parts) > 1 and parts[1]:
+        return ("instagram", parts[1], UrlKind.VIDEO)
+    if len(parts) == 1 and first not in INSTAGRAM_RESERVED and NAME_RE.match(first):
+        return ("instagramuser", first.lower(), UrlKind.CHANNEL)
+    return None
+
+
+def _twitter(parts: List[str], query: str) -> Optional[ParsedUrl]:
+    if len(parts) > 2 and parts[1] == "status" and DIGITS_RE.match(parts[2]):
+        return ("twitter", parts[2], UrlKind.VIDEO)
+    return None
+
+
+# Host (without www./m./mobile.) -> parser of its non-empty path segments and query
+HOST_PARSERS: Dict[str, Callable[[List[str], str], Optional[ParsedUrl]]] = {
+    "youtube.com": _youtube,
+    "music.youtube.com": _youtube,
+    "youtube-nocookie.com": _youtube,
+    "youtu.be": _youtu_be,
+    "vimeo.com": _vimeo,
+    "player.vimeo.com": _vimeo,
+    "dailymotion.com": _dailymotion,
+    "dai.ly": _dai_ly,
+    "twitch.tv": _twitch,
+    "clips.twitch.tv": _twitch_clips,
+    "tiktok.com": _tiktok,
+    "instagram.com": _instagram,
+    "twitter.com": _twitter,
+    "x.com": _twitter,
+}
+
+
+def parse_url(url: str) -> Optional[ParsedUrl]:
+    """Reduce a URL to the extractor and ID yt-dlp would report.
+
+    Args:
+        url: URL on YouTube, Vimeo, Dailymotion, Twitch, TikTok, Instagram
+            or Twitter/X
+
+    Returns:
+        (extractor, id, kind), or None for other sites and unrecognized
+        pages; kind is one of the UrlKind values
+    """
+    try:
+        parsed = urlsplit(url.strip())
+        host = parsed.hostname
+    except ValueError:
+        return None
+    if not host:
+        return None
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    parser = HOST_PARSERS.get(host)
+    if parser is None:
+        return None
+    parts = [part for part in parsed.path.split("/") if part]
+    if not parts:
+        return None
+    return parser(parts, parsed.query)
+
+
+def url_key(url: str) -> str:
+    """Stable key for deduplicating and caching a URL.
+
+    Args:
+        url: Any URL
+
+    Returns:
+        "<extractor> <id>" (the archive key format) for recognized URLs,
+        otherwise the URL itself
+    """
+    parsed = parse_url(url)
+    if parsed is None:
+        return url.strip()
+    return f"{parsed[0]} {parsed[1]}"
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """Extract a YouTube video ID from a URL without network access.
+
+    Args:
+        url: Video URL
+
+    Returns:
+        The 11-character video ID, or None if the URL isn't a YouTube video
+    """
+    parsed = parse_url(url)
+    if parsed is not None and parsed[0] == "youtube":
+        return parsed[1]
+    return None
+
+
+def find_urls(text: str) -> Iterator[str]:
+    """Find http(s) URLs in free text, such as a pasted list or a file line.
+
+    Args:
+        text: Text that may contain URLs anywhere
+
+    Yields:
+        Each URL in order, without trailing punctuation
+    """
+    if "http" not in text and "HTTP" not in text:
+        return
+    for match in URL_RE.finditer(text):
+        url = match.group().rstrip(URL_TRAILING)
+        if "." in url:
+            yield url
+
+
+def is_collection_url(url: str) -> bool:
+    """Check whether a URL points at a channel or playlist.
+
+    Args:
+        url: URL to check
+
+    Returns:
+        True for channel and playlist URLs, False for single videos and
+        anything that isn't recognized
+    """
+    parsed = parse_url(url)
+    return parsed is not None and parsed[2] in UrlKind.COLLECTIONS
@@ -0,0 +1,222 @@
+"""Watch-folder ingestion of URL lists.
+
+Text files of URLs dropped into (or appended to in) a folder are read
+incrementally: each file's read offset is remembered, so only new complete
+lines are parsed, one at a time. Change notification uses inotify on Linux
+and falls back to polling elsewhere.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import threading
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+STATE_NAME = ".ytdl-watch.json"
+DEFAULT_POLL_INTERVAL = 2.0
+URL_FILE_SUFFIXES = (".txt", ".urls", ".list")
+# Offsets are checkpointed this often while reading a large file
+CHECKPOINT_LINES = 10000
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class Inotify:
+    """Minimal ctypes binding for watching one directory with inotify."""
+
+    def __init__(self, directory: str):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def read_events(self, timeout: float) -> Optional[set]:
+        """Wait for events.
+
+        Returns:
+            Names of changed files, or None if the timeout expired
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return None
+        names = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            _, _, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name:
+                names.add(os.fsdecode(name))
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+def iter_urls(line_source: Iterator[str]) -> Iterator[str]:
+    """Yield URLs from lines, skipping blanks and ``#`` comments."""
+    for line in line_source:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+class FolderWatcher:
+    """Watches a folder for URL list files and reports new URLs.
+
+    Read offsets are saved in ``.ytdl-watch.json`` in the watched folder so
+    a restart resumes where it stopped. A file that was truncated or
+    replaced (new inode) is read again from the start.
+    """
+
+    def __init__(self, directory: str, on_url: Callable[[str], None],
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, use_inotify: bool = True):
+        """Initialize the folder watcher.
+
+        Args:
+            directory: Folder to watch
+            on_url: Called for every new URL; may block to apply backpressure
+            poll_interval: Seconds between scans when polling
+            use_inotify: Use inotify when available
+        """
+        self.directory = os.path.abspath(directory)
+        self.on_url = on_url
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.state_file = os.path.join(self.directory, STATE_NAME)
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._stop = threading.Event()
+        self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                self._offsets = {name: tuple(value) for name, value in json.load(f).items()}
+        except (OSError, ValueError):
+            self._offsets = {}
+
+    def _save_state(self):
+        tmp_path = self.state_file + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._offsets, f)
+        os.replace(tmp_path, self.state_file)
+
+    def _is_url_file(self, name: str) -> bool:
+        return name.endswith(URL_FILE_SUFFIXES) and not name.startswith(".")
+
+    def process_file(self, name: str) -> int:
+        """Read new complete lines from one file.
+
+        Args:
+            name: File name inside the watched folder
+
+        Returns:
+            Number of URLs found
+        """
+        path = os.path.join(self.directory, name)
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            return 0
+
+        count = 0
+        with f:
+            stat = os.fstat(f.fileno())
+            inode, offset = self._offsets.get(name, (stat.st_ino, 0))
+            if inode != stat.st_ino or stat.st_size < offset:
+                offset = 0
+            if stat.st_size == offset:
+                return 0
+            f.seek(offset)
+
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    # Incomplete last line: wait for the writer to finish it
+                    break
+                offset += len(raw)
+                for url in iter_urls([raw.decode('utf-8', errors='replace')]):
+                    self.on_url(url)
+                    count += 1
+                    if count % CHECKPOINT_LINES == 0:
+                        self._offsets[name] = (stat.st_ino, offset)
+                        self._save_state()
+                if self._stop.is_set():
+                    break
+
+        self._offsets[name] = (stat.st_ino, offset)
+        self._save_state()
+        return count
+
+    def scan(self) -> int:
+        """Process every URL file in the folder once.
+
+        Returns:
+            Number of URLs found
+        """
+        try:
+            names = sorted(e.name for e in os.scandir(self.directory) if e.is_file())
+        except OSError:
+            return 0
+        # Forget offsets of files that were removed
+        for name in set(self._offsets) - set(names):
+            del self._offsets[name]
+        return sum(self.process_file(name) for name in names if self._is_url_file(name))
+
+    def run(self):
+        """Watch until stop() is called."""
+        os.makedirs(self.directory, exist_ok=True)
+
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = Inotify(self.directory)
+            except (OSError, AttributeError):
+                inotify = None
+
+        try:
+            # Watch first, then scan, so nothing written in between is missed
+            self.scan()
+            while not self._stop.is_set():
+                if inotify is None:
+                    if self._stop.wait(self.poll_interval):
+                        break
+                    self.scan()
+                    continue
+                names = inotify.read_events(self.poll_interval)
+                if names:
+                    for name in sorted(names):
+                        if self._is_url_file(name):
+                            self.process_file(name)
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def stop(self):
+        """Stop watching after the current line."""
+        self._stop.set()
@@ -12,12 +12,16 @@ class ControlButtonsComponent:
                  start_callback: Optional[Callable[[], None]] = None,
                  clear_callback: Optional[Callable[[], None]] = None,
                  remove_callback: Optional[Callable[[], None]] = None,
+                 pause_callback: Optional[Callable[[], None]] = None,
+                 cancel_callback: Optional[Callable[[], None]] = None,
                  settings_callback: Optional[Callable[[], None]] = None,
                  exit_callback: Optional[Callable[[], None]] = None):
         self.parent = parent
         self.start_callback = start_callback
         self.clear_callback = clear_callback
         self.remove_callback = remove_callback
+        self.pause_callback = pause_callback
+        self.cancel_callback = cancel_callback
         self.settings_callback = settings_callback
         self.exit_callback = exit_callback
         
@@ -25,6 +29,8 @@ class ControlButtonsComponent:
         self.start_button = None
         self.clear_button = None
         self.remove_button = None
+        self.pause_button = None
+        self.cancel_button = None
         
         self._setup_ui()
     
@@ -39,13 +45,19 @@ class ControlButtonsComponent:
         self.clear_button.grid(row=0, column=1, padx=(0, 5))
         
         self.remove_button = ttk.Button(self.frame, text="Remove Selected", command=self._handle_remove)
-        self.remove_button.grid(row=0, column=2, padx=(0, 20))
+        self.remove_button.grid(row=0, column=2, padx=(0, 5))
+        
+        self.pause_button = ttk.Button(self.frame, text="Pause", command=self._handle_pause)
+        self.pause_button.grid(row=0, column=3, padx=(0, 5))
+        
+        self.cancel_button = ttk.Button(self.frame, text="Cancel", command=self._handle_cancel)
+        self.cancel_button.grid(row=0, column=4, padx=(0, 20))
         
         # Spacer
-        self.frame.columnconfigure(3, weight=1)
+        self.frame.columnconfigure(5, weight=1)
         
-        ttk.Button(self.frame, text="Settings", command=self._handle_settings).grid(row=0, column=4, padx=(0, 5))
-        ttk.Button(self.frame, text="Exit", command=self._handle_exit).grid(row=0, column=5)
+        ttk.Button(self.frame, text="Settings", command=self._handle_settings).grid(row=0, column=6, padx=(0, 5))
+        ttk.Button(self.frame, text="Exit", command=self._handle_exit).grid(row=0, column=7)
     
     def grid(self, **kwargs):
         """Grid the frame component"""
@@ -53,7 +65,9 @@ class ControlButtonsComponent:
             self.frame.grid(**kwargs)
     
     def update_button_states(self, has_queue: bool, has_selection: bool, 
-                           is_downloading: bool, pending_items: int):
+                           is_downloading: bool, pending_items: int,
+                           can_pause: bool = False, is_paused: bool = False,
+                           can_cancel: bool = False):
         """Update button states based on current state"""
         # Start button: enabled if there are pending items and not currently downloading
         if pending_items > 0 and not is_downloading:
@@ -70,6 +84,11 @@ class ControlButtonsComponent:
         
         # Remove button: enabled if there's a selection
         self.remove_button.config(state="normal" if has_selection else "disabled")
+        
+        # Pause/Resume and Cancel act on the selected item's download
+        self.pause_button.config(state="normal" if can_pause or is_paused else "disabled",
+                                 text="Resume" if is_paused else "Pause")
+        self.cancel_button.config(state="normal" if can_cancel else "disabled")
     
     def _handle_start(self):
         """Handle start button click"""
@@ -86,6 +105,16 @@ class ControlButtonsComponent:
         if self.remove_callback:
             self.remove_callback()
     
+    def _handle_pause(self):
+        """Handle pause/resume button click"""
+        if self.pause_callback:
+            self.pause_callback()
+    
+    def _handle_cancel(self):
+        """Handle cancel button click"""
+        if self.cancel_callback:
+            self.cancel_callback()
+    
     def _handle_settings(self):
         """Handle settings button click"""
         if self.settings_callback:
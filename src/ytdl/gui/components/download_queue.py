@@ -4,38 +4,71 @@ import tkinter as tk
 from tkinter import ttk
 from typing import List, Callable, Optional
 
-from ..models.download_item import DownloadItem
+from ..models.download_item import DownloadItem, ItemStatus
+from ..models.queue_model import QueueModel
+
+DEFAULT_ROW_HEIGHT = 20
 
 
 class DownloadQueueComponent:
-    """Component for displaying and managing the download queue"""
-    
-    def __init__(self, parent: tk.Widget, 
-                 selection_callback: Optional[Callable[[], None]] = None):
+    """Component for displaying and managing the download queue
+
+    The view is virtualized: the treeview only holds the rows that fit on
+    screen, filled from the queue model at the current scroll offset, so
+    scrolling and updates cost the same with 10 items or 100k.
+    """
+
+    def __init__(self, parent: tk.Widget,
+                 selection_callback: Optional[Callable[[], None]] = None,
+                 thumbnail_provider: Optional[Callable[[DownloadItem], Optional[object]]] = None,
+                 row_height: Optional[int] = None):
         self.parent = parent
         self.selection_callback = selection_callback
-        self.download_queue: List[DownloadItem] = []
-        
+        # Returns an item's thumbnail image, or None while it isn't loaded
+        self.thumbnail_provider = thumbnail_provider
+        self.model = QueueModel()
+
+        # First model row shown, number of rows that fit, and the treeview rows in use
+        self.offset = 0
+        self.visible_rows = 8
+        self._row_ids: List[str] = []
+        self._row_height = row_height or DEFAULT_ROW_HEIGHT
+        # An explicit height sets the row style; otherwise the theme's is read back
+        self._fixed_row_height = bool(row_height)
+        self.selected_job: Optional[int] = None
+
         self.frame = None
         self.queue_tree = None
-        
+        self.scrollbar = None
+
         self._setup_ui()
-    
+
+    @property
+    def download_queue(self) -> QueueModel:
+        """The queued items, in order"""
+        return self.model
+
     def _setup_ui(self):
         """Setup the download queue UI"""
         # Download queue frame
         self.frame = ttk.LabelFrame(self.parent, text="Download Queue", padding="5")
         self.frame.columnconfigure(0, weight=1)
         self.frame.rowconfigure(0, weight=1)
-        
+
         # Treeview for queue
         columns = ("URL", "Channel", "Size", "Quality", "Status", "Progress")
-        self.queue_tree = ttk.Treeview(self.frame, columns=columns, show="tree headings", height=8)
-        
+        tree_options = {}
+        if self._fixed_row_height:
+            # Taller rows to fit thumbnails
+            ttk.Style().configure("Queue.Treeview", rowheight=self._row_height)
+            tree_options["style"] = "Queue.Treeview"
+        self.queue_tree = ttk.Treeview(self.frame, columns=columns, show="tree headings",
+                                       height=self.visible_rows, selectmode="browse", **tree_options)
+
         # Configure columns
         self.queue_tree.heading("#0", text="Title")
         self.queue_tree.column("#0", width=250, minwidth=150)
-        
+
         # Configure individual columns with appropriate sizing
         column_config = {
             "URL": {"width": 120, "minwidth": 100},
@@ -43,111 +76,257 @@ class DownloadQueueComponent:
             "Size": {"width": 80, "minwidth": 70},
             "Quality": {"width": 80, "minwidth": 70},
             "Status": {"width": 80, "minwidth": 70},
-            "Progress": {"width": 70, "minwidth": 60}
+            "Progress": {"width": 160, "minwidth": 60}
         }
-        
+
         for col in columns:
             self.queue_tree.heading(col, text=col)
             config = column_config.get(col, {"width": 100, "minwidth": 80})
             self.queue_tree.column(col, width=config["width"], minwidth=config["minwidth"])
-        
+
         self.queue_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        # Bind selection change event
-        if self.selection_callback:
-            self.queue_tree.bind('<<TreeviewSelect>>', lambda e: self.selection_callback())
-        
+
+        if not self._fixed_row_height:
+            try:
+                self._row_height = int(ttk.Style().lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT)
+            except (tk.TclError, ValueError):
+                pass
+
+        # Selection, scrolling and resizing act on the model, not on treeview rows
+        self.queue_tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.queue_tree.bind('<Configure>', self._on_resize)
+        self.queue_tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.queue_tree.bind('<Button-4>', lambda e: self._scroll_by(-3))
+        self.queue_tree.bind('<Button-5>', lambda e: self._scroll_by(3))
+        self.queue_tree.bind('<Up>', lambda e: self._move_selection(-1))
+        self.queue_tree.bind('<Down>', lambda e: self._move_selection(1))
+        self.queue_tree.bind('<Prior>', lambda e: self._move_selection(-self.visible_rows))
+        self.queue_tree.bind('<Next>', lambda e: self._move_selection(self.visible_rows))
+
         # Queue scrollbar
-        queue_scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.queue_tree.yview)
-        queue_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.queue_tree.configure(yscrollcommand=queue_scrollbar.set)
-    
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+
     def grid(self, **kwargs):
         """Grid the frame component"""
         if self.frame:
             self.frame.grid(**kwargs)
-    
+
+    # -- rendering ------------------------------------------------------
+
+    def _row_text(self, item: DownloadItem) -> str:
+        if item.title == "Unknown" and not item.metadata_loaded:
+            return "Fetching title..."
+        return item.title
+
+    def _row_values(self, item: DownloadItem) -> tuple:
+        url_display = item.url[:30] + "..." if len(item.url) > 30 else item.url
+        if item.metadata_loaded:
+            channel, size = item.channel, item.file_size
+        else:
+            channel, size = "Fetching...", "Fetching..."
+        progress = f"{item.progress:.0f}%"
+        if item.status == ItemStatus.FAILED and item.error_message:
+            progress = item.error_message
+        elif item.status == ItemStatus.DOWNLOADING:
+            if item.speed:
+                progress += f" {item.speed}"
+            if item.eta:
+                progress += f" ETA {item.eta}"
+        return (url_display, channel, size, item.quality, item.status, progress)
+
+    def _fill_row(self, row_id: str, item: DownloadItem):
+        image = self.thumbnail_provider(item) if self.thumbnail_provider else None
+        self.queue_tree.item(row_id, text=self._row_text(item), values=self._row_values(item),
+                             image=image or "")
+
+    def _render(self):
+        """Fill the treeview rows from the model at the current offset"""
+        total = len(self.model)
+        self.offset = max(0, min(self.offset, total - self.visible_rows))
+        items = self.model.window(self.offset, self.visible_rows)
+
+        # Grow or shrink the pool of treeview rows to the number shown
+        while len(self._row_ids) < len(items):
+            self._row_ids.append(self.queue_tree.insert("", "end"))
+        while len(self._row_ids) > len(items):
+            self.queue_tree.delete(self._row_ids.pop())
+
+        selected_row = None
+        for row_id, item in zip(self._row_ids, items):
+            self._fill_row(row_id, item)
+            if item.job_id == self.selected_job:
+                selected_row = row_id
+
+        if selected_row:
+            if self.queue_tree.selection() != (selected_row,):
+                self.queue_tree.selection_set(selected_row)
+        elif self.queue_tree.selection():
+            self.queue_tree.selection_remove(self.queue_tree.selection())
+
+        self._update_scrollbar()
+
+    def _render_item(self, item: DownloadItem):
+        """Refresh one item's row if it is on screen"""
+        row_id = self._row_id_of(item)
+        if row_id:
+            self._fill_row(row_id, item)
+
+    def _row_id_of(self, item: DownloadItem) -> Optional[str]:
+        if item.job_id is None:
+            return None
+        row = self.model.row_of(item.job_id)
+        if row is None or not self.offset <= row < self.offset + len(self._row_ids):
+            return None
+        return self._row_ids[row - self.offset]
+
+    def _update_scrollbar(self):
+        total = len(self.model)
+        if total <= self.visible_rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.visible_rows) / total)
+
+    # -- scrolling and selection -----------------------------------------
+
+    def _scroll_to(self, offset: int):
+        offset = max(0, min(offset, len(self.model) - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _scroll_by(self, rows: int):
+        self._scroll_to(self.offset + rows)
+        return "break"
+
+    def _on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None):
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self.model)))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self._scroll_by(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_by(-3 * delta)
+
+    def _on_resize(self, event):
+        # One row's worth of height goes to the headings
+        rows = max(1, event.height // self._row_height - 1)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self._render()
+
+    def _on_select(self, event=None):
+        selection = self.queue_tree.selection()
+        # Rows are emptied when the selected item scrolls out of view; keep the selection then
+        if selection and selection[0] in self._row_ids:
+            item = self.model.at(self.offset + self._row_ids.index(selection[0]))
+            if item is not None:
+                self.selected_job = item.job_id
+        if self.selection_callback:
+            self.selection_callback()
+
+    def _move_selection(self, rows: int):
+        """Move the selection, scrolling it into view"""
+        if not len(self.model):
+            return "break"
+        current = self.model.row_of(self.selected_job) if self.selected_job is not None else None
+        row = 0 if current is None else max(0, min(current + rows, len(self.model) - 1))
+        self.selected_job = self.model.at(row).job_id
+        if row < self.offset:
+            self.offset = row
+        elif row >= self.offset + self.visible_rows:
+            self.offset = row - self.visible_rows + 1
+        self._render()
+        if self.selection_callback:
+            self.selection_callback()
+        return "break"
+
+    # -- queue operations -------------------------------------------------
+
     def add_item(self, item: DownloadItem):
         """Add an item to the download queue"""
-        self.download_queue.append(item)
-        
-        # Add to treeview with initial values
-        url_display = item.url[:30] + "..." if len(item.url) > 30 else item.url
-        item_id = self.queue_tree.insert("", "end", text="Fetching title...", 
-                                       values=(url_display, "Fetching...", "Fetching...", 
-                                              item.quality, item.status, "0%"))
-        item.tree_item_id = item_id
-    
+        self.model.add(item)
+
+        # Only the tail can change, so rendering is needed just when it's on screen
+        if len(self.model) <= self.offset + self.visible_rows:
+            self._render()
+        else:
+            self._update_scrollbar()
+
+    def add_items(self, items: List[DownloadItem]) -> List[DownloadItem]:
+        """Add many items at once, skipping ones already queued
+
+        The view is refreshed once for the whole batch.
+
+        Returns:
+            The items that were added
+        """
+        was_visible = len(self.model) < self.offset + self.visible_rows
+        added = self.model.add_many(items)
+        if added and was_visible:
+            self._render()
+        else:
+            self._update_scrollbar()
+        return added
+
     def update_item_metadata(self, item: DownloadItem):
         """Update download item metadata in the display"""
-        if item.tree_item_id and self.queue_tree.exists(item.tree_item_id):
-            self.queue_tree.item(item.tree_item_id, text=item.title)
-            # Update the channel and size columns
-            current_values = list(self.queue_tree.set(item.tree_item_id).values())
-            if len(current_values) >= 6:
-                current_values[1] = item.channel  # Channel column
-                current_values[2] = item.file_size  # Size column
-                self.queue_tree.item(item.tree_item_id, values=current_values)
-    
+        self._render_item(item)
+
     def update_item_progress(self, item: DownloadItem):
         """Update item progress and status in the display"""
-        if item.tree_item_id and self.queue_tree.exists(item.tree_item_id):
-            # Update all columns
-            self.queue_tree.set(item.tree_item_id, "Status", item.status)
-            self.queue_tree.set(item.tree_item_id, "Progress", f"{item.progress}%")
-            
-            # Update title if it was set
-            if item.title != "Unknown":
-                self.queue_tree.item(item.tree_item_id, text=item.title)
-    
+        self._render_item(item)
+
     def update_all_items(self):
         """Update all items in the display"""
-        for item in self.download_queue:
-            self.update_item_progress(item)
-    
+        self._render()
+
+    def update_items(self, items: List[DownloadItem]):
+        """Update only the given items' rows in the display"""
+        for item in items:
+            self._render_item(item)
+
     def get_selected_item(self) -> Optional[DownloadItem]:
         """Get the currently selected download item"""
-        selection = self.queue_tree.selection()
-        if not selection:
+        if self.selected_job is None:
             return None
-        
-        item_id = selection[0]
-        index = self.queue_tree.index(item_id)
-        
-        if 0 <= index < len(self.download_queue):
-            return self.download_queue[index]
-        
-        return None
-    
+        return self.model.get(self.selected_job)
+
     def remove_selected_item(self) -> bool:
         """Remove the selected item from the queue"""
-        selection = self.queue_tree.selection()
-        if not selection:
+        if self.selected_job is None or self.model.remove(self.selected_job) is None:
             return False
-        
-        item_id = selection[0]
-        index = self.queue_tree.index(item_id)
-        
-        # Remove from queue and treeview
-        if 0 <= index < len(self.download_queue):
-            del self.download_queue[index]
-        self.queue_tree.delete(item_id)
+
+        self.selected_job = None
+        self._render()
         return True
-    
+
     def clear_queue(self):
         """Clear all items from the queue"""
-        self.download_queue.clear()
-        for item in self.queue_tree.get_children():
-            self.queue_tree.delete(item)
-    
+        self.model.clear()
+        self.selected_job = None
+        self.offset = 0
+        self._render()
+
     def has_selection(self) -> bool:
         """Check if there's a selected item"""
-        return len(self.queue_tree.selection()) > 0
-    
+        return self.get_selected_item() is not None
+
     def has_items(self) -> bool:
         """Check if there are items in the queue"""
-        return len(self.download_queue) > 0
-    
+        return len(self.model) > 0
+
+    def find_item(self, url: str) -> Optional[DownloadItem]:
+        """Find a queued item for the same video as a URL"""
+        return self.model.find(url)
+
+    def set_item_status(self, item: DownloadItem, status: str):
+        """Change an item's status (thread-safe; rows are refreshed by the caller)"""
+        self.model.set_status(item, status)
+
     def count_pending_items(self) -> int:
         """Count items that are still pending (not completed or failed)"""
-        return sum(1 for item in self.download_queue if item.status == "Queued")
\ No newline at end of file
+        return self.model.count(ItemStatus.QUEUED)
@@ -2,6 +2,7 @@
 
 import tkinter as tk
 from tkinter import ttk
+from typing import Optional
 
 
 class ProgressDisplayComponent:
@@ -48,12 +49,15 @@ class ProgressDisplayComponent:
         self.status_label = ttk.Label(parent, textvariable=self.status_var)
         return self.status_label
     
-    def set_progress(self, percentage: float):
-        """Set the progress percentage"""
+    def set_progress(self, percentage: float, detail: Optional[str] = None):
+        """Set the progress percentage, with optional detail text after it"""
         if self.progress_var:
             self.progress_var.set(percentage)
         if self.progress_label:
-            self.progress_label.config(text=f"{percentage:.1f}%")
+            text = f"{percentage:.1f}%"
+            if detail:
+                text += f" ({detail})"
+            self.progress_label.config(text=text)
     
     def reset_progress(self):
         """Reset progress to 0"""
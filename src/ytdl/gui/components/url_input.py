@@ -1,9 +1,11 @@
 """URL input component"""
 
+import itertools
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from typing import Callable, Optional
 
+from ...core.urls import find_urls
 from ..utils.gui_utils import is_valid_url
 
 
@@ -12,10 +14,15 @@ class URLInputComponent:
     
     def __init__(self, parent: tk.Widget,
                  add_callback: Optional[Callable[[str], None]] = None,
-                 info_callback: Optional[Callable[[str], None]] = None):
+                 info_callback: Optional[Callable[[str], None]] = None,
+                 bulk_callback: Optional[Callable[[str], None]] = None,
+                 import_callback: Optional[Callable[[str], None]] = None):
         self.parent = parent
         self.add_callback = add_callback
         self.info_callback = info_callback
+        # Pasted text with several URLs, and URL list files
+        self.bulk_callback = bulk_callback
+        self.import_callback = import_callback
         
         self.frame = None
         self.url_var = None
@@ -39,12 +46,14 @@ class URLInputComponent:
         self.url_entry = ttk.Entry(self.frame, textvariable=self.url_var, width=50)
         self.url_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(0, 5))
         self.url_entry.bind('<Return>', lambda e: self._handle_add())
+        self.url_entry.bind('<<Paste>>', self._on_paste)
         
         # Add auto-fetch functionality with debouncing
         self.url_var.trace('w', self._on_url_change)
         
         ttk.Button(self.frame, text="Info", command=self._handle_info).grid(row=0, column=2, padx=(0, 5))
-        ttk.Button(self.frame, text="Add", command=self._handle_add).grid(row=0, column=3)
+        ttk.Button(self.frame, text="Add", command=self._handle_add).grid(row=0, column=3, padx=(0, 5))
+        ttk.Button(self.frame, text="Import...", command=self._handle_import).grid(row=0, column=4)
     
     def grid(self, **kwargs):
         """Grid the frame component"""
@@ -105,6 +114,28 @@ class URLInputComponent:
         # Clear URL entry
         self.clear_url()
     
+    def _on_paste(self, event=None):
+        """Send pastes with several URLs to the bulk import instead of the entry"""
+        if not self.bulk_callback:
+            return None
+        try:
+            text = self.parent.clipboard_get()
+        except tk.TclError:
+            return None
+        if len(list(itertools.islice(find_urls(text), 2))) < 2:
+            return None
+        self.bulk_callback(text)
+        return "break"
+    
+    def _handle_import(self):
+        """Handle import button click"""
+        path = filedialog.askopenfilename(
+            title="Import URLs",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if path and self.import_callback:
+            self.import_callback(path)
+    
     def _handle_info(self):
         """Handle info button click"""
         url = self.get_url()
@@ -2,16 +2,18 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+import os
 import threading
 import re
-import tempfile
-import signal
-from typing import Optional
+from typing import Dict, Optional
 
 from ..core.config import ConfigService
 from ..core.downloader import DownloaderService
 from ..core.logger import LoggerService
 from ..core.gui_output import GUIOutputHandler
+from ..core.eventbus import LogEvent, ProgressEvent, StageEvent
+from ..core.jobs import DownloadEngine, Job, JobStatus
+from ..core.processes import CAN_PAUSE
 
 from .components.url_input import URLInputComponent
 from .components.options_panel import OptionsPanelComponent
@@ -20,14 +22,13 @@ from .components.progress_display import ProgressDisplayComponent
 from .components.control_buttons import ControlButtonsComponent
 from .dialogs.settings_dialog import SettingsDialog
 from .dialogs.video_info_dialog import VideoInfoDialog
-from .models.download_item import DownloadItem
+from .models.batch_progress import BatchProgress
+from .models.download_item import DownloadItem, ItemStatus
 from .utils.gui_utils import format_file_size, is_valid_url, open_folder
-
-try:
-    from PIL import Image, ImageTk
-    HAS_PILLOW = True
-except ImportError:
-    HAS_PILLOW = False
+from .utils.update_pump import UpdatePump
+from .utils.metadata_pool import DEFAULT_BATCH_SIZE, DEFAULT_WORKERS, MetadataPool
+from .utils.thumbnail_cache import THUMBNAIL_SIZE, ThumbnailCache
+from .utils.url_import import iter_url_chunks
 
 
 class GUIService:
@@ -37,12 +38,23 @@ class GUIService:
         self.config = config
         self.downloader = downloader
         self.logger = logger
-        self.current_download: Optional[DownloadItem] = None
         
-        # Thumbnail cache management
-        self.thumbnail_cache = {}
-        self.thumbnail_temp_dir = tempfile.mkdtemp() if HAS_PILLOW else None
-        self.placeholder_image = None
+        # Downloads run on the engine's workers (concurrent_downloads at a time)
+        self.engine: Optional[DownloadEngine] = None
+        self._jobs_lock = threading.Lock()
+        # Engine job ID -> item, for jobs submitted and not finished
+        self.active_jobs: Dict[int, DownloadItem] = {}
+        # Queue item ID -> engine job ID (None until the feeder has submitted it)
+        self.item_jobs: Dict[int, Optional[int]] = {}
+        # Jobs that finished before the feeder recorded them
+        self._unclaimed: Dict[int, Job] = {}
+        self.batch = BatchProgress()
+        # Set to stop a bulk import that is still running
+        self._import_cancel: Optional[threading.Event] = None
+        
+        # Thumbnails load on worker threads and are handed over through the pump
+        # (None without Pillow)
+        self.thumbnails = ThumbnailCache.from_config(config, lambda fn, *args: self.pump.call(fn, *args))
         
         # Auto-fetch functionality
         self.auto_fetch_enabled = True
@@ -56,7 +68,19 @@ class GUIService:
         # Initialize components
         self._create_components()
         self._setup_layout()
+        
+        # All UI updates from worker threads go through the pump
+        self.pump = UpdatePump(self.root, render_dirty=self.download_queue.update_items)
+        self.pump.start()
         self._setup_gui_output_handler()
+        
+        # Metadata is fetched on a few workers, with a hard timeout per yt-dlp call;
+        # bulk imports fetch several videos per call
+        self.metadata_timeout = float(self.config.get("metadata_timeout", 30))
+        self.metadata_pool = MetadataPool(self._fetch_info,
+                                          int(self.config.get("metadata_workers", DEFAULT_WORKERS)),
+                                          fetch_many=self._fetch_info_many,
+                                          batch_size=int(self.config.get("metadata_batch_size", DEFAULT_BATCH_SIZE)))
     
     def _create_components(self):
         """Create all GUI components"""
@@ -71,7 +95,9 @@ class GUIService:
         self.url_input = URLInputComponent(
             self.main_frame,
             add_callback=self._handle_add_url,
-            info_callback=self._handle_show_info
+            info_callback=self._handle_show_info,
+            bulk_callback=self._handle_add_urls,
+            import_callback=self._handle_import_file
         )
         
         # Options panel component
@@ -85,7 +111,9 @@ class GUIService:
         # Download queue component
         self.download_queue = DownloadQueueComponent(
             self.main_frame,
-            selection_callback=self._update_button_states
+            selection_callback=self._update_button_states,
+            thumbnail_provider=self._queue_thumbnail if self.thumbnails else None,
+            row_height=THUMBNAIL_SIZE[1] + 4 if self.thumbnails else None
         )
         
         # Progress display component
@@ -98,6 +126,8 @@ class GUIService:
             start_callback=self._start_downloads,
             clear_callback=self._clear_queue,
             remove_callback=self._remove_selected,
+            pause_callback=self._toggle_pause_selected,
+            cancel_callback=self._cancel_selected,
             settings_callback=self._show_settings,
             exit_callback=self.root.quit
         )
@@ -137,16 +167,20 @@ class GUIService:
         self.gui_output = GUIOutputHandler(
             info_callback=self._handle_info_message,
             error_callback=self._handle_error_message,
-            progress_callback=self._handle_progress_update
+            progress_callback=self._handle_progress_update,
+            output_callback=self._handle_output_line
         )
         
         # Replace downloader's output handler
         self.downloader.output_handler = self.gui_output
+        # Called on the download's reader thread; the handlers only post to the update pump
+        self.downloader.bus.subscribe(self.gui_output, (ProgressEvent, LogEvent))
+        self.downloader.bus.subscribe(self._handle_stage_event, (StageEvent,))
     
     def _handle_add_url(self, url: str):
         """Handle URL addition to queue"""
-        # Check if URL is already in queue
-        if any(item.url == url for item in self.download_queue.download_queue):
+        # Check if the video is already in queue
+        if self.download_queue.find_item(url):
             return
         
         quality = self.options_panel.get_quality()
@@ -158,69 +192,130 @@ class GUIService:
         
         self.progress_display.set_status(f"Fetching video info... ({self.download_queue.count_pending_items()} items in queue)")
         
-        # Fetch title asynchronously with timeout handling
-        threading.Thread(target=self._fetch_metadata, args=(item,), daemon=True).start()
+        # Fetch title in the background; the pool bounds how many run at once
+        self.metadata_pool.request(url, item.job_id, lambda info: self._handle_metadata(item, info))
+        
+        # URLs added while downloading join the running batch
+        if self.item_jobs:
+            self._submit_items([item])
         
         # Update button states
         self._update_button_states()
     
-    def _fetch_metadata(self, item: DownloadItem):
-        """Fetch video metadata in background thread"""
+    def _handle_add_urls(self, text: str):
+        """Add every URL in pasted text"""
+        self._import_urls(text.splitlines(), "clipboard")
+    
+    def _handle_import_file(self, path: str):
+        """Add every URL in a text file"""
         try:
-            # Set timeout for metadata fetching (Unix systems only)
-            if hasattr(signal, 'SIGALRM'):
-                def timeout_handler(signum, frame):
-                    raise TimeoutError("Metadata fetch timeout")
-                
-                signal.signal(signal.SIGALRM, timeout_handler)
-                signal.alarm(10)  # 10 second timeout
-            
-            info = self.downloader.get_info(item.url)
+            lines = open(path, "r", encoding="utf-8", errors="replace")
+        except OSError as e:
+            messagebox.showerror("Import Failed", f"Could not read {path}:\n{e}")
+            return
+        self._import_urls(lines, os.path.basename(path), close=lines.close)
+    
+    def _import_urls(self, lines, source: str, close=None):
+        """Parse URLs on a background thread and add them to the queue a chunk per frame"""
+        quality = self.options_panel.get_quality()
+        output_dir = self.options_panel.get_output_dir()
+        queued_before = len(self.download_queue.download_queue)
+        cancel = self._import_cancel = threading.Event()
+        self.progress_display.set_status(f"Importing URLs from {source}...")
+        
+        def parse():
+            try:
+                for urls in iter_url_chunks(lines):
+                    added = threading.Event()
+                    self.pump.call(self._add_imported, urls, quality, output_dir, cancel, added)
+                    # One chunk per frame keeps the window responsive
+                    while not added.wait(0.5):
+                        if cancel.is_set():
+                            return
+                    if cancel.is_set():
+                        return
+            finally:
+                if close:
+                    close()
+            self.pump.call(self._finish_import, source, queued_before)
+        
+        threading.Thread(target=parse, name="ytdl-gui-import", daemon=True).start()
+    
+    def _add_imported(self, urls, quality: str, output_dir: str, cancel: threading.Event,
+                      added: threading.Event):
+        """Insert one chunk of imported URLs, skipping ones already queued"""
+        try:
+            if cancel.is_set():
+                return
+            items = self.download_queue.add_items([DownloadItem(url, quality, output_dir) for url in urls])
+            self.metadata_pool.request_many(
+                (item.url, item.job_id, lambda info, item=item: self._handle_metadata(item, info))
+                for item in items)
+            # URLs added while downloading join the running batch
+            if items and self.item_jobs:
+                self._submit_items(items)
+            self.progress_display.set_status(
+                f"Importing URLs... ({len(self.download_queue.download_queue)} items in queue)")
+            self._update_button_states()
+        finally:
+            added.set()
+    
+    def _finish_import(self, source: str, queued_before: int):
+        added = len(self.download_queue.download_queue) - queued_before
+        self.progress_display.set_status(f"Imported {max(0, added)} new URLs from {source}")
+    
+    def _fetch_info(self, url: str, cancel: threading.Event) -> Optional[dict]:
+        """Fetch video info on a metadata pool worker"""
+        return self.downloader.get_info(url, timeout=self.metadata_timeout, cancel=cancel)
+    
+    def _fetch_info_many(self, urls, cancel: threading.Event) -> Dict[str, dict]:
+        """Fetch info for a batch of videos with one yt-dlp call, on a metadata pool worker"""
+        return self.downloader.get_info_many(urls, timeout=self.metadata_timeout * len(urls), cancel=cancel)
+    
+    def _handle_metadata(self, item: DownloadItem, info: Optional[dict]):
+        """Handle fetched metadata (called on a metadata pool worker)"""
+        if info and 'title' in info:
+            title = info['title']
+            channel = info.get('uploader', info.get('channel', 'Unknown'))
             
-            if hasattr(signal, 'SIGALRM'):
-                signal.alarm(0)  # Cancel timeout
+            # Raw size in bytes; it is formatted when displayed
+            size_bytes = info.get('filesize') or info.get('filesize_approx')
             
-            if info and 'title' in info:
-                title = info['title']
-                channel = info.get('uploader', info.get('channel', 'Unknown'))
-                
-                # Extract file size information
-                file_size = "Unknown"
-                if 'filesize' in info and info['filesize']:
-                    file_size = format_file_size(info['filesize'])
-                elif 'filesize_approx' in info and info['filesize_approx']:
-                    file_size = format_file_size(info['filesize_approx'])
-                
-                # Update on main thread
-                self.root.after(0, lambda: self._update_item_metadata(item, title, channel, file_size))
-            else:
-                # Fallback
-                self.root.after(0, lambda: self._update_item_metadata(item, "Unknown", "Unknown", "Unknown"))
-        except (Exception, TimeoutError):
-            # Error or timeout
-            if hasattr(signal, 'SIGALRM'):
-                signal.alarm(0)
-            self.root.after(0, lambda: self._update_item_metadata(item, "Unknown", "Unknown", "Unknown"))
-    
-    def _update_item_metadata(self, item: DownloadItem, title: str, channel: str = None, file_size: str = None):
+            # Update on main thread
+            self.pump.call(self._update_item_metadata, item, title, channel, size_bytes,
+                           info.get('thumbnail'))
+        else:
+            # Failed or timed out
+            self.pump.call(self._update_item_metadata, item, "Unknown", "Unknown")
+    
+    def _update_item_metadata(self, item: DownloadItem, title: str, channel: str = None,
+                              size_bytes: Optional[int] = None, thumbnail_url: Optional[str] = None):
         """Update download item metadata"""
-        item.update_metadata(title, channel, file_size)
+        item.update_metadata(title, channel, size_bytes, thumbnail_url)
         self.download_queue.update_item_metadata(item)
         
         self.progress_display.set_status(f"Ready - {len(self.download_queue.download_queue)} items in queue")
         self._update_button_states()
     
+    def _queue_thumbnail(self, item: DownloadItem):
+        """Thumbnail for a queue row; starts loading it if it isn't in memory"""
+        if not item.thumbnail_url:
+            return None
+        image = self.thumbnails.get(item.thumbnail_url)
+        if image is None:
+            self.thumbnails.request(item.thumbnail_url, lambda image: self.pump.mark_dirty(item))
+        return image
+    
     def _handle_show_info(self, url: str):
         """Handle video info request"""
-        def fetch_info():
-            info = self.downloader.get_info(url)
+        def show_info(info: Optional[dict]):
             if info:
-                self.root.after(0, lambda: self._display_video_info(info))
+                self.pump.call(self._display_video_info, info)
             else:
-                self.root.after(0, lambda: messagebox.showerror("Error", "Could not fetch video information"))
+                self.pump.call(self._show_error, "Error", "Could not fetch video information")
         
         self.progress_display.set_status("Fetching video information...")
-        threading.Thread(target=fetch_info, daemon=True).start()
+        self.metadata_pool.request(url, "video_info", show_info)
     
     def _display_video_info(self, info: dict):
         """Display video information dialog"""
@@ -230,51 +325,175 @@ class GUIService:
     
     def _start_downloads(self):
         """Start downloading all queued items"""
-        if not self.download_queue.has_items():
+        items = [item for item in self.download_queue.download_queue
+                 if item.status == ItemStatus.QUEUED and item.job_id not in self.item_jobs]
+        if not items:
             return
         
-        if self.current_download:
-            messagebox.showinfo("Download in Progress", "A download is already in progress")
-            return
+        if not self.item_jobs:
+            self.batch.reset()
+        self.progress_display.set_status(f"Downloading {len(items)} items...")
+        self._submit_items(items)
+    
+    def _get_engine(self) -> DownloadEngine:
+        if self.engine is None:
+            self.engine = DownloadEngine.from_config(self.config, self.downloader, self.gui_output)
+            self.engine.on_job_finished.append(self._handle_job_finished)
+            self.engine.start()
+        return self.engine
+    
+    def _submit_items(self, items):
+        """Hand items to the download engine from a feeder thread (submit blocks while the engine queue is full)"""
+        engine = self._get_engine()
+        with self._jobs_lock:
+            for item in items:
+                self.item_jobs[item.job_id] = None
+        self._update_button_states()
         
-        def download_worker():
-            self.root.after(0, self._update_button_states)
-            
-            for item in self.download_queue.download_queue:
-                if item.status == "Queued":
-                    self.current_download = item
-                    self.root.after(0, lambda: self.progress_display.set_status(f"Downloading: {item.url}"))
-                    self.root.after(0, self._update_button_states)
-                    
-                    item.status = "Downloading"
-                    self.root.after(0, self.download_queue.update_all_items)
-                    
-                    success = self.downloader.download(item.url, item.output_dir or None, item.quality)
-                    
-                    if success:
-                        item.status = "Complete"
-                        item.progress = 100
+        def feed():
+            for item in items:
+                with self._jobs_lock:
+                    if item.job_id not in self.item_jobs:
+                        # Removed before it was submitted
+                        continue
+                job = engine.submit(item.url, item.output_dir or None, item.quality)
+                
+                with self._jobs_lock:
+                    if job is not None:
+                        if item.job_id in self.item_jobs:
+                            self.item_jobs[item.job_id] = job.id
+                            self.active_jobs[job.id] = item
+                            self.batch.add(job.id, item.size_bytes)
+                            finished = self._unclaimed.pop(job.id, None)
+                        else:
+                            finished = None
                     else:
-                        item.status = "Failed"
-                    
-                    self.root.after(0, self.download_queue.update_all_items)
-                    self.root.after(0, self._update_button_states)
-            
-            self.current_download = None
-            self.root.after(0, lambda: self.progress_display.set_status("All downloads completed"))
-            self.root.after(0, lambda: self.progress_display.reset_progress())
-            self.root.after(0, self._update_button_states)
+                        self.item_jobs.pop(item.job_id, None)
+                
+                if job is None:
+                    # Already downloaded
+                    item.progress = 100
+                    self.download_queue.set_item_status(item, ItemStatus.COMPLETE)
+                    self.pump.mark_dirty(item)
+                elif item.job_id not in self.item_jobs:
+                    engine.cancel(job.id)
+                    with self._jobs_lock:
+                        self._unclaimed.pop(job.id, None)
+                elif finished is not None:
+                    self._handle_job_finished(finished)
+            self.pump.call_latest("buttons", self._update_button_states)
+        
+        threading.Thread(target=feed, name="ytdl-gui-feeder", daemon=True).start()
+    
+    def _handle_job_finished(self, job: Job):
+        """Engine callback when a job ends (called on an engine worker thread)"""
+        with self._jobs_lock:
+            item = self.active_jobs.pop(job.id, None)
+            if item is None:
+                self._unclaimed[job.id] = job
+                return
+            self.item_jobs.pop(item.job_id, None)
+            idle = not self.item_jobs
+        
+        item.speed = item.eta = None
+        if job.status == JobStatus.DONE:
+            item.progress = 100
+            self.download_queue.set_item_status(item, ItemStatus.COMPLETE)
+        elif job.status == JobStatus.FAILED:
+            item.error_message = job.error or "Download failed"
+            self.download_queue.set_item_status(item, ItemStatus.FAILED)
+        else:
+            self.download_queue.set_item_status(item, ItemStatus.CANCELLED)
+        
+        if job.status == JobStatus.CANCELLED:
+            self.batch.remove(job.id)
+        elif job.status == JobStatus.FAILED:
+            self.batch.finish(job.id, f"{item.title if item.title != 'Unknown' else item.url}: {item.error_message}")
+        else:
+            self.batch.finish(job.id)
         
-        threading.Thread(target=download_worker, daemon=True).start()
+        self.pump.mark_dirty(item)
+        self.pump.call_latest("buttons", self._update_button_states)
+        if idle:
+            failed = len(self.batch.failures)
+            if failed:
+                self.pump.call_latest("status", self.progress_display.set_status,
+                                      f"Downloads finished, {failed} failed")
+                # One dialog for the whole batch; each failed row shows its own error
+                self.pump.call(self._show_error, "Downloads Failed", self.batch.failure_summary())
+            else:
+                self.pump.call_latest("status", self.progress_display.set_status, "All downloads completed")
+            self.pump.call_latest("progress", self.progress_display.reset_progress)
+        else:
+            self.pump.call_latest("progress", self._show_batch_progress)
+    
+    def _cancel_item(self, item: DownloadItem) -> bool:
+        """Withdraw an item from the engine, stopping it if it's running
+
+        Returns:
+            True if the item was withdrawn before reaching the engine
+        """
+        with self._jobs_lock:
+            if item.job_id not in self.item_jobs:
+                return False
+            job_id = self.item_jobs[item.job_id]
+            if job_id is None:
+                # The feeder skips it
+                del self.item_jobs[item.job_id]
+                return True
+        self.engine.cancel(job_id)
+        return False
+    
+    def _selected_engine_job(self) -> Optional[int]:
+        """Engine job ID of the selected item, if it's been submitted"""
+        item = self.download_queue.get_selected_item()
+        return self.item_jobs.get(item.job_id) if item else None
+    
+    def _toggle_pause_selected(self):
+        """Pause the selected download, or resume it if paused"""
+        item = self.download_queue.get_selected_item()
+        job_id = self._selected_engine_job()
+        if job_id is None:
+            return
+        if item.status == ItemStatus.PAUSED:
+            if self.engine.resume(job_id):
+                self.download_queue.set_item_status(item, ItemStatus.DOWNLOADING)
+        elif self.engine.pause(job_id):
+            item.speed = item.eta = None
+            self.download_queue.set_item_status(item, ItemStatus.PAUSED)
+        self.pump.mark_dirty(item)
+        self._update_button_states()
+    
+    def _cancel_selected(self):
+        """Cancel the selected item's download; partial files are deleted"""
+        item = self.download_queue.get_selected_item()
+        if item is None:
+            return
+        if self._cancel_item(item):
+            self.download_queue.set_item_status(item, ItemStatus.CANCELLED)
+            self.pump.mark_dirty(item)
+        self._update_button_states()
     
     def _clear_queue(self):
         """Clear the download queue"""
+        if self._import_cancel:
+            self._import_cancel.set()
+        self.metadata_pool.cancel_all()
+        for item in list(self.active_jobs.values()):
+            self._cancel_item(item)
+        with self._jobs_lock:
+            for item_id in [i for i, job_id in self.item_jobs.items() if job_id is None]:
+                del self.item_jobs[item_id]
         self.download_queue.clear_queue()
         self.progress_display.set_status("Queue cleared")
         self._update_button_states()
     
     def _remove_selected(self):
         """Remove selected item from queue"""
+        item = self.download_queue.get_selected_item()
+        if item:
+            self.metadata_pool.cancel(item.job_id)
+            self._cancel_item(item)
         if self.download_queue.remove_selected_item():
             self._update_button_states()
     
@@ -310,33 +529,83 @@ class GUIService:
         """Update button states based on current state"""
         has_queue = self.download_queue.has_items()
         has_selection = self.download_queue.has_selection()
-        is_downloading = self.current_download is not None
+        is_downloading = bool(self.item_jobs)
         pending_items = self.download_queue.count_pending_items()
         
-        self.control_buttons.update_button_states(has_queue, has_selection, is_downloading, pending_items)
+        item = self.download_queue.get_selected_item()
+        submitted = item is not None and item.job_id in self.item_jobs
+        status = item.status if submitted else None
+        self.control_buttons.update_button_states(
+            has_queue, has_selection, is_downloading, pending_items,
+            can_pause=CAN_PAUSE and status == ItemStatus.DOWNLOADING,
+            is_paused=status == ItemStatus.PAUSED,
+            can_cancel=submitted)
     
     def _handle_info_message(self, message: str):
-        """Handle info messages from downloader"""
-        self.progress_display.set_status(message)
+        """Handle info messages from downloader (may be called off the main thread)"""
+        self.pump.call_latest("status", self.progress_display.set_status, message)
     
     def _handle_error_message(self, message: str):
-        """Handle error messages from downloader"""
-        messagebox.showerror("Download Error", message)
-    
-    def _handle_progress_update(self, message: str):
-        """Handle progress updates from downloader"""
-        # Parse progress from yt-dlp output
-        percentage_match = re.search(r'(\d+(?:\.\d+)?)%', message)
-        if percentage_match:
-            progress = float(percentage_match.group(1))
-            self.progress_display.set_progress(progress)
-            
-            if self.current_download:
-                self.current_download.progress = progress
-                self.download_queue.update_all_items()
+        """Handle error messages from downloader (may be called off the main thread)
+
+        Shown in the status bar; failed items show their error in their row,
+        and the batch's failures are summed up once it finishes.
+        """
+        self.pump.call_latest("status", self.progress_display.set_status, f"Error: {message}")
+    
+    def _show_error(self, title: str, message: str):
+        """Show an error dialog once the current pump frame is done
+
+        A modal dialog run inside the pump's frame would hold up all other
+        UI updates until it is closed.
+        """
+        self.root.after_idle(messagebox.showerror, title, message)
+    
+    def _handle_progress_update(self, event: ProgressEvent):
+        """Handle progress events from the downloader (called off the main thread)"""
+        item = self.active_jobs.get(event.job)
+        if item is None:
+            return
+        item.progress = event.percent
+        item.speed = event.speed
+        item.eta = event.eta
+        if item.status == ItemStatus.QUEUED:
+            self.download_queue.set_item_status(item, ItemStatus.DOWNLOADING)
         
+        # Streams finished so far plus the size of the current one
+        expected = None
+        if event.total_bytes:
+            expected = event.written - (event.downloaded_bytes or 0) + event.total_bytes
+        self.batch.update(event.job, event.written, max(expected or 0, item.size_bytes or 0))
+        
+        self.pump.mark_dirty(item)
+        self.pump.call_latest("progress", self._show_batch_progress)
+    
+    def _handle_stage_event(self, event: StageEvent):
+        """Mark items as downloading when their job starts (called off the main thread)"""
+        item = self.active_jobs.get(event.job)
+        if item is not None and item.status == ItemStatus.QUEUED:
+            self.download_queue.set_item_status(item, ItemStatus.DOWNLOADING)
+            self.pump.mark_dirty(item)
+            self.pump.call_latest("buttons", self._update_button_states)
+    
+    def _show_batch_progress(self):
+        """Show aggregate bytes of the running batch in the progress bar"""
+        detail = None
+        if self.batch.expected:
+            detail = (f"{self.batch.finished} of {self.batch.total} done, "
+                      f"{format_file_size(self.batch.written)} of {format_file_size(self.batch.expected)}")
+        self.progress_display.set_progress(self.batch.percent, detail)
+    
+    def _handle_output_line(self, event: LogEvent):
+        """Handle raw yt-dlp output lines (called off the main thread)"""
+        item = self.active_jobs.get(event.job)
+        if item is not None and item.title == "Unknown":
+            self.pump.call(self._extract_title, item, event.message)
+    
+    def _extract_title(self, item: DownloadItem, message: str):
         # Parse video title from yt-dlp output as fallback
-        if self.current_download and self.current_download.title == "Unknown":
+        if item.title == "Unknown":
             title_patterns = [
                 r'\[download\] Downloading video: (.+)',
                 r'\[download\] (.+?)(?:\s+\[|$)',
@@ -352,9 +621,18 @@ class GUIService:
                         not extracted_title.startswith(('http', 'www.', 'Destination')) and
                         len(extracted_title) > 5 and
                         not extracted_title.endswith(('.m4a', '.mp4', '.mp3', '.webm'))):
-                        self._update_item_metadata(self.current_download, extracted_title)
+                        self._update_item_metadata(item, extracted_title)
                         break
     
     def run(self):
         """Start the GUI application"""
-        self.root.mainloop()
\ No newline at end of file
+        try:
+            self.root.mainloop()
+        finally:
+            self.metadata_pool.shutdown()
+            if self.engine:
+                # yt-dlp runs in its own session and would outlive the window;
+                # cancel running and queued jobs so their processes and partial files go
+                self.engine.shutdown(wait=False)
+            if self.thumbnails:
+                self.thumbnails.shutdown()
\ No newline at end of file
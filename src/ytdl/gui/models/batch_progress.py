@@ -0,0 +1,95 @@
+"""Aggregate progress of a batch of downloads"""
+
+import threading
+from typing import Dict, List, Optional
+
+# Failures listed by name in the end-of-batch summary
+SUMMARY_FAILURES_SHOWN = 5
+
+
+class BatchProgress:
+    """Bytes written and expected across all jobs of a batch
+
+    Updated from download threads with each job's running totals; the
+    sums are adjusted incrementally, so an update costs the same however
+    many jobs are running.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # job -> [written, expected]
+        self._jobs: Dict[int, List[int]] = {}
+        self.written = 0
+        self.expected = 0
+        self.finished = 0
+        # "title: error" for each failed job, in the order they failed
+        self.failures: List[str] = []
+
+    def add(self, job: int, expected: Optional[int] = None):
+        """Add a job, with its size if known"""
+        with self._lock:
+            if job not in self._jobs:
+                self._jobs[job] = [0, 0]
+            self._set(job, 0, expected or 0)
+
+    def update(self, job: int, written: int, expected: Optional[int] = None):
+        """Record a job's bytes written so far and its expected total"""
+        with self._lock:
+            if job in self._jobs:
+                self._set(job, written, max(expected or 0, written, self._jobs[job][1]))
+
+    def finish(self, job: int, failure: Optional[str] = None):
+        """Mark a job done; whatever it wrote is now its total
+
+        Args:
+            job: The job
+            failure: Description of the failure, if the job failed
+        """
+        with self._lock:
+            if job in self._jobs:
+                written = self._jobs[job][0]
+                self._set(job, written, written)
+                self.finished += 1
+                if failure is not None:
+                    self.failures.append(failure)
+
+    def remove(self, job: int):
+        """Drop a job that won't run"""
+        with self._lock:
+            if job in self._jobs:
+                self._set(job, 0, 0)
+                del self._jobs[job]
+
+    def reset(self):
+        """Start a new batch"""
+        with self._lock:
+            self._jobs = {}
+            self.written = self.expected = self.finished = 0
+            self.failures = []
+
+    @property
+    def total(self) -> int:
+        """Number of jobs in the batch"""
+        return len(self._jobs)
+
+    def failure_summary(self) -> str:
+        """Text for one dialog listing the batch's failures"""
+        with self._lock:
+            failures = list(self.failures)
+        lines = [f"{len(failures)} of {self.total} downloads failed:", ""]
+        lines.extend(failures[:SUMMARY_FAILURES_SHOWN])
+        if len(failures) > SUMMARY_FAILURES_SHOWN:
+            lines.append(f"...and {len(failures) - SUMMARY_FAILURES_SHOWN} more")
+        return "\n".join(lines)
+
+    @property
+    def percent(self) -> float:
+        with self._lock:
+            return 100.0 * self.written / self.expected if self.expected else 0.0
+
+    def _set(self, job: int, written: int, expected: int):
+        """Replace a job's totals. Caller holds the lock."""
+        entry = self._jobs[job]
+        self.written += written - entry[0]
+        self.expected += expected - entry[1]
+        entry[0], entry[1] = written, expected
@@ -1,44 +1,75 @@
 """Download item model for GUI"""
 
+import sys
 from typing import Optional
 
-try:
-    from PIL import Image
-    HAS_PILLOW = True
-except ImportError:
-    HAS_PILLOW = False
+from ..utils.gui_utils import format_file_size
+
+
+class ItemStatus:
+    """Download item states; items share these constants instead of holding their own strings"""
+    QUEUED = "Queued"
+    DOWNLOADING = "Downloading"
+    PAUSED = "Paused"
+    CANCELLED = "Cancelled"
+    COMPLETE = "Complete"
+    FAILED = "Failed"
+
+
+UNKNOWN = "Unknown"
 
 
 class DownloadItem:
-    """Represents a single download item in the queue"""
-    
+    """Represents a single download item in the queue
+
+    Kept small so very large queues fit in memory: attributes live in
+    slots, repeated strings (quality, output folder, channel) are interned,
+    sizes are raw byte counts formatted only for display, and thumbnails
+    and full video info are kept in caches rather than on the item.
+    """
+
+    __slots__ = ("url", "quality", "output_dir", "status", "progress", "speed", "eta", "title",
+                 "channel", "size_bytes", "error_message", "thumbnail_url", "metadata_loaded", "job_id")
+
     def __init__(self, url: str, quality: str = "best", output_dir: str = ""):
         self.url = url
-        self.quality = quality
-        self.output_dir = output_dir
-        self.status = "Queued"
+        self.quality = sys.intern(quality)
+        self.output_dir = sys.intern(output_dir)
+        self.status = ItemStatus.QUEUED
         self.progress = 0
-        self.title = "Unknown"
-        self.channel = "Unknown"
-        self.file_size = "Unknown"
+        # Live transfer rate and time left while downloading
+        self.speed: Optional[str] = None
+        self.eta: Optional[str] = None
+        self.title = UNKNOWN
+        self.channel = UNKNOWN
+        self.size_bytes: Optional[int] = None
         self.error_message = ""
         self.thumbnail_url: Optional[str] = None
-        self.thumbnail_image = None  # PIL Image for display
-        self.tree_item_id: Optional[str] = None  # Store reference to GUI tree item
-    
+        self.metadata_loaded = False
+        self.job_id: Optional[int] = None  # Assigned by the queue model
+
+    @property
+    def file_size(self) -> str:
+        """Human-readable file size"""
+        return format_file_size(self.size_bytes)
+
     def update_title(self, title: str):
         """Update the title of this download item"""
         if title and title.strip():
             self.title = title.strip()
-    
-    def update_metadata(self, title: str = None, channel: str = None, file_size: str = None):
+
+    def update_metadata(self, title: str = None, channel: str = None, size_bytes: Optional[int] = None,
+                        thumbnail_url: Optional[str] = None):
         """Update multiple metadata fields"""
+        self.metadata_loaded = True
+        if thumbnail_url:
+            self.thumbnail_url = thumbnail_url
         if title and title.strip():
             self.title = title.strip()
         if channel and channel.strip():
-            self.channel = channel.strip()
-        if file_size and file_size.strip():
-            self.file_size = file_size.strip()
-    
+            self.channel = sys.intern(channel.strip())
+        if size_bytes:
+            self.size_bytes = int(size_bytes)
+
     def __str__(self):
-        return f"{self.title} ({self.status})"
\ No newline at end of file
+        return f"{self.title} ({self.status})"
@@ -0,0 +1,206 @@
+"""Download queue model"""
+
+import itertools
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from ...core.urls import url_key
+from .download_item import DownloadItem
+
+# Removed slots are compacted away once there are this many and they outnumber live items
+COMPACT_MIN_DEAD = 1024
+
+
+class _LiveIndex:
+    """Fenwick tree counting live slots, for row <-> slot mapping in O(log n)"""
+
+    def __init__(self, size: int = 0):
+        # 1-based; every slot starts live
+        self._tree = [0] * (size + 1)
+        for i in range(1, size + 1):
+            self._tree[i] += 1
+            parent = i + (i & -i)
+            if parent <= size:
+                self._tree[parent] += self._tree[i]
+
+    def append(self):
+        """Add a live slot at the end"""
+        i = len(self._tree)
+        # Node i covers slots (i - lowbit(i), i]
+        self._tree.append(1 + self.prefix(i - 1) - self.prefix(i - (i & -i)))
+
+    def remove(self, slot: int):
+        """Mark a slot as removed"""
+        i = slot + 1
+        while i < len(self._tree):
+            self._tree[i] -= 1
+            i += i & -i
+
+    def prefix(self, n: int) -> int:
+        """Number of live slots among the first n"""
+        total = 0
+        while n > 0:
+            total += self._tree[n]
+            n -= n & -n
+        return total
+
+    def find(self, row: int) -> int:
+        """Slot holding the row-th live item (0-based)"""
+        pos = 0
+        remaining = row + 1
+        bit = 1 << (len(self._tree) - 1).bit_length()
+        while bit:
+            nxt = pos + bit
+            if nxt < len(self._tree) and self._tree[nxt] < remaining:
+                pos = nxt
+                remaining -= self._tree[nxt]
+            bit >>= 1
+        return pos
+
+
+class QueueModel:
+    """Ordered download items keyed by job ID
+
+    Lookup and removal by job ID are O(1) and O(log n); positional access
+    for a visible window of rows is O(log n + rows), so views can show a
+    slice of a very large queue without walking it. Items are also indexed
+    by URL key (extractor and video ID) for duplicate checks, and counted per status;
+    status changes must go through set_status() to keep the counts right.
+    """
+
+    def __init__(self):
+        self._slots: List[Optional[DownloadItem]] = []
+        self._slot_of: Dict[int, int] = {}
+        self._live = _LiveIndex()
+        self._ids = itertools.count(1)
+        self._by_key: Dict[str, int] = {}
+        self._status_counts: Dict[str, int] = {}
+        # Status changes come from download threads
+        self._lock = threading.Lock()
+
+    def add(self, item: DownloadItem) -> int:
+        """Append an item and assign its job ID"""
+        with self._lock:
+            self._append(item, url_key(item.url))
+        return item.job_id
+
+    def add_many(self, items: Iterable[DownloadItem]) -> List[DownloadItem]:
+        """Append the items that aren't queued yet, in one locked pass
+
+        Returns:
+            The items added; duplicates of queued items (or of each other)
+            are left out
+        """
+        added = []
+        with self._lock:
+            for item in items:
+                key = url_key(item.url)
+                if key in self._by_key:
+                    continue
+                self._append(item, key)
+                added.append(item)
+        return added
+
+    def _append(self, item: DownloadItem, key: str):
+        """Add an item at the end and index it. Caller holds the lock."""
+        item.job_id = next(self._ids)
+        self._slot_of[item.job_id] = len(self._slots)
+        self._slots.append(item)
+        self._live.append()
+        self._by_key[key] = item.job_id
+        self._count(item.status, 1)
+
+    def find(self, url: str) -> Optional[DownloadItem]:
+        """Find a queued item for the same video (or the same URL)"""
+        job_id = self._by_key.get(url_key(url))
+        return None if job_id is None else self.get(job_id)
+
+    def set_status(self, item: DownloadItem, status: str):
+        """Change an item's status and update the per-status counts"""
+        with self._lock:
+            if item.job_id in self._slot_of:
+                self._count(item.status, -1)
+                self._count(status, 1)
+            item.status = status
+
+    def count(self, status: str) -> int:
+        """Number of items with a status"""
+        return self._status_counts.get(status, 0)
+
+    def _count(self, status: str, delta: int):
+        """Adjust a status count. Caller holds the lock."""
+        self._status_counts[status] = self._status_counts.get(status, 0) + delta
+
+    def get(self, job_id: int) -> Optional[DownloadItem]:
+        """Look up an item by job ID"""
+        slot = self._slot_of.get(job_id)
+        return None if slot is None else self._slots[slot]
+
+    def remove(self, job_id: int) -> Optional[DownloadItem]:
+        """Remove an item by job ID"""
+        with self._lock:
+            slot = self._slot_of.pop(job_id, None)
+            if slot is None:
+                return None
+            item = self._slots[slot]
+            self._slots[slot] = None
+            self._live.remove(slot)
+            self._unindex(item)
+            self._count(item.status, -1)
+            self._maybe_compact()
+        return item
+
+    def clear(self):
+        """Remove all items"""
+        with self._lock:
+            self._slots = []
+            self._slot_of = {}
+            self._live = _LiveIndex()
+            self._by_key = {}
+            self._status_counts = {}
+
+    def _unindex(self, item: DownloadItem):
+        """Drop an item's URL key entry. Caller holds the lock."""
+        key = url_key(item.url)
+        if self._by_key.get(key) == item.job_id:
+            del self._by_key[key]
+
+    def row_of(self, job_id: int) -> Optional[int]:
+        """Current row (position) of an item"""
+        slot = self._slot_of.get(job_id)
+        return None if slot is None else self._live.prefix(slot)
+
+    def at(self, row: int) -> Optional[DownloadItem]:
+        """Item at a row"""
+        if not 0 <= row < len(self):
+            return None
+        return self._slots[self._live.find(row)]
+
+    def window(self, start: int, count: int) -> List[DownloadItem]:
+        """Items in rows [start, start + count)"""
+        if count <= 0 or start >= len(self):
+            return []
+        items = []
+        slot = self._live.find(max(0, start))
+        while slot < len(self._slots) and len(items) < count:
+            item = self._slots[slot]
+            if item is not None:
+                items.append(item)
+            slot += 1
+        return items
+
+    def _maybe_compact(self):
+        dead = len(self._slots) - len(self._slot_of)
+        if dead >= COMPACT_MIN_DEAD and dead > len(self._slot_of):
+            self._slots = [item for item in self._slots if item is not None]
+            self._slot_of = {item.job_id: slot for slot, item in enumerate(self._slots)}
+            self._live = _LiveIndex(len(self._slots))
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __iter__(self) -> Iterator[DownloadItem]:
+        return (item for item in self._slots if item is not None)
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self._slot_of
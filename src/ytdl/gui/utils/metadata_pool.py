@@ -0,0 +1,195 @@
+"""Bounded pool for background metadata fetches
+
+Pasting hundreds of URLs queues hundreds of fetches, but only a fixed
+number of yt-dlp processes run at once. Requests for a video that is
+already being fetched share that fetch, and a fetch nobody is waiting for
+any more is cancelled (its yt-dlp process killed if already running).
+Bulk imports go through request_many(), which fetches several videos per
+yt-dlp call when a batch fetch is available.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from ...core.urls import url_key
+
+DEFAULT_WORKERS = 4
+DEFAULT_BATCH_SIZE = 20
+
+# fetch(url, cancel_event) -> info dict or None
+Fetch = Callable[[str, threading.Event], Optional[dict]]
+# fetch_many(urls, cancel_event) -> {url: info} for the URLs that succeeded
+FetchMany = Callable[[List[str], threading.Event], Dict[str, dict]]
+Callback = Callable[[Optional[dict]], None]
+
+
+class _Batch:
+    """Requests fetched together; cancelled once none of them is wanted"""
+
+    def __init__(self, size: int):
+        self.cancel = threading.Event()
+        self.remaining = size
+
+
+class _Request:
+    """One in-flight fetch and the owners waiting for it"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.cancel = threading.Event()
+        self.callbacks: Dict[Hashable, Callback] = {}
+        self.future: Optional[Future] = None
+        self.batch: Optional[_Batch] = None
+
+
+class MetadataPool:
+    """Runs metadata fetches on a fixed number of worker threads"""
+
+    def __init__(self, fetch: Fetch, workers: int = DEFAULT_WORKERS,
+                 fetch_many: Optional[FetchMany] = None, batch_size: int = DEFAULT_BATCH_SIZE):
+        """Create the pool.
+
+        Args:
+            fetch: Called on a worker thread with the URL and a cancel event;
+                returns the video info or None
+            workers: Maximum concurrent fetches
+            fetch_many: Called with up to batch_size URLs and a cancel event;
+                returns the info of those that succeeded, keyed by URL
+            batch_size: URLs per fetch_many call
+        """
+        self.fetch = fetch
+        self.fetch_many = fetch_many
+        self.batch_size = max(1, batch_size)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers),
+                                            thread_name_prefix="ytdl-metadata")
+        self._lock = threading.Lock()
+        self._requests: Dict[str, _Request] = {}
+        self._owner_keys: Dict[Hashable, str] = {}
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return url_key(url)
+
+    def request(self, url: str, owner: Hashable, callback: Callback):
+        """Fetch info for a URL and pass it to callback (on a worker thread).
+
+        Args:
+            url: Video URL
+            owner: Identifies the requester, for cancel(); one request per owner
+            callback: Called with the info, or None if the fetch failed
+        """
+        key = self._key(url)
+        with self._lock:
+            self._drop_owner(owner)
+            req = self._requests.get(key)
+            if req is None:
+                req = self._requests[key] = _Request(url)
+                req.future = self._executor.submit(self._run, key, req)
+            req.callbacks[owner] = callback
+            self._owner_keys[owner] = key
+
+    def request_many(self, requests: Iterable[Tuple[str, Hashable, Callback]]):
+        """Fetch info for many URLs, several per fetch_many call.
+
+        Args:
+            requests: (url, owner, callback) tuples, as for request()
+        """
+        new = []
+        with self._lock:
+            for url, owner, callback in requests:
+                key = self._key(url)
+                self._drop_owner(owner)
+                req = self._requests.get(key)
+                if req is None:
+                    req = self._requests[key] = _Request(url)
+                    new.append((key, req))
+                req.callbacks[owner] = callback
+                self._owner_keys[owner] = key
+            size = self.batch_size if self.fetch_many is not None else 1
+            for start in range(0, len(new), size):
+                group = new[start:start + size]
+                if len(group) == 1:
+                    key, req = group[0]
+                    req.future = self._executor.submit(self._run, key, req)
+                    continue
+                batch = _Batch(len(group))
+                future = self._executor.submit(self._run_batch, group, batch)
+                for _, req in group:
+                    req.batch = batch
+                    req.future = future
+
+    def cancel(self, owner: Hashable):
+        """Forget an owner's request; the fetch stops if no one else wants it"""
+        with self._lock:
+            self._drop_owner(owner)
+
+    def cancel_all(self):
+        """Cancel every pending and running fetch"""
+        with self._lock:
+            for owner in list(self._owner_keys):
+                self._drop_owner(owner)
+
+    def shutdown(self):
+        """Cancel everything and stop the worker threads"""
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def pending(self) -> int:
+        """Number of fetches queued or running"""
+        with self._lock:
+            return len(self._requests)
+
+    def _drop_owner(self, owner: Hashable):
+        """Remove an owner's callback. Caller holds the lock."""
+        key = self._owner_keys.pop(owner, None)
+        req = self._requests.get(key) if key is not None else None
+        if req is None:
+            return
+        req.callbacks.pop(owner, None)
+        if not req.callbacks:
+            del self._requests[key]
+            req.cancel.set()
+            if req.batch is None:
+                req.future.cancel()
+                return
+            req.batch.remaining -= 1
+            if not req.batch.remaining:
+                req.batch.cancel.set()
+                req.future.cancel()
+
+    def _run(self, key: str, req: _Request):
+        if req.cancel.is_set():
+            return
+        try:
+            info = self.fetch(req.url, req.cancel)
+        except Exception:
+            info = None
+        self._deliver(key, req, info)
+
+    def _run_batch(self, group: List[Tuple[str, _Request]], batch: _Batch):
+        live = [(key, req) for key, req in group if not req.cancel.is_set()]
+        if not live:
+            return
+        try:
+            found = self.fetch_many([req.url for _, req in live], batch.cancel)
+        except Exception:
+            found = {}
+        for key, req in live:
+            self._deliver(key, req, found.get(req.url))
+
+    def _deliver(self, key: str, req: _Request, info: Optional[dict]):
+        """Hand a finished fetch to everyone still waiting for it"""
+        with self._lock:
+            if self._requests.get(key) is req:
+                del self._requests[key]
+            callbacks = list(req.callbacks.values())
+            for owner in req.callbacks:
+                if self._owner_keys.get(owner) == key:
+                    del self._owner_keys[owner]
+            req.callbacks.clear()
+
+        if req.cancel.is_set():
+            return
+        for callback in callbacks:
+            callback(info)
@@ -0,0 +1,226 @@
+"""Two-tier thumbnail cache
+
+Thumbnails are downloaded, decoded and downscaled on worker threads and
+stored as small JPEGs in a size-capped directory that persists between
+runs. Only the Tk thread creates PhotoImages; a bounded LRU keeps the
+recently shown ones, so memory stays flat however long the queue gets.
+"""
+
+import hashlib
+import io
+import os
+import threading
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    from PIL import Image, ImageTk
+    HAS_PILLOW = True
+except ImportError:
+    HAS_PILLOW = False
+
+THUMBNAIL_SIZE = (48, 27)
+DEFAULT_MEMORY_ITEMS = 256
+DEFAULT_DISK_MB = 50
+DEFAULT_WORKERS = 2
+FETCH_TIMEOUT = 15
+CACHE_DIR_NAME = ".ytdl-thumbnails"
+
+ThumbnailCallback = Callable[[object], None]
+
+
+class DiskCache:
+    """Directory of files capped at a total size, evicting least recently used first"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # name -> size, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._total += size
+        with self._lock:
+            self._evict()
+
+    def get(self, name: str) -> Optional[bytes]:
+        """Read a cached file and mark it as recently used"""
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError:
+            with self._lock:
+                self._total -= self._entries.pop(name, 0)
+            return None
+
+    def put(self, name: str, data: bytes):
+        """Store a file, evicting old ones to stay under the size cap"""
+        path = os.path.join(self.directory, name)
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            return
+        with self._lock:
+            self._total += len(data) - self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            self._evict()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def _evict(self):
+        """Delete least recently used files over the cap. Caller holds the lock."""
+        while self._total > self.max_bytes and self._entries:
+            name, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+class ThumbnailCache:
+    """Display-sized thumbnails from memory, disk or the network"""
+
+    def __init__(self, cache_dir: str, deliver: Callable[..., None],
+                 max_disk_bytes: int = DEFAULT_DISK_MB * 1024 * 1024,
+                 memory_items: int = DEFAULT_MEMORY_ITEMS,
+                 size: Tuple[int, int] = THUMBNAIL_SIZE, workers: int = DEFAULT_WORKERS):
+        """Create the cache.
+
+        Args:
+            cache_dir: Directory for the on-disk tier
+            deliver: deliver(fn, *args) runs fn on the Tk thread (e.g. UpdatePump.call)
+            max_disk_bytes: Size cap of the on-disk tier
+            memory_items: Number of PhotoImages kept in memory
+            size: Maximum thumbnail width and height
+            workers: Threads for fetching and decoding
+        """
+        self.disk = DiskCache(cache_dir, max_disk_bytes)
+        self.deliver = deliver
+        self.memory_items = memory_items
+        self.size = size
+        self._memory: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._waiting: Dict[str, List[ThumbnailCallback]] = {}
+        self._failed: Set[str] = set()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers),
+                                            thread_name_prefix="ytdl-thumbnail")
+
+    @classmethod
+    def from_config(cls, config, deliver: Callable[..., None]) -> Optional['ThumbnailCache']:
+        """Create the cache from config, or None without Pillow or with thumbnail_cache_mb at 0."""
+        max_mb = float(config.get("thumbnail_cache_mb", DEFAULT_DISK_MB))
+        if not HAS_PILLOW or max_mb <= 0:
+            return None
+        cache_dir = config.get("thumbnail_cache_dir") or os.path.join(config.download_dir, CACHE_DIR_NAME)
+        try:
+            return cls(cache_dir, deliver, int(max_mb * 1024 * 1024))
+        except OSError:
+            return None
+
+    def get(self, url: str) -> Optional[object]:
+        """Thumbnail already in memory (Tk thread only)"""
+        image = self._memory.get(url)
+        if image is not None:
+            self._memory.move_to_end(url)
+        return image
+
+    def request(self, url: str, callback: ThumbnailCallback):
+        """Load a thumbnail in the background; callback gets it on the Tk thread.
+
+        Requests for a URL that is already loading share the load, and URLs
+        that failed once aren't retried this session.
+        """
+        image = self.get(url)
+        if image is not None:
+            callback(image)
+            return
+        with self._lock:
+            if url in self._failed:
+                return
+            if url in self._waiting:
+                self._waiting[url].append(callback)
+                return
+            self._waiting[url] = [callback]
+        self._executor.submit(self._load, url)
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _cache_name(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest() + ".jpg"
+
+    def _load(self, url: str):
+        """Worker: get a downscaled image from disk or the network"""
+        try:
+            name = self._cache_name(url)
+            data = self.disk.get(name)
+            if data is None:
+                data = self._prepare(self._fetch(url))
+                self.disk.put(name, data)
+            image = self._decode(data)
+        except Exception:
+            with self._lock:
+                self._waiting.pop(url, None)
+                self._failed.add(url)
+            return
+        self.deliver(self._store, url, image)
+
+    def _fetch(self, url: str) -> bytes:
+        with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT) as response:
+            return response.read()
+
+    def _prepare(self, data: bytes) -> bytes:
+        """Downscale a fetched image and encode it for the disk tier"""
+        image = Image.open(io.BytesIO(data))
+        image.thumbnail(self.size)
+        out = io.BytesIO()
+        image.convert("RGB").save(out, "JPEG", quality=85)
+        return out.getvalue()
+
+    def _decode(self, data: bytes) -> object:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+        return image
+
+    def _to_photo(self, image: object) -> object:
+        return ImageTk.PhotoImage(image)
+
+    def _store(self, url: str, image: object):
+        """Tk thread: turn the image into a PhotoImage and hand it out"""
+        photo = self._to_photo(image)
+        self._memory[url] = photo
+        self._memory.move_to_end(url)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+        with self._lock:
+            callbacks = self._waiting.pop(url, [])
+        for callback in callbacks:
+            callback(photo)
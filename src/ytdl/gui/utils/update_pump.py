@@ -0,0 +1,91 @@
+"""Coalescing UI update pump
+
+Worker threads never touch Tk directly. They post calls and mark items
+dirty; a single Tk timer drains everything posted since the last frame,
+runs only the latest call per key and re-renders each dirty item once.
+"""
+
+import sys
+import threading
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+DEFAULT_FPS = 20
+
+
+class UpdatePump:
+    """Batches UI work from any thread into one Tk timer callback per frame"""
+
+    def __init__(self, root, render_dirty: Optional[Callable[[List[object]], None]] = None,
+                 fps: int = DEFAULT_FPS):
+        """Create the pump.
+
+        Args:
+            root: Tk root (only its after() method is used)
+            render_dirty: Called on the Tk thread with the items marked dirty
+                since the last frame
+            fps: Frames per second
+        """
+        self.root = root
+        self.render_dirty = render_dirty
+        self.interval_ms = max(1, int(1000 / fps))
+        self._lock = threading.Lock()
+        # Call order is kept; a keyed call replaces an earlier one with the same key
+        self._calls: Dict[Hashable, Tuple[Callable, tuple]] = {}
+        self._dirty: Dict[int, object] = {}
+        self._sequence = 0
+        self._timer = None
+        self._running = False
+
+    def start(self):
+        """Start the frame timer"""
+        if not self._running:
+            self._running = True
+            self._timer = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        """Stop the frame timer"""
+        self._running = False
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+            self._timer = None
+
+    def call(self, fn: Callable, *args):
+        """Run fn(*args) on the Tk thread in the next frame"""
+        with self._lock:
+            self._sequence += 1
+            self._calls[("call", self._sequence)] = (fn, args)
+
+    def call_latest(self, key: Hashable, fn: Callable, *args):
+        """Like call(), but only the last call posted with this key per frame runs"""
+        with self._lock:
+            self._calls[("latest", key)] = (fn, args)
+
+    def mark_dirty(self, item: object):
+        """Re-render an item in the next frame"""
+        with self._lock:
+            self._dirty[id(item)] = item
+
+    def _tick(self):
+        self.flush()
+        if self._running:
+            self._timer = self.root.after(self.interval_ms, self._tick)
+
+    def flush(self):
+        """Run pending calls and render dirty items now (Tk thread only)"""
+        with self._lock:
+            calls, self._calls = self._calls, {}
+            dirty, self._dirty = self._dirty, {}
+
+        for fn, args in calls.values():
+            self._run(fn, *args)
+        if dirty and self.render_dirty:
+            self._run(self.render_dirty, list(dirty.values()))
+
+    def _run(self, fn: Callable, *args):
+        try:
+            fn(*args)
+        except Exception:
+            # Keep the pump alive; report like Tk does for callback errors
+            report = getattr(self.root, "report_callback_exception", None)
+            if report:
+                report(*sys.exc_info())
@@ -0,0 +1,37 @@
+"""Streaming URL import for bulk adds
+
+Pasted text and imported files are scanned a line at a time, so a list
+of tens of thousands of URLs is never parsed in one go. URLs come out in
+chunks, without duplicates of earlier ones, for the GUI to insert into
+the queue one chunk per frame.
+"""
+
+from typing import Iterable, Iterator, List, Set
+
+from ...core.urls import find_urls, url_key
+
+IMPORT_CHUNK = 500
+
+
+def iter_url_chunks(lines: Iterable[str], chunk_size: int = IMPORT_CHUNK) -> Iterator[List[str]]:
+    """Yield the URLs found in text lines, chunk_size at a time
+
+    Lines starting with # are comments, as in batch files. A URL for a
+    video that appeared earlier in the input is dropped.
+    """
+    seen: Set[str] = set()
+    chunk: List[str] = []
+    for line in lines:
+        if line.lstrip().startswith("#"):
+            continue
+        for url in find_urls(line):
+            key = url_key(url)
+            if key in seen:
+                continue
+            seen.add(key)
+            chunk.append(url)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
@@ -77,7 +77,10 @@ def main():
             # Error dialog already shown in validate_binary function
             return 1
         
-        downloader = DownloaderService(config, logger)
+        downloader = DownloaderService.from_config(config, logger)
+        if downloader.library is not None:
+            # Lookups wait for the scan; the window opens right away
+            downloader.library.scan_in_background()
         
         # Create and run GUI
         gui = GUIService(config, downloader, logger)
@@ -4,18 +4,39 @@ from ytdl.core.config import ConfigService
 from ytdl.core.downloader import DownloaderService
 from ytdl.core.cli import CLIService
 from ytdl.core.logger import LoggerService
+from ytdl.core.progress import ProgressRenderer
+from ytdl.core.events import JsonEventWriter
+from ytdl.core.processes import interrupt_on_termination
 
 
 def main():
+    # Killed or hung up: cancel downloads as on Ctrl+C instead of orphaning yt-dlp
+    interrupt_on_termination()
     config = ConfigService()
+    # With --json-events stdout carries only events; log messages go to stderr
+    json_events = "--json-events" in sys.argv[1:]
     logger = LoggerService(
         level=config.get("log_level", "INFO"),
-        log_file=config.get("log_file")
+        log_file=config.get("log_file"),
+        console_stream=sys.stderr if json_events else None
     )
-    downloader = DownloaderService(config, logger)
-    cli = CLIService(config, downloader, logger)
+    # All console output goes through the renderer so it prints above the progress bars
+    progress = ProgressRenderer(mode="off") if json_events else ProgressRenderer.from_config(config)
+    output = progress.wrap(logger)
+    events = JsonEventWriter.from_config(config) if json_events else None
+    downloader = DownloaderService.from_config(config, output, progress=progress, events=events)
+    if downloader.library is not None:
+        # Incremental: only directories that changed since the last run are re-read.
+        # Commands that never check the index (e.g. --info) don't wait for it.
+        downloader.library.scan_in_background()
+    cli = CLIService(config, downloader, output)
     
-    return cli.run()
+    try:
+        return cli.run()
+    finally:
+        # Deliver queued events (e.g. the JSON stream) before exiting
+        downloader.bus.close()
+        progress.close()
 
 
 if __name__ == "__main__":
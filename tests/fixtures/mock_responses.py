@@ -44,4 +44,23 @@ FULL_CONFIG = {
     "log_file": "ytdl.log"
 }
 
-INVALID_CONFIG_JSON = '{"download_dir": "downloads", "quality":}'  # Malformed JSON
\ No newline at end of file
+INVALID_CONFIG_JSON = '{"download_dir": "downloads", "quality":}'  # Malformed JSON
+
+# Mock yt-dlp info JSON with a format list (for format planning)
+MOCK_FORMATS_INFO = {
+    "id": "test123",
+    "title": "Test Video Title",
+    "duration": 180,
+    "formats": [
+        {"format_id": "sb0", "ext": "mhtml", "vcodec": "none", "acodec": "none"},
+        {"format_id": "140", "ext": "m4a", "vcodec": "none", "acodec": "mp4a.40.2", "abr": 129, "filesize": 2900000},
+        {"format_id": "251", "ext": "webm", "vcodec": "none", "acodec": "opus", "abr": 135, "filesize": 3000000},
+        {"format_id": "18", "ext": "mp4", "vcodec": "avc1.42001E", "acodec": "mp4a.40.2", "height": 360, "filesize": 9000000},
+        {"format_id": "134", "ext": "mp4", "vcodec": "avc1.4d401e", "acodec": "none", "height": 360, "filesize": 6000000},
+        {"format_id": "22", "ext": "mp4", "vcodec": "avc1.64001F", "acodec": "mp4a.40.2", "height": 720, "filesize_approx": 30000000},
+        {"format_id": "136", "ext": "mp4", "vcodec": "avc1.4d401f", "acodec": "none", "height": 720, "filesize": 25000000},
+        {"format_id": "247", "ext": "webm", "vcodec": "vp9", "acodec": "none", "height": 720, "tbr": 1000},
+        {"format_id": "137", "ext": "mp4", "vcodec": "avc1.640028", "acodec": "none", "height": 1080, "filesize": 50000000},
+        {"format_id": "248", "ext": "webm", "vcodec": "vp9", "acodec": "none", "height": 1080, "filesize": 40000000}
+    ]
+}
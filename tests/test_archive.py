@@ -0,0 +1,129 @@
+import unittest
+import os
+import tempfile
+import shutil
+from ytdl.core.archive import BloomFilter, DownloadArchive, archive_key
+from ytdl.core.downloader import CompletedDownload
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        """Test that every added key is reported present."""
+        bloom = BloomFilter(1000)
+        keys = [f"youtube id{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        self.assertTrue(all(key in bloom for key in keys))
+
+    def test_false_positive_rate_is_bounded(self):
+        """Test that absent keys are mostly rejected."""
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"youtube id{i}")
+
+        false_positives = sum(f"youtube other{i}" in bloom for i in range(10000))
+
+        self.assertLess(false_positives, 300)
+
+
+class TestDownloadArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "archive.txt")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_archive_key_format(self):
+        """Test that keys use yt-dlp's archive format."""
+        self.assertEqual(archive_key("Youtube", "dQw4w9WgXcQ"), "youtube dQw4w9WgXcQ")
+
+    def test_add_and_lookup_before_compaction(self):
+        """Test that journal entries are found immediately."""
+        archive = DownloadArchive(self.path)
+        archive.add("youtube aaa")
+
+        self.assertIn("youtube aaa", archive)
+        self.assertNotIn("youtube bbb", archive)
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+    def test_compaction_merges_sorted(self):
+        """Test that compaction produces a sorted, deduplicated file."""
+        archive = DownloadArchive(self.path, compact_threshold=1000)
+        archive.add_many(["youtube ccc", "youtube aaa"])
+        archive.compact()
+        archive.add_many(["youtube bbb", "youtube aaa", "youtube ddd"])
+        archive.compact()
+
+        with open(self.path) as f:
+            self.assertEqual(f.read().split("\n")[:-1],
+                             ["youtube aaa", "youtube bbb", "youtube ccc", "youtube ddd"])
+        self.assertEqual(os.path.getsize(self.path + ".journal"), 0)
+        self.assertEqual(len(archive), 4)
+
+    def test_lookup_by_binary_search_after_reload(self):
+        """Test lookups against the memory-mapped sorted file after reopening."""
+        archive = DownloadArchive(self.path, compact_threshold=100)
+        keys = [f"youtube {i:05d}" for i in range(250)]
+        archive.add_many(keys)
+        archive.close()
+
+        reopened = DownloadArchive(self.path)
+
+        for key in keys:
+            self.assertIn(key, reopened)
+        self.assertNotIn("youtube 99999", reopened)
+        self.assertNotIn("vimeo 00001", reopened)
+        self.assertNotIn("youtube 00000a", reopened)
+
+    def test_threshold_triggers_compaction(self):
+        """Test that reaching the journal threshold compacts automatically."""
+        archive = DownloadArchive(self.path, compact_threshold=3)
+        for key in ["youtube a", "youtube b", "youtube c"]:
+            archive.add(key)
+
+        self.assertGreater(os.path.getsize(self.path), 0)
+        self.assertEqual(os.path.getsize(self.path + ".journal"), 0)
+
+    def test_journal_survives_restart(self):
+        """Test that uncompacted entries are reloaded from the journal."""
+        archive = DownloadArchive(self.path)
+        archive.add("youtube aaa")
+
+        self.assertIn("youtube aaa", DownloadArchive(self.path))
+
+    def test_unsorted_ytdlp_archive_used_in_place(self):
+        """Test that a plain yt-dlp archive file is sorted on first open."""
+        with open(self.path, "w") as f:
+            f.write("youtube zzz\nyoutube aaa\nyoutube mmm\n")
+
+        archive = DownloadArchive(self.path)
+
+        self.assertIn("youtube aaa", archive)
+        self.assertIn("youtube zzz", archive)
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "youtube aaa\nyoutube mmm\nyoutube zzz\n")
+
+    def test_import_ytdlp_archive(self):
+        """Test importing keys from a yt-dlp archive file."""
+        source = os.path.join(self.temp_dir, "ytdlp-archive.txt")
+        with open(source, "w") as f:
+            f.write("youtube aaa\n\nyoutube bbb\n")
+        archive = DownloadArchive(self.path)
+
+        self.assertEqual(archive.import_ytdlp_archive(source), 3)
+        self.assertIn("youtube bbb", archive)
+
+    def test_completion_hook_adds_key(self):
+        """Test that finished downloads are archived."""
+        archive = DownloadArchive(self.path)
+
+        archive.record_completed(CompletedDownload("url", "abc", "Youtube", "22", "/x.mp4"))
+
+        self.assertIn("youtube abc", archive)
+
+if __name__ == '__main__':
+    unittest.main()
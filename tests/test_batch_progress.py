@@ -0,0 +1,66 @@
+import unittest
+from ytdl.gui.models.batch_progress import BatchProgress
+
+
+class TestBatchProgress(unittest.TestCase):
+
+    def setUp(self):
+        self.batch = BatchProgress()
+
+    def test_totals_follow_job_updates(self):
+        """Test that written and expected bytes are summed across jobs."""
+        self.batch.add(1, 1000)
+        self.batch.add(2)
+        self.batch.update(1, 250)
+        self.batch.update(2, 100, 500)
+        self.batch.update(2, 300, 500)
+
+        self.assertEqual(self.batch.written, 550)
+        self.assertEqual(self.batch.expected, 1500)
+        self.assertAlmostEqual(self.batch.percent, 100 * 550 / 1500)
+        self.assertEqual(self.batch.total, 2)
+
+    def test_finish_uses_written_bytes_as_total(self):
+        """Test that a finished job counts as complete even if its size estimate was off."""
+        self.batch.add(1, 1000)
+        self.batch.update(1, 900)
+        self.batch.finish(1)
+
+        self.assertEqual(self.batch.finished, 1)
+        self.assertEqual(self.batch.percent, 100.0)
+
+    def test_remove_and_reset(self):
+        """Test that removed jobs stop counting and reset starts over."""
+        self.batch.add(1, 1000)
+        self.batch.add(2, 1000)
+        self.batch.update(2, 500)
+        self.batch.remove(1)
+
+        self.assertEqual(self.batch.expected, 1000)
+        self.assertEqual(self.batch.total, 1)
+        self.batch.update(1, 100)
+        self.assertEqual(self.batch.written, 500)
+
+        self.batch.reset()
+        self.assertEqual((self.batch.written, self.batch.expected, self.batch.total), (0, 0, 0))
+        self.assertEqual(self.batch.percent, 0.0)
+
+
+    def test_failures_are_summed_up(self):
+        """Test that failures are collected for one summary and cleared on reset."""
+        for job in range(1, 9):
+            self.batch.add(job)
+        for job in range(1, 8):
+            self.batch.finish(job, f"Video {job}: Private video")
+        self.batch.finish(8)
+
+        summary = self.batch.failure_summary()
+        self.assertTrue(summary.startswith("7 of 8 downloads failed:"))
+        self.assertIn("Video 5: Private video", summary)
+        self.assertNotIn("Video 6", summary)
+        self.assertTrue(summary.endswith("...and 2 more"))
+        self.batch.reset()
+        self.assertEqual(self.batch.failures, [])
+
+if __name__ == '__main__':
+    unittest.main()
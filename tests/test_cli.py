@@ -1,9 +1,14 @@
 import unittest
 import argparse
+import io
+import os
 import sys
+import tempfile
+import threading
 from unittest.mock import patch, Mock, MagicMock
 from ytdl.core.cli import CLIService
 from ytdl.core.downloader import OutputHandler
+from ytdl.core.events import JsonEventWriter
 from tests.fixtures.mock_responses import MOCK_VIDEO_INFO
 
 
@@ -15,7 +20,11 @@ class TestCLIService(unittest.TestCase):
         self.mock_config.download_dir = "test_downloads"
         self.mock_config.quality = "best"
         
+        self.mock_config.get.side_effect = lambda key, default=None: default
+        
         self.mock_downloader = Mock()
+        self.mock_downloader.find_existing.return_value = None
+        self.mock_downloader.get_info.return_value = None
         self.mock_output = Mock(spec=OutputHandler)
         
         self.cli = CLIService(self.mock_config, self.mock_downloader, self.mock_output)
@@ -115,6 +124,23 @@ class TestCLIService(unittest.TestCase):
             quality="best"
         )
     
+    def test_run_with_json_events(self):
+        """Test that --json-events attaches an event writer to the downloader."""
+        self.mock_downloader.events = None
+        self.mock_downloader.download.return_value = True
+        
+        result = self.cli.run(["https://youtube.com/watch?v=test123", "--json-events"])
+        
+        self.assertEqual(result, 0)
+        self.assertIsInstance(self.mock_downloader.enable_json_events.call_args[0][0], JsonEventWriter)
+    
+    def test_json_events_rejected_in_interactive_mode(self):
+        """Test that the prompt can't mix with event output."""
+        result = self.cli.run(["-i", "--json-events"])
+        
+        self.assertEqual(result, 1)
+        self.mock_output.error.assert_called_with("--json-events can't be used in interactive mode")
+    
     def test_run_download_with_options(self):
         """Test download with custom options."""
         self.mock_downloader.download.return_value = True
@@ -188,6 +214,93 @@ class TestCLIService(unittest.TestCase):
         self.assertEqual(result, 1)
         self.mock_output.error.assert_called_with("Could not fetch video information")
     
+    def test_run_dedup_mode(self):
+        """Test that --dedup runs a deduplication pass without downloading."""
+        result = self.cli.run(["--dedup"])
+        
+        self.assertEqual(result, 0)
+        self.mock_downloader.deduplicator.deduplicate_tree.assert_called_once()
+        self.mock_downloader.download.assert_not_called()
+    
+    @patch('ytdl.core.cli.ChannelSync')
+    def test_run_sync_subcommand(self, mock_sync_class):
+        """Test that 'sync' syncs each source with the given options."""
+        channel_sync = mock_sync_class.from_config.return_value
+        channel_sync.sync.return_value = Mock(success=True)
+        
+        result = self.cli.run(["sync", "https://youtube.com/@a", "https://youtube.com/@b", "-q", "720p"])
+        
+        self.assertEqual(result, 0)
+        channel_sync.sync.assert_has_calls([
+            unittest.mock.call("https://youtube.com/@a", output_dir=None, quality="720p", full=False),
+            unittest.mock.call("https://youtube.com/@b", output_dir=None, quality="720p", full=False),
+        ])
+    
+    @patch('ytdl.core.cli.ChannelSync')
+    def test_run_sync_reports_failure(self, mock_sync_class):
+        """Test that a failed source gives a non-zero exit code."""
+        mock_sync_class.from_config.return_value.sync.return_value = Mock(success=False)
+        
+        self.assertEqual(self.cli.run(["sync", "https://youtube.com/@a"]), 1)
+    
+    @patch('ytdl.core.cli.FolderWatcher')
+    @patch('ytdl.core.cli.DownloadEngine')
+    def test_run_watch_subcommand(self, mock_engine_class, mock_watcher_class):
+        """Test that 'watch' feeds URLs from the folder into the engine."""
+        engine = mock_engine_class.from_config.return_value
+        watcher = mock_watcher_class.return_value
+        watcher.run.side_effect = lambda: mock_watcher_class.call_args[0][1]("https://youtube.com/watch?v=test123")
+        
+        result = self.cli.run(["watch", "/inbox", "-j", "4", "--poll"])
+        
+        self.assertEqual(result, 0)
+        mock_engine_class.from_config.assert_called_once_with(
+            self.mock_config, self.mock_downloader, self.mock_output, workers=4)
+        mock_watcher_class.assert_called_once_with("/inbox", unittest.mock.ANY, use_inotify=False)
+        engine.submit.assert_called_once_with("https://youtube.com/watch?v=test123", output_dir=None, quality="best")
+        engine.start.assert_called_once()
+        engine.shutdown.assert_called_once_with()
+    
+    def _setup_batch(self):
+        self.mock_config.get.side_effect = lambda key, default=None: default
+        self.mock_downloader.find_existing.side_effect = lambda url, info=None: (
+            "Already downloaded" if "archived" in url else None)
+        self.mock_downloader.download.side_effect = lambda url, **kwargs: "bad" not in url
+    
+    def test_run_batch_file_with_status_file(self):
+        """Test batch downloads from a file with a per-URL status file."""
+        self._setup_batch()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch_file = os.path.join(temp_dir, "urls.txt")
+            status_file = os.path.join(temp_dir, "status.tsv")
+            with open(batch_file, "w") as f:
+                f.write("https://vimeo.com/1\n# comment\nhttps://vimeo.com/bad\nhttps://vimeo.com/archived\n")
+            
+            result = self.cli.run(["-a", batch_file, "-j", "2", "--status-file", status_file])
+            
+            with open(status_file) as f:
+                statuses = sorted(line.rstrip("\n").split("\t") for line in f)
+        
+        self.assertEqual(result, 1)
+        self.assertEqual(statuses, [
+            ["done", "https://vimeo.com/1"],
+            ["failed", "https://vimeo.com/bad"],
+            ["skipped", "https://vimeo.com/archived"],
+        ])
+        self.mock_output.info.assert_called_with(
+            "Summary: 1 downloaded, 1 failed, 1 skipped (duplicate or already downloaded)")
+    
+    def test_run_reads_urls_from_stdin(self):
+        """Test that '-' streams URLs from stdin."""
+        self._setup_batch()
+        
+        with patch('sys.stdin', io.StringIO("https://vimeo.com/1\nhttps://vimeo.com/2\n")):
+            result = self.cli.run(["-", "-q", "720p"])
+        
+        self.assertEqual(result, 0)
+        self.assertEqual(self.mock_downloader.download.call_count, 2)
+        self.mock_downloader.download.assert_any_call("https://vimeo.com/2", output_dir=None, quality="720p", info=None, job_id=2)
+    
     def test_run_no_url_non_interactive(self):
         """Test error when no URL provided in non-interactive mode."""
         result = self.cli.run([])
@@ -232,9 +345,11 @@ class TestCLIService(unittest.TestCase):
         
         # Verify download was called
         self.mock_downloader.download.assert_called_once_with(
-            url="https://youtube.com/watch?v=test123",
+            "https://youtube.com/watch?v=test123",
             output_dir=None,
-            quality="best"
+            quality="best",
+            info=None,
+            job_id=1
         )
     
     @patch('builtins.input')
@@ -289,12 +404,12 @@ class TestCLIService(unittest.TestCase):
             "https://youtube.com/watch?v=success",
             "quit"
         ]
-        self.mock_downloader.download.side_effect = [False, True]
+        self.mock_downloader.download.side_effect = lambda url, **kwargs: "success" in url
         
         result = self.cli.run(["-i"])
         
         self.assertEqual(result, 0)
-        self.mock_output.error.assert_called_with("Download failed, continuing...")
+        self.mock_output.error.assert_called_with("Job 1 failed: https://youtube.com/watch?v=fail")
         self.assertEqual(self.mock_downloader.download.call_count, 2)
     
     @patch('builtins.input')
@@ -320,11 +435,127 @@ class TestCLIService(unittest.TestCase):
         
         # Verify download uses preset options
         self.mock_downloader.download.assert_called_once_with(
-            url="https://youtube.com/watch?v=test123",
+            "https://youtube.com/watch?v=test123",
             output_dir="/custom/output",
-            quality="720p"
+            quality="720p",
+            info=None,
+            job_id=1
         )
     
+    def _blocking_input(self, lines, release):
+        """Input that releases blocked downloads when the user quits."""
+        self.prompts = []
+        lines = iter(lines)
+        
+        def fake_input(prompt):
+            self.prompts.append(prompt)
+            line = next(lines)
+            if line == "quit":
+                release.set()
+            return line
+        return fake_input
+    
+    @patch('builtins.input')
+    def test_interactive_mode_prompt_returns_while_downloading(self, mock_input):
+        """Test that URLs are queued without waiting for the download."""
+        release = threading.Event()
+        self.mock_downloader.download.side_effect = lambda url, **kwargs: release.wait(5)
+        mock_input.side_effect = self._blocking_input(
+            ["https://youtube.com/watch?v=test123", "status", "quit"], release)
+        
+        result = self.cli.run(["-i"])
+        
+        self.assertEqual(result, 0)
+        self.assertEqual(self.prompts[0], "ytdl> ")
+        self.assertTrue(self.prompts[1].startswith("ytdl [1 "))
+        self.mock_output.info.assert_any_call("Queued job 1: https://youtube.com/watch?v=test123")
+        self.mock_output.info.assert_any_call("Job 1 done: https://youtube.com/watch?v=test123")
+    
+    @patch('builtins.input')
+    def test_interactive_mode_cancel_and_jobs(self, mock_input):
+        """Test cancelling a queued job and listing jobs."""
+        release = threading.Event()
+        self.mock_downloader.download.side_effect = lambda url, **kwargs: release.wait(5)
+        mock_input.side_effect = self._blocking_input(
+            ["https://youtube.com/watch?v=one", "https://youtube.com/watch?v=two",
+             "cancel 2", "cancel x", "jobs", "quit"], release)
+        
+        result = self.cli.run(["-i", "-j", "1"])
+        
+        self.assertEqual(result, 0)
+        self.mock_output.info.assert_any_call("Cancelled job 2")
+        self.mock_output.error.assert_any_call("Usage: cancel <job number>")
+        self.mock_output.info.assert_any_call("[2] cancelled https://youtube.com/watch?v=two")
+        self.mock_downloader.download.assert_called_once()
+    
+    @patch('builtins.input')
+    def test_interactive_mode_pause_resume_and_cancel_running(self, mock_input):
+        """Test pausing, resuming and cancelling a running job."""
+        release = threading.Event()
+        started = threading.Event()
+        self.mock_downloader.download.side_effect = lambda url, **kwargs: started.set() or release.wait(5)
+        self.mock_downloader.cancel.side_effect = lambda job_id, pending=False: release.set() or True
+        lines = iter(["https://youtube.com/watch?v=one", "pause 1", "jobs", "resume 1", "resume 1",
+                      "pause", "cancel 1", "quit"])
+        
+        def fake_input(prompt):
+            line = next(lines)
+            if line == "pause 1":
+                started.wait(5)
+            return line
+        mock_input.side_effect = fake_input
+        
+        result = self.cli.run(["-i"])
+        
+        self.assertEqual(result, 0)
+        self.mock_output.info.assert_any_call("Paused job 1")
+        self.mock_output.info.assert_any_call("[1] paused    https://youtube.com/watch?v=one")
+        self.mock_output.info.assert_any_call("Resumed job 1")
+        self.mock_output.error.assert_any_call("Job 1 is not paused")
+        self.mock_output.error.assert_any_call("Usage: pause <job number>")
+        self.mock_output.info.assert_any_call("Cancelled job 1")
+        self.mock_downloader.pause.assert_called_once_with(1)
+    
+    @patch('builtins.input')
+    def test_interactive_mode_prefetches_metadata(self, mock_input):
+        """Test that metadata of queued jobs is fetched while they wait."""
+        self.mock_config.get.side_effect = lambda key, default=None: True if key == "prefetch_metadata" else default
+        fetched = threading.Event()
+        release = threading.Event()
+        self.mock_output.info.side_effect = lambda message: message == "Job 2: Title two" and fetched.set()
+        
+        def get_info(url, **kwargs):
+            return {"id": url[-3:], "title": f"Title {url[-3:]}"}
+        self.mock_downloader.get_info.side_effect = get_info
+        self.mock_downloader.download.side_effect = lambda url, **kwargs: release.wait(5)
+        lines = iter(["https://youtube.com/watch?v=one", "https://youtube.com/watch?v=two", "quit"])
+        
+        def fake_input(prompt):
+            line = next(lines)
+            if line == "quit":
+                fetched.wait(5)
+                release.set()
+            return line
+        mock_input.side_effect = fake_input
+        
+        self.cli.run(["-i", "-j", "1"])
+        
+        self.assertTrue(fetched.is_set())
+        second = self.mock_downloader.download.call_args_list[1]
+        self.assertEqual(second.kwargs["info"], {"id": "two", "title": "Title two"})
+        self.mock_output.info.assert_any_call("Job 2 done: Title two")
+    
+    @patch('builtins.input')
+    def test_interactive_mode_skips_known_urls(self, mock_input):
+        """Test that already downloaded URLs are reported instead of queued."""
+        self.mock_downloader.find_existing.return_value = "Already downloaded: /downloads/x.mp4"
+        mock_input.side_effect = ["https://youtube.com/watch?v=test123", "quit"]
+        
+        self.cli.run(["-i"])
+        
+        self.mock_output.info.assert_any_call("Already downloaded: /downloads/x.mp4")
+        self.mock_downloader.download.assert_not_called()
+    
     @patch('builtins.input')
     def test_interactive_mode_keyboard_interrupt(self, mock_input):
         """Test interactive mode handles keyboard interrupt gracefully."""
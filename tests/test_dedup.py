@@ -0,0 +1,149 @@
+import unittest
+import os
+import tempfile
+import shutil
+from unittest.mock import Mock, patch
+from ytdl.core import dedup
+from ytdl.core.dedup import FileDeduplicator, full_hash, partial_hash
+from ytdl.core.downloader import CompletedDownload
+
+
+class TestFileDeduplicator(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.output = Mock()
+        self.dedup = FileDeduplicator([self.temp_dir], self.output, min_size=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, name, data):
+        path = os.path.join(self.temp_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_hashes_distinguish_middle_bytes(self):
+        """Test that files differing only in the middle share a partial hash but not a full one."""
+        size = 512 * 1024
+        a = self._write("a.mp4", b"x" * size)
+        b = self._write("b.mp4", b"x" * (size // 2) + b"y" + b"x" * (size // 2 - 1))
+
+        self.assertEqual(partial_hash(a, size), partial_hash(b, size))
+        self.assertNotEqual(full_hash(a), full_hash(b))
+
+    def test_duplicate_is_replaced_with_hardlink(self):
+        """Test that an identical file becomes a hardlink and space saved is reported."""
+        original = self._write("channel1/video.mp4", b"video data" * 1000)
+        duplicate = self._write("channel2/video.mp4", b"video data" * 1000)
+
+        saved = self.dedup.deduplicate_file(duplicate)
+
+        self.assertEqual(saved, 10000)
+        self.assertEqual(os.stat(original).st_ino, os.stat(duplicate).st_ino)
+        self.output.info.assert_called_once()
+        self.assertIn("MB saved", self.output.info.call_args[0][0])
+
+    def test_different_content_same_size_is_kept(self):
+        """Test that same-size files with different content are left alone."""
+        original = self._write("a.mp4", b"a" * 4096)
+        other = self._write("b.mp4", b"b" * 4096)
+
+        self.assertEqual(self.dedup.deduplicate_file(other), 0)
+        self.assertNotEqual(os.stat(original).st_ino, os.stat(other).st_ino)
+
+    def test_already_linked_files_save_nothing(self):
+        """Test that existing hardlinks are not linked again."""
+        original = self._write("a.mp4", b"data" * 100)
+        linked = os.path.join(self.temp_dir, "b.mp4")
+        os.link(original, linked)
+
+        self.assertEqual(self.dedup.deduplicate_file(linked), 0)
+
+    def test_unique_file_is_indexed_for_later_downloads(self):
+        """Test that a new unique file becomes a candidate for later duplicates."""
+        self.dedup.deduplicate_file(self._write("first.mp4", b"z" * 2048))
+        first = os.path.join(self.temp_dir, "first.mp4")
+        second = self._write("second.mp4", b"z" * 2048)
+
+        self.assertEqual(self.dedup.find_duplicate(second), first)
+
+    def test_small_files_are_ignored(self):
+        """Test that files under the minimum size are skipped."""
+        dedup = FileDeduplicator([self.temp_dir], min_size=1024)
+        self._write("a.txt", b"small")
+        duplicate = self._write("b.txt", b"small")
+
+        self.assertEqual(dedup.deduplicate_file(duplicate), 0)
+
+    def test_deduplicate_tree(self):
+        """Test a full pass over existing files."""
+        for name in ("a.mp4", "b.mp4", "c.mp4"):
+            self._write(name, b"same" * 256)
+        self._write("d.mp4", b"diff" * 256)
+
+        result = self.dedup.deduplicate_tree()
+
+        self.assertEqual(result.files_linked, 2)
+        self.assertEqual(result.bytes_saved, 2048)
+        inodes = {os.stat(os.path.join(self.temp_dir, n)).st_ino for n in ("a.mp4", "b.mp4", "c.mp4")}
+        self.assertEqual(len(inodes), 1)
+
+    def test_partial_files_are_skipped(self):
+        """Test that in-progress downloads are never linked."""
+        self._write("a.mp4", b"same" * 256)
+        self._write("b.mp4.part", b"same" * 256)
+
+        self.assertEqual(self.dedup.deduplicate_tree().files_linked, 0)
+
+    def test_completion_hook(self):
+        """Test deduplication from the download completion hook."""
+        self._write("a.mp4", b"same" * 256)
+        duplicate = self._write("b.mp4", b"same" * 256)
+
+        self.dedup.record_completed(CompletedDownload("url", "id", "Youtube", "22", duplicate))
+
+        self.assertEqual(os.stat(duplicate).st_nlink, 2)
+
+    def test_files_are_hashed_without_the_lock(self):
+        """Test that hashing a large file doesn't block other completion hooks."""
+        self._write("a.mp4", b"same" * 256)
+        duplicate = self._write("b.mp4", b"same" * 256)
+        locked = []
+
+        def hash_and_check(path):
+            locked.append(self.dedup._lock.locked())
+            return full_hash(path)
+
+        with patch.object(dedup, "full_hash", side_effect=hash_and_check):
+            self.assertGreater(self.dedup.deduplicate_file(duplicate), 0)
+
+        self.assertEqual(locked, [False, False])
+
+    def test_hash_cache_is_bounded(self):
+        """Test that only the most recently used hashes are kept."""
+        deduplicator = FileDeduplicator([self.temp_dir], min_size=1, cache_size=3)
+        for i in range(5):
+            self._write(f"a{i}.mp4", bytes([i]) * (100 + i))
+            self._write(f"b{i}.mp4", bytes([i]) * (100 + i))
+
+        self.assertEqual(deduplicator.deduplicate_tree().files_linked, 5)
+        self.assertEqual(len(deduplicator._hashes), 3)
+
+    def test_from_config(self):
+        """Test that dedup is opt-in and covers all output roots."""
+        config = Mock()
+        config.download_dir = "/downloads"
+        values = {"dedup": True, "output_roots": ["/disk1", {"path": "/disk2"}]}
+        config.get.side_effect = lambda key, default=None: values.get(key, default)
+
+        self.assertEqual(FileDeduplicator.from_config(config).roots, ["/disk1", "/disk2"])
+
+        values["dedup"] = False
+        self.assertIsNone(FileDeduplicator.from_config(config))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import threading
+import time
+from collections import namedtuple
+from unittest.mock import patch, Mock
+from ytdl.core.diskspace import (
+    DiskReservations, InsufficientDiskSpaceError, estimate_required_bytes
+)
+from ytdl.core.formats import FormatPlan
+
+DiskUsage = namedtuple("DiskUsage", "total used free")
+MB = 1024 * 1024
+
+
+class TestEstimateRequiredBytes(unittest.TestCase):
+
+    def test_estimate_from_plan_with_merge_headroom(self):
+        """Test that merged plans reserve room for parts and output."""
+        plan = FormatPlan("137+140", "mp4", True, False, 100 * MB, 0)
+        self.assertEqual(estimate_required_bytes({}, plan), 200 * MB)
+
+    def test_estimate_from_progressive_plan(self):
+        """Test that progressive plans need no headroom."""
+        plan = FormatPlan("22", "mp4", False, False, 100 * MB, 0)
+        self.assertEqual(estimate_required_bytes({}, plan), 100 * MB)
+
+    def test_estimate_from_info_filesize(self):
+        """Test estimation from filesize/filesize_approx."""
+        self.assertEqual(estimate_required_bytes({"filesize": 1000}), 1000)
+        self.assertEqual(estimate_required_bytes({"filesize_approx": 2000}), 2000)
+
+    def test_estimate_from_requested_formats(self):
+        """Test estimation from merged requested formats."""
+        info = {"requested_formats": [{"filesize": 1000}, {"filesize_approx": 500}]}
+        self.assertEqual(estimate_required_bytes(info), 3000)
+
+    def test_estimate_unknown(self):
+        """Test that unknown sizes return None."""
+        self.assertIsNone(estimate_required_bytes(None))
+        self.assertIsNone(estimate_required_bytes({"title": "x"}))
+
+
+@patch('ytdl.core.diskspace.volume_id', return_value=1)
+@patch('ytdl.core.diskspace.shutil.disk_usage')
+class TestDiskReservations(unittest.TestCase):
+
+    def test_reserve_and_release(self, mock_usage, mock_volume):
+        """Test that reservations reduce available space until released."""
+        mock_usage.return_value = DiskUsage(1000 * MB, 0, 1000 * MB)
+        reservations = DiskReservations(safety_margin=0)
+
+        with reservations.reserve("/data", 600 * MB):
+            self.assertEqual(reservations.available_bytes("/data"), 400 * MB)
+            self.assertIsNone(reservations.try_reserve("/data", 600 * MB))
+
+        self.assertEqual(reservations.available_bytes("/data"), 1000 * MB)
+
+    def test_safety_margin_is_kept_free(self, mock_usage, mock_volume):
+        """Test that the safety margin is never reserved."""
+        mock_usage.return_value = DiskUsage(1000 * MB, 0, 1000 * MB)
+        reservations = DiskReservations(safety_margin=100 * MB, policy="fail")
+
+        with self.assertRaises(InsufficientDiskSpaceError):
+            reservations.reserve("/data", 950 * MB)
+
+    def test_fail_policy_fails_fast(self, mock_usage, mock_volume):
+        """Test that the fail policy does not wait for other jobs."""
+        mock_usage.return_value = DiskUsage(1000 * MB, 0, 1000 * MB)
+        reservations = DiskReservations(safety_margin=0, policy="fail")
+        reservations.reserve("/data", 800 * MB)
+
+        with self.assertRaises(InsufficientDiskSpaceError):
+            reservations.reserve("/data", 300 * MB)
+
+    def test_request_that_never_fits_fails_immediately(self, mock_usage, mock_volume):
+        """Test that waiting is skipped when the job can never fit."""
+        mock_usage.return_value = DiskUsage(1000 * MB, 0, 1000 * MB)
+        reservations = DiskReservations(safety_margin=0, policy="wait", wait_timeout=60)
+
+        start = time.monotonic()
+        with self.assertRaises(InsufficientDiskSpaceError):
+            reservations.reserve("/data", 2000 * MB)
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_wait_policy_waits_for_release(self, mock_usage, mock_volume):
+        """Test that a waiting job proceeds once another releases its space."""
+        mock_usage.return_value = DiskUsage(1000 * MB, 0, 1000 * MB)
+        reservations = DiskReservations(safety_margin=0, policy="wait", wait_timeout=5)
+        first = reservations.reserve("/data", 800 * MB)
+
+        threading.Timer(0.1, first.release).start()
+        second = reservations.reserve("/data", 500 * MB)
+
+        self.assertEqual(second.nbytes, 500 * MB)
+
+    def test_consume_moves_bytes_out_of_pending(self, mock_usage, mock_volume):
+        """Test that written bytes stop counting as pending."""
+        mock_usage.return_value = DiskUsage(1000 * MB, 0, 1000 * MB)
+        reservations = DiskReservations(safety_margin=0)
+        reservation = reservations.reserve("/data", 600 * MB)
+
+        reservation.consume(200 * MB)
+        self.assertEqual(reservations.pending_bytes("/data"), 400 * MB)
+
+        reservation.release()
+        reservation.release()  # Releasing twice is harmless
+        self.assertEqual(reservations.pending_bytes("/data"), 0)
+
+    def test_from_config(self, mock_usage, mock_volume):
+        """Test creating reservations from config values."""
+        config = Mock()
+        config.get.side_effect = lambda key, default=None: {
+            "disk_safety_margin_mb": 10, "disk_full_policy": "fail", "disk_wait_timeout": 5
+        }.get(key, default)
+
+        reservations = DiskReservations.from_config(config)
+
+        self.assertEqual(reservations.safety_margin, 10 * MB)
+        self.assertEqual(reservations.policy, "fail")
+        self.assertEqual(reservations.wait_timeout, 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
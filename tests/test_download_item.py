@@ -0,0 +1,35 @@
+import unittest
+from ytdl.gui.models.download_item import DownloadItem, ItemStatus
+
+
+class TestDownloadItem(unittest.TestCase):
+
+    def test_size_is_stored_raw_and_formatted_for_display(self):
+        """Test that metadata keeps the byte count and file_size formats it."""
+        item = DownloadItem("https://youtu.be/dQw4w9WgXcQ")
+        self.assertEqual(item.file_size, "Unknown")
+        self.assertEqual(item.status, ItemStatus.QUEUED)
+
+        item.update_metadata(" Title ", "Channel", 5 * 1024 * 1024)
+
+        self.assertTrue(item.metadata_loaded)
+        self.assertEqual(item.title, "Title")
+        self.assertEqual(item.size_bytes, 5 * 1024 * 1024)
+        self.assertEqual(item.file_size, "5.0 MB")
+
+    def test_items_have_no_instance_dict(self):
+        """Test that items are slotted and share repeated strings."""
+        first = DownloadItem("https://youtu.be/a", "".join(["be", "st"]))
+        second = DownloadItem("https://youtu.be/b", "best")
+        first.update_metadata(channel="".join(["Some ", "Channel"]))
+        second.update_metadata(channel="Some Channel")
+
+        self.assertFalse(hasattr(first, "__dict__"))
+        with self.assertRaises(AttributeError):
+            first.thumbnail_image = object()
+        self.assertIs(first.quality, second.quality)
+        self.assertIs(first.channel, second.channel)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import itertools
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+from ytdl.gui.components.download_queue import DownloadQueueComponent, DEFAULT_ROW_HEIGHT
+from ytdl.gui.models.download_item import DownloadItem, ItemStatus
+
+
+class TestDownloadQueueComponent(unittest.TestCase):
+    """The component is built against a stubbed ttk, so no display is needed."""
+
+    def setUp(self):
+        patcher = patch('ytdl.gui.components.download_queue.ttk')
+        self.ttk = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.style = self.ttk.Style.return_value
+        self.style.lookup.return_value = "24"
+        self.tree = self.ttk.Treeview.return_value
+        ids = itertools.count()
+        self.tree.insert.side_effect = lambda *a, **k: f"row{next(ids)}"
+        self.tree.selection.return_value = ()
+
+    def test_construct_with_theme_row_height(self):
+        """Test that without an explicit height the theme's row height is used."""
+        queue = DownloadQueueComponent(Mock())
+
+        self.assertEqual(queue._row_height, 24)
+        self.style.configure.assert_not_called()
+        self.assertNotIn("style", self.ttk.Treeview.call_args.kwargs)
+
+    def test_construct_with_explicit_row_height(self):
+        """Test that an explicit height configures the row style and is kept."""
+        queue = DownloadQueueComponent(Mock(), row_height=48)
+
+        self.assertEqual(queue._row_height, 48)
+        self.style.configure.assert_called_once_with("Queue.Treeview", rowheight=48)
+        self.assertEqual(self.ttk.Treeview.call_args.kwargs["style"], "Queue.Treeview")
+
+    def test_unreadable_theme_height_falls_back(self):
+        """Test that a theme without a row height leaves the default."""
+        self.style.lookup.return_value = ""
+        queue = DownloadQueueComponent(Mock())
+
+        self.assertEqual(queue._row_height, DEFAULT_ROW_HEIGHT)
+
+    def test_items_are_rendered_into_visible_rows(self):
+        """Test that added items fill treeview rows up to the visible count."""
+        queue = DownloadQueueComponent(Mock())
+        queue.add_items([DownloadItem(f"https://youtu.be/video{i:06d}") for i in range(20)])
+
+        self.assertEqual(len(queue._row_ids), queue.visible_rows)
+        self.assertTrue(queue.has_items())
+
+
+    def test_failed_row_shows_error(self):
+        """Test that a failed item shows its error in its row."""
+        queue = DownloadQueueComponent(Mock())
+        item = DownloadItem("https://youtu.be/video000001")
+        item.status = ItemStatus.FAILED
+        item.error_message = "Private video"
+
+        self.assertEqual(queue._row_values(item)[-1], "Private video")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,17 @@
 import unittest
 import subprocess
 import os
+import io
 import json
+import threading
+import time
 from unittest.mock import patch, Mock, MagicMock, call
 from ytdl.core.downloader import DownloaderService, OutputHandler, ConsoleOutputHandler
+from ytdl.core.events import JsonEventWriter
+from ytdl.core.metadata import MetadataCache
+from ytdl.core.eventbus import JobEvent, JobState, LogEvent, MetricEvent, ProgressEvent, Stage, StageEvent
 from tests.fixtures.mock_responses import (
-    MOCK_VIDEO_INFO, MOCK_PROGRESS_OUTPUT, MOCK_ERROR_OUTPUT
+    MOCK_VIDEO_INFO, MOCK_PROGRESS_OUTPUT, MOCK_ERROR_OUTPUT, MOCK_FORMATS_INFO
 )
 
 
@@ -94,6 +100,56 @@ class TestDownloaderService(unittest.TestCase):
         self.mock_output.info.assert_called_with("Downloading: https://youtube.com/watch?v=invalid")
         self.mock_output.error.assert_called_with("Download failed")
     
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_download_passes_extra_args_and_accepts_early_stop(self, mock_makedirs, mock_popen):
+        """Test extra yt-dlp arguments and yt-dlp's deliberate early-stop exit code."""
+        mock_process = Mock()
+        mock_process.stdout = iter([])
+        mock_process.wait.return_value = 101
+        mock_popen.return_value = mock_process
+        
+        result = self.downloader.download("https://youtube.com/@channel",
+                                          extra_args=["--lazy-playlist"])
+        
+        self.assertTrue(result)
+        cmd = mock_popen.call_args[0][0]
+        self.assertIn("--lazy-playlist", cmd)
+        self.assertEqual(cmd[-1], "https://youtube.com/@channel")
+    
+    @patch('ytdl.core.processes.JobProcess.signal_group')
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_cancel_running_download(self, mock_makedirs, mock_popen, mock_signal):
+        """Test that a cancelled download is terminated, cleaned up and reported as cancelled."""
+        events = []
+        self.downloader.bus.subscribe(events.append, (JobEvent,))
+        
+        def output():
+            yield "[download] Destination: test_downloads/Title.mp4\n"
+            self.assertEqual(self.downloader.processes.running(), [7])
+            self.assertTrue(self.downloader.pause(7))
+            self.assertTrue(self.downloader.cancel(7))
+        mock_process = Mock()
+        mock_process.stdout = output()
+        mock_process.wait.return_value = -15
+        mock_popen.return_value = mock_process
+        
+        with patch('os.path.isfile', side_effect=lambda path: path.endswith(".part")), \
+             patch('glob.glob', return_value=["test_downloads/Title.mp4.part"]), \
+             patch('os.remove') as mock_remove:
+            result = self.downloader.download("https://youtube.com/watch?v=test123", job_id=7)
+        self.downloader.bus.flush()
+        
+        self.assertFalse(result)
+        self.assertTrue(mock_popen.call_args.kwargs.get("start_new_session") or
+                        mock_popen.call_args.kwargs.get("creationflags"))
+        mock_remove.assert_any_call("test_downloads/Title.mp4.part")
+        self.mock_output.info.assert_any_call("Download cancelled")
+        self.assertEqual([e.state for e in events], [JobState.PAUSED, JobState.CANCELLED])
+        self.assertEqual(self.downloader.processes.running(), [])
+        self.assertFalse(self.downloader.cancel(7))
+    
     @patch('subprocess.Popen')
     @patch('os.makedirs')
     def test_download_exception_handling(self, mock_makedirs, mock_popen):
@@ -114,7 +170,7 @@ class TestDownloaderService(unittest.TestCase):
         
         expected_cmd = [
             "./yt-dlp_linux",
-            "-o", "test_downloads/%(title)s.%(ext)s",
+            "-o", "test_downloads/%(title)s [%(id)s].%(ext)s",
             "https://youtube.com/watch?v=test123"
         ]
         
@@ -130,7 +186,7 @@ class TestDownloaderService(unittest.TestCase):
         
         expected_cmd = [
             "./yt-dlp_linux",
-            "-o", "/custom/output/%(title)s.%(ext)s",
+            "-o", "/custom/output/%(title)s [%(id)s].%(ext)s",
             "https://youtube.com/watch?v=test123"
         ]
         
@@ -146,7 +202,7 @@ class TestDownloaderService(unittest.TestCase):
         
         expected_cmd = [
             "./yt-dlp_linux",
-            "-o", "test_downloads/%(title)s.%(ext)s",
+            "-o", "test_downloads/%(title)s [%(id)s].%(ext)s",
             "-f", "720p",
             "https://youtube.com/watch?v=test123"
         ]
@@ -163,7 +219,7 @@ class TestDownloaderService(unittest.TestCase):
         
         expected_cmd = [
             "./yt-dlp_linux",
-            "-o", "test_downloads/%(title)s.%(ext)s",
+            "-o", "test_downloads/%(title)s [%(id)s].%(ext)s",
             "https://youtube.com/watch?v=test123"
         ]
         
@@ -180,7 +236,7 @@ class TestDownloaderService(unittest.TestCase):
         
         expected_cmd = [
             "./yt-dlp_linux",
-            "-o", "/custom/dir/%(title)s.%(ext)s",
+            "-o", "/custom/dir/%(title)s [%(id)s].%(ext)s",
             "-f", "1080p",
             "https://youtube.com/watch?v=test123"
         ]
@@ -204,64 +260,189 @@ class TestDownloaderService(unittest.TestCase):
         
         mock_makedirs.assert_called_once_with("/custom/path", exist_ok=True)
     
-    @patch('subprocess.run')
-    def test_get_info_success(self, mock_run):
+    def _info_process(self, returncode=0, stdout=""):
+        process = Mock()
+        process.returncode = returncode
+        process.communicate.return_value = (stdout, "")
+        return process
+    
+    @patch('subprocess.Popen')
+    def test_get_info_success(self, mock_popen):
         """Test successful video info retrieval."""
-        # Mock successful subprocess result
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = json.dumps(MOCK_VIDEO_INFO)
-        mock_run.return_value = mock_result
+        mock_popen.return_value = self._info_process(stdout=json.dumps(MOCK_VIDEO_INFO))
         
         info = self.downloader.get_info("https://youtube.com/watch?v=test123")
         
         # Verify correct command was called
         expected_cmd = ["./yt-dlp_linux", "--dump-json", "https://youtube.com/watch?v=test123"]
-        mock_run.assert_called_once_with(expected_cmd, capture_output=True, text=True)
+        self.assertEqual(mock_popen.call_args[0][0], expected_cmd)
         
         # Verify returned info
         self.assertEqual(info, MOCK_VIDEO_INFO)
         self.assertEqual(info["title"], "Test Video Title")
         self.assertEqual(info["duration"], 180)
     
-    @patch('subprocess.run')
-    def test_get_info_failure(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_get_info_failure(self, mock_popen):
         """Test failed video info retrieval."""
-        # Mock failed subprocess result
-        mock_result = Mock()
-        mock_result.returncode = 1
-        mock_run.return_value = mock_result
+        mock_popen.return_value = self._info_process(returncode=1)
         
         info = self.downloader.get_info("https://youtube.com/watch?v=invalid")
         
         # Should return None on failure
         self.assertIsNone(info)
     
-    @patch('subprocess.run')
-    def test_get_info_exception_handling(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_get_info_exception_handling(self, mock_popen):
         """Test get_info exception handling."""
         # Mock subprocess exception
-        mock_run.side_effect = OSError("Binary not found")
+        mock_popen.side_effect = OSError("Binary not found")
         
         info = self.downloader.get_info("https://youtube.com/watch?v=test123")
         
         # Should return None on exception
         self.assertIsNone(info)
     
-    @patch('subprocess.run')
-    def test_get_info_invalid_json(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_get_info_invalid_json(self, mock_popen):
         """Test get_info with invalid JSON response."""
-        # Mock subprocess with invalid JSON
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Invalid JSON response"
-        mock_run.return_value = mock_result
+        mock_popen.return_value = self._info_process(stdout="Invalid JSON response")
         
         info = self.downloader.get_info("https://youtube.com/watch?v=test123")
         
         # Should return None when JSON parsing fails
         self.assertIsNone(info)
     
+    @patch('subprocess.Popen')
+    def test_get_info_timeout_kills_process(self, mock_popen):
+        """Test that get_info kills yt-dlp when it runs past the timeout."""
+        process = self._info_process()
+        
+        def communicate(timeout=None):
+            if process.kill.called:
+                return ("", "")
+            time.sleep(timeout)
+            raise subprocess.TimeoutExpired("yt-dlp", timeout)
+        process.communicate.side_effect = communicate
+        mock_popen.return_value = process
+        
+        info = self.downloader.get_info("https://youtube.com/watch?v=test123", timeout=0.01)
+        
+        self.assertIsNone(info)
+        process.kill.assert_called_once()
+    
+    @patch('subprocess.Popen')
+    def test_get_info_many_matches_results_to_urls(self, mock_popen):
+        """Test that one yt-dlp call serves a batch and failed URLs are left out."""
+        urls = ["https://youtu.be/aaaaaaaaaaa", "https://vimeo.com/2", "https://youtu.be/bbbbbbbbbbb"]
+        lines = [json.dumps({"id": "bbbbbbbbbbb", "extractor_key": "Youtube", "title": "B"}),
+                 json.dumps({"id": "2", "title": "Two", "original_url": "https://vimeo.com/2"}),
+                 "not json"]
+        mock_popen.return_value = self._info_process(returncode=1, stdout="\n".join(lines))
+        
+        found = self.downloader.get_info_many(urls, timeout=5)
+        
+        cmd = mock_popen.call_args[0][0]
+        self.assertEqual(cmd[:2], ["./yt-dlp_linux", "--dump-json"])
+        self.assertEqual(cmd[-3:], urls)
+        self.assertIn("--ignore-errors", cmd)
+        self.assertEqual(found, {"https://youtu.be/bbbbbbbbbbb": json.loads(lines[0]),
+                                 "https://vimeo.com/2": json.loads(lines[1])})
+        self.assertEqual(self.downloader.get_info_many([]), {})
+    
+    @patch('subprocess.Popen')
+    def test_get_info_many_keeps_results_on_timeout(self, mock_popen):
+        """Test that videos extracted before a timeout are still returned."""
+        process = self._info_process()
+        
+        def communicate(timeout=None):
+            if process.kill.called:
+                return (json.dumps({"id": "aaaaaaaaaaa", "extractor_key": "Youtube", "title": "A"}) + "\n", "")
+            time.sleep(timeout)
+            raise subprocess.TimeoutExpired("yt-dlp", timeout)
+        process.communicate.side_effect = communicate
+        mock_popen.return_value = process
+        
+        found = self.downloader.get_info_many(["https://youtu.be/aaaaaaaaaaa", "https://vimeo.com/2"],
+                                              timeout=0.01)
+        
+        process.kill.assert_called_once()
+        self.assertEqual(list(found), ["https://youtu.be/aaaaaaaaaaa"])
+    
+    @patch('subprocess.Popen')
+    def test_get_info_cancel_kills_process(self, mock_popen):
+        """Test that setting the cancel event kills yt-dlp."""
+        cancel = threading.Event()
+        process = self._info_process()
+        
+        def communicate(timeout=None):
+            if process.kill.called:
+                return ("", "")
+            cancel.set()
+            raise subprocess.TimeoutExpired("yt-dlp", timeout)
+        process.communicate.side_effect = communicate
+        mock_popen.return_value = process
+        
+        info = self.downloader.get_info("https://youtube.com/watch?v=test123", cancel=cancel)
+        
+        self.assertIsNone(info)
+        process.kill.assert_called_once()
+    
+    @patch('subprocess.Popen')
+    def test_concurrent_get_info_shares_one_extraction(self, mock_popen):
+        """Test that concurrent lookups of one video run yt-dlp once and fill the cache."""
+        downloader = DownloaderService(self.mock_config, self.mock_output, metadata=MetadataCache())
+        release = threading.Event()
+        info = dict(MOCK_VIDEO_INFO, id="aaaaaaaaaaa", extractor_key="Youtube")
+        process = self._info_process(stdout=json.dumps(info))
+        
+        def communicate(timeout=None):
+            release.wait(5)
+            return (json.dumps(info), "")
+        process.communicate.side_effect = communicate
+        mock_popen.return_value = process
+        
+        urls = ["https://youtu.be/aaaaaaaaaaa", "https://www.youtube.com/watch?v=aaaaaaaaaaa",
+                "https://m.youtube.com/shorts/aaaaaaaaaaa"]
+        results = []
+        threads = [threading.Thread(target=lambda u=u: results.append(downloader.get_info(u)))
+                   for u in urls]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual(mock_popen.call_count, 1)
+        self.assertEqual(results, [info] * 3)
+        # Later lookups are served from the cache
+        self.assertEqual(downloader.get_info("https://youtube.com/embed/aaaaaaaaaaa"), info)
+        self.assertEqual(downloader.get_info_many(["https://youtu.be/aaaaaaaaaaa"]),
+                         {"https://youtu.be/aaaaaaaaaaa": info})
+        self.assertEqual(mock_popen.call_count, 1)
+    
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_download_uses_cached_info(self, mock_makedirs, mock_popen):
+        """Test that a download reuses info extracted shortly before."""
+        self.mock_config.format = "mp4"
+        self.mock_config.get.return_value = True
+        cache = MetadataCache()
+        cache.put("youtube aaaaaaaaaaa", MOCK_FORMATS_INFO)
+        downloader = DownloaderService(self.mock_config, self.mock_output, metadata=cache)
+        mock_process = Mock()
+        mock_process.stdout = iter([])
+        mock_process.wait.return_value = 0
+        mock_popen.return_value = mock_process
+        
+        with patch.object(downloader, 'get_info') as mock_info:
+            result = downloader.download("https://youtu.be/aaaaaaaaaaa", quality="720p")
+        
+        self.assertTrue(result)
+        mock_info.assert_not_called()
+        self.assertIn("--load-info-json", mock_popen.call_args[0][0])
+    
     @patch('subprocess.Popen')
     @patch('os.makedirs')
     def test_download_with_empty_output(self, mock_makedirs, mock_popen):
@@ -376,6 +557,381 @@ class TestDownloaderService(unittest.TestCase):
                        if call[0] and not call[0][0].startswith('\r')]
         self.assertTrue(len(normal_calls) > 0, "Should have normal print calls")
     
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_download_sends_progress_to_renderer(self, mock_makedirs, mock_popen):
+        """Test that progress goes to the shared renderer instead of stdout."""
+        mock_process = Mock()
+        mock_process.stdout = iter(MOCK_PROGRESS_OUTPUT)
+        mock_process.wait.return_value = 0
+        mock_popen.return_value = mock_process
+        renderer = Mock()
+        downloader = DownloaderService(self.mock_config, self.mock_output, progress=renderer)
+        
+        with patch('builtins.print') as mock_print:
+            self.assertTrue(downloader.download("https://youtube.com/watch?v=test123"))
+        
+        mock_print.assert_not_called()
+        events = [c.args[0] for c in renderer.call_args_list]
+        progress = [e for e in events if isinstance(e, ProgressEvent)]
+        self.assertEqual(len(progress), 5)
+        self.assertEqual((progress[-1].job, progress[-1].percent), (1, 100.0))
+        self.assertEqual(progress[-1].url, "https://youtube.com/watch?v=test123")
+        self.assertIn('[ffmpeg] Merging formats into "Test Video Title.mp4"',
+                      [e.message for e in events if isinstance(e, LogEvent)])
+        self.assertEqual(events[-1].state, JobState.COMPLETED)
+    
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_download_progress_consumes_reservation(self, mock_makedirs, mock_popen):
+        """Test that written bytes are reported to the disk reservation."""
+        mock_process = Mock()
+        mock_process.stdout = iter(MOCK_PROGRESS_OUTPUT)
+        mock_process.wait.return_value = 0
+        mock_popen.return_value = mock_process
+        reservations = Mock()
+        reservation = reservations.try_reserve.return_value
+        downloader = DownloaderService(self.mock_config, self.mock_output, reservations=reservations)
+        
+        with patch('builtins.print'):
+            downloader.download("https://youtube.com/watch?v=test123",
+                                info=dict(MOCK_VIDEO_INFO, filesize=11 * 1024 ** 2))
+        
+        reservation.consume.assert_called_with(int(10.5 * 1024 ** 2))
+        reservation.release.assert_called_once()
+    
+    def test_build_command_with_format_plan(self):
+        """Test that info JSON yields an explicit format ID without remux."""
+        self.mock_config.format = "mp4"
+        
+        with patch('os.makedirs'):
+            cmd = self.downloader._build_command(
+                "https://youtube.com/watch?v=test123",
+                quality="720p",
+                info=MOCK_FORMATS_INFO,
+                info_file="/tmp/test.info.json"
+            )
+        
+        expected_cmd = [
+            "./yt-dlp_linux",
+            "-o", "test_downloads/%(title)s [%(id)s].%(ext)s",
+            "-f", "22",
+            "--load-info-json", "/tmp/test.info.json"
+        ]
+        
+        self.assertEqual(cmd, expected_cmd)
+    
+    def test_build_command_mp4_without_info_keeps_selector(self):
+        """Test that the selector fallback is used when no info is available."""
+        self.mock_config.format = "mp4"
+        
+        with patch('os.makedirs'):
+            cmd = self.downloader._build_command("https://youtube.com/watch?v=test123", quality="720p")
+        
+        self.assertIn("--remux-video", cmd)
+        self.assertEqual(cmd[-1], "https://youtube.com/watch?v=test123")
+    
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_download_plans_from_fetched_info(self, mock_makedirs, mock_popen):
+        """Test that download fetches info once and hands it to yt-dlp."""
+        self.mock_config.format = "mp4"
+        self.mock_config.get.return_value = True
+        mock_process = Mock()
+        mock_process.stdout = iter([])
+        mock_process.wait.return_value = 0
+        mock_popen.return_value = mock_process
+        
+        with patch.object(self.downloader, 'get_info', return_value=MOCK_FORMATS_INFO) as mock_info:
+            result = self.downloader.download("https://youtube.com/watch?v=test123", quality="720p")
+        
+        self.assertTrue(result)
+        mock_info.assert_called_once_with("https://youtube.com/watch?v=test123")
+        cmd = mock_popen.call_args[0][0]
+        self.assertIn("--load-info-json", cmd)
+        self.assertNotIn("--remux-video", cmd)
+        self.assertNotIn("https://youtube.com/watch?v=test123", cmd)
+        # Temporary info file is cleaned up afterwards
+        self.assertFalse(os.path.exists(cmd[cmd.index("--load-info-json") + 1]))
+    
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_download_fails_before_spawn_without_disk_space(self, mock_makedirs, mock_popen):
+        """Test that a job that doesn't fit never starts yt-dlp."""
+        from ytdl.core.diskspace import InsufficientDiskSpaceError
+        reservations = Mock()
+        reservations.try_reserve.return_value = None
+        reservations.reserve.side_effect = InsufficientDiskSpaceError("Not enough disk space")
+        downloader = DownloaderService(self.mock_config, self.mock_output, reservations=reservations)
+        
+        result = downloader.download("https://youtube.com/watch?v=test123", info={"filesize": 1000})
+        
+        self.assertFalse(result)
+        mock_popen.assert_not_called()
+        self.mock_output.error.assert_called_with("Error during download: Not enough disk space")
+    
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_download_fetches_info_for_disk_space_check(self, mock_makedirs, mock_popen):
+        """Test that info is fetched for the space check even without a format plan."""
+        self.mock_config.format = "webm"
+        reservations = Mock()
+        mock_process = Mock()
+        mock_process.stdout = iter([])
+        mock_process.wait.return_value = 0
+        mock_popen.return_value = mock_process
+        downloader = DownloaderService(self.mock_config, self.mock_output, reservations=reservations)
+        
+        with patch.object(downloader, 'get_info', return_value={"filesize": 1000}) as mock_info:
+            self.assertTrue(downloader.download("https://youtube.com/watch?v=test123"))
+        
+        mock_info.assert_called_once_with("https://youtube.com/watch?v=test123")
+        reservations.try_reserve.assert_called_once_with("test_downloads", 1000)
+    
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_download_reports_skipped_disk_space_check(self, mock_makedirs, mock_popen):
+        """Test that a download without a size estimate says the space check was skipped."""
+        reservations = Mock()
+        mock_process = Mock()
+        mock_process.stdout = iter([])
+        mock_process.wait.return_value = 0
+        mock_popen.return_value = mock_process
+        downloader = DownloaderService(self.mock_config, self.mock_output, reservations=reservations)
+        
+        with patch.object(downloader, 'get_info') as mock_info:
+            self.assertTrue(downloader.download("https://www.youtube.com/playlist?list=PLabc"))
+        
+        mock_info.assert_not_called()
+        reservations.try_reserve.assert_not_called()
+        self.mock_output.info.assert_any_call(
+            "Skipping disk space check: playlist and channel sizes aren't known in advance")
+    
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_download_releases_reservation(self, mock_makedirs, mock_popen):
+        """Test that the reservation is released when the job finishes."""
+        reservation = Mock()
+        reservations = Mock()
+        reservations.try_reserve.return_value = reservation
+        mock_process = Mock()
+        mock_process.stdout = iter([])
+        mock_process.wait.return_value = 0
+        mock_popen.return_value = mock_process
+        downloader = DownloaderService(self.mock_config, self.mock_output, reservations=reservations)
+        
+        self.assertTrue(downloader.download("https://youtube.com/watch?v=test123", info={"filesize": 1000}))
+        
+        reservations.try_reserve.assert_called_once_with("test_downloads", 1000)
+        reservation.release.assert_called_once()
+    
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_download_uses_placement_without_output_dir(self, mock_makedirs, mock_popen):
+        """Test that multi-root placement chooses the directory when none is given."""
+        placement = Mock()
+        reservation = Mock()
+        placement.place.return_value = ("/disk2", reservation)
+        mock_process = Mock()
+        mock_process.stdout = iter([])
+        mock_process.wait.return_value = 0
+        mock_popen.return_value = mock_process
+        downloader = DownloaderService(self.mock_config, self.mock_output, placement=placement)
+        
+        self.assertTrue(downloader.download("https://youtube.com/watch?v=test123", info={"id": "test123", "filesize": 10}))
+        
+        placement.place.assert_called_once_with({"id": "test123", "filesize": 10}, 10,
+                                                "https://youtube.com/watch?v=test123")
+        self.assertIn("/disk2/%(title)s [%(id)s].%(ext)s", mock_popen.call_args[0][0])
+        reservation.release.assert_called_once()
+    
+    @patch('subprocess.Popen')
+    def test_download_skips_videos_in_library(self, mock_popen):
+        """Test that indexed videos are skipped before anything is spawned."""
+        library = Mock()
+        library.contains.return_value = True
+        library.lookup.return_value = {"path": "/downloads/video.mp4"}
+        downloader = DownloaderService(self.mock_config, self.mock_output, library=library)
+        
+        result = downloader.download("https://youtu.be/dQw4w9WgXcQ")
+        
+        self.assertTrue(result)
+        library.contains.assert_called_once_with("dQw4w9WgXcQ", "youtube")
+        mock_popen.assert_not_called()
+        self.mock_output.info.assert_called_with("Already downloaded: /downloads/video.mp4")
+    
+    @patch('subprocess.Popen')
+    def test_download_skips_archived_videos_before_extraction(self, mock_popen):
+        """Test that archived videos are skipped without spawning yt-dlp."""
+        archive = Mock()
+        archive.__contains__ = Mock(return_value=True)
+        downloader = DownloaderService(self.mock_config, self.mock_output, archive=archive)
+        
+        result = downloader.download("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+        
+        self.assertTrue(result)
+        archive.__contains__.assert_called_once_with("youtube dQw4w9WgXcQ")
+        mock_popen.assert_not_called()
+    
+    def _fake_listing_popen(self, listing, calls):
+        """Popen that answers a flat listing with `listing` and runs downloads with no output."""
+        def fake_popen(cmd, **kwargs):
+            calls.append(cmd)
+            process = Mock()
+            if "--flat-playlist" in cmd:
+                process.communicate.return_value = (listing, "")
+                process.returncode = 0
+            else:
+                process.stdout = iter([])
+                process.wait.return_value = 0
+            return process
+        return fake_popen
+    
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_collection_download_skips_archived_entries(self, mock_makedirs, mock_popen):
+        """Test that playlist entries are checked against the archive one by one."""
+        calls = []
+        mock_popen.side_effect = self._fake_listing_popen(
+            "1\tYoutube\taaa\n2\tYoutube\tbbb\n3\tYoutube\tccc\n4\tYoutube\tddd\n5\tYoutube\teee\n", calls)
+        archive = Mock()
+        archive.__contains__ = Mock(side_effect=lambda key: key in {"youtube bbb"})
+        downloader = DownloaderService(self.mock_config, self.mock_output, archive=archive)
+        
+        self.assertTrue(downloader.download("https://www.youtube.com/playlist?list=PL123",
+                                            extra_args=["--lazy-playlist"]))
+        
+        listing, download = calls
+        self.assertEqual(listing[1:3], ["--flat-playlist", "--print"])
+        self.assertIn("--lazy-playlist", listing)
+        self.assertEqual(download[download.index("--playlist-items") + 1], "1,3-5")
+        self.assertNotIn("--download-archive", download)
+    
+    @patch('subprocess.Popen')
+    def test_collection_download_skipped_when_all_entries_archived(self, mock_popen):
+        """Test that nothing is downloaded when every entry is archived."""
+        calls = []
+        mock_popen.side_effect = self._fake_listing_popen("1\tYoutube\taaa\n2\tYoutube\tbbb\n", calls)
+        archive = Mock()
+        archive.__contains__ = Mock(return_value=True)
+        downloader = DownloaderService(self.mock_config, self.mock_output, archive=archive)
+        events = []
+        downloader.bus.subscribe(events.append, [JobEvent])
+        
+        self.assertTrue(downloader.download("https://www.youtube.com/playlist?list=PL123"))
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(events[-1].state, JobState.SKIPPED)
+    
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_video_download_does_not_list_entries(self, mock_makedirs, mock_popen):
+        """Test that single videos rely on the up-front archive check only."""
+        mock_process = Mock()
+        mock_process.stdout = iter([])
+        mock_process.wait.return_value = 0
+        mock_popen.return_value = mock_process
+        archive = Mock()
+        archive.__contains__ = Mock(return_value=False)
+        downloader = DownloaderService(self.mock_config, self.mock_output, archive=archive)
+        
+        self.assertTrue(downloader.download("https://www.youtube.com/watch?v=dQw4w9WgXcQ"))
+        
+        mock_popen.assert_called_once()
+        self.assertNotIn("--playlist-items", mock_popen.call_args[0][0])
+    
+    def test_find_existing_uses_local_keys_for_other_sites(self):
+        """Test that archive checks work from the URL alone beyond YouTube."""
+        archive = Mock()
+        archive.__contains__ = Mock(return_value=True)
+        downloader = DownloaderService(self.mock_config, self.mock_output, archive=archive)
+        
+        self.assertEqual(downloader.find_existing("https://player.vimeo.com/video/76979871"),
+                         "Already in archive: 76979871")
+        archive.__contains__.assert_called_once_with("vimeo 76979871")
+        self.assertIsNone(downloader.find_existing("https://www.youtube.com/@channel"))
+    
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_completion_hooks_receive_finished_files(self, mock_makedirs, mock_popen):
+        """Test that files reported by yt-dlp are passed to completion hooks."""
+        def fake_popen(cmd, **kwargs):
+            record_file = cmd[cmd.index("--print-to-file") + 2]
+            with open(record_file, "w") as f:
+                f.write("test123\tYoutube\t22\t20240101\t/downloads/Test Video.mp4\n")
+            process = Mock()
+            process.stdout = iter([])
+            process.wait.return_value = 0
+            return process
+        mock_popen.side_effect = fake_popen
+        hook = Mock()
+        self.downloader.add_completion_hook(hook)
+        
+        self.assertTrue(self.downloader.download("https://youtube.com/watch?v=test123"))
+        
+        completed = hook.call_args[0][0]
+        self.assertEqual(completed.video_id, "test123")
+        self.assertEqual(completed.format_id, "22")
+        self.assertEqual(completed.filepath, "/downloads/Test Video.mp4")
+        self.assertEqual(completed.upload_date, "20240101")
+    
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_download_emits_json_events(self, mock_makedirs, mock_popen):
+        """Test the event sequence of a successful download."""
+        def fake_popen(cmd, **kwargs):
+            record_file = cmd[cmd.index("--print-to-file") + 2]
+            with open(record_file, "w") as f:
+                f.write("test123\tYoutube\t22\t20240101\t/downloads/Test Video Title.mp4\n")
+            process = Mock()
+            process.stdout = iter(MOCK_PROGRESS_OUTPUT)
+            process.wait.return_value = 0
+            return process
+        mock_popen.side_effect = fake_popen
+        stream = io.StringIO()
+        downloader = DownloaderService(self.mock_config, self.mock_output,
+                                       events=JsonEventWriter(stream, progress_interval=60))
+        
+        with patch('builtins.print') as mock_print:
+            self.assertTrue(downloader.download("https://youtube.com/watch?v=test123"))
+        downloader.bus.flush()
+        
+        mock_print.assert_not_called()
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        names = [e["event"] for e in events]
+        # Progress updates may be merged while queued, but the 100% one is never lost
+        self.assertEqual([n for i, n in enumerate(names) if n != "progress" or names[i - 1] != "progress"],
+                         ["queued", "extracting", "progress", "post_processing", "completed"])
+        self.assertTrue(all(e["job"] == 1 for e in events))
+        self.assertEqual(events[-3]["percent"], 100.0)
+        self.assertEqual(events[-2]["step"], "ffmpeg")
+        self.assertEqual(events[-1]["files"], ["/downloads/Test Video Title.mp4"])
+    
+    @patch('subprocess.Popen')
+    @patch('os.makedirs')
+    def test_failed_download_event_is_classified(self, mock_makedirs, mock_popen):
+        """Test that the failed event carries yt-dlp's error and its reason."""
+        mock_process = Mock()
+        mock_process.stdout = iter(MOCK_ERROR_OUTPUT)
+        mock_process.wait.return_value = 1
+        mock_popen.return_value = mock_process
+        downloader = DownloaderService(self.mock_config, self.mock_output)
+        events = []
+        downloader.bus.subscribe(events.append, (JobEvent, StageEvent, MetricEvent))
+        
+        with patch('builtins.print'):
+            self.assertFalse(downloader.download("https://youtube.com/watch?v=test123", job_id=7))
+        
+        self.assertEqual([type(e) for e in events], [StageEvent, MetricEvent, JobEvent])
+        self.assertEqual((events[0].job, events[0].stage), (7, Stage.EXTRACTING))
+        self.assertEqual(events[1].tags, {"reason": "private"})
+        failed = events[2]
+        self.assertEqual((failed.job, failed.state), (7, JobState.FAILED))
+        self.assertEqual(failed.details["error"], "This video is private")
+        self.assertEqual(failed.details["reason"], "private")
+        self.assertFalse(failed.details["retryable"])
+        self.assertEqual(failed.details["exit_code"], 1)
+    
     def test_progress_line_edge_cases(self):
         """Test progress line detection edge cases."""
         # Edge cases that should NOT be detected as progress
@@ -0,0 +1,156 @@
+import unittest
+import threading
+import time
+from unittest.mock import Mock
+from ytdl.core.eventbus import (AsyncSink, EventBus, JobEvent, JobState, LogEvent, MetricEvent,
+                                MetricsSink, OutputHandlerSink, ProgressEvent)
+
+
+def progress(job, percent):
+    return ProgressEvent(job, f"https://vimeo.com/{job}", "Video", percent)
+
+
+class TestEventBus(unittest.TestCase):
+
+    def test_sinks_receive_subscribed_types(self):
+        """Test delivery filtered by event type."""
+        bus = EventBus()
+        everything, logs = [], []
+        bus.subscribe(everything.append)
+        bus.subscribe(logs.append, (LogEvent,))
+
+        bus.publish(LogEvent(LogEvent.INFO, "hello"))
+        bus.publish(progress(1, 10.0))
+
+        self.assertEqual(len(everything), 2)
+        self.assertEqual([e.message for e in logs], ["hello"])
+
+    def test_failing_sink_does_not_stop_delivery(self):
+        """Test that sink errors are counted, not raised."""
+        bus = EventBus()
+        received = []
+        bus.subscribe(Mock(side_effect=RuntimeError("boom")))
+        bus.subscribe(received.append)
+
+        bus.publish(LogEvent(LogEvent.INFO, "hello"))
+
+        self.assertEqual(bus.errors, 1)
+        self.assertEqual(len(received), 1)
+
+    def test_unsubscribe(self):
+        """Test that removed sinks get no more events."""
+        bus = EventBus()
+        received = []
+        subscription = bus.subscribe(received.append)
+        bus.unsubscribe(subscription)
+
+        bus.publish(LogEvent(LogEvent.INFO, "hello"))
+
+        self.assertEqual(received, [])
+
+    def test_job_ids(self):
+        """Test that standalone jobs get increasing IDs."""
+        bus = EventBus()
+        self.assertEqual([bus.new_job_id() for _ in range(3)], [1, 2, 3])
+
+
+class TestAsyncSink(unittest.TestCase):
+
+    def _blocked_sink(self):
+        """Sink that holds its first event until released."""
+        release = threading.Event()
+        received = []
+
+        def sink(event):
+            release.wait(5)
+            received.append(event)
+        return sink, release, received
+
+    def test_slow_sink_does_not_block_publisher(self):
+        """Test that publishing returns immediately while the sink is stuck."""
+        sink, release, received = self._blocked_sink()
+        bus = EventBus()
+        bus.subscribe(sink, queue_size=100)
+
+        start = time.monotonic()
+        for i in range(50):
+            bus.publish(LogEvent(LogEvent.OUTPUT, f"line {i}"))
+        self.assertLess(time.monotonic() - start, 1.0)
+
+        release.set()
+        bus.close()
+        self.assertEqual([e.message for e in received], [f"line {i}" for i in range(50)])
+
+    def test_progress_is_coalesced_in_order(self):
+        """Test that queued progress for a job collapses to its latest update."""
+        sink, release, received = self._blocked_sink()
+        async_sink = AsyncSink(sink, queue_size=100)
+        async_sink(LogEvent(LogEvent.INFO, "first"))
+        time.sleep(0.05)
+
+        async_sink(JobEvent(1, JobState.QUEUED, "https://vimeo.com/1"))
+        for percent in (10.0, 20.0, 30.0):
+            async_sink(progress(1, percent))
+            async_sink(progress(2, percent))
+        async_sink(JobEvent(1, JobState.COMPLETED, "https://vimeo.com/1"))
+        release.set()
+        async_sink.close()
+
+        delivered = [(type(e).__name__, e.job, getattr(e, "percent", None)) for e in received[1:]]
+        self.assertEqual(delivered, [
+            ("JobEvent", 1, None),
+            ("ProgressEvent", 1, 30.0),
+            ("ProgressEvent", 2, 30.0),
+            ("JobEvent", 1, None),
+        ])
+
+    def test_full_queue_drops_oldest_progress_only(self):
+        """Test that a full queue drops progress updates, never lifecycle or log events."""
+        sink, release, received = self._blocked_sink()
+        async_sink = AsyncSink(sink, queue_size=3)
+        async_sink(LogEvent(LogEvent.INFO, "in flight"))
+        time.sleep(0.05)
+
+        async_sink(progress(1, 10.0))
+        async_sink(progress(2, 10.0))
+        async_sink(JobEvent(1, JobState.COMPLETED, "https://vimeo.com/1"))
+        async_sink(JobEvent(2, JobState.FAILED, "https://vimeo.com/2"))
+        async_sink(progress(2, 20.0))
+        for i in range(3):
+            async_sink(JobEvent(i + 3, JobState.QUEUED, f"https://vimeo.com/{i + 3}"))
+        release.set()
+        async_sink.close()
+
+        self.assertEqual(async_sink.dropped, 2)
+        delivered = [(type(e).__name__, e.job) for e in received[1:]]
+        self.assertEqual(delivered, [("JobEvent", 1), ("JobEvent", 2), ("JobEvent", 3),
+                                     ("JobEvent", 4), ("JobEvent", 5)])
+
+class TestSinks(unittest.TestCase):
+
+    def test_metrics_sink_sums_values(self):
+        """Test metric aggregation by name."""
+        metrics = MetricsSink()
+        metrics(MetricEvent("download.bytes", 100, 1))
+        metrics(MetricEvent("download.bytes", 50, 2))
+        metrics(LogEvent(LogEvent.INFO, "ignored"))
+
+        self.assertEqual(metrics.total("download.bytes"), 150)
+        self.assertEqual(metrics.count("download.bytes"), 2)
+        self.assertEqual(metrics.total("missing"), 0)
+
+    def test_output_handler_sink(self):
+        """Test that info and error messages reach an output handler."""
+        handler = Mock()
+        sink = OutputHandlerSink(handler)
+
+        sink(LogEvent(LogEvent.INFO, "Downloading"))
+        sink(LogEvent(LogEvent.ERROR, "Download failed"))
+        sink(LogEvent(LogEvent.OUTPUT, "[youtube] raw line"))
+
+        handler.info.assert_called_once_with("Downloading")
+        handler.error.assert_called_once_with("Download failed")
+
+
+if __name__ == '__main__':
+    unittest.main()
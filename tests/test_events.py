@@ -0,0 +1,96 @@
+import unittest
+import io
+import json
+from unittest.mock import Mock, patch
+from ytdl.core.events import JsonEventWriter, classify_failure, post_processor_step
+from ytdl.core.eventbus import JobEvent, JobState, LogEvent, Stage, StageEvent
+
+
+class TestClassification(unittest.TestCase):
+
+    def test_classify_failure(self):
+        """Test reason codes for common yt-dlp errors."""
+        cases = {
+            "[youtube] abc: Private video. Sign in if you've been granted access": "private",
+            "[youtube] abc: Sign in to confirm your age. This video may be inappropriate for some users.": "age_restricted",
+            "[youtube] abc: Video unavailable. The uploader has not made this video available in your country": "geo_restricted",
+            "[youtube] abc: Video unavailable": "unavailable",
+            "Unsupported URL: https://example.com/": "unsupported_url",
+            "unable to download video data: HTTP Error 429: Too Many Requests": "rate_limited",
+            "Unable to download webpage: <urlopen error [Errno -3] Temporary failure in name resolution>": "network",
+            "Postprocessing: Conversion failed!": "post_processing",
+            "Not enough disk space in /downloads: need 10 bytes, 0 available": "disk_full",
+            "something odd happened": "unknown",
+        }
+        for message, reason in cases.items():
+            with self.subTest(message=message):
+                self.assertEqual(classify_failure(message), reason)
+        self.assertEqual(classify_failure(None), "unknown")
+
+    def test_post_processor_step(self):
+        """Test detection of post-processor output lines."""
+        self.assertEqual(post_processor_step('[Merger] Merging formats into "a.mp4"'), "Merger")
+        self.assertEqual(post_processor_step("[FixupM3u8] Fixing MPEG-TS in MP4 container"), "FixupM3u8")
+        self.assertIsNone(post_processor_step("[youtube] abc: Downloading webpage"))
+
+
+class TestJsonEventWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.events = JsonEventWriter(self.stream, progress_interval=60)
+
+    def _events(self):
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_emit_writes_one_json_line(self):
+        """Test the common event fields and omission of None values."""
+        self.events.emit("queued", 3, url="https://vimeo.com/1", title=None)
+
+        self.assertEqual(self.stream.getvalue().count("\n"), 1)
+        event = self._events()[0]
+        self.assertEqual(event["event"], "queued")
+        self.assertEqual(event["job"], 3)
+        self.assertEqual(event["url"], "https://vimeo.com/1")
+        self.assertIsInstance(event["ts"], float)
+        self.assertNotIn("title", event)
+
+    def test_progress_is_throttled_per_job(self):
+        """Test that progress events are limited, except the final one."""
+        for percent in (1.0, 2.0, 3.0):
+            self.events.progress(1, {"percent": percent})
+            self.events.progress(2, {"percent": percent})
+        self.events.progress(1, {"percent": 100.0})
+
+        events = self._events()
+        self.assertEqual([(e["job"], e["percent"]) for e in events], [(1, 1.0), (2, 1.0), (1, 100.0)])
+
+    def test_bus_events_are_written(self):
+        """Test the mapping of typed bus events to JSON events."""
+        self.events(JobEvent(4, JobState.QUEUED, "https://youtu.be/x"))
+        self.events(StageEvent(4, Stage.POST_PROCESSING, step="Merger"))
+        self.events(JobEvent(4, JobState.FAILED, "https://youtu.be/x", reason="unavailable",
+                             retryable=False, exit_code=1))
+        self.events(LogEvent(LogEvent.OUTPUT, "[youtube] x: Downloading webpage", 4))
+
+        events = self._events()
+        self.assertEqual([e["event"] for e in events], ["queued", "post_processing", "failed"])
+        self.assertEqual(events[1]["step"], "Merger")
+        self.assertEqual(events[2]["reason"], "unavailable")
+        self.assertFalse(events[2]["retryable"])
+        self.assertEqual(events[2]["exit_code"], 1)
+
+    def test_broken_pipe_stops_output(self):
+        """Test that a closed reader doesn't break downloads."""
+        stream = Mock()
+        stream.write.side_effect = BrokenPipeError()
+        events = JsonEventWriter(stream)
+
+        events.emit("queued", 1)
+        events.emit("queued", 2)
+
+        stream.write.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import copy
+from ytdl.core.formats import (
+    FormatPlan, plan_formats, parse_height, is_plannable_quality, estimate_format_bytes
+)
+from tests.fixtures.mock_responses import MOCK_FORMATS_INFO
+
+
+class TestFormatPlanner(unittest.TestCase):
+
+    def test_parse_height(self):
+        """Test height parsing from quality strings."""
+        self.assertEqual(parse_height("720p"), 720)
+        self.assertEqual(parse_height("1080p"), 1080)
+        self.assertIsNone(parse_height("best"))
+        self.assertIsNone(parse_height("bestaudio/best"))
+
+    def test_is_plannable_quality(self):
+        """Test which quality settings the planner handles."""
+        self.assertTrue(is_plannable_quality("best"))
+        self.assertTrue(is_plannable_quality("480p"))
+        self.assertFalse(is_plannable_quality("worst"))
+        self.assertFalse(is_plannable_quality("bestaudio/best"))
+
+    def test_estimate_format_bytes_fallbacks(self):
+        """Test size estimation from filesize, filesize_approx and bitrate."""
+        self.assertEqual(estimate_format_bytes({"filesize": 100}), 100)
+        self.assertEqual(estimate_format_bytes({"filesize_approx": 200}), 200)
+        self.assertEqual(estimate_format_bytes({"tbr": 8}, duration=10), 10000)
+        self.assertIsNone(estimate_format_bytes({}))
+
+    def test_progressive_mp4_preferred_at_same_height(self):
+        """Test that a progressive MP4 skips merge and remux entirely."""
+        plan = plan_formats(MOCK_FORMATS_INFO, "720p")
+
+        self.assertEqual(plan.format_id, "22")
+        self.assertFalse(plan.needs_merge)
+        self.assertFalse(plan.needs_remux)
+        self.assertEqual(plan.ytdlp_args(), ["-f", "22"])
+
+    def test_best_quality_never_drops_resolution(self):
+        """Test that 'best' stays at the highest height even when it costs more."""
+        plan = plan_formats(MOCK_FORMATS_INFO, "best")
+
+        self.assertEqual(plan.height, 1080)
+        self.assertTrue(plan.needs_merge)
+
+    def test_split_plan_merges_straight_into_target(self):
+        """Test that non-MP4 merges go directly to MP4 without a remux pass."""
+        plan = plan_formats(MOCK_FORMATS_INFO, "best")
+
+        self.assertEqual(plan.format_id, "248+140")
+        self.assertEqual(plan.ytdlp_args(), ["-f", "248+140", "--merge-output-format", "mp4"])
+        self.assertNotIn("--remux-video", plan.ytdlp_args())
+
+    def test_split_plan_cheaper_than_large_progressive(self):
+        """Test that a split plan wins when the progressive format is much larger."""
+        info = copy.deepcopy(MOCK_FORMATS_INFO)
+        for fmt in info["formats"]:
+            if fmt["format_id"] == "22":
+                fmt["filesize_approx"] = 90000000
+
+        plan = plan_formats(info, "720p")
+
+        self.assertTrue(plan.needs_merge)
+        self.assertTrue(plan.format_id.endswith("+140"))
+
+    def test_progressive_non_mp4_needs_remux(self):
+        """Test that a progressive format in another container is remuxed."""
+        info = {"duration": 10, "formats": [
+            {"format_id": "43", "ext": "webm", "vcodec": "vp8", "acodec": "vorbis",
+             "height": 360, "filesize": 1000}
+        ]}
+
+        plan = plan_formats(info, "best")
+
+        self.assertTrue(plan.needs_remux)
+        self.assertEqual(plan.ytdlp_args(), ["-f", "43", "--remux-video", "mp4"])
+
+    def test_low_bitrate_audio_not_chosen_for_cost(self):
+        """Test that the planner does not trade audio quality for bytes."""
+        info = copy.deepcopy(MOCK_FORMATS_INFO)
+        info["formats"].append({"format_id": "139", "ext": "m4a", "vcodec": "none",
+                                "acodec": "mp4a.40.5", "abr": 48, "filesize": 1000000})
+
+        plan = plan_formats(info, "best")
+
+        self.assertNotIn("139", plan.format_id)
+
+    def test_no_plan_without_formats(self):
+        """Test that missing or unusable format lists produce no plan."""
+        self.assertIsNone(plan_formats({}, "best"))
+        self.assertIsNone(plan_formats({"formats": []}, "best"))
+        self.assertIsNone(plan_formats(MOCK_FORMATS_INFO, "worst"))
+        self.assertIsNone(plan_formats(MOCK_FORMATS_INFO, "144p"))
+
+    def test_format_plan_repr(self):
+        """Test FormatPlan string representation."""
+        plan = FormatPlan("22", "mp4", False, False, 100, 100.0)
+        self.assertIn("'22'", repr(plan))
+
+
+if __name__ == '__main__':
+    unittest.main()
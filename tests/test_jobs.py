@@ -0,0 +1,286 @@
+import unittest
+import threading
+from unittest.mock import Mock
+from ytdl.core.jobs import DownloadEngine, JobStatus, job_key
+from ytdl.core.eventbus import EventBus, JobEvent, JobState, ProgressEvent, Stage, StageEvent
+
+
+class TestDownloadEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.downloader = Mock()
+        self.downloader.find_existing.return_value = None
+        self.downloader.download.return_value = True
+        self.output = Mock()
+
+    def test_job_key_uses_video_id(self):
+        """Test that URL variants of one video share a key."""
+        self.assertEqual(job_key("https://youtu.be/dQw4w9WgXcQ"),
+                         job_key("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=1"))
+        self.assertEqual(job_key("https://player.vimeo.com/video/1"), job_key("https://vimeo.com/1?share=copy"))
+        self.assertEqual(job_key(" https://example.com/v/1 "), "https://example.com/v/1")
+
+    def test_jobs_run_on_workers(self):
+        """Test that submitted jobs are downloaded and counted."""
+        engine = DownloadEngine(self.downloader, workers=3, output_handler=self.output)
+        engine.start()
+        jobs = [engine.submit(f"https://vimeo.com/{i}", quality="720p") for i in range(5)]
+        engine.wait(timeout=5)
+        engine.shutdown()
+
+        self.assertEqual([j.id for j in jobs], [1, 2, 3, 4, 5])
+        self.assertTrue(all(j.status == JobStatus.DONE for j in jobs))
+        self.assertEqual(engine.counts()[JobStatus.DONE], 5)
+        self.downloader.download.assert_any_call("https://vimeo.com/0", output_dir=None, quality="720p", info=None, job_id=1)
+
+    def test_runs_downloads_concurrently(self):
+        """Test that several downloads are in flight at once."""
+        started = threading.Barrier(2, timeout=5)
+        self.downloader.download.side_effect = lambda *a, **k: started.wait() is not None
+        engine = DownloadEngine(self.downloader, workers=2, output_handler=self.output)
+        engine.start()
+        engine.submit("https://vimeo.com/1")
+        engine.submit("https://vimeo.com/2")
+
+        self.assertTrue(engine.wait(timeout=5))
+        engine.shutdown()
+        self.assertEqual(engine.counts()[JobStatus.DONE], 2)
+
+    def test_duplicates_are_rejected_while_active(self):
+        """Test deduplication against queued jobs."""
+        engine = DownloadEngine(self.downloader, output_handler=self.output)
+
+        self.assertIsNotNone(engine.submit("https://youtu.be/dQw4w9WgXcQ"))
+        self.assertIsNone(engine.submit("https://www.youtube.com/watch?v=dQw4w9WgXcQ"))
+        self.assertTrue(engine.is_queued("https://youtube.com/shorts/dQw4w9WgXcQ"))
+
+    def test_already_downloaded_urls_are_skipped(self):
+        """Test deduplication against the library and archive."""
+        self.downloader.find_existing.return_value = "Already in archive: x"
+        engine = DownloadEngine(self.downloader, output_handler=self.output)
+
+        self.assertIsNone(engine.submit("https://youtu.be/dQw4w9WgXcQ"))
+
+    def test_full_queue_without_blocking(self):
+        """Test that a non-blocking submit fails when the queue is full."""
+        engine = DownloadEngine(self.downloader, queue_size=1, output_handler=self.output)
+
+        self.assertIsNotNone(engine.submit("https://vimeo.com/1", block=False))
+        self.assertIsNone(engine.submit("https://vimeo.com/2", block=False))
+        self.assertFalse(engine.is_queued("https://vimeo.com/2"))
+
+    def test_cancel_queued_job(self):
+        """Test that a cancelled job is never downloaded."""
+        engine = DownloadEngine(self.downloader, output_handler=self.output)
+        job = engine.submit("https://vimeo.com/1")
+
+        self.assertTrue(engine.cancel(job.id))
+        engine.start()
+        engine.shutdown()
+
+        self.assertEqual(job.status, JobStatus.CANCELLED)
+        self.downloader.download.assert_not_called()
+        self.assertFalse(engine.cancel(job.id))
+
+    def test_engine_events(self):
+        """Test that queued, skipped and cancelled events carry the engine's job IDs."""
+        engine = DownloadEngine(self.downloader, output_handler=self.output)
+        job = engine.submit("https://vimeo.com/1")
+        engine.submit("https://vimeo.com/1")
+        engine.cancel(job.id)
+
+        events = [c.args[0] for c in self.downloader.bus.publish.call_args_list]
+        self.assertEqual([(e.job, e.state) for e in events],
+                         [(1, JobState.QUEUED), (None, JobState.SKIPPED), (1, JobState.CANCELLED)])
+        self.assertEqual(events[1].details, {"reason": "Already queued"})
+
+    def test_job_store_tracks_progress(self):
+        """Test that running jobs pick up stage and progress from the bus."""
+        bus = EventBus()
+        self.downloader.bus = bus
+        seen = threading.Event()
+
+        def download(url, **kwargs):
+            bus.publish(StageEvent(kwargs["job_id"], Stage.EXTRACTING, url=url))
+            bus.publish(ProgressEvent(kwargs["job_id"], url, url, 42.0))
+            seen.wait(5)
+            return True
+        self.downloader.download.side_effect = download
+        engine = DownloadEngine(self.downloader, output_handler=self.output)
+        engine.start()
+        job = engine.submit("https://vimeo.com/1")
+
+        for _ in range(100):
+            if job.percent is not None:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual((job.stage, job.percent), (Stage.EXTRACTING, 42.0))
+        seen.set()
+        engine.shutdown()
+
+    def test_failed_job_keeps_error_from_bus(self):
+        """Test that a failed download's error is recorded on its job."""
+        bus = EventBus()
+        self.downloader.bus = bus
+
+        def download(url, **kwargs):
+            bus.publish(JobEvent(kwargs["job_id"], JobState.FAILED, url, error="Private video"))
+            return False
+        self.downloader.download.side_effect = download
+        engine = DownloadEngine(self.downloader, output_handler=self.output)
+        engine.start()
+        job = engine.submit("https://vimeo.com/1")
+        engine.shutdown()
+
+        self.assertEqual(job.status, JobStatus.FAILED)
+        self.assertEqual(job.error, "Private video")
+
+    def test_job_ids_come_from_the_bus(self):
+        """Test that engine jobs and jobs given IDs by the bus never share an ID."""
+        bus = EventBus()
+        self.downloader.bus = bus
+        direct = bus.new_job_id()
+        engine = DownloadEngine(self.downloader, output_handler=self.output)
+
+        job = engine.submit("https://vimeo.com/1")
+
+        self.assertNotEqual(job.id, direct)
+        self.assertNotIn(bus.new_job_id(), (direct, job.id))
+        engine.shutdown(wait=False)
+
+    def test_failures_and_exceptions(self):
+        """Test that failed downloads and exceptions mark jobs failed."""
+        self.downloader.download.side_effect = [False, RuntimeError("boom")]
+        engine = DownloadEngine(self.downloader, workers=1, output_handler=self.output)
+        finished = []
+        engine.on_job_finished.append(finished.append)
+        engine.start()
+        engine.submit("https://vimeo.com/1")
+        job = engine.submit("https://vimeo.com/2")
+        engine.shutdown()
+
+        self.assertEqual([j.status for j in finished], [JobStatus.FAILED, JobStatus.FAILED])
+        self.assertEqual(job.error, "boom")
+        self.assertIs(engine.get(job.id), job)
+
+    def _start_blocked(self, engine):
+        """Start a job whose download blocks until released or cancelled."""
+        release = threading.Event()
+        started = threading.Event()
+
+        def download(url, **kwargs):
+            started.set()
+            release.wait(5)
+            return False
+        self.downloader.download.side_effect = download
+        self.downloader.cancel.side_effect = lambda job_id, pending=False: release.set() or True
+        engine.start()
+        job = engine.submit("https://vimeo.com/1")
+        self.assertTrue(started.wait(5))
+        return job, release
+
+    def test_pause_and_resume_running_job(self):
+        """Test that pause and resume reach the downloader for running jobs only."""
+        engine = DownloadEngine(self.downloader, output_handler=self.output)
+        job, release = self._start_blocked(engine)
+
+        self.assertTrue(engine.pause(job.id))
+        self.assertTrue(job.paused)
+        self.assertFalse(engine.pause(job.id))
+        self.assertTrue(engine.resume(job.id))
+        self.assertFalse(job.paused)
+        self.assertFalse(engine.resume(job.id))
+        self.downloader.pause.assert_called_once_with(job.id)
+        self.downloader.resume.assert_called_once_with(job.id)
+        release.set()
+        engine.shutdown()
+        self.assertFalse(engine.pause(job.id))
+
+    def test_cancel_running_job(self):
+        """Test that a cancelled running job ends as cancelled, not failed."""
+        engine = DownloadEngine(self.downloader, output_handler=self.output)
+        job, _ = self._start_blocked(engine)
+
+        self.assertTrue(engine.cancel(job.id))
+        self.assertFalse(engine.cancel(job.id))
+        engine.shutdown()
+
+        self.downloader.cancel.assert_called_once_with(job.id, pending=True)
+        self.assertEqual(job.status, JobStatus.CANCELLED)
+        self.assertEqual(engine.counts()[JobStatus.FAILED], 0)
+
+    def test_shutdown_without_wait_cancels_running_jobs(self):
+        """Test that an aborting shutdown stops running downloads."""
+        engine = DownloadEngine(self.downloader, output_handler=self.output)
+        job, _ = self._start_blocked(engine)
+
+        engine.shutdown(wait=False)
+
+        self.assertEqual(job.status, JobStatus.CANCELLED)
+
+    def test_lookahead_extracts_upcoming_jobs(self):
+        """Test that the jobs after those about to start are extracted while others download."""
+        self.downloader.get_info.side_effect = lambda url, **kwargs: {"title": url}
+        engine = DownloadEngine(self.downloader, workers=1, output_handler=self.output, lookahead=2)
+        job, release = self._start_blocked(engine)
+        upcoming = [engine.submit(url) for url in
+                    ("https://vimeo.com/2", "https://vimeo.com/showcase/3", "https://vimeo.com/4",
+                     "https://vimeo.com/5")]
+        upcoming[0].lookup.result(timeout=5)
+
+        self.assertEqual(upcoming[0].info, {"title": "https://vimeo.com/2"})
+        self.assertEqual(upcoming[0].title, "https://vimeo.com/2")
+        # The playlist is in the window but left to its download
+        self.assertIsNone(upcoming[1].lookup)
+        self.assertIsNone(upcoming[2].lookup)
+        release.set()
+        self.assertTrue(engine.wait(timeout=5))
+        engine.shutdown()
+
+        self.downloader.download.assert_any_call("https://vimeo.com/2", output_dir=None, quality=None,
+                                                 info={"title": "https://vimeo.com/2"}, job_id=upcoming[0].id)
+        extracted = [c.args[0] for c in self.downloader.get_info.call_args_list]
+        self.assertNotIn(job.url, extracted)
+        self.assertNotIn("https://vimeo.com/showcase/3", extracted)
+
+    def test_prefetch_uses_timeout_and_stops_on_shutdown(self):
+        """Test that background fetches are time-limited and none start after shutdown."""
+        self.downloader.get_info.return_value = {"title": "One"}
+        engine = DownloadEngine(self.downloader, output_handler=self.output, prefetch_timeout=12)
+        job = engine.submit("https://vimeo.com/1")
+
+        self.assertEqual(engine.prefetch(job).result(timeout=5), {"title": "One"})
+        kwargs = self.downloader.get_info.call_args.kwargs
+        self.assertEqual(kwargs["timeout"], 12)
+        self.assertFalse(kwargs["cancel"].is_set())
+
+        engine.shutdown(wait=False)
+        self.assertTrue(kwargs["cancel"].is_set())
+        late = engine.submit("https://vimeo.com/2")
+        self.assertIsNone(engine.prefetch(late).result(timeout=0))
+        self.assertIsNone(engine._prefetcher)
+        self.downloader.get_info.assert_called_once()
+
+    def test_lookahead_waits_for_idle_workers(self):
+        """Test that jobs an idle worker will take aren't extracted ahead."""
+        engine = DownloadEngine(self.downloader, workers=2, output_handler=self.output, lookahead=2)
+        engine.submit("https://vimeo.com/1")
+        engine.submit("https://vimeo.com/2")
+
+        self.downloader.get_info.assert_not_called()
+
+    def test_from_config(self):
+        """Test sizing the engine from config."""
+        config = Mock()
+        config.get.side_effect = lambda key, default=None: {"concurrent_downloads": 4}.get(key, default)
+
+        self.assertEqual(DownloadEngine.from_config(config, self.downloader).workers, 4)
+        self.assertEqual(DownloadEngine.from_config(config, self.downloader, workers=8).workers, 8)
+        engine = DownloadEngine.from_config(config, self.downloader)
+        self.assertEqual(engine.lookahead, 2)
+        self.assertEqual(engine.limiter.interval, 2.0)
+        self.assertEqual(engine.prefetch_timeout, 30.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
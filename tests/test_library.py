@@ -0,0 +1,155 @@
+import unittest
+import os
+import tempfile
+import shutil
+import sqlite3
+import time
+from ytdl.core.library import LibraryIndex
+from ytdl.core.downloader import CompletedDownload
+
+
+class TestLibraryIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.library = LibraryIndex(self.temp_dir, scan_workers=2)
+
+    def tearDown(self):
+        self.library.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _touch(self, *parts, content=b"data"):
+        path = os.path.join(self.temp_dir, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_database_created_in_download_dir(self):
+        """Test that the SQLite file lives in the indexed directory."""
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, ".ytdl-library.sqlite")))
+
+    def test_scan_finds_ids_in_nested_directories(self):
+        """Test that the scan indexes bracketed IDs in all subdirectories."""
+        path = self._touch("Channel A", "First video [dQw4w9WgXcQ].mp4", content=b"12345")
+        self._touch("Channel B", "Season 1", "Second [abcdefghijk].webm")
+        self._touch("notes.txt")
+        self._touch("Partial [zzzzzzzzzzz].mp4.part")
+
+        self.library.scan()
+
+        self.assertEqual(len(self.library), 2)
+        entry = self.library.lookup("dQw4w9WgXcQ")
+        self.assertEqual(entry["path"], path)
+        self.assertEqual(entry["size"], 5)
+        self.assertIsNone(self.library.lookup("zzzzzzzzzzz"))
+
+    def test_incremental_scan_skips_unchanged_directories(self):
+        """Test that only directories with a new mtime are re-read."""
+        self._touch("Channel A", "First [dQw4w9WgXcQ].mp4")
+        self._touch("Channel B", "Second [abcdefghijk].mp4")
+        self.assertEqual(self.library.scan(), 3)
+
+        self.assertEqual(self.library.scan(), 0)
+
+        new_dir = os.path.join(self.temp_dir, "Channel B")
+        self._touch("Channel B", "Third [lmnopqrstuv].mp4")
+        future = time.time() + 10
+        os.utime(new_dir, (future, future))
+
+        self.assertEqual(self.library.scan(), 1)
+        self.assertIsNotNone(self.library.lookup("lmnopqrstuv"))
+
+    def test_lookup_waits_for_background_scan(self):
+        """Test that lookups see the results of a scan still running."""
+        path = self._touch("Channel A", "First [dQw4w9WgXcQ].mp4")
+
+        thread = self.library.scan_in_background()
+
+        self.assertEqual(self.library.lookup("dQw4w9WgXcQ")["path"], path)
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+    def test_scan_drops_deleted_files(self):
+        """Test that files removed from disk disappear from the index."""
+        path = self._touch("Channel A", "First [dQw4w9WgXcQ].mp4")
+        self.library.scan()
+
+        os.remove(path)
+        self.library.scan(full=True)
+
+        self.assertIsNone(self.library.lookup("dQw4w9WgXcQ"))
+
+    def test_completion_hook_indexes_file(self):
+        """Test that finished downloads are indexed without a scan."""
+        path = self._touch("Some title.mp4")
+
+        self.library.record_completed(CompletedDownload("url", "abc123", "Youtube", "22", path))
+
+        self.assertTrue(self.library.contains("abc123"))
+        self.assertEqual(self.library.lookup("abc123")["format"], "22")
+
+    def test_hook_entries_survive_rescan(self):
+        """Test that hook-recorded files without bracketed IDs are kept by scans."""
+        path = self._touch("Some title.mp4")
+        self.library.add("abc123", path)
+
+        self.library.scan(full=True)
+
+        self.assertTrue(self.library.contains("abc123"))
+
+    def test_contains_drops_missing_files(self):
+        """Test that contains() validates the file still exists."""
+        path = self._touch("Some title.mp4")
+        self.library.add("abc123", path)
+        os.remove(path)
+
+        self.assertFalse(self.library.contains("abc123"))
+        self.assertIsNone(self.library.lookup("abc123"))
+
+
+    def test_entries_are_keyed_by_extractor(self):
+        """Test that the same ID from two sites doesn't collide."""
+        youtube = self._touch("A [12345678].mp4")
+        vimeo = self._touch("B [12345678].mp4")
+        self.library.add("12345678", youtube, extractor="Youtube")
+        self.library.add("12345678", vimeo, extractor="Vimeo")
+
+        self.assertEqual(self.library.lookup("12345678", "youtube")["path"], youtube)
+        self.assertEqual(self.library.lookup("12345678", "Vimeo")["path"], vimeo)
+        self.assertFalse(self.library.contains("12345678", "dailymotion"))
+
+    def test_scanned_files_match_any_extractor(self):
+        """Test that files found by a scan, whose extractor is unknown, still match."""
+        path = self._touch("Title [dQw4w9WgXcQ].mp4")
+        self.library.scan()
+
+        self.assertTrue(self.library.contains("dQw4w9WgXcQ", "youtube"))
+
+        self.library.record_completed(CompletedDownload("url", "dQw4w9WgXcQ", "Youtube", "22", path))
+        self.library.scan(full=True)
+
+        self.assertEqual(len(self.library), 1)
+        self.assertEqual(self.library.lookup("dQw4w9WgXcQ")["extractor"], "youtube")
+
+    def test_index_keyed_by_bare_id_is_migrated(self):
+        """Test that an index from before extractor keys keeps its entries."""
+        self.library.close()
+        db_path = os.path.join(self.temp_dir, ".ytdl-library.sqlite")
+        os.remove(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.executescript(
+            "CREATE TABLE videos (video_id TEXT PRIMARY KEY, path TEXT NOT NULL, dir TEXT NOT NULL, "
+            "size INTEGER, mtime REAL, format TEXT);"
+            "CREATE INDEX videos_dir ON videos(dir);"
+            "INSERT INTO videos VALUES ('abc123', '/x/a.mp4', '/x', 1, 1.0, '22');")
+        conn.close()
+
+        self.library = LibraryIndex(self.temp_dir)
+
+        entry = self.library.lookup("abc123", "youtube")
+        self.assertEqual((entry["path"], entry["extractor"], entry["format"]), ("/x/a.mp4", "", "22"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+from ytdl.core.metadata import MetadataCache, RateLimiter, SingleFlight
+
+
+class TestMetadataCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted at the cap."""
+        cache = MetadataCache(max_items=2)
+        cache.put("youtube a", {"id": "a"})
+        cache.put("youtube b", {"id": "b"})
+        cache.get("youtube a")
+        cache.put("youtube c", {"id": "c"})
+
+        self.assertEqual(cache.get("youtube a"), {"id": "a"})
+        self.assertIsNone(cache.get("youtube b"))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_entries_expire(self):
+        """Test that entries older than the TTL are dropped."""
+        cache = MetadataCache(ttl=60)
+        with patch('ytdl.core.metadata.time.monotonic', return_value=1000.0):
+            cache.put("vimeo 1", {"id": "1"})
+        with patch('ytdl.core.metadata.time.monotonic', return_value=1059.0):
+            self.assertIsNotNone(cache.get("vimeo 1"))
+        with patch('ytdl.core.metadata.time.monotonic', return_value=1061.0):
+            self.assertIsNone(cache.get("vimeo 1"))
+        self.assertEqual(len(cache), 0)
+
+    def test_from_config(self):
+        """Test that a size or TTL of 0 disables the cache."""
+        config = Mock()
+        values = {"metadata_cache_size": 10, "metadata_cache_ttl": 30}
+        config.get.side_effect = lambda key, default=None: values.get(key, default)
+        cache = MetadataCache.from_config(config)
+        self.assertEqual((cache.max_items, cache.ttl), (10, 30.0))
+
+        values["metadata_cache_size"] = 0
+        self.assertIsNone(MetadataCache.from_config(config))
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def _slow(self, result="info"):
+        def fn():
+            self.calls += 1
+            self.release.wait(5)
+            return result
+        return fn
+
+    def _start(self, key, fn, results, **kwargs):
+        thread = threading.Thread(target=lambda: results.append(self.flight.run(key, fn, **kwargs)))
+        thread.start()
+        return thread
+
+    def _wait_for_leader(self):
+        for _ in range(500):
+            if self.flight.in_flight():
+                return
+            time.sleep(0.01)
+        self.fail("call never started")
+
+    def test_concurrent_callers_share_one_call(self):
+        """Test that callers arriving during a call get its result without running it."""
+        results = []
+        threads = [self._start("youtube x", self._slow(), results)]
+        self._wait_for_leader()
+        threads += [self._start("youtube x", self._slow("other"), results) for _ in range(3)]
+        time.sleep(0.05)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, ["info"] * 4)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.flight.in_flight(), 0)
+
+    def test_waiter_timeout_and_cancel(self):
+        """Test that a waiter gives up on its own timeout or cancel event."""
+        results = []
+        leader = self._start("youtube x", self._slow(), results)
+        self._wait_for_leader()
+
+        self.assertIsNone(self.flight.run("youtube x", self._slow(), timeout=0.05))
+        cancel = threading.Event()
+        cancel.set()
+        self.assertIsNone(self.flight.run("youtube x", self._slow(), cancel=cancel))
+        self.release.set()
+        leader.join(5)
+        self.assertEqual(results, ["info"])
+        self.assertEqual(self.calls, 1)
+
+    def test_waiters_retry_when_leader_is_cancelled(self):
+        """Test that a cancelled leader's empty result isn't passed to waiters that still want it."""
+        cancel = threading.Event()
+        started = threading.Event()
+
+        def cancelled_fetch():
+            started.set()
+            cancel.wait(5)
+            return None
+        results = []
+        leader = self._start("youtube x", cancelled_fetch, results, cancel=cancel)
+        self.assertTrue(started.wait(5))
+        waiter = self._start("youtube x", lambda: "info", results)
+        time.sleep(0.05)
+        cancel.set()
+        leader.join(5)
+        waiter.join(5)
+
+        self.assertEqual(sorted(results, key=str), [None, "info"])
+
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_calls_are_spaced(self):
+        """Test that callers get evenly spaced slots."""
+        limiter = RateLimiter(6000)
+        start = time.monotonic()
+        for _ in range(3):
+            self.assertTrue(limiter.wait())
+        self.assertGreaterEqual(time.monotonic() - start, 0.02)
+
+    def test_wait_can_be_cancelled(self):
+        """Test that a waiting caller stops when its cancel event is set."""
+        limiter = RateLimiter(1)
+        cancel = threading.Event()
+        self.assertTrue(limiter.wait(cancel))
+        cancel.set()
+        self.assertFalse(limiter.wait(cancel))
+
+    def test_zero_rate_means_no_limit(self):
+        """Test that a rate of 0 creates no limiter."""
+        self.assertIsNone(RateLimiter.per_minute(0))
+        self.assertEqual(RateLimiter.per_minute(30).interval, 2.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import threading
+import unittest
+from ytdl.gui.utils.metadata_pool import MetadataPool
+
+
+class TestMetadataPool(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.started = []
+        self.cancelled = []
+        self.lock = threading.Lock()
+
+        def fetch(url, cancel):
+            with self.lock:
+                self.started.append(url)
+            while not self.release.wait(0.01):
+                if cancel.is_set():
+                    self.cancelled.append(url)
+                    return None
+            return {"title": url}
+
+        self.pool = MetadataPool(fetch, workers=2)
+
+    def tearDown(self):
+        self.release.set()
+        self.pool.shutdown()
+
+    def _wait_until(self, condition):
+        for _ in range(500):
+            if condition():
+                return
+            threading.Event().wait(0.01)
+        self.fail("condition not reached")
+
+    def test_concurrency_is_bounded(self):
+        """Test that no more fetches run at once than there are workers."""
+        for i in range(10):
+            self.pool.request(f"https://example.com/{i}", i, lambda info: None)
+
+        self._wait_until(lambda: len(self.started) == 2)
+        threading.Event().wait(0.05)
+        self.assertEqual(len(self.started), 2)
+        self.assertEqual(self.pool.pending(), 10)
+
+    def test_same_video_is_fetched_once(self):
+        """Test that requests for one video share a single fetch."""
+        results = []
+        done = threading.Event()
+
+        def callback(info):
+            results.append(info)
+            if len(results) == 2:
+                done.set()
+
+        self.pool.request("https://www.youtube.com/watch?v=dQw4w9WgXcQ", 1, callback)
+        self.pool.request("https://youtu.be/dQw4w9WgXcQ", 2, callback)
+        self.release.set()
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(len(self.started), 1)
+        self.assertEqual(results[0], results[1])
+
+    def test_cancel_stops_fetch_nobody_wants(self):
+        """Test that cancelling the last owner stops a running fetch without a callback."""
+        callback_a = []
+        callback_b = []
+        self.pool.request("https://example.com/a", "a", callback_a.append)
+        self.pool.request("https://example.com/a", "b", callback_b.append)
+        self._wait_until(lambda: self.started)
+
+        self.pool.cancel("a")
+        threading.Event().wait(0.05)
+        self.assertEqual(self.cancelled, [])
+
+        self.pool.cancel("b")
+        self._wait_until(lambda: self.cancelled)
+        self.assertEqual(self.pool.pending(), 0)
+        self.assertEqual(callback_a + callback_b, [])
+
+    def test_cancel_before_start_skips_fetch(self):
+        """Test that a queued fetch that was cancelled never runs."""
+        for i in range(2):
+            self.pool.request(f"https://example.com/{i}", i, lambda info: None)
+        self.pool.request("https://example.com/queued", "queued", lambda info: None)
+
+        self.pool.cancel("queued")
+        self.release.set()
+        self._wait_until(lambda: self.pool.pending() == 0)
+
+        self.assertNotIn("https://example.com/queued", self.started)
+
+
+
+class TestMetadataPoolBatches(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.release = threading.Event()
+
+        def fetch_many(urls, cancel):
+            self.calls.append(list(urls))
+            self.release.wait(5)
+            # The last URL of each batch fails
+            return {url: {"title": url} for url in urls[:-1]}
+
+        self.pool = MetadataPool(lambda url, cancel: {"title": "single"}, workers=1,
+                                 fetch_many=fetch_many, batch_size=3)
+
+    def tearDown(self):
+        self.release.set()
+        self.pool.shutdown()
+
+    def test_requests_are_fetched_in_batches(self):
+        """Test that bulk requests share yt-dlp calls and get their own results."""
+        results = {}
+        done = threading.Event()
+
+        def callback(owner):
+            def deliver(info):
+                results[owner] = info
+                if len(results) == 7:
+                    done.set()
+            return deliver
+
+        self.pool.request_many((f"https://example.com/{i}", i, callback(i)) for i in range(7))
+        self.release.set()
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual([len(c) for c in self.calls], [3, 3])
+        self.assertEqual(results[0], {"title": "https://example.com/0"})
+        self.assertIsNone(results[2])
+        # A batch of one uses the single fetch
+        self.assertEqual(results[6], {"title": "single"})
+
+    def test_batch_is_cancelled_when_nobody_waits(self):
+        """Test that a batch fetch is only cancelled once all of its requests are."""
+        self.pool.request_many((f"https://example.com/{i}", i, lambda info: None) for i in range(3))
+        for _ in range(500):
+            if self.calls:
+                break
+            threading.Event().wait(0.01)
+        batch = self.pool._requests["https://example.com/0"].batch
+
+        self.pool.cancel(0)
+        self.pool.cancel(1)
+        self.assertFalse(batch.cancel.is_set())
+        self.pool.cancel(2)
+        self.assertTrue(batch.cancel.is_set())
+        self.assertEqual(self.pool.pending(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
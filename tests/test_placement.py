@@ -0,0 +1,192 @@
+import unittest
+import os
+import tempfile
+import shutil
+from unittest.mock import Mock, patch
+from ytdl.core.placement import COMPACT_MIN_LINES, OutputPlacement, OutputRoot, PlacementIndex
+
+
+class TestPlacementIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_file = os.path.join(self.temp_dir, "placement.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_record_and_lookup(self):
+        """Test recording a placement and looking it up."""
+        index = PlacementIndex(self.index_file)
+        index.record("abc123", "/disk1")
+
+        self.assertEqual(index.lookup("abc123")["root"], "/disk1")
+        self.assertIsNone(index.lookup("missing"))
+
+    def test_index_persists_and_latest_entry_wins(self):
+        """Test that the index reloads from disk with the newest entry per video."""
+        index = PlacementIndex(self.index_file)
+        index.record("abc123", "/disk1")
+        index.record("abc123", "/disk2")
+
+        reloaded = PlacementIndex(self.index_file)
+
+        self.assertEqual(len(reloaded), 1)
+        self.assertEqual(reloaded.lookup("abc123")["root"], "/disk2")
+
+    def test_index_tolerates_torn_line(self):
+        """Test that a partially written last line is ignored."""
+        with open(self.index_file, "w") as f:
+            f.write('{"id": "abc123", "root": "/disk1"}\n{"id": "tor')
+
+        index = PlacementIndex(self.index_file)
+
+        self.assertEqual(len(index), 1)
+
+    def test_superseded_lines_are_compacted(self):
+        """Test that the file is rewritten once superseded lines pile up."""
+        index = PlacementIndex(self.index_file)
+        for i in range(COMPACT_MIN_LINES):
+            index.record(f"video{i % 10}", "/disk1")
+
+        with open(self.index_file) as f:
+            self.assertEqual(len(f.readlines()), 10)
+        index.record("video0", "/disk2", "/disk2/a.mp4")
+        reloaded = PlacementIndex(self.index_file)
+        self.assertEqual(len(reloaded), 10)
+        self.assertEqual(reloaded.lookup("video0")["path"], "/disk2/a.mp4")
+
+    def test_oversized_file_is_compacted_on_load(self):
+        """Test that an index left with many superseded lines is compacted when loaded."""
+        with open(self.index_file, "w") as f:
+            for i in range(COMPACT_MIN_LINES):
+                f.write('{"id": "abc123", "root": "/disk%d"}\n' % (i % 2))
+
+        index = PlacementIndex(self.index_file)
+
+        self.assertEqual(index.lookup("abc123")["root"], "/disk1")
+        with open(self.index_file) as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+
+class TestOutputPlacement(unittest.TestCase):
+
+    def setUp(self):
+        self.roots = [OutputRoot("/disk1"), OutputRoot("/disk2"), OutputRoot("/disk3")]
+
+    def test_invalid_configuration(self):
+        """Test that empty roots and unknown policies are rejected."""
+        with self.assertRaises(ValueError):
+            OutputPlacement([])
+        with self.assertRaises(ValueError):
+            OutputPlacement(self.roots, policy="random")
+
+    def test_most_free_prefers_weighted_free_space(self):
+        """Test that most_free picks the root with the most weighted space."""
+        reservations = Mock()
+        free = {"/disk1": 100, "/disk2": 300, "/disk3": 200}
+        reservations.available_bytes.side_effect = lambda path: free[path]
+        placement = OutputPlacement(self.roots, "most_free", reservations)
+
+        self.assertEqual([r.path for r in placement.rank()], ["/disk2", "/disk3", "/disk1"])
+
+        self.roots[0].weight = 10
+        self.assertEqual(placement.rank()[0].path, "/disk1")
+
+    def test_round_robin_respects_weights(self):
+        """Test smooth weighted round-robin distribution."""
+        roots = [OutputRoot("/disk1", 2), OutputRoot("/disk2", 1)]
+        placement = OutputPlacement(roots, "round_robin")
+
+        picks = [placement.place()[0] for _ in range(6)]
+
+        self.assertEqual(picks.count("/disk1"), 4)
+        self.assertEqual(picks.count("/disk2"), 2)
+
+    def test_hash_by_channel_is_stable(self):
+        """Test that a channel always maps to the same root."""
+        placement = OutputPlacement(self.roots, "hash_by_channel")
+        info = {"id": "v1", "channel_id": "UC123"}
+
+        first = placement.rank(info)[0].path
+        for _ in range(5):
+            self.assertEqual(placement.rank({"channel_id": "UC123"})[0].path, first)
+
+    def test_hash_by_channel_spreads_channels(self):
+        """Test that different channels spread across roots."""
+        placement = OutputPlacement(self.roots, "hash_by_channel")
+
+        chosen = {placement.rank({"channel_id": f"UC{i}"})[0].path for i in range(50)}
+
+        self.assertEqual(len(chosen), 3)
+
+    def test_hash_by_channel_uses_url_without_info(self):
+        """Test that collections without info are spread by their URL, not all on one root."""
+        placement = OutputPlacement(self.roots, "hash_by_channel")
+        urls = [f"https://www.youtube.com/@channel{i}" for i in range(50)]
+
+        chosen = {placement.place(None, None, url)[0] for url in urls}
+
+        self.assertEqual(len(chosen), 3)
+        self.assertEqual(placement.rank(None, "https://youtube.com/@Channel1/videos")[0].path,
+                         placement.rank(None, urls[1])[0].path)
+
+    def test_place_skips_roots_that_do_not_fit(self):
+        """Test that a job goes to another volume when its first choice is full."""
+        reservations = Mock()
+        reservations.available_bytes.side_effect = lambda path: {"/disk1": 3, "/disk2": 2, "/disk3": 1}[path]
+        reservation = Mock()
+        reservations.try_reserve.side_effect = lambda path, nbytes: reservation if path == "/disk2" else None
+        placement = OutputPlacement(self.roots, "most_free", reservations)
+
+        root, result = placement.place({"id": "v1"}, 1000)
+
+        self.assertEqual(root, "/disk2")
+        self.assertIs(result, reservation)
+        self.assertEqual(placement.index.lookup("v1")["root"], "/disk2")
+
+    def test_place_waits_on_preferred_root_when_nothing_fits(self):
+        """Test that the job waits on its first choice if no root has space."""
+        reservations = Mock()
+        reservations.available_bytes.side_effect = lambda path: {"/disk1": 3, "/disk2": 2, "/disk3": 1}[path]
+        reservations.try_reserve.return_value = None
+        placement = OutputPlacement(self.roots, "most_free", reservations)
+
+        root, _ = placement.place({"id": "v1"}, 1000)
+
+        self.assertEqual(root, "/disk1")
+        reservations.reserve.assert_called_once_with("/disk1", 1000)
+
+    def test_known_video_returns_to_its_root(self):
+        """Test that re-downloads are placed where the video already lives."""
+        placement = OutputPlacement(self.roots, "round_robin")
+        placement.index.record("v1", "/disk3")
+
+        self.assertEqual(placement.rank({"id": "v1"})[0].path, "/disk3")
+
+    def test_from_config(self):
+        """Test building placement from config."""
+        config = Mock()
+        config.get.side_effect = lambda key, default=None: {
+            "output_roots": ["/disk1", {"path": "/disk2", "weight": 3}],
+            "placement_policy": "round_robin",
+            "placement_index": None,
+        }.get(key, default)
+
+        with patch.object(PlacementIndex, '_load'):
+            placement = OutputPlacement.from_config(config)
+
+        self.assertEqual([r.path for r in placement.roots], ["/disk1", "/disk2"])
+        self.assertEqual(placement.roots[1].weight, 3.0)
+        self.assertEqual(placement.policy, "round_robin")
+        self.assertEqual(placement.index.index_file, os.path.join("/disk1", ".ytdl-placement.jsonl"))
+
+    def test_from_config_without_roots(self):
+        """Test that no placement is created without output roots."""
+        config = Mock()
+        config.get.return_value = []
+        self.assertIsNone(OutputPlacement.from_config(config))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from ytdl.core.processes import (CAN_PAUSE, JobProcess, ProcessRegistry, interrupt_on_termination,
+                                 process_group_kwargs)
+
+
+def spawn(code: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-c", code], **process_group_kwargs())
+
+
+class TestJobProcess(unittest.TestCase):
+
+    def test_partial_files_from_output(self):
+        """Test that destinations announced by yt-dlp map to their partial files."""
+        with tempfile.TemporaryDirectory() as tmp:
+            video = os.path.join(tmp, "Title.f137.mp4")
+            merged = os.path.join(tmp, "Title.mp4")
+            for path in (video + ".part", video + ".part-Frag3", video + ".ytdl", os.path.join(tmp, "Other.mp4.part")):
+                open(path, "w").close()
+            entry = JobProcess(1, "https://youtu.be/x", None)
+            entry.note_output(f"[download] Destination: {video}")
+            entry.note_output(f'[Merger] Merging formats into "{merged}"')
+            entry.note_output("[download]  42.0% of 10.00MiB")
+
+            self.assertEqual(entry.destinations, [video, merged])
+            self.assertEqual(sorted(entry.partial_files()),
+                             sorted([video + ".ytdl", video + ".part", video + ".part-Frag3"]))
+
+            open(video, "w").close()
+            self.assertIn(video, entry.partial_files())
+
+
+@unittest.skipIf(os.name == "nt", "process groups are POSIX-only")
+class TestProcessRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ProcessRegistry()
+
+    @unittest.skipUnless(CAN_PAUSE, "no SIGSTOP")
+    def test_pause_and_resume(self):
+        """Test that a paused process is stopped until resumed."""
+        process = spawn("import time; time.sleep(30)")
+        self.addCleanup(process.kill)
+        self.registry.register(1, "https://youtu.be/x", process)
+
+        self.assertTrue(self.registry.pause(1))
+        self.assertFalse(self.registry.pause(1))
+        self.assertTrue(self.registry.get(1).paused)
+        self.assertTrue(self.registry.resume(1))
+        self.assertFalse(self.registry.resume(1))
+        self.assertIsNone(process.poll())
+
+    def test_cancel_terminates_group_and_deletes_partial_files(self):
+        """Test that cancelling a paused job ends its children and cleans up."""
+        with tempfile.TemporaryDirectory() as tmp:
+            destination = os.path.join(tmp, "Title.mp4")
+            open(destination + ".part", "w").close()
+            pid_file = os.path.join(tmp, "child")
+            # The child stands in for the ffmpeg process yt-dlp starts
+            process = spawn("import subprocess, sys, time\n"
+                            f"child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+                            f"open({pid_file!r}, 'w').write(str(child.pid))\n"
+                            "time.sleep(30)")
+            self.addCleanup(process.kill)
+            entry = self.registry.register(1, "https://youtu.be/x", process)
+            entry.note_output(f"[download] Destination: {destination}")
+            for _ in range(200):
+                if os.path.exists(pid_file) and open(pid_file).read():
+                    break
+                time.sleep(0.01)
+            child = int(open(pid_file).read())
+            if CAN_PAUSE:
+                self.registry.pause(1)
+
+            self.assertTrue(self.registry.cancel(1))
+            self.assertFalse(self.registry.cancel(1))
+            self.registry.finish_cancelled(entry)
+
+            self.assertIsNotNone(process.poll())
+            self.assertFalse(os.path.exists(destination + ".part"))
+            for _ in range(200):
+                try:
+                    os.kill(child, 0)
+                except ProcessLookupError:
+                    break
+                time.sleep(0.01)
+            else:
+                os.kill(child, signal.SIGKILL)
+                self.fail("child process survived the cancel")
+
+    def test_cancel_before_start(self):
+        """Test that a job cancelled before its process starts is stopped on registration."""
+        self.assertFalse(self.registry.cancel(1))
+        self.assertTrue(self.registry.cancel(1, pending=True))
+        process = spawn("import time; time.sleep(30)")
+        self.addCleanup(process.kill)
+
+        entry = self.registry.register(1, "https://youtu.be/x", process)
+
+        self.assertTrue(entry.cancelled)
+        self.assertIsNotNone(process.wait(timeout=5))
+        self.registry.unregister(1)
+        self.assertEqual(self.registry.running(), [])
+
+
+
+@unittest.skipUnless(hasattr(signal, "SIGHUP"), "POSIX signals")
+class TestInterruptOnTermination(unittest.TestCase):
+
+    def setUp(self):
+        for sig in (signal.SIGTERM, signal.SIGHUP):
+            self.addCleanup(signal.signal, sig, signal.getsignal(sig))
+        interrupt_on_termination()
+
+    def test_sigterm_and_sighup_interrupt(self):
+        """Test that termination signals unwind like Ctrl+C, so jobs get cancelled."""
+        for sig in (signal.SIGTERM, signal.SIGHUP):
+            with self.assertRaises(KeyboardInterrupt):
+                os.kill(os.getpid(), sig)
+                time.sleep(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+import unittest
+import io
+import os
+import time
+from unittest.mock import Mock, patch
+from ytdl.core.progress import ByteCounter, ProgressRenderer, parse_progress_line, parse_size
+
+
+class TestParseProgress(unittest.TestCase):
+
+    def test_parse_size_units(self):
+        """Test binary and decimal size units."""
+        self.assertEqual(parse_size("10.50MiB"), int(10.5 * 1024 ** 2))
+        self.assertEqual(parse_size("1.5GB"), 1500000000)
+        self.assertEqual(parse_size("512B"), 512)
+        self.assertIsNone(parse_size("N/A"))
+
+    def test_parse_full_progress_line(self):
+        """Test a typical yt-dlp progress line."""
+        progress = parse_progress_line("[download]  25.5% of 10.50MiB at  2.1MiB/s ETA 00:03")
+
+        self.assertEqual(progress["percent"], 25.5)
+        self.assertEqual(progress["total_bytes"], int(10.5 * 1024 ** 2))
+        self.assertEqual(progress["downloaded_bytes"], int(10.5 * 1024 ** 2 * 0.255))
+        self.assertEqual(progress["speed"], "2.1MiB/s")
+        self.assertEqual(progress["eta"], "00:03")
+
+    def test_parse_partial_and_estimated_lines(self):
+        """Test lines with an estimated size or missing fields."""
+        progress = parse_progress_line("[download]  50.0% of ~ 100.00MiB at Unknown B/s ETA Unknown")
+        self.assertEqual(progress["total_bytes"], 100 * 1024 ** 2)
+        self.assertIsNone(progress["eta"])
+
+        progress = parse_progress_line("[download]100% of 1.0MiB")
+        self.assertEqual(progress["percent"], 100.0)
+
+    def test_non_progress_lines(self):
+        """Test that other lines are not parsed."""
+        for line in ["[download] Destination: x.mp4", "[ffmpeg] Merging", ""]:
+            with self.subTest(line=line):
+                self.assertIsNone(parse_progress_line(line))
+
+
+class TestByteCounter(unittest.TestCase):
+
+    def test_sums_streams(self):
+        """Test that the audio stream's bytes add to the finished video stream."""
+        counter = ByteCounter()
+        counter.update({"downloaded_bytes": 500, "total_bytes": 1000})
+        counter.update({"downloaded_bytes": 1000, "total_bytes": 1000})
+        written = counter.update({"downloaded_bytes": 100, "total_bytes": 200})
+
+        self.assertEqual(written, 1100)
+
+
+class TestProgressRenderer(unittest.TestCase):
+
+    def test_default_mode_follows_tty(self):
+        """Test that non-TTY streams get plain progress lines."""
+        self.assertEqual(ProgressRenderer(io.StringIO()).mode, "plain")
+        tty = io.StringIO()
+        tty.isatty = lambda: True
+        self.assertEqual(ProgressRenderer(tty).mode, "bars")
+        with self.assertRaises(ValueError):
+            ProgressRenderer(io.StringIO(), mode="fancy")
+
+    def test_bars_are_rate_limited_with_one_write_per_frame(self):
+        """Test that many updates produce few, single-write frames."""
+        stream = Mock()
+        renderer = ProgressRenderer(stream, mode="bars", max_fps=10)
+        start = time.monotonic()
+        for i in range(200):
+            renderer.update("job1", {"percent": i / 2}, "First video")
+            renderer.update("job2", {"percent": i / 4}, "Second video")
+            time.sleep(0.001)
+        time.sleep(0.15)
+        renderer.close()
+        elapsed = time.monotonic() - start
+
+        frames = [c.args[0] for c in stream.write.call_args_list if "First video" in c.args[0]]
+        self.assertGreater(len(frames), 0)
+        self.assertLessEqual(len(frames), elapsed * 10 + 2)
+        self.assertIn("Second video", frames[-1])
+
+    def test_redraw_replaces_previous_block(self):
+        """Test that each frame moves the cursor back over the previous block."""
+        stream = io.StringIO()
+        renderer = ProgressRenderer(stream, mode="bars", max_fps=100)
+        renderer.update("job1", {"percent": 10.0}, "Video")
+        time.sleep(0.05)
+        renderer.update("job1", {"percent": 20.0}, "Video")
+        time.sleep(0.05)
+        renderer.close()
+
+        output = stream.getvalue()
+        self.assertIn("\x1b[1F\x1b[J", output)
+        self.assertIn(" 20.0%", output)
+
+    def test_bars_fit_terminal_width(self):
+        """Test that bar lines are clipped so they never wrap."""
+        stream = io.StringIO()
+        renderer = ProgressRenderer(stream, mode="bars", max_fps=100)
+        with patch('ytdl.core.progress.shutil.get_terminal_size', return_value=os.terminal_size((60, 24))):
+            renderer.update("job1", {"percent": 10.0, "total_bytes": 10 ** 9, "speed": "1.00MiB/s",
+                                     "eta": "00:10"}, "A video with a rather long title")
+            time.sleep(0.05)
+            renderer.close()
+
+        lines = stream.getvalue().replace("\x1b[1F\x1b[J", "").splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(all(len(line) <= 59 for line in lines))
+
+    def test_log_prints_above_bars(self):
+        """Test that log lines clear the bar block first."""
+        stream = io.StringIO()
+        renderer = ProgressRenderer(stream, mode="bars", max_fps=100)
+        renderer.update("job1", {"percent": 10.0}, "Video")
+        time.sleep(0.05)
+        renderer.log("[youtube] Extracting URL")
+        renderer.close()
+
+        output = stream.getvalue()
+        self.assertIn("\x1b[1F\x1b[J[youtube] Extracting URL\n", output)
+
+    def test_plain_mode_logs_periodically(self):
+        """Test that plain mode prints progress lines at most once per interval."""
+        stream = io.StringIO()
+        renderer = ProgressRenderer(stream, mode="plain", max_fps=100, log_interval=10)
+        for percent in range(0, 100, 10):
+            renderer.update("job1", {"percent": float(percent)}, "Video")
+        time.sleep(0.05)
+        renderer.close()
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].startswith("[progress] Video:"))
+        self.assertNotIn("\x1b", stream.getvalue())
+
+    def test_finish_and_snapshot(self):
+        """Test that finished jobs are removed."""
+        renderer = ProgressRenderer(io.StringIO(), mode="plain")
+        renderer.update("job1", {"percent": 50.0})
+        self.assertEqual(renderer.snapshot()["job1"].percent, 50.0)
+
+        renderer.finish("job1")
+        renderer.close()
+        self.assertEqual(renderer.snapshot(), {})
+
+    def test_wrapped_handler_clears_block(self):
+        """Test that wrapped output handlers print above the bars."""
+        stream = io.StringIO()
+        renderer = ProgressRenderer(stream, mode="bars", max_fps=100)
+        handler = Mock()
+        handler.info.side_effect = lambda message: stream.write(f"INFO: {message}\n")
+        renderer.update("job1", {"percent": 10.0}, "Video")
+        time.sleep(0.05)
+
+        renderer.wrap(handler).info("Download completed successfully")
+        renderer.close()
+
+        self.assertIn("\x1b[J" + "INFO: Download completed successfully", stream.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from ytdl.gui.models.download_item import DownloadItem
+from ytdl.gui.models.queue_model import QueueModel, COMPACT_MIN_DEAD
+
+
+class TestQueueModel(unittest.TestCase):
+
+    def setUp(self):
+        self.model = QueueModel()
+        self.items = [DownloadItem(f"https://youtu.be/video{i}") for i in range(10)]
+        for item in self.items:
+            self.model.add(item)
+
+    def test_add_assigns_job_ids(self):
+        """Test that items get unique job IDs and can be looked up by them."""
+        ids = [item.job_id for item in self.items]
+        self.assertEqual(len(set(ids)), 10)
+        self.assertIs(self.model.get(ids[3]), self.items[3])
+        self.assertIn(ids[3], self.model)
+        self.assertEqual(len(self.model), 10)
+
+    def test_window_returns_visible_rows(self):
+        """Test that a window of rows is taken from the current order."""
+        self.assertEqual(self.model.window(2, 3), self.items[2:5])
+        self.assertEqual(self.model.window(8, 5), self.items[8:])
+        self.assertEqual(self.model.window(10, 5), [])
+
+    def test_remove_shifts_rows(self):
+        """Test that removing an item moves the following rows up."""
+        removed = self.model.remove(self.items[2].job_id)
+
+        self.assertIs(removed, self.items[2])
+        self.assertIsNone(self.model.get(self.items[2].job_id))
+        self.assertEqual(len(self.model), 9)
+        self.assertIs(self.model.at(2), self.items[3])
+        self.assertEqual(self.model.row_of(self.items[5].job_id), 4)
+        self.assertEqual(self.model.window(1, 3), [self.items[1], self.items[3], self.items[4]])
+        self.assertEqual(list(self.model), self.items[:2] + self.items[3:])
+        self.assertIsNone(self.model.remove(self.items[2].job_id))
+
+    def test_rows_stay_consistent_through_compaction(self):
+        """Test that lookups still work after many removals compact the model."""
+        model = QueueModel()
+        items = [DownloadItem(f"https://youtu.be/{i}") for i in range(3 * COMPACT_MIN_DEAD)]
+        for item in items:
+            model.add(item)
+        kept = items[::3]
+        for i, item in enumerate(items):
+            if i % 3:
+                model.remove(item.job_id)
+
+        self.assertEqual(len(model), len(kept))
+        self.assertEqual(list(model), kept)
+        self.assertIs(model.at(100), kept[100])
+        self.assertEqual(model.row_of(kept[200].job_id), 200)
+        self.assertEqual(model.window(50, 2), kept[50:52])
+
+    def test_find_matches_same_video_or_url(self):
+        """Test that duplicates are found by video ID across URL forms, or by URL."""
+        model = QueueModel()
+        video = DownloadItem("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+        other = DownloadItem("https://example.com/clip")
+        model.add(video)
+        model.add(other)
+
+        self.assertIs(model.find("https://youtu.be/dQw4w9WgXcQ"), video)
+        self.assertIs(model.find("https://example.com/clip "), other)
+        self.assertIsNone(model.find("https://youtu.be/aaaaaaaaaaa"))
+
+        model.remove(video.job_id)
+        self.assertIsNone(model.find("https://youtu.be/dQw4w9WgXcQ"))
+
+    def test_status_counts_follow_transitions(self):
+        """Test that per-status counts track adds, status changes and removals."""
+        self.assertEqual(self.model.count("Queued"), 10)
+
+        self.model.set_status(self.items[0], "Downloading")
+        self.model.set_status(self.items[0], "Complete")
+        self.model.set_status(self.items[1], "Failed")
+        self.model.remove(self.items[2].job_id)
+        self.model.remove(self.items[1].job_id)
+
+        self.assertEqual(self.items[0].status, "Complete")
+        self.assertEqual(self.model.count("Queued"), 7)
+        self.assertEqual(self.model.count("Complete"), 1)
+        self.assertEqual(self.model.count("Failed"), 0)
+        self.assertEqual(self.model.count("Downloading"), 0)
+
+    def test_add_many_skips_duplicates(self):
+        """Test that a batch insert leaves out queued videos and repeats within the batch."""
+        batch = [DownloadItem("https://youtu.be/video3"),
+                 DownloadItem("https://www.youtube.com/watch?v=dQw4w9WgXcQ"),
+                 DownloadItem("https://youtu.be/dQw4w9WgXcQ"),
+                 DownloadItem("https://vimeo.com/1")]
+
+        added = self.model.add_many(batch)
+
+        self.assertEqual(added, [batch[1], batch[3]])
+        self.assertIsNone(batch[0].job_id)
+        self.assertEqual(len(self.model), 12)
+        self.assertEqual(self.model.window(10, 5), added)
+        self.assertIs(self.model.find("https://youtube.com/shorts/dQw4w9WgXcQ"), batch[1])
+        self.assertEqual(self.model.count("Queued"), 12)
+
+    def test_clear(self):
+        """Test that clearing empties the model but keeps IDs unique."""
+        self.model.clear()
+        self.assertEqual(len(self.model), 0)
+        self.assertEqual(self.model.window(0, 5), [])
+        self.assertEqual(self.model.count("Queued"), 0)
+        self.assertIsNone(self.model.find(self.items[0].url))
+        item = DownloadItem("https://youtu.be/new")
+        self.model.add(item)
+        self.assertNotIn(item.job_id, [i.job_id for i in self.items])
+        self.assertIs(self.model.at(0), item)
+
+
+if __name__ == '__main__':
+    unittest.main()
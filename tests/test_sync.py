@@ -0,0 +1,163 @@
+import unittest
+import os
+import tempfile
+import shutil
+from unittest.mock import Mock
+from ytdl.core.sync import ChannelSync, SyncState, build_break_filter, KNOWN_IDS_KEPT
+from ytdl.core.downloader import CompletedDownload
+from ytdl.core.eventbus import EventBus, JobEvent, JobState
+
+CHANNEL = "https://www.youtube.com/@TestChannel/videos"
+
+
+class TestSyncState(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state_file = os.path.join(self.temp_dir, "sync.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_update_persists_newest_first(self):
+        """Test that new IDs are stored ahead of older ones and survive reload."""
+        state = SyncState(self.state_file)
+        state.update(CHANNEL, ["old2", "old1"], "20240101")
+        state.update(CHANNEL, ["new1"], "20240301")
+
+        entry = SyncState(self.state_file).get(CHANNEL)
+
+        self.assertEqual(entry["known_ids"], ["new1", "old2", "old1"])
+        self.assertEqual(entry["newest_date"], "20240301")
+
+    def test_known_ids_are_bounded(self):
+        """Test that only the most recent IDs are kept."""
+        state = SyncState(self.state_file)
+        state.update(CHANNEL, [f"id{i}" for i in range(100)])
+
+        self.assertEqual(len(state.get(CHANNEL)["known_ids"]), KNOWN_IDS_KEPT)
+
+    def test_corrupt_state_starts_empty(self):
+        """Test that an unreadable state file is treated as no state."""
+        with open(self.state_file, "w") as f:
+            f.write("{not json")
+
+        self.assertEqual(SyncState(self.state_file).get(CHANNEL), {})
+
+
+class TestBuildBreakFilter(unittest.TestCase):
+
+    def test_first_sync_has_no_filter(self):
+        """Test that a source with no state is enumerated fully."""
+        self.assertIsNone(build_break_filter([]))
+
+    def test_filter_breaks_on_known_ids_and_older_dates(self):
+        """Test the generated match filter."""
+        self.assertEqual(
+            build_break_filter(["abc", "d-e"], "20240101"),
+            "id!='abc' & id!='d-e' & upload_date>=?20240101"
+        )
+
+
+class TestChannelSync(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state = SyncState(os.path.join(self.temp_dir, "sync.json"))
+        self.downloader = Mock()
+        self.downloader.completion_hooks = []
+        self.downloader.add_completion_hook.side_effect = self.downloader.completion_hooks.append
+        self.downloader.bus = EventBus()
+        self.output = Mock()
+        self.sync = ChannelSync(self.downloader, self.state, self.output)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _fake_download(self, *completed, success=True, exit_code=None):
+        def download(url, **kwargs):
+            for video_id, date in completed:
+                for hook in list(self.downloader.completion_hooks):
+                    hook(CompletedDownload(url, video_id, "Youtube", "22", f"/d/{video_id}.mp4", date))
+            if not success:
+                self.downloader.bus.publish(JobEvent(kwargs["job_id"], JobState.FAILED, url,
+                                                     error="failed", exit_code=exit_code))
+            return success
+        self.downloader.download.side_effect = download
+
+    def test_first_sync_enumerates_lazily_without_break_filter(self):
+        """Test that a first sync downloads everything and records state."""
+        self._fake_download(("new", "20240201"), ("old", "20240101"))
+
+        result = self.sync.sync(CHANNEL)
+
+        extra_args = self.downloader.download.call_args.kwargs["extra_args"]
+        self.assertEqual(extra_args, ["--lazy-playlist", "--ignore-errors"])
+        self.assertEqual(result.new_ids, ["new", "old"])
+        self.assertEqual(self.state.get(CHANNEL)["newest_date"], "20240201")
+        self.assertEqual(self.downloader.completion_hooks, [])
+
+    def test_later_sync_stops_at_known_items(self):
+        """Test that a later sync passes a break filter built from stored state."""
+        self.state.update(CHANNEL, ["old"], "20240101")
+        self._fake_download(("newer", "20240301"))
+
+        result = self.sync.sync(CHANNEL, quality="720p")
+
+        kwargs = self.downloader.download.call_args.kwargs
+        self.assertEqual(kwargs["quality"], "720p")
+        self.assertEqual(kwargs["extra_args"],
+                         ["--lazy-playlist", "--ignore-errors", "--break-match-filters", "id!='old' & upload_date>=?20240101"])
+        self.assertEqual(result.new_ids, ["newer"])
+        self.assertEqual(self.state.get(CHANNEL)["known_ids"], ["newer", "old"])
+
+    def test_full_sync_ignores_state(self):
+        """Test that --full enumerates everything again."""
+        self.state.update(CHANNEL, ["old"], "20240101")
+        self._fake_download()
+
+        self.sync.sync(CHANNEL, full=True)
+
+        self.assertEqual(self.downloader.download.call_args.kwargs["extra_args"], ["--lazy-playlist", "--ignore-errors"])
+
+    def test_failed_sync_without_downloads_keeps_state(self):
+        """Test that a failed sync that fetched nothing doesn't touch state."""
+        self.state.update(CHANNEL, ["old"], "20240101")
+        self.downloader.download.return_value = False
+
+        result = self.sync.sync(CHANNEL)
+
+        self.assertFalse(result.success)
+        self.assertEqual(self.state.get(CHANNEL)["known_ids"], ["old"])
+
+    def test_entry_errors_still_advance_state(self):
+        """Test that a sync where one upload failed records the uploads that finished."""
+        self.state.update(CHANNEL, ["old"], "20240101")
+        # yt-dlp exits with 1 after the walk when e.g. a members-only upload failed
+        self._fake_download(("newest", "20240401"), ("newer", "20240301"), success=False, exit_code=1)
+
+        result = self.sync.sync(CHANNEL)
+
+        self.assertFalse(result.success)
+        self.assertTrue(result.partial)
+        self.assertEqual(self.state.get(CHANNEL)["known_ids"], ["newest", "newer", "old"])
+        self.assertEqual(self.state.get(CHANNEL)["newest_date"], "20240401")
+        self.output.error.assert_called_once()
+
+    def test_aborted_partial_sync_keeps_state(self):
+        """Test that a sync that downloaded some uploads and then aborted doesn't advance state."""
+        self.state.update(CHANNEL, ["old"], "20240101")
+        self._fake_download(("newest", "20240401"), success=False, exit_code=-15)
+
+        result = self.sync.sync(CHANNEL)
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.new_ids, ["newest"])
+        # The next sync still breaks at "old", so uploads between the two are retried
+        self.assertEqual(self.state.get(CHANNEL)["known_ids"], ["old"])
+        self.assertEqual(self.state.get(CHANNEL)["newest_date"], "20240101")
+        self.output.error.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
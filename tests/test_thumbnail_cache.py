@@ -0,0 +1,156 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock
+from ytdl.gui.utils.thumbnail_cache import DiskCache, ThumbnailCache
+
+
+class FakeThumbnailCache(ThumbnailCache):
+    """Thumbnail cache with the network and Pillow steps replaced."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fetched = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def _fetch(self, url):
+        self.release.wait(5)
+        self.fetched.append(url)
+        if "broken" in url:
+            raise OSError("404")
+        return url.encode()
+
+    def _prepare(self, data):
+        return b"small:" + data
+
+    def _decode(self, data):
+        return data
+
+    def _to_photo(self, image):
+        return ("photo", image)
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def test_evicts_least_recently_used_over_cap(self):
+        """Test that the oldest unused files are deleted to stay under the cap."""
+        cache = DiskCache(self.dir, max_bytes=25)
+        cache.put("a", b"x" * 10)
+        cache.put("b", b"x" * 10)
+        self.assertEqual(cache.get("a"), b"x" * 10)
+
+        cache.put("c", b"x" * 10)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "b")))
+        self.assertEqual(cache.get("a"), b"x" * 10)
+        self.assertEqual(cache.total_bytes, 20)
+
+    def test_existing_files_are_counted_on_start(self):
+        """Test that a reopened cache knows its files and enforces a smaller cap."""
+        cache = DiskCache(self.dir, max_bytes=100)
+        for name in "abc":
+            cache.put(name, b"x" * 10)
+
+        reopened = DiskCache(self.dir, max_bytes=15)
+
+        self.assertEqual(reopened.total_bytes, 10)
+        self.assertEqual(len(os.listdir(self.dir)), 1)
+
+
+class TestThumbnailCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.delivered = []
+        self.cache = self._cache()
+
+    def _cache(self, **kwargs):
+        cache = FakeThumbnailCache(self.dir, self._deliver, **kwargs)
+        self.addCleanup(cache.shutdown)
+        return cache
+
+    def _deliver(self, fn, *args):
+        # Stands in for the Tk thread: run later, from run_deliveries()
+        self.delivered.append((fn, args))
+
+    def _run_deliveries(self, count=1):
+        for _ in range(500):
+            if len(self.delivered) >= count:
+                break
+            threading.Event().wait(0.01)
+        deliveries, self.delivered = self.delivered, []
+        for fn, args in deliveries:
+            fn(*args)
+
+    def test_request_loads_and_keeps_in_memory(self):
+        """Test that a requested thumbnail reaches the callback and the memory tier."""
+        callback = Mock()
+        self.cache.request("https://i.ytimg.com/a.jpg", callback)
+        self._run_deliveries()
+
+        callback.assert_called_once_with(("photo", b"small:https://i.ytimg.com/a.jpg"))
+        self.assertEqual(self.cache.get("https://i.ytimg.com/a.jpg"), ("photo", b"small:https://i.ytimg.com/a.jpg"))
+
+    def test_concurrent_requests_share_one_fetch(self):
+        """Test that requests for a URL that is already loading don't fetch it again."""
+        first, second = Mock(), Mock()
+        self.cache.release.clear()
+        self.cache.request("https://i.ytimg.com/a.jpg", first)
+        self.cache.request("https://i.ytimg.com/a.jpg", second)
+        self.cache.release.set()
+        self._run_deliveries()
+
+        self.assertEqual(self.cache.fetched, ["https://i.ytimg.com/a.jpg"])
+        first.assert_called_once()
+        second.assert_called_once()
+
+    def test_disk_tier_survives_restart(self):
+        """Test that a new cache reads thumbnails from disk instead of fetching."""
+        self.cache.request("https://i.ytimg.com/a.jpg", Mock())
+        self._run_deliveries()
+
+        restarted = self._cache()
+        callback = Mock()
+        restarted.request("https://i.ytimg.com/a.jpg", callback)
+        self._run_deliveries()
+
+        self.assertEqual(restarted.fetched, [])
+        callback.assert_called_once_with(("photo", b"small:https://i.ytimg.com/a.jpg"))
+
+    def test_memory_tier_is_bounded(self):
+        """Test that only the most recently used PhotoImages stay in memory."""
+        cache = self._cache(memory_items=2)
+        for name in "abc":
+            cache.request(f"https://i.ytimg.com/{name}.jpg", Mock())
+            self._run_deliveries()
+
+        self.assertIsNone(cache.get("https://i.ytimg.com/a.jpg"))
+        self.assertIsNotNone(cache.get("https://i.ytimg.com/c.jpg"))
+
+    def test_failed_urls_are_not_retried(self):
+        """Test that a thumbnail that failed to load isn't fetched again."""
+        callback = Mock()
+        self.cache.request("https://i.ytimg.com/broken.jpg", callback)
+        for _ in range(500):
+            if "https://i.ytimg.com/broken.jpg" in self.cache._failed:
+                break
+            threading.Event().wait(0.01)
+        self.cache.request("https://i.ytimg.com/broken.jpg", callback)
+        threading.Event().wait(0.05)
+
+        self.assertEqual(self.cache.fetched, ["https://i.ytimg.com/broken.jpg"])
+        self.assertEqual(self.delivered, [])
+        callback.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from unittest.mock import Mock
+from ytdl.gui.utils.update_pump import UpdatePump
+
+
+class TestUpdatePump(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Mock()
+        self.render = Mock()
+        self.pump = UpdatePump(self.root, render_dirty=self.render, fps=10)
+
+    def test_calls_run_in_order_on_flush(self):
+        """Test that posted calls wait for the next frame and keep their order."""
+        calls = []
+        self.pump.call(calls.append, 1)
+        self.pump.call(calls.append, 2)
+        self.assertEqual(calls, [])
+
+        self.pump.flush()
+
+        self.assertEqual(calls, [1, 2])
+        self.pump.flush()
+        self.assertEqual(calls, [1, 2])
+
+    def test_keyed_calls_are_coalesced(self):
+        """Test that only the latest call per key runs in a frame."""
+        status = Mock()
+        for i in range(100):
+            self.pump.call_latest("status", status, f"line {i}")
+
+        self.pump.flush()
+
+        status.assert_called_once_with("line 99")
+
+    def test_dirty_items_render_once_per_frame(self):
+        """Test that repeated marks of an item render it once."""
+        first, second = object(), object()
+        for _ in range(50):
+            self.pump.mark_dirty(first)
+            self.pump.mark_dirty(second)
+
+        self.pump.flush()
+        self.pump.flush()
+
+        self.render.assert_called_once_with([first, second])
+
+    def test_single_timer(self):
+        """Test that the pump reschedules one timer per frame."""
+        self.pump.start()
+        self.pump.start()
+        self.root.after.assert_called_once_with(100, self.pump._tick)
+
+        self.pump._tick()
+        self.assertEqual(self.root.after.call_count, 2)
+
+        self.pump.stop()
+        self.root.after_cancel.assert_called_once()
+        self.pump._tick()
+        self.assertEqual(self.root.after.call_count, 2)
+
+    def test_failing_call_does_not_stop_frame(self):
+        """Test that a callback error is reported and later calls still run."""
+        later = Mock()
+        self.pump.call(Mock(side_effect=RuntimeError("boom")))
+        self.pump.call(later)
+
+        self.pump.flush()
+
+        later.assert_called_once()
+        self.root.report_callback_exception.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+from ytdl.gui.utils.url_import import iter_url_chunks
+
+
+class TestIterUrlChunks(unittest.TestCase):
+
+    def test_chunks_and_duplicates(self):
+        """Test that URLs come out in chunks with repeated videos dropped."""
+        lines = ["# https://youtu.be/commented1",
+                 "https://youtu.be/dQw4w9WgXcQ https://vimeo.com/1",
+                 "",
+                 "see https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=3 again",
+                 "https://vimeo.com/2",
+                 "https://vimeo.com/1",
+                 "https://vimeo.com/3"]
+
+        chunks = list(iter_url_chunks(lines, chunk_size=2))
+
+        self.assertEqual(chunks, [["https://youtu.be/dQw4w9WgXcQ", "https://vimeo.com/1"],
+                                  ["https://vimeo.com/2", "https://vimeo.com/3"]])
+
+    def test_streams_lazily(self):
+        """Test that a chunk is yielded before the rest of the input is read."""
+        def lines():
+            for i in range(3):
+                yield f"https://vimeo.com/{i}"
+            raise AssertionError("read too far")
+
+        self.assertEqual(next(iter_url_chunks(lines(), chunk_size=3)),
+                         ["https://vimeo.com/0", "https://vimeo.com/1", "https://vimeo.com/2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
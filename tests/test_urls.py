@@ -0,0 +1,148 @@
+import unittest
+from ytdl.core.urls import UrlKind, extract_video_id, find_urls, is_collection_url, parse_url, url_key
+
+
+class TestExtractVideoId(unittest.TestCase):
+
+    def test_youtube_url_variants(self):
+        """Test that common YouTube URL forms resolve to the same ID."""
+        urls = [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://youtube.com/watch?v=dQw4w9WgXcQ&t=42",
+            "https://m.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://music.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://youtu.be/dQw4w9WgXcQ?si=tracking",
+            "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+            "https://www.youtube.com/embed/dQw4w9WgXcQ",
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(extract_video_id(url), "dQw4w9WgXcQ")
+
+    def test_non_video_urls(self):
+        """Test that non-video URLs return None."""
+        urls = [
+            "https://www.youtube.com/@channel",
+            "https://www.youtube.com/playlist?list=PL123",
+            "https://vimeo.com/123456",
+            "https://youtube.com/watch?v=short",
+            "not a url",
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertIsNone(extract_video_id(url))
+
+
+
+class TestIsCollectionUrl(unittest.TestCase):
+
+    def test_channel_and_playlist_urls(self):
+        """Test that channel and playlist URLs are recognized."""
+        urls = [
+            "https://www.youtube.com/@channel",
+            "https://www.youtube.com/@channel/videos",
+            "https://www.youtube.com/channel/UC1234567890",
+            "https://www.youtube.com/c/name",
+            "https://www.youtube.com/user/name",
+            "https://www.youtube.com/playlist?list=PL123",
+            "https://vimeo.com/channels/staffpicks",
+            "https://www.tiktok.com/@someone",
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertTrue(is_collection_url(url))
+
+    def test_videos_and_other_sites_are_not_collections(self):
+        """Test that single videos and unknown sites are not collections."""
+        urls = [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PL123",
+            "https://youtu.be/dQw4w9WgXcQ",
+            "https://vimeo.com/channels/staffpicks/123456",
+            "https://example.com/channel/name",
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertFalse(is_collection_url(url))
+
+
+class TestParseUrl(unittest.TestCase):
+
+    def test_video_variants_share_a_key(self):
+        """Test that host, path and tracking-parameter variants map to one key."""
+        groups = {
+            ("youtube", "dQw4w9WgXcQ"): [
+                "https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ&si=abc",
+                "https://music.youtube.com/watch?v=dQw4w9WgXcQ&list=RD1",
+                "https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ?start=3",
+                "https://youtube.com/live/dQw4w9WgXcQ",
+            ],
+            ("vimeo", "76979871"): [
+                "https://vimeo.com/76979871?utm_source=x",
+                "https://player.vimeo.com/video/76979871",
+                "https://vimeo.com/channels/staffpicks/76979871",
+            ],
+            ("dailymotion", "x8abcde"): [
+                "https://www.dailymotion.com/video/x8abcde_some-title",
+                "https://dai.ly/x8abcde",
+            ],
+            ("twitchvod", "v123456"): ["https://www.twitch.tv/videos/123456?t=1h"],
+            ("twitchclips", "FunnyClip"): ["https://clips.twitch.tv/FunnyClip",
+                                           "https://www.twitch.tv/someone/clip/FunnyClip"],
+            ("tiktok", "7123456789"): ["https://www.tiktok.com/@someone/video/7123456789?is_from_webapp=1",
+                                       "https://m.tiktok.com/@someone/video/7123456789"],
+            ("instagram", "Cabc123"): ["https://www.instagram.com/p/Cabc123/?igshid=x",
+                                       "https://instagram.com/reel/Cabc123"],
+            ("twitter", "1700000000000000000"): ["https://twitter.com/user/status/1700000000000000000?s=20",
+                                                 "https://x.com/user/status/1700000000000000000",
+                                                 "https://mobile.twitter.com/user/status/1700000000000000000"],
+        }
+        for (extractor, video_id), urls in groups.items():
+            for url in urls:
+                with self.subTest(url=url):
+                    self.assertEqual(parse_url(url), (extractor, video_id, UrlKind.VIDEO))
+                    self.assertEqual(url_key(url), f"{extractor} {video_id}")
+
+    def test_playlists_and_channels(self):
+        """Test that collections are classified and keyed."""
+        self.assertEqual(parse_url("https://www.youtube.com/playlist?list=PLabc123&si=x"),
+                         ("youtubetab", "PLabc123", UrlKind.PLAYLIST))
+        self.assertEqual(parse_url("https://m.youtube.com/@SomeOne/videos"),
+                         ("youtubetab", "@someone", UrlKind.CHANNEL))
+        self.assertEqual(parse_url("https://www.youtube.com/channel/UCabcDEF"),
+                         ("youtubetab", "channel/UCabcDEF", UrlKind.CHANNEL))
+        self.assertEqual(parse_url("https://vimeo.com/showcase/1234"),
+                         ("vimeoalbum", "1234", UrlKind.PLAYLIST))
+        self.assertEqual(parse_url("https://www.twitch.tv/SomeOne"),
+                         ("twitchstream", "someone", UrlKind.VIDEO))
+
+    def test_unrecognized_urls(self):
+        """Test that other sites and unknown pages have no parsed key."""
+        for url in ["https://example.com/watch?v=dQw4w9WgXcQ", "https://www.youtube.com/",
+                    "https://www.youtube.com/feed/trending", "https://vm.tiktok.com/ZMabc/",
+                    "https://twitter.com/user", "not a url", "http://[::1"]:
+            with self.subTest(url=url):
+                self.assertIsNone(parse_url(url))
+        self.assertEqual(url_key(" https://example.com/a "), "https://example.com/a")
+
+
+class TestFindUrls(unittest.TestCase):
+
+    def test_urls_in_text(self):
+        """Test that URLs are found anywhere in a line, without surrounding punctuation."""
+        text = ('Watch https://youtu.be/dQw4w9WgXcQ, and (https://vimeo.com/123). '
+                '<a href="https://www.youtube.com/watch?v=abcdefghijk&t=5">x</a> HTTPS://EXAMPLE.COM/v')
+        self.assertEqual(list(find_urls(text)), [
+            "https://youtu.be/dQw4w9WgXcQ",
+            "https://vimeo.com/123",
+            "https://www.youtube.com/watch?v=abcdefghijk&t=5",
+            "HTTPS://EXAMPLE.COM/v",
+        ])
+
+    def test_no_urls(self):
+        """Test that text without URLs yields nothing."""
+        self.assertEqual(list(find_urls("no links here")), [])
+        self.assertEqual(list(find_urls("http:// and https://localhost")), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import os
+import tempfile
+import shutil
+import threading
+from ytdl.core.watch import FolderWatcher, Inotify
+
+
+class TestFolderWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.urls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _watcher(self, **kwargs):
+        return FolderWatcher(self.temp_dir, self.urls.append, **kwargs)
+
+    def _append(self, name, text):
+        with open(os.path.join(self.temp_dir, name), "a") as f:
+            f.write(text)
+
+    def test_scan_reads_url_files(self):
+        """Test that URL files are parsed, skipping comments and blank lines."""
+        self._append("batch.txt", "https://a\n\n# comment\n  https://b  \n")
+        self._append("notes.md", "https://ignored\n")
+
+        self.assertEqual(self._watcher().scan(), 2)
+        self.assertEqual(self.urls, ["https://a", "https://b"])
+
+    def test_appended_lines_are_read_once(self):
+        """Test that only new lines are read after an append."""
+        watcher = self._watcher()
+        self._append("batch.txt", "https://a\n")
+        watcher.scan()
+        self._append("batch.txt", "https://b\n")
+        watcher.scan()
+        watcher.scan()
+
+        self.assertEqual(self.urls, ["https://a", "https://b"])
+
+    def test_incomplete_line_waits_for_newline(self):
+        """Test that a partially written line is not read early."""
+        watcher = self._watcher()
+        self._append("batch.txt", "https://a\nhttps://par")
+        watcher.scan()
+        self._append("batch.txt", "tial\n")
+        watcher.scan()
+
+        self.assertEqual(self.urls, ["https://a", "https://partial"])
+
+    def test_offsets_survive_restart(self):
+        """Test that a new watcher resumes from the saved offsets."""
+        self._append("batch.txt", "https://a\n")
+        self._watcher().scan()
+        self._append("batch.txt", "https://b\n")
+        self._watcher().scan()
+
+        self.assertEqual(self.urls, ["https://a", "https://b"])
+
+    def test_replaced_file_is_read_from_start(self):
+        """Test that truncating a file resets its offset."""
+        watcher = self._watcher()
+        self._append("batch.txt", "https://a\nhttps://b\n")
+        watcher.scan()
+        with open(os.path.join(self.temp_dir, "batch.txt"), "w") as f:
+            f.write("https://c\n")
+        watcher.scan()
+
+        self.assertEqual(self.urls, ["https://a", "https://b", "https://c"])
+
+    def test_run_picks_up_new_files(self):
+        """Test the watch loop with polling and with inotify when available."""
+        for use_inotify in (False, True):
+            with self.subTest(use_inotify=use_inotify):
+                self.urls.clear()
+                seen = threading.Event()
+                watcher = FolderWatcher(self.temp_dir, lambda url: (self.urls.append(url), seen.set()),
+                                        poll_interval=0.05, use_inotify=use_inotify)
+                thread = threading.Thread(target=watcher.run)
+                thread.start()
+                try:
+                    self._append(f"new-{use_inotify}.txt", "https://new\n")
+                    self.assertTrue(seen.wait(5))
+                finally:
+                    watcher.stop()
+                    thread.join(5)
+                self.assertEqual(self.urls, ["https://new"])
+
+
+class TestInotify(unittest.TestCase):
+
+    def test_reports_changed_file_names(self):
+        """Test that inotify reports files written in the watched folder."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            try:
+                inotify = Inotify(temp_dir)
+            except OSError:
+                self.skipTest("inotify not available")
+            with open(os.path.join(temp_dir, "a.txt"), "w") as f:
+                f.write("x\n")
+            names = inotify.read_events(2)
+            inotify.close()
+            self.assertIn("a.txt", names)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -67,7 +67,7 @@ try:
     print("✓ DownloadItem initialization works")
     
     # Test metadata update
-    item.update_metadata("Test Video", "Test Channel", "10.5 MB")
+    item.update_metadata("Test Video", "Test Channel", 11010048)
     assert item.title == "Test Video"
     assert item.channel == "Test Channel"
     assert item.file_size == "10.5 MB"